@@ -3,19 +3,31 @@
 """
 能源计算系统 - 主入口
 支持模块: 能源平衡表、工业、交通、建筑、电力
-分析模块: 宏观测算参考
+分析模块: 宏观测算参考、数据模板、能源结构、碳排放轨迹、情景数据一览表、统计表格
+模块和分析结果发布到进程内结果存储（ResultStore），下游分析直接读取，CSV导出为可选输出
+
+使用方法:
+    python main.py [--config config/config.json]
+    python main.py --watch [--interval 1.0]    # 监视输入CSV和配置文件，修改后只重算受影响的阶段
 """
 
+import argparse
 import os
 import sys
 
 # 添加src目录到路径
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-from src.utils import ConfigLoader
+from src.utils import ConfigLoader, ResultStore
 from src.modules import (BalanceCalculator, IndustryCalculator, 
-                         TransportCalculator, BuildingCalculator, PowerCalculator)
+                         TransportCalculator, BuildingCalculator, PowerCalculator,
+                         VectorizedPowerCalculator)
+from src.modules.power import (PowerDispatchCalculator, LdcPowerCalculator,
+                               ExpansionPowerCalculator, RegionalPowerCalculator)
 from src.analysis import MacroAnalyzer, TemplateAnalyzer, StructureAnalyzer
+from src.analysis.trajectory import TrajectoryAnalyzer
+from src.analysis.scenario_summary import ScenarioSummaryAnalyzer
+from src.analysis.statistics import StatisticsAnalyzer
 
 
 # 模块计算器映射
@@ -27,16 +39,48 @@ CALCULATORS = {
     'power': PowerCalculator,
 }
 
+# 可选计算引擎映射（模块配置 "engine" 指定）
+# - vectorized: 向量化计算
+# - hourly: 逐时调度，需配置 profile_csv_file
+# - ldc: 负荷持续曲线调度，可选配置 profile_csv_file
+# - expansion: 最小成本装机规划（需要 scipy）
+# - regional: 多区域计算，input_csv_file 为区域清单，可选配置 network_csv_file（跨区输电网络，需要 scipy）
+# 向量化类引擎可选配置 catalog_csv_file（技术目录）
+ENGINE_CALCULATORS = {
+    'vectorized': {'power': VectorizedPowerCalculator},
+    'hourly': {'power': PowerDispatchCalculator},
+    'ldc': {'power': LdcPowerCalculator},
+    'expansion': {'power': ExpansionPowerCalculator},
+    'regional': {'power': RegionalPowerCalculator},
+}
 
-def run_module(module_name: str, module_config: dict) -> dict:
-    """运行指定模块的计算"""
-    if module_name not in CALCULATORS:
-        print(f"模块 {module_name} 尚未实现")
-        return {}
-    
-    calculator_class = CALCULATORS[module_name]
+
+def load_calculator(module_name: str, module_config: dict, calculator_class=None):
+    """
+    按配置创建模块计算器并加载输入数据，输入文件不存在时返回 None
+    calculator_class 为空时按模块名称和 engine 选择计算器
+    """
+    if calculator_class is None:
+        calculator_class = CALCULATORS[module_name]
+        engine = module_config.get('engine')
+        if engine:
+            calculator_class = ENGINE_CALCULATORS.get(engine, {}).get(module_name, calculator_class)
     calculator = calculator_class()
     
+    catalog_file = module_config.get('catalog_csv_file')
+    if catalog_file and hasattr(calculator, 'load_catalog_from_csv'):
+        if os.path.exists(catalog_file):
+            calculator.load_catalog_from_csv(catalog_file)
+        else:
+            print(f"警告: 技术目录文件不存在 - {catalog_file}")
+    
+    profile_file = module_config.get('profile_csv_file')
+    if profile_file and hasattr(calculator, 'load_profiles_from_csv'):
+        if os.path.exists(profile_file):
+            calculator.load_profiles_from_csv(profile_file)
+        else:
+            print(f"警告: 逐时曲线文件不存在 - {profile_file}")
+    
     input_type = module_config.get('input_type', 'csv')
     
     if input_type == 'json':
@@ -46,7 +90,7 @@ def run_module(module_name: str, module_config: dict) -> dict:
     
     if not os.path.exists(input_file):
         print(f"错误: 输入文件不存在 - {input_file}")
-        return {}
+        return None
     
     print(f"从{input_type.upper()}文件加载数据: {input_file}")
     
@@ -55,26 +99,38 @@ def run_module(module_name: str, module_config: dict) -> dict:
     else:
         calculator.load_from_csv(input_file)
     
+    network_file = module_config.get('network_csv_file')
+    if network_file and hasattr(calculator, 'load_network_from_csv'):
+        if os.path.exists(network_file):
+            calculator.load_network_from_csv(network_file)
+        else:
+            print(f"警告: 输电网络文件不存在 - {network_file}")
+    
+    return calculator
+
+
+def run_module(module_name: str, module_config: dict) -> dict:
+    """运行指定模块的计算"""
+    if module_name not in CALCULATORS:
+        print(f"模块 {module_name} 尚未实现")
+        return {}
+    
+    calculator = load_calculator(module_name, module_config)
+    if calculator is None:
+        return {}
+    
     results = calculator.calculate()
     calculator.print_results(results)
     
     output_file = module_config.get('output_csv_file')
-    calculator.export_to_csv(results, output_file)
+    if output_file:
+        calculator.export_to_csv(results, output_file)
     
     return results
 
 
-def run_macro_analysis(config: dict, module_results: dict = None) -> dict:
-    """运行宏观测算参考分析"""
-    macro_config = config.get('analysis', {}).get('macro', {})
-    
-    if not macro_config.get('enabled', False):
-        return {}
-    
-    print(f"\n{'='*70}")
-    print("运行分析模块: 宏观测算参考")
-    print("=" * 70)
-    
+def load_macro_analyzer(macro_config: dict, module_results: dict = None) -> MacroAnalyzer:
+    """按配置创建宏观测算参考分析器并加载输入数据和部门数据"""
     analyzer = MacroAnalyzer()
     
     # 加载输入数据
@@ -99,6 +155,23 @@ def run_macro_analysis(config: dict, module_results: dict = None) -> dict:
             print(f"从CSV文件加载部门数据: {sector_file}")
             analyzer.load_sector_data_from_csv(sector_file)
     
+    return analyzer
+
+
+def run_macro_analysis(config: dict, module_results: dict = None,
+                       store: ResultStore = None) -> dict:
+    """运行宏观测算参考分析"""
+    macro_config = config.get('analysis', {}).get('macro', {})
+    
+    if not macro_config.get('enabled', False):
+        return {}
+    
+    print(f"\n{'='*70}")
+    print("运行分析模块: 宏观测算参考")
+    print("=" * 70)
+    
+    analyzer = load_macro_analyzer(macro_config, module_results)
+    
     # 执行计算
     results = analyzer.calculate()
     
@@ -110,20 +183,14 @@ def run_macro_analysis(config: dict, module_results: dict = None) -> dict:
     if output_file:
         analyzer.export_to_csv(results, output_file)
     
+    if store is not None:
+        store.publish('macro', results, analyzer)
+    
     return results
 
 
-def run_template_analysis(config: dict, module_results: dict = None) -> dict:
-    """运行数据模板分析"""
-    template_config = config.get('analysis', {}).get('template', {})
-    
-    if not template_config.get('enabled', False):
-        return {}
-    
-    print(f"\n{'='*70}")
-    print("运行分析模块: 数据模板")
-    print("=" * 70)
-    
+def load_template_analyzer(template_config: dict, module_results: dict = None) -> TemplateAnalyzer:
+    """按配置创建数据模板分析器并加载数据"""
     analyzer = TemplateAnalyzer()
     
     # 加载数据
@@ -142,6 +209,23 @@ def run_template_analysis(config: dict, module_results: dict = None) -> dict:
             print(f"从CSV文件加载数据: {input_file}")
             analyzer.load_input_from_csv(input_file)
     
+    return analyzer
+
+
+def run_template_analysis(config: dict, module_results: dict = None,
+                          store: ResultStore = None) -> dict:
+    """运行数据模板分析"""
+    template_config = config.get('analysis', {}).get('template', {})
+    
+    if not template_config.get('enabled', False):
+        return {}
+    
+    print(f"\n{'='*70}")
+    print("运行分析模块: 数据模板")
+    print("=" * 70)
+    
+    analyzer = load_template_analyzer(template_config, module_results)
+    
     # 执行计算
     results = analyzer.calculate()
     
@@ -153,10 +237,37 @@ def run_template_analysis(config: dict, module_results: dict = None) -> dict:
     if output_file:
         analyzer.export_to_csv(results, output_file)
     
+    if store is not None:
+        store.publish('template', results, analyzer)
+    
     return results
 
 
-def run_structure_analysis(config: dict, module_results: dict = None) -> dict:
+def load_structure_analyzer(structure_config: dict, module_results: dict = None) -> StructureAnalyzer:
+    """按配置创建能源结构分析器并加载数据"""
+    analyzer = StructureAnalyzer()
+    
+    # 加载数据
+    use_module_results = structure_config.get('use_module_results', False)
+    
+    if use_module_results and module_results:
+        # 从模块计算结果加载数据
+        print("从模块计算结果加载数据...")
+        for module_name, results in module_results.items():
+            analyzer.load_module_results(module_name, results)
+        analyzer.load_from_modules()
+    else:
+        # 从CSV文件加载数据
+        input_file = structure_config.get('input_csv_file')
+        if input_file and os.path.exists(input_file):
+            print(f"从CSV文件加载数据: {input_file}")
+            analyzer.load_input_from_csv(input_file)
+    
+    return analyzer
+
+
+def run_structure_analysis(config: dict, module_results: dict = None,
+                           store: ResultStore = None) -> dict:
     """运行能源结构分析"""
     structure_config = config.get('analysis', {}).get('structure', {})
     
@@ -167,10 +278,31 @@ def run_structure_analysis(config: dict, module_results: dict = None) -> dict:
     print("运行分析模块: 能源结构")
     print("=" * 70)
     
-    analyzer = StructureAnalyzer()
+    analyzer = load_structure_analyzer(structure_config, module_results)
+    
+    # 执行计算
+    results = analyzer.calculate()
+    
+    # 打印结果
+    analyzer.print_results(results)
+    
+    # 导出结果
+    output_file = structure_config.get('output_csv_file')
+    if output_file:
+        analyzer.export_to_csv(results, output_file)
+    
+    if store is not None:
+        store.publish('structure', results, analyzer)
+    
+    return results
+
+
+def load_trajectory_analyzer(trajectory_config: dict, module_results: dict = None) -> TrajectoryAnalyzer:
+    """按配置创建碳排放轨迹分析器并加载数据"""
+    analyzer = TrajectoryAnalyzer()
     
     # 加载数据
-    use_module_results = structure_config.get('use_module_results', False)
+    use_module_results = trajectory_config.get('use_module_results', False)
     
     if use_module_results and module_results:
         # 从模块计算结果加载数据
@@ -180,11 +312,28 @@ def run_structure_analysis(config: dict, module_results: dict = None) -> dict:
         analyzer.load_from_modules()
     else:
         # 从CSV文件加载数据
-        input_file = structure_config.get('input_csv_file')
+        input_file = trajectory_config.get('input_csv_file')
         if input_file and os.path.exists(input_file):
             print(f"从CSV文件加载数据: {input_file}")
             analyzer.load_input_from_csv(input_file)
     
+    return analyzer
+
+
+def run_trajectory_analysis(config: dict, module_results: dict = None,
+                            store: ResultStore = None) -> dict:
+    """运行碳排放轨迹分析"""
+    trajectory_config = config.get('analysis', {}).get('trajectory', {})
+    
+    if not trajectory_config.get('enabled', False):
+        return {}
+    
+    print(f"\n{'='*70}")
+    print("运行分析模块: 碳排放轨迹")
+    print("=" * 70)
+    
+    analyzer = load_trajectory_analyzer(trajectory_config, module_results)
+    
     # 执行计算
     results = analyzer.calculate()
     
@@ -192,53 +341,166 @@ def run_structure_analysis(config: dict, module_results: dict = None) -> dict:
     analyzer.print_results(results)
     
     # 导出结果
-    output_file = structure_config.get('output_csv_file')
+    output_file = trajectory_config.get('output_csv_file')
     if output_file:
         analyzer.export_to_csv(results, output_file)
     
+    if store is not None:
+        store.publish('trajectory', results, analyzer)
+    
     return results
 
 
-def main():
-    """主函数"""
+def run_scenario_summary_analysis(config: dict, store: ResultStore = None) -> dict:
+    """运行情景数据一览表分析（use_module_results 时从结果存储读取，否则读取各分析的输出CSV）"""
+    summary_config = config.get('analysis', {}).get('scenario_summary', {})
+    
+    if not summary_config.get('enabled', False):
+        return {}
+    
+    print(f"\n{'='*70}")
+    print("运行分析模块: 情景数据一览表")
     print("=" * 70)
-    print("能源计算系统")
+    
+    use_store = summary_config.get('use_module_results', False) and store is not None
+    if use_store:
+        print("从结果存储加载数据...")
+    paths = _analysis_output_paths(config)
+    results = ScenarioSummaryAnalyzer().run(
+        input_path=summary_config.get('input_csv_file'),
+        output_path=summary_config.get('output_csv_file'),
+        macro_path=paths['macro'],
+        structure_path=paths['structure'],
+        trajectory_path=paths['trajectory'],
+        template_path=paths['template'],
+        store=store if use_store else None)
+    
+    if store is not None:
+        store.publish('scenario_summary', results)
+    
+    return results
+
+
+def run_statistics_analysis(config: dict, store: ResultStore = None) -> dict:
+    """运行统计表格分析（use_module_results 时从结果存储读取，否则读取各分析的输出CSV）"""
+    statistics_config = config.get('analysis', {}).get('statistics', {})
+    
+    if not statistics_config.get('enabled', False):
+        return {}
+    
+    print(f"\n{'='*70}")
+    print("运行分析模块: 统计表格")
     print("=" * 70)
     
-    # 加载配置
-    config_loader = ConfigLoader('config/config.json')
-    config = config_loader.load()
+    analyzer = StatisticsAnalyzer()
+    
+    if statistics_config.get('use_module_results', False) and store is not None:
+        print("从结果存储加载数据...")
+        analyzer.load_from_store(store)
+    else:
+        analyzer.load_from_csv(statistics_config.get('data_dir', 'data/output'))
     
+    # 执行计算
+    results = analyzer.calculate()
+    
+    # 打印结果
+    analyzer.print_results()
+    
+    # 导出结果
+    output_file = statistics_config.get('output_csv_file')
+    if output_file:
+        analyzer.export_to_csv(output_file)
+    
+    if store is not None:
+        store.publish('statistics', results)
+    
+    return results
+
+
+def _analysis_output_paths(config: dict) -> dict:
+    """各分析模块的输出CSV路径"""
+    analysis = config.get('analysis', {})
+    return {name: analysis.get(name, {}).get('output_csv_file', f"data/output/{name}_output.csv")
+            for name in ['macro', 'structure', 'trajectory', 'template']}
+
+
+def run_all(config: dict, store: ResultStore = None, completed=(), on_stage=None,
+            only=None) -> ResultStore:
+    """
+    运行全部已启用的计算模块和分析模块，返回结果存储
+    Args:
+        store: 结果存储，为空时新建
+        completed: 已完成的阶段（结果已恢复到 store 中），跳过不再运行
+        only: 只运行这些阶段（模块名称或 macro、template 等分析名称），为空时运行全部
+        on_stage: 每个阶段运行完成后调用 on_stage(阶段名称, store)，用于保存检查点
+    """
     # 获取启用的模块
-    enabled_modules = config_loader.get_enabled_modules()
+    modules = config.get('modules', {})
+    enabled_modules = [name for name, cfg in modules.items() if cfg.get('enabled', False)]
     
     if not enabled_modules:
         print("没有启用的计算模块，请检查配置文件")
     else:
         print(f"启用的模块: {', '.join(enabled_modules)}")
     
-    # 存储模块计算结果
-    module_results = {}
+    # 存储模块和分析结果（进程内传递，完整精度）
+    if store is None:
+        store = ResultStore()
     
-    # 运行各模块
-    for module_name in enabled_modules:
+    def run_module_stage(module_name):
         print(f"\n{'='*70}")
         print(f"运行模块: {module_name}")
         print("=" * 70)
-        
-        module_config = config_loader.get_module_config(module_name)
-        results = run_module(module_name, module_config)
+        results = run_module(module_name, modules[module_name])
         if results:
-            module_results[module_name] = results
+            store.publish(module_name, results)
+    
+    # 各阶段按顺序运行：计算模块，宏观测算参考、数据模板、能源结构、碳排放轨迹，情景数据一览表和统计表格
+    stages = [(name, lambda name=name: run_module_stage(name)) for name in enabled_modules]
+    stages += [
+        ('macro', lambda: run_macro_analysis(config, store, store)),
+        ('template', lambda: run_template_analysis(config, store, store)),
+        ('structure', lambda: run_structure_analysis(config, store, store)),
+        ('trajectory', lambda: run_trajectory_analysis(config, store, store)),
+        ('scenario_summary', lambda: run_scenario_summary_analysis(config, store)),
+        ('statistics', lambda: run_statistics_analysis(config, store)),
+    ]
+    for name, run in stages:
+        if only is not None and name not in only:
+            continue
+        if name in completed:
+            print(f"\n跳过已完成的阶段: {name}")
+            continue
+        run()
+        if on_stage is not None:
+            on_stage(name, store)
+    
+    return store
+
+
+def main():
+    """主函数"""
+    parser = argparse.ArgumentParser(description='能源计算系统')
+    parser.add_argument('--config', type=str, default='config/config.json', help='配置文件')
+    parser.add_argument('--watch', action='store_true',
+                        help='监视 data/input/*.csv 和配置文件，修改后只重算受影响的阶段')
+    parser.add_argument('--interval', type=float, default=1.0, help='监视模式的轮询间隔（秒）')
+    args = parser.parse_args()
+    
+    print("=" * 70)
+    print("能源计算系统")
+    print("=" * 70)
     
-    # 运行宏观测算参考分析
-    run_macro_analysis(config, module_results)
+    if args.watch:
+        from src.service import WatchSession
+        WatchSession(args.config, interval=args.interval).run()
+        return
     
-    # 运行数据模板分析
-    run_template_analysis(config, module_results)
+    # 加载配置
+    config_loader = ConfigLoader(args.config)
+    config = config_loader.load()
     
-    # 运行能源结构分析
-    run_structure_analysis(config, module_results)
+    run_all(config)
     
     print("\n" + "=" * 70)
     print("所有计算完成！")
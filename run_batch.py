@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+批量情景计算脚本
+
+在进程池中为多个情景运行完整的计算模块和分析模块，每个情景的输出写入 {输出根目录}/{情景名称}/。
+工作进程只导入一次计算代码，连续处理多个情景，可同时使用多个CPU核。
+
+使用方法:
+    python run_batch.py 情景文件.json [--config config/config.json] [--output-root 目录] [--workers N]
+    python run_batch.py --input-dirs data/input/情景A data/input/情景B [--workers N]
+    python run_batch.py 情景文件.json --shard 0/4      # 多节点：每个节点运行一个分片
+    python run_batch.py 情景文件.json --merge          # 全部分片完成后合并结果
+    python run_batch.py 情景文件.json --restart        # 清除检查点，全部重新计算
+
+    情景文件: 见 src/batch/scenarios.py，每个情景可指定输入目录和配置覆盖项
+    --input-dirs: 不使用情景文件，每个输入目录作为一个情景（名称为目录名）
+    --workers: 进程数，默认CPU核数，1 表示在当前进程中顺序执行
+    --no-shared-inputs: 不通过共享内存传递多个情景共用的输入文件
+    --shard: 只运行第 i 个分片（i/N，按情景名称哈希分片），结果保存到输出根目录供合并
+    --merge: 合并输出根目录下已完成情景的结果，可重复执行，报告未完成的分片
+    默认记录检查点（{输出根目录}/_journal/），中断后以相同参数重新运行时跳过已完成的情景和阶段；
+    --restart: 清除检查点日志后重新计算全部情景
+    --no-checkpoint: 不读写检查点日志
+"""
+
+import argparse
+import os
+import sys
+
+# 添加项目根目录到路径
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from src.utils import ConfigLoader
+from src.batch import (BatchRunner, BatchJournal, ScenarioSpec, load_scenarios,
+                       DEFAULT_OUTPUT_ROOT, parse_shard, run_shard, merge_results)
+from src.pipeline import STATUS_DONE
+
+
+def main():
+    parser = argparse.ArgumentParser(description='批量情景计算')
+    parser.add_argument('scenarios', nargs='?', default=None, help='情景文件（JSON）')
+    parser.add_argument('--input-dirs', nargs='+', default=None, help='每个输入目录作为一个情景')
+    parser.add_argument('--config', type=str, default=None, help='基础配置文件，默认 config/config.json')
+    parser.add_argument('--output-root', type=str, default=None, help='输出根目录')
+    parser.add_argument('--workers', type=int, default=None, help='进程数，默认CPU核数')
+    parser.add_argument('--no-shared-inputs', action='store_true', help='不使用共享内存输入表')
+    parser.add_argument('--shard', type=str, default=None, help='只运行指定分片，格式 i/N')
+    parser.add_argument('--merge', action='store_true', help='合并已完成情景的结果')
+    parser.add_argument('--restart', action='store_true', help='清除检查点，全部重新计算')
+    parser.add_argument('--no-checkpoint', action='store_true', help='不使用检查点')
+    args = parser.parse_args()
+
+    settings = {}
+    if args.scenarios:
+        scenarios, settings = load_scenarios(args.scenarios)
+    elif args.input_dirs:
+        scenarios = [ScenarioSpec(name=os.path.basename(os.path.normpath(d)), input_dir=d)
+                     for d in args.input_dirs]
+    else:
+        parser.error('需要情景文件或 --input-dirs')
+
+    output_root = args.output_root or settings.get('output_root', DEFAULT_OUTPUT_ROOT)
+    if args.merge:
+        merged = merge_results(output_root, scenarios)
+        if merged['missing']:
+            sys.exit(1)
+        return
+
+    config = ConfigLoader(args.config or settings.get('config', 'config/config.json')).load()
+    print(f"情景数: {len(scenarios)}，输出根目录: {output_root}")
+    if args.restart:
+        BatchJournal(output_root).clear()
+    checkpoint = not args.no_checkpoint
+
+    if args.shard:
+        shard_index, num_shards = parse_shard(args.shard)
+        results = run_shard(scenarios, config, shard_index, num_shards, output_root,
+                            max_workers=args.workers, checkpoint=checkpoint)
+    else:
+        results = BatchRunner(scenarios, config, output_root, max_workers=args.workers,
+                              share_inputs=not args.no_shared_inputs,
+                              checkpoint=checkpoint).run()
+    if any(result.status != STATUS_DONE for result in results.values()):
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
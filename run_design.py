@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+实验设计运行脚本（拉丁超立方 / Sobol序列 / 全因子）
+
+在设计文件声明的参数范围内生成设计点，每个设计点是一组输入覆盖项，
+直接作用于内存中已解析的输入数据（PowerData、MacroInputData、数据模板和碳排放轨迹的数据类），
+不复制或修改输入CSV；输入只解析一次，每个设计点只重算受影响的阶段。
+
+使用方法:
+    python run_design.py 设计文件.json [--config config/config.json] [--method lhs|sobol|factorial]
+                         [--samples 1000] [--seed 1] [--workers 1] [--save-design points.json]
+                         [--output data/output/design_output.csv] [--years 2030 2060]
+    python run_design.py --points points.json              # 计算已保存的设计点
+    python run_design.py 设计文件.json --no-run --save-design points.json   # 只生成设计点
+    python run_design.py --list-paths                      # 列出可覆盖的输入路径
+
+    设计文件: 见 src/batch/design.py
+"""
+
+import argparse
+import io
+import os
+import sys
+import time
+from contextlib import redirect_stdout
+
+# 添加项目根目录到路径
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from src.utils import ConfigLoader
+from src.batch import (ScenarioEvaluator, DesignRunner, generate_design, load_design_parameters,
+                       save_design, load_design, DESIGN_METHODS)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='实验设计（内存覆盖输入，批量计算设计点）')
+    parser.add_argument('design', nargs='?', default=None, help='设计文件（JSON）')
+    parser.add_argument('--config', type=str, default='config/config.json', help='配置文件')
+    parser.add_argument('--method', type=str, default=None, choices=list(DESIGN_METHODS),
+                        help='设计方法（默认取设计文件中的 method，否则 lhs）')
+    parser.add_argument('--samples', type=int, default=None, help='设计点数（默认取设计文件，否则 100）')
+    parser.add_argument('--seed', type=int, default=None, help='随机种子')
+    parser.add_argument('--points', type=str, default=None, help='已保存的设计点文件，不再生成')
+    parser.add_argument('--save-design', type=str, default=None, help='保存生成的设计点')
+    parser.add_argument('--no-run', action='store_true', help='只生成设计点，不计算')
+    parser.add_argument('--workers', type=int, default=1, help='进程数')
+    parser.add_argument('--years', type=str, nargs='+', default=None, help='输出CSV中的年份（默认全部）')
+    parser.add_argument('--output', type=str, default='data/output/design_output.csv', help='输出CSV文件')
+    parser.add_argument('--list-paths', action='store_true', help='列出可覆盖的输入路径后退出')
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("实验设计")
+    print("=" * 60)
+
+    if args.points:
+        parameters, points = [], load_design(args.points)
+        print(f"\n读取设计点: {args.points}（{len(points)} 个）")
+    elif args.design:
+        parameters, settings = load_design_parameters(args.design)
+        method = args.method or settings.get('method', 'lhs')
+        samples = args.samples or settings.get('samples', 100)
+        seed = args.seed if args.seed is not None else settings.get('seed')
+        points = generate_design(parameters, method, samples, seed)
+        print(f"\n{DESIGN_METHODS[method]}设计: {len(parameters)} 个参数，{len(points)} 个设计点")
+    elif not args.list_paths:
+        parser.error("需要设计文件或 --points")
+    if args.save_design and not args.list_paths:
+        save_design(points, args.save_design, parameters)
+    if args.no_run and not args.list_paths:
+        return None
+
+    with redirect_stdout(io.StringIO()):
+        config = ConfigLoader(args.config).load()
+    print("正在解析输入并计算基础情景...")
+    evaluator = ScenarioEvaluator(config).load()
+    if args.list_paths:
+        for path in evaluator.input_paths():
+            print(f"  {path}")
+        return None
+
+    runner = DesignRunner(evaluator)
+    print(f"正在计算 {len(points)} 个设计点...")
+    start = time.perf_counter()
+    results = runner.run(points, args.workers)
+    runner.print_summary(results, time.perf_counter() - start)
+    if args.output:
+        runner.export_to_csv(points, results, args.output, args.years)
+
+    print("\n" + "=" * 60)
+    print("实验设计完成！")
+    print("=" * 60)
+    return results
+
+
+if __name__ == '__main__':
+    main()
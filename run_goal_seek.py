@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+目标求解运行脚本（区间求根 / Newton迭代）
+
+给定目标（碳中和年份、2030年相对下降比例或任意输出指标的取值）和可调输入（杠杆），
+求出达到目标所需的杠杆取值。杠杆是内存中的输入覆盖项，输入只解析一次，
+每次迭代只重算杠杆所在阶段到目标阶段之间受影响的阶段。
+
+使用方法:
+    python run_goal_seek.py 问题文件.json [--config config/config.json] [--method auto|bracket|newton]
+                            [--max-iterations 60] [--save solved.json]
+    python run_design.py --points solved.json      # 按求得的杠杆取值重新计算全部输出
+
+    问题文件: 见 src/batch/goal_seek.py
+"""
+
+import argparse
+import io
+import os
+import sys
+from contextlib import redirect_stdout
+
+# 添加项目根目录到路径
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from src.utils import ConfigLoader
+from src.batch import (ScenarioEvaluator, GoalSeeker, DesignPoint, load_goal_problem, save_design,
+                       SOLVE_METHODS)
+from src.batch.goal_seek import MAX_ITERATIONS
+
+
+def main():
+    parser = argparse.ArgumentParser(description='目标求解（求达到目标所需的输入取值）')
+    parser.add_argument('problem', help='问题文件（JSON）')
+    parser.add_argument('--config', type=str, default='config/config.json', help='配置文件')
+    parser.add_argument('--method', type=str, default=None, choices=list(SOLVE_METHODS),
+                        help='求解方法（默认取问题文件中的 method，否则 auto）')
+    parser.add_argument('--max-iterations', type=int, default=None,
+                        help=f'最大迭代次数（默认取问题文件，否则 {MAX_ITERATIONS}）')
+    parser.add_argument('--save', type=str, default=None,
+                        help='保存求得的杠杆取值（设计点文件，可用 run_design.py --points 计算）')
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("目标求解")
+    print("=" * 60)
+
+    targets, levers, settings = load_goal_problem(args.problem)
+    method = args.method or settings.get('method', 'auto')
+    max_iterations = args.max_iterations or settings.get('max_iterations', MAX_ITERATIONS)
+    print(f"\n读取问题: {args.problem}（{len(targets)} 个目标，{len(levers)} 个杠杆）")
+
+    with redirect_stdout(io.StringIO()):
+        config = ConfigLoader(args.config).load()
+    print("正在解析输入并计算基础情景...")
+    evaluator = ScenarioEvaluator(config).load()
+
+    seeker = GoalSeeker(evaluator)
+    result = seeker.solve(targets, levers, method, max_iterations)
+    seeker.print_results(result)
+    if args.save:
+        save_design([DesignPoint('goal_seek', result.overrides)], args.save)
+
+    print("\n" + "=" * 60)
+    print("目标求解完成！" if result.converged else "目标求解结束（目标未全部满足）")
+    print("=" * 60)
+    return result
+
+
+if __name__ == '__main__':
+    main()
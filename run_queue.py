@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+作业队列脚本
+
+情景计算作业保存在本地 SQLite 队列文件中，工作进程池按优先级领取执行（见 src/batch/jobs.py）。
+小作业（只含分析阶段）默认优先，并可为小作业保留工作进程；作业可取消，工作进程崩溃后作业自动重新排队。
+
+使用方法:
+    python run_queue.py submit 情景文件.json [--stages macro scenario_summary] [--priority N]
+    python run_queue.py submit --input-dirs data/input/情景A data/input/情景B
+    python run_queue.py list [--status 排队]
+    python run_queue.py cancel 作业编号 [作业编号 ...]
+    python run_queue.py work [--workers N] [--small-workers 1] [--forever]
+
+    --queue: 队列文件，默认 data/output/queue/jobs.sqlite
+    --output-root: 作业输出根目录，默认 data/output/queue；每个作业写入 {输出根目录}/{情景名称}/job-{编号}
+    --stages: 只运行这些阶段（模块名称，或 macro、template、structure、trajectory、
+              scenario_summary、statistics），默认全部已启用的阶段
+    --priority: 优先级（数值越大越先执行），默认按作业规模估计：只含分析 10，含计算模块 5，含逐时调度等重型电力引擎 0
+    --small-workers: 只领取小作业（优先级不低于 10）的保留进程数
+    --forever: 队列为空后继续等待新作业，否则全部作业结束后退出
+"""
+
+import argparse
+import os
+import sys
+import time
+
+# 添加项目根目录到路径
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from src.utils import ConfigLoader
+from src.batch import (JobQueue, JobWorkerPool, JOB_RUNNING, ScenarioSpec, load_scenarios,
+                       DEFAULT_QUEUE_ROOT, DEFAULT_QUEUE_DB)
+
+
+def submit(args, queue: JobQueue) -> None:
+    settings = {}
+    if args.scenarios:
+        scenarios, settings = load_scenarios(args.scenarios)
+    elif args.input_dirs:
+        scenarios = [ScenarioSpec(name=os.path.basename(os.path.normpath(d)), input_dir=d)
+                     for d in args.input_dirs]
+    else:
+        sys.exit('需要情景文件或 --input-dirs')
+    output_root = args.output_root or settings.get('output_root', DEFAULT_QUEUE_ROOT)
+    base_config = ConfigLoader(args.config or settings.get('config', 'config/config.json')).load()
+    for spec in scenarios:
+        job_id = queue.submit_scenario(base_config, spec, output_root, stages=args.stages,
+                                       priority=args.priority, max_attempts=args.max_attempts)
+        job = queue.get(job_id)
+        print(f"已提交作业 {job_id}: {spec.name}（优先级 {job.priority}） -> {job.output_dir}")
+
+
+def list_jobs(args, queue: JobQueue) -> None:
+    jobs = queue.jobs(args.status)
+    print(f"{'编号':>6}  {'状态':<4}{'优先级':>6}{'尝试':>5}  {'耗时':>8}  {'名称':<20}进度")
+    for job in jobs:
+        seconds = ''
+        if job.started:
+            seconds = f"{(job.finished or time.time()) - job.started:.2f}s"
+        progress = ', '.join(job.progress)
+        if job.cancel_requested and job.status == JOB_RUNNING:
+            progress += '（已请求取消）'
+        print(f"{job.id:>6}  {job.status:<4}{job.priority:>6}{job.attempts:>5}  {seconds:>8}  "
+              f"{job.name:<20}{progress}")
+        if job.error and args.errors:
+            print(job.error)
+    print("作业状态: " + "，".join(f"{status} {count}" for status, count in queue.counts().items()))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='情景计算作业队列')
+    parser.add_argument('--queue', type=str, default=DEFAULT_QUEUE_DB, help='队列文件')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    submit_parser = commands.add_parser('submit', help='提交作业')
+    submit_parser.add_argument('scenarios', nargs='?', default=None, help='情景文件（JSON）')
+    submit_parser.add_argument('--input-dirs', nargs='+', default=None, help='每个输入目录作为一个情景')
+    submit_parser.add_argument('--config', type=str, default=None, help='基础配置文件')
+    submit_parser.add_argument('--output-root', type=str, default=None, help='输出根目录')
+    submit_parser.add_argument('--stages', nargs='+', default=None, help='只运行这些阶段')
+    submit_parser.add_argument('--priority', type=int, default=None, help='优先级，越大越先执行')
+    submit_parser.add_argument('--max-attempts', type=int, default=3, help='工作进程崩溃后的最大尝试次数')
+
+    list_parser = commands.add_parser('list', help='列出作业')
+    list_parser.add_argument('--status', type=str, default=None, help='只列出该状态的作业')
+    list_parser.add_argument('--errors', action='store_true', help='打印失败作业的错误信息')
+
+    cancel_parser = commands.add_parser('cancel', help='取消作业')
+    cancel_parser.add_argument('ids', nargs='+', type=int, help='作业编号')
+
+    work_parser = commands.add_parser('work', help='运行工作进程池')
+    work_parser.add_argument('--workers', type=int, default=None, help='工作进程数，默认CPU核数')
+    work_parser.add_argument('--small-workers', type=int, default=1, help='只领取小作业的保留进程数')
+    work_parser.add_argument('--forever', action='store_true', help='队列为空后继续等待新作业')
+    args = parser.parse_args()
+
+    if args.command == 'work':
+        JobWorkerPool(args.queue, args.workers, args.small_workers).run(until_empty=not args.forever)
+        return
+
+    queue = JobQueue(args.queue)
+    try:
+        if args.command == 'submit':
+            submit(args, queue)
+        elif args.command == 'list':
+            list_jobs(args, queue)
+        elif args.command == 'cancel':
+            for job_id in args.ids:
+                if queue.cancel(job_id):
+                    print(f"已取消作业 {job_id}")
+                else:
+                    print(f"作业 {job_id} 不存在或已结束")
+    finally:
+        queue.close()
+
+
+if __name__ == '__main__':
+    main()
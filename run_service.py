@@ -0,0 +1,37 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+常驻情景计算服务
+
+服务进程只在启动时导入计算代码、读取配置和解析输入表，之后每个情景计算请求只做计算，
+适合交互式情景工具（单参数修改后快速返回结果）。接口说明见 src/service/server.py。
+
+使用方法:
+    python run_service.py [--config config/config.json] [--host 127.0.0.1] [--port 8765] [--verbose]
+
+    curl http://127.0.0.1:8765/health
+    curl -X POST http://127.0.0.1:8765/evaluate -d '{"outputs": ["trajectory"]}'
+"""
+
+import argparse
+import os
+import sys
+
+# 添加项目根目录到路径
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from src.service import serve, DEFAULT_HOST, DEFAULT_PORT
+
+
+def main():
+    parser = argparse.ArgumentParser(description='常驻情景计算服务')
+    parser.add_argument('--config', type=str, default='config/config.json', help='基础配置文件')
+    parser.add_argument('--host', type=str, default=DEFAULT_HOST, help='监听地址，默认仅本机')
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT, help='监听端口')
+    parser.add_argument('--verbose', action='store_true', help='打印每个请求')
+    args = parser.parse_args()
+    serve(args.config, args.host, args.port, args.verbose)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+代理模型脚本（多项式混沌展开）
+
+train: 按设计文件生成训练点和验证点（拉丁超立方），在内存中完整计算后拟合代理模型，
+       输出验证报告，模型保存在设计文件旁（{文件名}.surrogate.npz）
+predict: 读取代理模型，预测一个情景的温室气体净排放、一次能源结构和LCOE逐年数值及误差估计
+
+使用方法:
+    python run_surrogate.py train 设计文件.json [--config config/config.json] [--samples 200]
+                            [--validation 50] [--seed 1] [--degree 3] [--workers 1]
+                            [--model 模型.npz] [--report data/output/surrogate_validation.csv]
+    python run_surrogate.py train --points points.json [--validation 50]   # 用已保存的设计点训练，最后 50 个用于验证
+    python run_surrogate.py predict 模型.npz --set power.capacity_cost=0.9 trajectory.other.carbon_sink=1.2
+                            [--years 2030 2060]
+
+    设计文件: 见 src/batch/design.py；未给出的参数取基础情景（倍数 1，取值取范围中点）
+"""
+
+import argparse
+import io
+import os
+import sys
+import time
+from contextlib import redirect_stdout
+
+# 添加项目根目录到路径
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from src.utils import ConfigLoader
+from src.batch import (ScenarioEvaluator, DesignRunner, generate_design, load_design_parameters,
+                       load_design, SurrogateModel, train_surrogate, surrogate_path, export_report,
+                       print_report, SURROGATE_OUTPUTS)
+from src.batch.surrogate import MAX_DEGREE
+
+
+def train(args, parser) -> None:
+    source = args.points or args.design
+    if not source:
+        parser.error("需要设计文件或 --points")
+    parameters, settings = load_design_parameters(source)
+    if not parameters:
+        parser.error(f"{source} 中没有设计参数")
+    if args.points:
+        points = load_design(args.points)
+        validation_count = args.validation if args.validation is not None else len(points) // 5
+        training, validation = points[:len(points) - validation_count], points[len(points) - validation_count:]
+        print(f"\n读取设计点: {args.points}（训练 {len(training)} 个，验证 {len(validation)} 个）")
+    else:
+        samples = args.samples or settings.get('samples', 200)
+        seed = args.seed if args.seed is not None else settings.get('seed')
+        validation_count = args.validation if args.validation is not None else samples // 4
+        training = generate_design(parameters, 'lhs', samples, seed)
+        validation = generate_design(parameters, 'lhs', validation_count,
+                                     None if seed is None else seed + 1, prefix='v') if validation_count else []
+        print(f"\n拉丁超立方设计: {len(parameters)} 个参数，训练 {len(training)} 个点，验证 {len(validation)} 个点")
+
+    with redirect_stdout(io.StringIO()):
+        config = ConfigLoader(args.config).load()
+    print("正在解析输入并计算基础情景...")
+    evaluator = ScenarioEvaluator(config).load()
+
+    print(f"正在完整计算 {len(training) + len(validation)} 个设计点并拟合代理模型...")
+    start = time.perf_counter()
+    model, report = train_surrogate(DesignRunner(evaluator, SURROGATE_OUTPUTS), parameters,
+                                    training, validation, args.degree, args.workers)
+    print(f"耗时 {time.perf_counter() - start:.2f}s")
+    print_report(model, report)
+
+    summary = {label: min(item['r2'] for item in report if item['label'] == label)
+               for label in dict.fromkeys(item['label'] for item in report)}
+    model.save(args.model or surrogate_path(source),
+               {'source': os.path.basename(source), 'config': args.config,
+                'validation_points': len(validation), 'validation_min_r2': summary})
+    if report and args.report:
+        export_report(report, args.report)
+
+
+def predict(args) -> None:
+    start = time.perf_counter()
+    model = SurrogateModel.load(args.model)
+    loaded = time.perf_counter() - start
+
+    settings = {}
+    for item in args.set or []:
+        name, sep, value = item.rpartition('=')
+        if not sep:
+            sys.exit(f"参数格式应为 名称=取值: {item}")
+        settings[name] = float(value)
+    x = model.values(settings)
+    for name in model.outside(x):
+        print(f"警告: {name} 超出训练范围，预测为外推，误差估计不可靠")
+
+    start = time.perf_counter()
+    outputs = model.predict_outputs(settings)
+    predicted = time.perf_counter() - start
+
+    print(f"代理模型: {args.model}（读取 {loaded * 1000:.2f} ms，预测 {predicted * 1e6:.0f} µs）")
+    for name, value in zip(model.names, x.tolist()):
+        print(f"  {name:<40} {value:.6g}")
+    for label, by_year in outputs.items():
+        print(f"\n【{label}】")
+        for year, (value, error) in by_year.items():
+            if args.years is None or year in args.years:
+                print(f"  {year}: {value:>12.4f} ± {error:.2g}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='代理模型（训练与预测）')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    train_parser = commands.add_parser('train', help='训练代理模型')
+    train_parser.add_argument('design', nargs='?', default=None, help='设计文件（JSON）')
+    train_parser.add_argument('--points', type=str, default=None, help='已保存的设计点文件，不再生成')
+    train_parser.add_argument('--config', type=str, default='config/config.json', help='配置文件')
+    train_parser.add_argument('--samples', type=int, default=None, help='训练点数（默认取设计文件，否则 200）')
+    train_parser.add_argument('--validation', type=int, default=None,
+                              help='验证点数（默认为训练点数的 1/4；--points 时取最后 1/5 的设计点）')
+    train_parser.add_argument('--seed', type=int, default=None, help='随机种子')
+    train_parser.add_argument('--degree', type=int, default=MAX_DEGREE, help='最高阶数')
+    train_parser.add_argument('--workers', type=int, default=1, help='进程数')
+    train_parser.add_argument('--model', type=str, default=None, help='模型文件（默认在设计文件旁）')
+    train_parser.add_argument('--report', type=str, default='data/output/surrogate_validation.csv',
+                              help='验证报告CSV')
+
+    predict_parser = commands.add_parser('predict', help='用代理模型预测')
+    predict_parser.add_argument('model', help='模型文件（.npz）')
+    predict_parser.add_argument('--set', nargs='+', default=None, help='参数取值 名称=取值')
+    predict_parser.add_argument('--years', type=str, nargs='+', default=None, help='只显示这些年份')
+    args = parser.parse_args()
+
+    if args.command == 'train':
+        print("=" * 60)
+        print("代理模型训练")
+        print("=" * 60)
+        train(args, train_parser)
+        print("\n" + "=" * 60)
+        print("代理模型训练完成！")
+        print("=" * 60)
+    else:
+        predict(args)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+不确定性分析运行脚本（向量化蒙特卡洛）
+
+对排放因子、GDP年增长率、利用小时数、装机成本、燃料成本和CCS捕集率抽样，
+一次数组运算得到全部样本的温室气体净排放、CO2排放量、LCOE等指标，输出分位数区间和碳中和年份分布。
+
+使用方法:
+    python run_uncertainty.py [--config config/config.json] [--params params.json]
+                              [--samples 10000] [--seed 20240101] [--workers 1]
+                              [--percentiles 5 50 95] [--output data/output/uncertainty_output.csv]
+
+参数文件为不确定参数列表（抽样值为相对基准值的倍数），未指定时使用默认参数:
+    [{"name": "capacity_cost.光伏(集中)", "distribution": "triangular", "params": [0.8, 1.0, 1.1]},
+     {"name": "emission_factor.煤", "distribution": "normal", "params": [1.0, 0.03]}]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+# 添加项目根目录到路径
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from src.utils import ConfigLoader
+from src.analysis.uncertainty import UncertaintyAnalyzer, UncertaintyVariables
+
+
+def main():
+    variables = UncertaintyVariables()
+    parser = argparse.ArgumentParser(description='不确定性分析（向量化蒙特卡洛）')
+    parser.add_argument('--config', type=str, default='config/config.json', help='配置文件')
+    parser.add_argument('--params', type=str, default=None, help='不确定参数JSON文件')
+    parser.add_argument('--samples', type=int, default=variables.DEFAULT_SAMPLES, help='样本数')
+    parser.add_argument('--seed', type=int, default=variables.DEFAULT_SEED, help='随机种子')
+    parser.add_argument('--workers', type=int, default=1, help='进程数')
+    parser.add_argument('--chunk-size', type=int, default=variables.CHUNK_SIZE,
+                        help='每批样本数（与种子一起决定随机数流）')
+    parser.add_argument('--percentiles', type=float, nargs='+', default=variables.PERCENTILES,
+                        help='输出的分位数（%%）')
+    parser.add_argument('--output', type=str, default='data/output/uncertainty_output.csv',
+                        help='输出CSV文件')
+    parser.add_argument('--list-params', action='store_true', help='列出可抽样的参数名称后退出')
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("不确定性分析")
+    print("=" * 60)
+
+    config = ConfigLoader(args.config).load()
+    analyzer = UncertaintyAnalyzer()
+
+    print("\n正在加载基准情景...")
+    analyzer.load_from_config(config)
+    if args.list_params:
+        for name in analyzer.model.parameter_names():
+            print(f"  {name}")
+        return None
+    if args.params:
+        analyzer.load_parameters_from_json(args.params)
+
+    print(f"正在计算 {args.samples} 个样本...")
+    start = time.perf_counter()
+    results = analyzer.calculate(args.samples, args.seed, args.workers,
+                                 args.percentiles, args.chunk_size)
+    print(f"计算完成，耗时 {time.perf_counter() - start:.2f}s")
+
+    analyzer.print_results(results)
+    if args.output:
+        analyzer.export_to_csv(results, args.output)
+
+    print("\n" + "=" * 60)
+    print("不确定性分析完成！")
+    print("=" * 60)
+    return results
+
+
+if __name__ == '__main__':
+    main()
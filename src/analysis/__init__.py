@@ -8,6 +8,8 @@ from .trajectory import TrajectoryAnalyzer, TrajectoryVariables, TrajectoryFormu
 from .balance_2030_2050 import BalanceAnalyzer, BalanceVariables, BalanceFormulas
 from .scenario_summary import ScenarioSummaryAnalyzer, ScenarioSummaryVariables, ScenarioSummaryFormulas
 from .statistics import StatisticsAnalyzer, StatisticsVariables, StatisticsFormulas
+from .uncertainty import UncertaintyAnalyzer, UncertaintyVariables, UncertaintyFormulas
+from .sensitivity import SensitivityAnalyzer, SensitivityVariables, SensitivityFormulas
 
 __all__ = [
     'MacroAnalyzer', 'MacroVariables', 'MacroFormulas',
@@ -16,5 +18,7 @@ __all__ = [
     'TrajectoryAnalyzer', 'TrajectoryVariables', 'TrajectoryFormulas',
     'BalanceAnalyzer', 'BalanceVariables', 'BalanceFormulas',
     'ScenarioSummaryAnalyzer', 'ScenarioSummaryVariables', 'ScenarioSummaryFormulas',
-    'StatisticsAnalyzer', 'StatisticsVariables', 'StatisticsFormulas'
+    'StatisticsAnalyzer', 'StatisticsVariables', 'StatisticsFormulas',
+    'UncertaintyAnalyzer', 'UncertaintyVariables', 'UncertaintyFormulas',
+    'SensitivityAnalyzer', 'SensitivityVariables', 'SensitivityFormulas'
 ]
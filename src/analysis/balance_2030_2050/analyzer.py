@@ -7,6 +7,7 @@ import pandas as pd
 from typing import Dict, Any, List, Optional
 from dataclasses import dataclass, field
 
+from ...utils import IOHandler
 from .variables import BalanceVariables
 from .formulas import BalanceFormulas
 
@@ -82,7 +83,7 @@ class BalanceAnalyzer:
     
     def load_input_from_csv(self, filepath: str) -> None:
         """从CSV文件加载输入数据"""
-        df = pd.read_csv(filepath, encoding='utf-8')
+        df = IOHandler.read_csv(filepath)
         self._parse_input_dataframe(df)
     
     def _parse_input_dataframe(self, df: pd.DataFrame) -> None:
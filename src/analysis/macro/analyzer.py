@@ -3,9 +3,10 @@
 
 import csv
 import pandas as pd
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple
 from dataclasses import dataclass, field
 
+from ...utils import IOHandler
 from .variables import MacroVariables
 from .formulas import MacroFormulas
 
@@ -57,7 +58,7 @@ class MacroAnalyzer:
     
     def load_input_from_csv(self, filepath: str) -> None:
         """从CSV文件加载输入数据"""
-        df = pd.read_csv(filepath, encoding='utf-8')
+        df = IOHandler.read_csv(filepath)
         self._parse_input_dataframe(df)
     
     def load_input_from_dict(self, data: dict) -> None:
@@ -160,7 +161,7 @@ class MacroAnalyzer:
     
     def load_sector_data_from_csv(self, filepath: str) -> None:
         """从CSV文件加载部门数据"""
-        df = pd.read_csv(filepath, encoding='utf-8')
+        df = IOHandler.read_csv(filepath)
         self._parse_sector_dataframe(df)
     
     def _parse_sector_dataframe(self, df: pd.DataFrame) -> None:
@@ -559,10 +560,12 @@ class MacroAnalyzer:
         
         return results
     
-    def export_to_csv(self, results: dict, filepath: str) -> None:
-        """将计算结果导出为CSV"""
-        import os
-        os.makedirs(os.path.dirname(filepath), exist_ok=True) if os.path.dirname(filepath) else None
+    def build_table(self, results: dict, precise: bool = False) -> Tuple[List[str], List[list]]:
+        """
+        构建输出表，返回 (表头, 数据行)
+        precise=True 时数值保留完整精度（供结果存储使用），否则格式化为导出CSV的字符串
+        """
+        fmt = (lambda value, spec: value) if precise else format
         
         years = results['years']
         rows = []
@@ -572,14 +575,14 @@ class MacroAnalyzer:
         rows.append(['宏观指标'] + [''] * len(years))
         for key in ['GDP年增长率', 'GDP指数', '一次能源指数', '二氧化碳指数', 
                     '能源消费弹性', '能源消费年增长率', '能源消费量']:
-            rows.append([key] + [f"{v:.4f}" for v in results['macro_indicators'][key]])
+            rows.append([key] + [fmt(v, '.4f') for v in results['macro_indicators'][key]])
         
         rows.append([''] * (len(years) + 1))
         
         # 能源结构
         rows.append(['能源结构(%)'] + [''] * len(years))
         for key in ['煤炭占比', '石油占比', '天然气占比', '非化石占比']:
-            rows.append([key] + [f"{v:.2f}" for v in results['energy_structure'][key]])
+            rows.append([key] + [fmt(v, '.2f') for v in results['energy_structure'][key]])
         
         rows.append([''] * (len(years) + 1))
         
@@ -587,7 +590,7 @@ class MacroAnalyzer:
         rows.append(['CO2指标'] + [''] * len(years))
         for key in ['单位能耗CO2强度', '单位能耗CO2强度年下降率', 'CO2排放量', 
                     'CO2排放增长率', 'GDP的CO2强度', '单位GDP的CO2强度下降率', '比2005年下降幅度']:
-            rows.append([key] + [f"{v:.4f}" for v in results['co2_indicators'][key]])
+            rows.append([key] + [fmt(v, '.4f') for v in results['co2_indicators'][key]])
         
         rows.append([''] * (len(years) + 1))
         
@@ -595,35 +598,35 @@ class MacroAnalyzer:
         rows.append(['GDP强度指标'] + [''] * len(years))
         for key in ['GDP的能耗强度', '5年GDP能源强度下降幅度', '5年GDP的CO2强度下降幅度', 
                     '单位GDP能耗强度年下降率']:
-            rows.append([key] + [f"{v:.4f}" for v in results['gdp_intensity'][key]])
+            rows.append([key] + [fmt(v, '.4f') for v in results['gdp_intensity'][key]])
         
         rows.append([''] * (len(years) + 1))
         
         # CO2下降
         rows.append(['CO2下降指标'] + [''] * len(years))
         for key in ['二氧化碳年下降率', '二氧化碳五年累计下降率', '二氧化碳五年绝对下降量', '碳捕集量']:
-            rows.append([key] + [f"{v:.4f}" for v in results['co2_decline'][key]])
+            rows.append([key] + [fmt(v, '.4f') for v in results['co2_decline'][key]])
         
         rows.append([''] * (len(years) + 1))
         
         # 煤炭消费
         rows.append(['煤炭消费(亿tce)'] + [''] * len(years))
         for key in ['工业', '建筑', '交通', '电力', '制氢', '其他', '总量', '电煤占比']:
-            rows.append([key] + [f"{v:.4f}" for v in results['coal_by_sector'][key]])
+            rows.append([key] + [fmt(v, '.4f') for v in results['coal_by_sector'][key]])
         
         rows.append([''] * (len(years) + 1))
         
         # 石油消费
         rows.append(['石油消费(亿tce)'] + [''] * len(years))
         for key in ['工业', '建筑', '交通', '电力', '其他', '总量']:
-            rows.append([key] + [f"{v:.4f}" for v in results['oil_by_sector'][key]])
+            rows.append([key] + [fmt(v, '.4f') for v in results['oil_by_sector'][key]])
         
         rows.append([''] * (len(years) + 1))
         
         # 天然气消费
         rows.append(['天然气消费(亿tce)'] + [''] * len(years))
         for key in ['工业', '建筑', '交通', '电力', '其他', '总量']:
-            rows.append([key] + [f"{v:.4f}" for v in results['gas_by_sector'][key]])
+            rows.append([key] + [fmt(v, '.4f') for v in results['gas_by_sector'][key]])
         
         rows.append([''] * (len(years) + 1))
         
@@ -632,8 +635,16 @@ class MacroAnalyzer:
         for key in ['工业-生物质', '建筑-生物质', '交通-生物质', '电力-生物质', 
                     '其他-生物质', '氢能-生物质', '生物质总量', '电力-水能', 
                     '电力-核能', '电力-风光', '总量']:
-            rows.append([key] + [f"{v:.4f}" for v in results['non_fossil'][key]])
+            rows.append([key] + [fmt(v, '.4f') for v in results['non_fossil'][key]])
+        return headers, rows
+
+
+    def export_to_csv(self, results: dict, filepath: str) -> None:
+        """将计算结果导出为CSV"""
+        import os
+        os.makedirs(os.path.dirname(filepath), exist_ok=True) if os.path.dirname(filepath) else None
         
+        headers, rows = self.build_table(results)
         with open(filepath, 'w', newline='', encoding='utf-8-sig') as f:
             writer = csv.writer(f)
             writer.writerow(headers)
@@ -10,6 +10,7 @@ import pandas as pd
 from typing import Dict, Any, List, Optional
 from dataclasses import dataclass, field
 
+from ...utils import IOHandler
 from .variables import ScenarioSummaryVariables
 from .formulas import ScenarioSummaryFormulas
 
@@ -50,9 +51,29 @@ class ScenarioSummaryAnalyzer:
         if os.path.exists(template_path):
             self._load_template_data(template_path)
 
-    def _load_macro_data(self, filepath: str) -> None:
+    def load_from_store(self, store) -> None:
+        """从结果存储（ResultStore）加载各模块的输出表，数值为完整精度，不经过CSV"""
+        loaders = {
+            'macro': self._load_macro_data,
+            'structure': self._load_structure_data,
+            'trajectory': self._load_trajectory_data,
+            'template': self._load_template_data,
+        }
+        for name, loader in loaders.items():
+            table = store.table(name)
+            if table is not None:
+                loader(table)
+
+    @staticmethod
+    def _read_table(source) -> pd.DataFrame:
+        """输出表：DataFrame 直接使用，否则按CSV文件路径读取"""
+        if isinstance(source, pd.DataFrame):
+            return source
+        return pd.read_csv(source, encoding='utf-8')
+
+    def _load_macro_data(self, source) -> None:
         """加载宏观测算参考数据"""
-        df = pd.read_csv(filepath, encoding='utf-8')
+        df = self._read_table(source)
         year_cols = [c for c in df.columns if c not in ['项目', '类别', '单位', '部门']]
         self.years = year_cols
         
@@ -62,9 +83,9 @@ class ScenarioSummaryAnalyzer:
                 values = [self._safe_float(row[y]) for y in year_cols]
                 self.module_data.macro[item] = values
     
-    def _load_structure_data(self, filepath: str) -> None:
+    def _load_structure_data(self, source) -> None:
         """加载能源消费结构数据"""
-        df = pd.read_csv(filepath, encoding='utf-8')
+        df = self._read_table(source)
         year_cols = [c for c in df.columns if c not in ['类别', '项目', '单位', '部门']]
         if not self.years:
             self.years = year_cols
@@ -82,9 +103,9 @@ class ScenarioSummaryAnalyzer:
                 values = [self._safe_float(row[y]) for y in year_cols]
                 self.module_data.structure[key] = values
     
-    def _load_trajectory_data(self, filepath: str) -> None:
+    def _load_trajectory_data(self, source) -> None:
         """加载碳排放轨迹数据"""
-        df = pd.read_csv(filepath, encoding='utf-8')
+        df = self._read_table(source)
         year_cols = [c for c in df.columns if c not in ['部门', '项目', '单位', '类别']]
         if not self.years:
             self.years = year_cols
@@ -102,9 +123,9 @@ class ScenarioSummaryAnalyzer:
                 values = [self._safe_float(row[y]) for y in year_cols]
                 self.module_data.trajectory[key] = values
 
-    def _load_template_data(self, filepath: str) -> None:
+    def _load_template_data(self, source) -> None:
         """加载数据模板数据"""
-        df = pd.read_csv(filepath, encoding='utf-8')
+        df = self._read_table(source)
         year_cols = [c for c in df.columns if c not in ['部门', '类别', '项目', '单位']]
         if not self.years:
             self.years = year_cols
@@ -128,7 +149,7 @@ class ScenarioSummaryAnalyzer:
     
     def load_input_from_csv(self, filepath: str) -> None:
         """从CSV文件加载输入数据（用于直接输入人口等数据）"""
-        df = pd.read_csv(filepath, encoding='utf-8')
+        df = IOHandler.read_csv(filepath)
         year_cols = [c for c in df.columns if c not in ['项目', '单位']]
         if not self.years:
             self.years = year_cols
@@ -350,16 +371,21 @@ class ScenarioSummaryAnalyzer:
         macro_path: str = 'data/output/macro_output.csv',
         structure_path: str = 'data/output/structure_output.csv',
         trajectory_path: str = 'data/output/trajectory_output.csv',
-        template_path: str = 'data/output/template_output.csv'
+        template_path: str = 'data/output/template_output.csv',
+        store=None
     ) -> Dict[str, Any]:
-        """运行情景数据一览表分析"""
-        self.load_module_outputs(macro_path, structure_path, trajectory_path, template_path)
+        """运行情景数据一览表分析（给出 store 时从结果存储读取各模块输出，否则读取输出CSV）"""
+        if store is not None:
+            self.load_from_store(store)
+        else:
+            self.load_module_outputs(macro_path, structure_path, trajectory_path, template_path)
         
         if input_path and os.path.exists(input_path):
             self.load_input_from_csv(input_path)
         
         results = self.calculate()
-        self.export_to_csv(results, output_path)
+        if output_path:
+            self.export_to_csv(results, output_path)
         
         return results
 
@@ -0,0 +1,8 @@
+# -*- coding: utf-8 -*-
+"""全局敏感性分析模块（Sobol / Morris）"""
+
+from .variables import SensitivityVariables
+from .formulas import SensitivityFormulas
+from .analyzer import SensitivityParameter, SensitivityAnalyzer
+
+__all__ = ['SensitivityVariables', 'SensitivityFormulas', 'SensitivityParameter', 'SensitivityAnalyzer']
@@ -0,0 +1,260 @@
+# -*- coding: utf-8 -*-
+"""全局敏感性分析器（Sobol / Morris）
+
+在参数倍数范围内生成 Saltelli 或 Morris 抽样设计，设计矩阵的每一行是一组参数倍数，
+由向量化模型（uncertainty.UncertaintyModel，电力、宏观测算参考和碳排放轨迹）分批一次计算，
+可在多个进程中并行；报告各输出指标逐年的 Sobol 一阶/总效应指数或 Morris μ*/σ。
+
+参数名称同不确定性分析（UncertaintyModel.parameter_names），默认取全部最细参数
+（如每种技术的装机成本、每个部门的煤炭消费、碳排放轨迹的每个输入行）。
+"""
+
+import csv
+import json
+import os
+from dataclasses import dataclass
+from typing import Dict, Any, List, Optional, Tuple, Union
+
+import numpy as np
+
+from ..uncertainty import UncertaintyModel, UncertaintyVariables, evaluate_design
+from .variables import SensitivityVariables
+from .formulas import SensitivityFormulas
+
+
+@dataclass
+class SensitivityParameter:
+    """敏感性分析参数（倍数在 [low, high] 内均匀分布）"""
+    name: str
+    low: float = 0.8
+    high: float = 1.2
+
+    @classmethod
+    def from_value(cls, value: Union[str, Dict[str, Any]],
+                   default_range: List[float]) -> 'SensitivityParameter':
+        """由参数名称或 {'name': ..., 'range': [low, high]} 创建"""
+        if isinstance(value, str):
+            return cls(value, *default_range)
+        if 'name' not in value:
+            raise ValueError("敏感性参数缺少字段: name")
+        low, high = value.get('range', default_range)
+        if not low < high:
+            raise ValueError(f"{value['name']}: 范围下限应小于上限")
+        return cls(str(value['name']), float(low), float(high))
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {'name': self.name, 'range': [self.low, self.high]}
+
+
+class SensitivityAnalyzer:
+    """全局敏感性分析器"""
+
+    def __init__(self):
+        self.variables = SensitivityVariables()
+        self.formulas = SensitivityFormulas()
+        self.model: Optional[UncertaintyModel] = None
+        self.parameters: List[SensitivityParameter] = []
+
+        # 最近一次计算的设计矩阵（参数倍数）和模型输出 {指标: (行数, Y)}
+        self.design: Optional[np.ndarray] = None
+        self.outputs: Dict[str, np.ndarray] = {}
+
+    # ==================== 数据加载 ====================
+
+    def load_model(self, model: UncertaintyModel) -> None:
+        self.model = model
+
+    def load_from_config(self, config: Dict[str, Any], store=None) -> None:
+        """按配置加载基准情景（见 UncertaintyModel.from_config）"""
+        self.model = UncertaintyModel.from_config(config, store)
+
+    def load_parameters(self, parameters: List[Union[str, Dict[str, Any]]],
+                        default_range: List[float] = None) -> None:
+        """加载参数：参数名称或 {'name': ..., 'range': [low, high]}"""
+        default_range = default_range or self.variables.DEFAULT_RANGE
+        self.parameters = [SensitivityParameter.from_value(p, default_range) for p in parameters]
+
+    def load_parameters_from_json(self, filepath: str) -> None:
+        """从JSON文件加载参数（参数列表，或 {"range": [...], "parameters": [...]}）"""
+        with open(filepath, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        if isinstance(data, dict):
+            self.load_parameters(data['parameters'], data.get('range'))
+        else:
+            self.load_parameters(data)
+
+    def _check(self, outputs: List[str]) -> List[str]:
+        if self.model is None:
+            raise ValueError("尚未加载基准情景")
+        if not self.parameters:
+            self.load_parameters(self.model.parameter_names(detailed=True))
+        names = set(self.model.parameter_names())
+        seen = set()
+        for parameter in self.parameters:
+            if parameter.name not in names:
+                raise ValueError(f"未知或未加载的参数: {parameter.name}")
+            if parameter.name in seen:
+                raise ValueError(f"参数重复: {parameter.name}")
+            seen.add(parameter.name)
+
+        available = [key for key in UncertaintyVariables().OUTPUTS if key in self.model.years]
+        outputs = outputs or [key for key in self.variables.DEFAULT_OUTPUTS if key in available]
+        unknown = [key for key in outputs if key not in available]
+        if unknown:
+            raise ValueError(f"未知或未加载的输出指标: {', '.join(unknown)}")
+        if not outputs:
+            raise ValueError("没有可分析的输出指标")
+        return outputs
+
+    # ==================== 计算 ====================
+
+    def scale(self, unit: np.ndarray) -> np.ndarray:
+        """单位超立方体上的设计换算为参数倍数"""
+        low = np.array([p.low for p in self.parameters])
+        high = np.array([p.high for p in self.parameters])
+        return low + unit * (high - low)
+
+    def calculate(self, method: str = 'sobol', samples: int = None, seed: int = None,
+                  workers: int = 1, outputs: List[str] = None, batch_size: int = None,
+                  levels: int = None, bootstrap: int = None) -> Dict[str, Any]:
+        """
+        执行敏感性分析
+        Args:
+            method: 'sobol' 或 'morris'
+            samples: Sobol 为基础样本数 N（计算 N×(k+2) 次），Morris 为轨迹数 r（计算 r×(k+1) 次）
+            seed: 随机种子
+            workers: 进程数
+            outputs: 输出指标，为空时取 DEFAULT_OUTPUTS 中已加载的部分
+            batch_size: 每批计算的行数
+            levels: Morris 网格层数
+            bootstrap: Sobol 置信区间的重抽样次数，0 时不计算
+        """
+        if method not in self.variables.METHODS:
+            raise ValueError(f"未知的分析方法: {method}")
+        outputs = self._check(outputs)
+        seed = self.variables.DEFAULT_SEED if seed is None else seed
+        batch_size = batch_size or self.variables.BATCH_SIZE
+        rng = np.random.default_rng(seed)
+        k = len(self.parameters)
+        names = [p.name for p in self.parameters]
+
+        if method == 'sobol':
+            samples = samples or self.variables.SOBOL_SAMPLES
+            unit = self.formulas.saltelli_design(rng.random((samples, 2 * k)))
+        else:
+            samples = samples or self.variables.MORRIS_TRAJECTORIES
+            levels = levels or self.variables.MORRIS_LEVELS
+            unit, order, sign, delta = self.formulas.morris_design(samples, k, levels, rng)
+
+        self.design = self.scale(unit)
+        evaluated = evaluate_design(self.model, names, self.design, batch_size, workers)
+        self.outputs = {key: evaluated[key] for key in outputs}
+
+        results = {
+            'method': method, 'samples': samples, 'evaluations': len(self.design), 'seed': seed,
+            'parameters': [p.to_dict() for p in self.parameters],
+            'outputs': {},
+        }
+        if method == 'morris':
+            results['levels'] = levels
+        bootstrap = self.variables.BOOTSTRAP_RESAMPLES if bootstrap is None else bootstrap
+
+        for key in outputs:
+            y = self.outputs[key]
+            if method == 'sobol':
+                s1, st = self.formulas.sobol_indices(y, samples, k)
+                indices = {'S1': s1, 'ST': st}
+                if bootstrap > 1:
+                    indices['S1_conf'], indices['ST_conf'] = self.formulas.sobol_confidence(
+                        y, samples, k, bootstrap, self.variables.CONFIDENCE_LEVEL, rng)
+            else:
+                indices = self.formulas.morris_indices(y, order, sign, delta)
+            results['outputs'][key] = {
+                'years': self.model.years[key],
+                **{index: {name: [round(v, 6) for v in values[j].tolist()]
+                           for j, name in enumerate(names)}
+                   for index, values in indices.items()}
+            }
+        return results
+
+    def ranking(self, results: dict, output: str, year: str = None) -> List[Tuple[str, float]]:
+        """
+        按排序指数（Sobol 为 ST，Morris 为 μ*）从大到小排列某年的参数，year 为空时取最后一年
+        输出没有年份（如对应输入缺失）时返回空列表
+        """
+        section = results['outputs'][output]
+        if not section['years']:
+            return []
+        year = year or section['years'][-1]
+        j = section['years'].index(year)
+        index = section[self.variables.RANK_INDEX[results['method']]]
+        return sorted(((name, values[j]) for name, values in index.items()),
+                      key=lambda item: -item[1])
+
+    # ==================== 输出 ====================
+
+    def build_table(self, results: dict, precise: bool = False) -> Tuple[List[str], List[list]]:
+        """
+        构建输出表，返回 (表头, 数据行)
+        precise=True 时数值保留完整精度，否则格式化为导出CSV的字符串
+        """
+        fmt = (lambda value, spec: value) if precise else format
+        output_names = UncertaintyVariables().OUTPUTS
+        years = []
+        for section in results['outputs'].values():
+            years += [y for y in section['years'] if y not in years]
+        headers = ['项目'] + years
+
+        rows = []
+        for key, section in results['outputs'].items():
+            for index, label in self.variables.INDICES.items():
+                if index not in section:
+                    continue
+                rows.append([f"{output_names[key]} - {label}"] + [''] * len(years))
+                for name, values in section[index].items():
+                    by_year = dict(zip(section['years'], values))
+                    rows.append([name] + [fmt(by_year[y], '.6f') if y in by_year else ''
+                                          for y in years])
+                rows.append([''] * (len(years) + 1))
+
+        method = self.variables.METHODS[results['method']]
+        rows.append([f"{method}，样本数 {results['samples']}，模型计算 {results['evaluations']} 次，"
+                     f"随机种子 {results['seed']}"] + [''] * len(years))
+        return headers, rows
+
+    def export_to_csv(self, results: dict, filepath: str) -> None:
+        """导出结果到CSV"""
+        if os.path.dirname(filepath):
+            os.makedirs(os.path.dirname(filepath), exist_ok=True)
+        headers, rows = self.build_table(results)
+        with open(filepath, 'w', newline='', encoding='utf-8-sig') as f:
+            writer = csv.writer(f)
+            writer.writerow(headers)
+            writer.writerows(rows)
+        print(f"结果已导出到: {filepath}")
+
+    def print_results(self, results: dict, year: str = None, top: int = None) -> None:
+        """打印各输出指标某年（默认最后一年）排名靠前的参数"""
+        top = top or self.variables.TOP
+        output_names = UncertaintyVariables().OUTPUTS
+        method = results['method']
+        columns = ['S1', 'S1_conf', 'ST', 'ST_conf'] if method == 'sobol' else ['mu_star', 'mu', 'sigma']
+
+        print("\n" + "=" * 70)
+        print(f"全局敏感性分析结果（{self.variables.METHODS[method]}）")
+        print(f"参数 {len(results['parameters'])} 个，样本数 {results['samples']}，"
+              f"模型计算 {results['evaluations']} 次，随机种子 {results['seed']}")
+        print("=" * 70)
+
+        for key, section in results['outputs'].items():
+            if not section['years']:
+                print(f"\n【{output_names[key]}】无结果（输出没有年份，请检查对应的输入文件）")
+                continue
+            shown_year = year if year in section['years'] else section['years'][-1]
+            j = section['years'].index(shown_year)
+            columns_shown = [c for c in columns if c in section]
+            print(f"\n【{output_names[key]}】{shown_year}年，按 "
+                  f"{self.variables.INDICES[self.variables.RANK_INDEX[method]]} 排序前 {top} 个参数")
+            print(f"  {'参数':<36}" + ''.join(f"{self.variables.INDICES[c]:>14}" for c in columns_shown))
+            for name, _ in self.ranking(results, key, shown_year)[:top]:
+                print(f"  {name:<36}" + ''.join(f"{section[c][name][j]:>14.4f}" for c in columns_shown))
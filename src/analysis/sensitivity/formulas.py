@@ -0,0 +1,124 @@
+# -*- coding: utf-8 -*-
+"""全局敏感性分析计算公式定义
+
+抽样设计在 [0, 1] 单位超立方体上生成，各指数沿年份维整体计算，
+模型输出为 (行数, Y) 数组，指数为 (k, Y) 数组。
+"""
+
+from statistics import NormalDist
+from typing import Dict, Tuple
+
+import numpy as np
+
+
+def _safe_divide(numerator: np.ndarray, denominator: np.ndarray) -> np.ndarray:
+    """逐元素除法，分母为0处（输出无变化）结果为0"""
+    numerator, denominator = np.broadcast_arrays(numerator, denominator)
+    out = np.zeros(numerator.shape)
+    np.divide(numerator, denominator, out=out, where=denominator != 0)
+    return out
+
+
+class SensitivityFormulas:
+    """全局敏感性分析计算公式"""
+
+    # ==================== Sobol ====================
+
+    @staticmethod
+    def saltelli_design(unit: np.ndarray) -> np.ndarray:
+        """
+        Saltelli 抽样设计
+        unit 为 (N, 2k) 单位样本，前 k 列为矩阵 A，后 k 列为矩阵 B；
+        AB_i 为 A 的第 i 列替换为 B 的第 i 列
+        Returns:
+            (N × (k+2), k) 设计矩阵，行依次为 A、B、AB_1 … AB_k
+        """
+        num, k = unit.shape[0], unit.shape[1] // 2
+        a, b = unit[:, :k], unit[:, k:]
+        ab = np.repeat(a[None, :, :], k, axis=0)
+        ab[np.arange(k), :, np.arange(k)] = b.T
+        return np.concatenate([a, b, ab.reshape(k * num, k)])
+
+    @staticmethod
+    def sobol_indices(y: np.ndarray, num: int, k: int) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        由 Saltelli 设计的输出计算一阶和总效应指数
+        公式: V = Var([f(A); f(B)])
+              S1_i = mean(f(B) × (f(AB_i) - f(A))) / V          (Saltelli 2010)
+              ST_i = mean((f(A) - f(AB_i))^2) / 2 / V            (Jansen 1999)
+        输出方差为0的年份指数记为0
+        Returns:
+            (S1, ST)，均为 (k, Y)
+        """
+        y_a, y_b = y[:num], y[num:2 * num]
+        y_ab = y[2 * num:].reshape(k, num, *y.shape[1:])
+        variance = np.concatenate([y_a, y_b]).var(axis=0)
+        s1 = _safe_divide(np.mean(y_b * (y_ab - y_a), axis=1), variance)
+        st = _safe_divide(0.5 * np.mean((y_a - y_ab) ** 2, axis=1), variance)
+        return s1, st
+
+    def sobol_confidence(self, y: np.ndarray, num: int, k: int, resamples: int,
+                         level: float, rng: np.random.Generator) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        自助法置信区间半宽：对 N 个基础样本有放回重抽样，
+        半宽 = z(置信水平) × 重抽样指数的标准差
+        """
+        y_a, y_b = y[:num], y[num:2 * num]
+        y_ab = y[2 * num:].reshape(k, num, *y.shape[1:])
+        s1_all, st_all = [], []
+        for _ in range(resamples):
+            index = rng.integers(0, num, num)
+            sample = np.concatenate([y_a[index], y_b[index], y_ab[:, index].reshape(k * num, *y.shape[1:])])
+            s1, st = self.sobol_indices(sample, num, k)
+            s1_all.append(s1)
+            st_all.append(st)
+        z = NormalDist().inv_cdf(0.5 + level / 2)
+        return z * np.std(s1_all, axis=0, ddof=1), z * np.std(st_all, axis=0, ddof=1)
+
+    # ==================== Morris ====================
+
+    @staticmethod
+    def morris_design(trajectories: int, k: int, levels: int,
+                      rng: np.random.Generator) -> Tuple[np.ndarray, np.ndarray, np.ndarray, float]:
+        """
+        Morris 轨迹设计：每条轨迹从 p 层网格上的随机起点出发，按随机顺序每步只改变一个参数 ±Δ
+        公式: Δ = p / (2(p-1))，起点 + Δ <= 1 时向上走，否则向下走
+        Returns:
+            (设计矩阵 (r × (k+1), k), 各步改变的参数 (r, k), 各参数的方向 ±1 (r, k), Δ)
+        """
+        delta = levels / (2 * (levels - 1))
+        grid = np.arange(levels) / (levels - 1)
+        start = rng.choice(grid, size=(trajectories, k))
+        order = np.argsort(rng.random((trajectories, k)), axis=1)
+        sign = np.where(start + delta <= 1 + 1e-12, 1.0, -1.0)
+
+        points = np.empty((trajectories, k + 1, k))
+        points[:, 0] = start
+        rows = np.arange(trajectories)
+        for step in range(k):
+            points[:, step + 1] = points[:, step]
+            changed = order[:, step]
+            points[rows, step + 1, changed] += sign[rows, changed] * delta
+        return points.reshape(trajectories * (k + 1), k), order, sign, delta
+
+    @staticmethod
+    def morris_indices(y: np.ndarray, order: np.ndarray, sign: np.ndarray,
+                       delta: float) -> Dict[str, np.ndarray]:
+        """
+        由轨迹输出计算基本效应统计量（参数按范围归一化到 [0, 1]）
+        公式: EE_i = (f(x + Δe_i) - f(x)) / (±Δ)
+              μ = mean(EE_i)，μ* = mean(|EE_i|)，σ = std(EE_i)
+        Returns:
+            {'mu_star': (k, Y), 'mu': (k, Y), 'sigma': (k, Y)}
+        """
+        trajectories, k = order.shape
+        y = y.reshape(trajectories, k + 1, *y.shape[1:])
+        diff = y[:, 1:] - y[:, :-1]
+        rows = np.arange(trajectories)[:, None]
+        effects = np.empty(diff.shape)
+        effects[rows, order] = diff / (sign[rows, order] * delta)[..., None]
+        return {
+            'mu_star': np.abs(effects).mean(axis=0),
+            'mu': effects.mean(axis=0),
+            'sigma': effects.std(axis=0, ddof=1) if trajectories > 1 else np.zeros(effects.shape[1:]),
+        }
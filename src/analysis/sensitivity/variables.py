@@ -0,0 +1,66 @@
+# -*- coding: utf-8 -*-
+"""全局敏感性分析变量定义"""
+
+from dataclasses import dataclass, field
+from typing import List, Dict
+
+
+@dataclass
+class SensitivityVariables:
+    """全局敏感性分析变量定义"""
+
+    # 分析方法
+    METHODS: Dict[str, str] = field(default_factory=lambda: {
+        'sobol': 'Sobol指数（Saltelli抽样）',
+        'morris': 'Morris基本效应',
+    })
+
+    # 参数倍数的默认范围（在范围内均匀分布，参数名称同 UncertaintyModel.parameter_names）
+    DEFAULT_RANGE: List[float] = field(default_factory=lambda: [0.8, 1.2])
+
+    # 默认输出指标（UncertaintyVariables.OUTPUTS 的键）
+    DEFAULT_OUTPUTS: List[str] = field(default_factory=lambda: [
+        'net_ghg_emission', 'energy_consumption', 'lcoe'
+    ])
+
+    # 默认随机种子
+    DEFAULT_SEED: int = 20240101
+
+    # 每批计算的行数
+    BATCH_SIZE: int = 4096
+
+    # ==================== Sobol ====================
+    # 基础样本数 N，共计算 N × (k + 2) 次
+    SOBOL_SAMPLES: int = 1024
+
+    # 置信区间的自助法重抽样次数和置信水平
+    BOOTSTRAP_RESAMPLES: int = 100
+    CONFIDENCE_LEVEL: float = 0.95
+
+    # ==================== Morris ====================
+    # 轨迹数 r，共计算 r × (k + 1) 次
+    MORRIS_TRAJECTORIES: int = 20
+
+    # 网格层数 p，步长 Δ = p / (2(p-1))
+    MORRIS_LEVELS: int = 4
+
+    # ==================== 输出 ====================
+    # 指数名称
+    INDICES: Dict[str, str] = field(default_factory=lambda: {
+        'S1': '一阶指数S1',
+        'S1_conf': 'S1置信区间半宽',
+        'ST': '总效应指数ST',
+        'ST_conf': 'ST置信区间半宽',
+        'mu_star': 'μ*',
+        'mu': 'μ',
+        'sigma': 'σ',
+    })
+
+    # 各方法用于排序的指数
+    RANK_INDEX: Dict[str, str] = field(default_factory=lambda: {
+        'sobol': 'ST',
+        'morris': 'mu_star',
+    })
+
+    # 打印排名前几的参数
+    TOP: int = 10
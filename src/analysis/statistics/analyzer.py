@@ -43,14 +43,13 @@ class StatisticsAnalyzer:
         self.macro_data = self._load_macro_csv(
             os.path.join(data_dir, 'macro_output.csv'))
 
-    def _load_structure_csv(self, filepath: str) -> Dict[str, Any]:
+    def _load_structure_csv(self, source) -> Dict[str, Any]:
         """加载能源消费结构数据"""
         data = {'years': [], 'items': {}}
-        if not os.path.exists(filepath):
-            print(f"警告: 文件不存在 {filepath}")
+        df = self._read_table(source)
+        if df is None:
             return data
         
-        df = pd.read_csv(filepath, encoding='utf-8')
         year_cols = [c for c in df.columns if c not in ['类别', '项目', '单位']]
         data['years'] = year_cols
         
@@ -66,14 +65,13 @@ class StatisticsAnalyzer:
         
         return data
     
-    def _load_trajectory_csv(self, filepath: str) -> Dict[str, Any]:
+    def _load_trajectory_csv(self, source) -> Dict[str, Any]:
         """加载碳排放轨迹数据"""
         data = {'years': [], 'items': {}}
-        if not os.path.exists(filepath):
-            print(f"警告: 文件不存在 {filepath}")
+        df = self._read_table(source)
+        if df is None:
             return data
         
-        df = pd.read_csv(filepath, encoding='utf-8')
         year_cols = [c for c in df.columns if c not in ['部门', '项目', '单位']]
         data['years'] = year_cols
         
@@ -94,14 +92,13 @@ class StatisticsAnalyzer:
         
         return data
 
-    def _load_template_csv(self, filepath: str) -> Dict[str, Any]:
+    def _load_template_csv(self, source) -> Dict[str, Any]:
         """加载数据模板数据"""
         data = {'years': [], 'items': {}}
-        if not os.path.exists(filepath):
-            print(f"警告: 文件不存在 {filepath}")
+        df = self._read_table(source)
+        if df is None:
             return data
         
-        df = pd.read_csv(filepath, encoding='utf-8')
         year_cols = [c for c in df.columns if c not in ['部门', '类别', '项目', '单位']]
         data['years'] = year_cols
         
@@ -126,14 +123,13 @@ class StatisticsAnalyzer:
         
         return data
     
-    def _load_macro_csv(self, filepath: str) -> Dict[str, Any]:
+    def _load_macro_csv(self, source) -> Dict[str, Any]:
         """加载宏观测算参考数据"""
         data = {'years': [], 'items': {}}
-        if not os.path.exists(filepath):
-            print(f"警告: 文件不存在 {filepath}")
+        df = self._read_table(source)
+        if df is None:
             return data
         
-        df = pd.read_csv(filepath, encoding='utf-8')
         year_cols = [c for c in df.columns if c != '项目']
         data['years'] = year_cols
         
@@ -147,6 +143,31 @@ class StatisticsAnalyzer:
         
         return data
 
+    def load_from_store(self, store) -> None:
+        """从结果存储（ResultStore）加载各模块的输出表，数值为完整精度，不经过CSV"""
+        loaders = {
+            'structure': self._load_structure_csv,
+            'trajectory': self._load_trajectory_csv,
+            'template': self._load_template_csv,
+            'macro': self._load_macro_csv,
+        }
+        for name, loader in loaders.items():
+            table = store.table(name)
+            if table is None:
+                print(f"警告: 结果存储中没有 {name} 的输出表")
+                continue
+            setattr(self, f"{name}_data", loader(table))
+
+    @staticmethod
+    def _read_table(source) -> Optional[pd.DataFrame]:
+        """输出表：DataFrame 直接使用，否则按CSV文件路径读取（文件不存在时返回 None）"""
+        if isinstance(source, pd.DataFrame):
+            return source
+        if not os.path.exists(source):
+            print(f"警告: 文件不存在 {source}")
+            return None
+        return pd.read_csv(source, encoding='utf-8')
+
     def load_from_modules(self, structure_results: Dict = None,
                           trajectory_results: Dict = None,
                           template_results: Dict = None,
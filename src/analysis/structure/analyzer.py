@@ -3,9 +3,10 @@
 
 import csv
 import pandas as pd
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple
 from dataclasses import dataclass, field
 
+from ...utils import IOHandler
 from .variables import StructureVariables
 from .formulas import StructureFormulas
 
@@ -63,7 +64,7 @@ class StructureAnalyzer:
     
     def load_input_from_csv(self, filepath: str) -> None:
         """从CSV文件加载输入数据"""
-        df = pd.read_csv(filepath, encoding='utf-8')
+        df = IOHandler.read_csv(filepath)
         self._parse_input_dataframe(df)
     
     def _parse_input_dataframe(self, df: pd.DataFrame) -> None:
@@ -431,10 +432,12 @@ class StructureAnalyzer:
         
         return results
 
-    def export_to_csv(self, results: dict, filepath: str) -> None:
-        """将计算结果导出为CSV"""
-        import os
-        os.makedirs(os.path.dirname(filepath), exist_ok=True) if os.path.dirname(filepath) else None
+    def build_table(self, results: dict, precise: bool = False) -> Tuple[List[str], List[list]]:
+        """
+        构建输出表，返回 (表头, 数据行)
+        precise=True 时数值保留完整精度（供结果存储使用），否则格式化为导出CSV的字符串
+        """
+        fmt = (lambda value, spec: value) if precise else format
         
         years = results['years']
         rows = []
@@ -442,75 +445,84 @@ class StructureAnalyzer:
         
         # 终端消费
         rows.append(['终端消费', '', ''] + [''] * len(years))
-        rows.append(['', '工业总消费', '亿tce'] + [f"{v:.4f}" for v in results['terminal']['industry']['total']])
-        rows.append(['', '建筑总消费', '亿tce'] + [f"{v:.4f}" for v in results['terminal']['building']['total']])
-        rows.append(['', '交通总消费', '亿tce'] + [f"{v:.4f}" for v in results['terminal']['transport']['total']])
-        rows.append(['', '其他部门消费', '亿tce'] + [f"{v:.4f}" for v in results['terminal']['other']['total']])
-        rows.append(['', '终端总消费', '亿tce'] + [f"{v:.4f}" for v in results['terminal']['total']])
+        rows.append(['', '工业总消费', '亿tce'] + [fmt(v, '.4f') for v in results['terminal']['industry']['total']])
+        rows.append(['', '建筑总消费', '亿tce'] + [fmt(v, '.4f') for v in results['terminal']['building']['total']])
+        rows.append(['', '交通总消费', '亿tce'] + [fmt(v, '.4f') for v in results['terminal']['transport']['total']])
+        rows.append(['', '其他部门消费', '亿tce'] + [fmt(v, '.4f') for v in results['terminal']['other']['total']])
+        rows.append(['', '终端总消费', '亿tce'] + [fmt(v, '.4f') for v in results['terminal']['total']])
         
         rows.append([''] * (3 + len(years)))
         
         # 电气化率
         rows.append(['电气化率', '', ''] + [''] * len(years))
-        rows.append(['', '工业电气化率', '%'] + [f"{v:.2f}" for v in results['electrification']['industry']])
-        rows.append(['', '建筑电气化率', '%'] + [f"{v:.2f}" for v in results['electrification']['building']])
-        rows.append(['', '交通电气化率', '%'] + [f"{v:.2f}" for v in results['electrification']['transport']])
-        rows.append(['', '终端电气化率', '%'] + [f"{v:.2f}" for v in results['electrification']['terminal']])
+        rows.append(['', '工业电气化率', '%'] + [fmt(v, '.2f') for v in results['electrification']['industry']])
+        rows.append(['', '建筑电气化率', '%'] + [fmt(v, '.2f') for v in results['electrification']['building']])
+        rows.append(['', '交通电气化率', '%'] + [fmt(v, '.2f') for v in results['electrification']['transport']])
+        rows.append(['', '终端电气化率', '%'] + [fmt(v, '.2f') for v in results['electrification']['terminal']])
         
         rows.append([''] * (3 + len(years)))
         
         # 氢能
         rows.append(['氢能', '', ''] + [''] * len(years))
-        rows.append(['', '氢能总消费', '亿tce'] + [f"{v:.4f}" for v in results['hydrogen']['total']])
-        rows.append(['', '氢能占比', '%'] + [f"{v:.2f}" for v in results['hydrogen']['ratio']])
+        rows.append(['', '氢能总消费', '亿tce'] + [fmt(v, '.4f') for v in results['hydrogen']['total']])
+        rows.append(['', '氢能占比', '%'] + [fmt(v, '.2f') for v in results['hydrogen']['ratio']])
         
         rows.append([''] * (3 + len(years)))
         
         # 一次能源
         rows.append(['一次能源', '', ''] + [''] * len(years))
-        rows.append(['', '煤', '亿tce'] + [f"{v:.4f}" for v in results['primary']['coal']])
-        rows.append(['', '油', '亿tce'] + [f"{v:.4f}" for v in results['primary']['oil']])
-        rows.append(['', '气', '亿tce'] + [f"{v:.4f}" for v in results['primary']['gas']])
-        rows.append(['', '非化石', '亿tce'] + [f"{v:.4f}" for v in results['primary']['non_fossil']])
-        rows.append(['', '总能源消费', '亿tce'] + [f"{v:.4f}" for v in results['primary']['total']])
+        rows.append(['', '煤', '亿tce'] + [fmt(v, '.4f') for v in results['primary']['coal']])
+        rows.append(['', '油', '亿tce'] + [fmt(v, '.4f') for v in results['primary']['oil']])
+        rows.append(['', '气', '亿tce'] + [fmt(v, '.4f') for v in results['primary']['gas']])
+        rows.append(['', '非化石', '亿tce'] + [fmt(v, '.4f') for v in results['primary']['non_fossil']])
+        rows.append(['', '总能源消费', '亿tce'] + [fmt(v, '.4f') for v in results['primary']['total']])
         
         rows.append([''] * (3 + len(years)))
         
         # 非化石细分
         rows.append(['非化石细分', '', ''] + [''] * len(years))
-        rows.append(['', '风', '亿tce'] + [f"{v:.4f}" for v in results['primary']['wind']])
-        rows.append(['', '光', '亿tce'] + [f"{v:.4f}" for v in results['primary']['solar']])
-        rows.append(['', '水', '亿tce'] + [f"{v:.4f}" for v in results['primary']['hydro']])
-        rows.append(['', '核', '亿tce'] + [f"{v:.4f}" for v in results['primary']['nuclear']])
-        rows.append(['', '生物质', '亿tce'] + [f"{v:.4f}" for v in results['primary']['biomass']])
+        rows.append(['', '风', '亿tce'] + [fmt(v, '.4f') for v in results['primary']['wind']])
+        rows.append(['', '光', '亿tce'] + [fmt(v, '.4f') for v in results['primary']['solar']])
+        rows.append(['', '水', '亿tce'] + [fmt(v, '.4f') for v in results['primary']['hydro']])
+        rows.append(['', '核', '亿tce'] + [fmt(v, '.4f') for v in results['primary']['nuclear']])
+        rows.append(['', '生物质', '亿tce'] + [fmt(v, '.4f') for v in results['primary']['biomass']])
         
         rows.append([''] * (3 + len(years)))
         
         # 能源结构占比
         rows.append(['能源结构占比', '', ''] + [''] * len(years))
-        rows.append(['', '煤炭', '%'] + [f"{v:.2f}" for v in results['structure']['coal_ratio']])
-        rows.append(['', '石油', '%'] + [f"{v:.2f}" for v in results['structure']['oil_ratio']])
-        rows.append(['', '天然气', '%'] + [f"{v:.2f}" for v in results['structure']['gas_ratio']])
-        rows.append(['', '非化石能源', '%'] + [f"{v:.2f}" for v in results['structure']['non_fossil_ratio']])
+        rows.append(['', '煤炭', '%'] + [fmt(v, '.2f') for v in results['structure']['coal_ratio']])
+        rows.append(['', '石油', '%'] + [fmt(v, '.2f') for v in results['structure']['oil_ratio']])
+        rows.append(['', '天然气', '%'] + [fmt(v, '.2f') for v in results['structure']['gas_ratio']])
+        rows.append(['', '非化石能源', '%'] + [fmt(v, '.2f') for v in results['structure']['non_fossil_ratio']])
         
         rows.append([''] * (3 + len(years)))
         
         # 终端能源结构
         rows.append(['终端能源结构', '', ''] + [''] * len(years))
-        rows.append(['', '煤', '亿tce'] + [f"{v:.4f}" for v in results['terminal_structure']['coal']])
-        rows.append(['', '油', '亿tce'] + [f"{v:.4f}" for v in results['terminal_structure']['oil']])
-        rows.append(['', '气', '亿tce'] + [f"{v:.4f}" for v in results['terminal_structure']['gas']])
-        rows.append(['', '生物质', '亿tce'] + [f"{v:.4f}" for v in results['terminal_structure']['biomass']])
-        rows.append(['', '氢', '亿tce'] + [f"{v:.4f}" for v in results['terminal_structure']['hydrogen']])
-        rows.append(['', '电', '亿tce'] + [f"{v:.4f}" for v in results['terminal_structure']['electricity']])
+        rows.append(['', '煤', '亿tce'] + [fmt(v, '.4f') for v in results['terminal_structure']['coal']])
+        rows.append(['', '油', '亿tce'] + [fmt(v, '.4f') for v in results['terminal_structure']['oil']])
+        rows.append(['', '气', '亿tce'] + [fmt(v, '.4f') for v in results['terminal_structure']['gas']])
+        rows.append(['', '生物质', '亿tce'] + [fmt(v, '.4f') for v in results['terminal_structure']['biomass']])
+        rows.append(['', '氢', '亿tce'] + [fmt(v, '.4f') for v in results['terminal_structure']['hydrogen']])
+        rows.append(['', '电', '亿tce'] + [fmt(v, '.4f') for v in results['terminal_structure']['electricity']])
         
         rows.append([''] * (3 + len(years)))
         
         # 生物质汇总
         rows.append(['生物质汇总', '', ''] + [''] * len(years))
-        rows.append(['', '生物质总消费', '亿tce'] + [f"{v:.4f}" for v in results['biomass_total']])
+        rows.append(['', '生物质总消费', '亿tce'] + [fmt(v, '.4f') for v in results['biomass_total']])
         
         # 写入CSV
+        return headers, rows
+
+
+    def export_to_csv(self, results: dict, filepath: str) -> None:
+        """将计算结果导出为CSV"""
+        import os
+        os.makedirs(os.path.dirname(filepath), exist_ok=True) if os.path.dirname(filepath) else None
+        
+        headers, rows = self.build_table(results)
         with open(filepath, 'w', newline='', encoding='utf-8') as f:
             writer = csv.writer(f)
             writer.writerow(headers)
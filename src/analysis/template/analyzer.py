@@ -3,9 +3,10 @@
 
 import csv
 import pandas as pd
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple
 from dataclasses import dataclass, field
 
+from ...utils import IOHandler
 from .variables import TemplateVariables
 from .formulas import TemplateFormulas
 
@@ -119,7 +120,7 @@ class TemplateAnalyzer:
     
     def load_input_from_csv(self, filepath: str) -> None:
         """从CSV文件加载输入数据"""
-        df = pd.read_csv(filepath, encoding='utf-8')
+        df = IOHandler.read_csv(filepath)
         self._parse_input_dataframe(df)
     
     def _parse_input_dataframe(self, df: pd.DataFrame) -> None:
@@ -614,10 +615,12 @@ class TemplateAnalyzer:
         
         return results
 
-    def export_to_csv(self, results: dict, filepath: str) -> None:
-        """将计算结果导出为CSV"""
-        import os
-        os.makedirs(os.path.dirname(filepath), exist_ok=True) if os.path.dirname(filepath) else None
+    def build_table(self, results: dict, precise: bool = False) -> Tuple[List[str], List[list]]:
+        """
+        构建输出表，返回 (表头, 数据行)
+        precise=True 时数值保留完整精度（供结果存储使用），否则格式化为导出CSV的字符串
+        """
+        fmt = (lambda value, spec: value) if precise else format
         
         years = results['years']
         rows = []
@@ -628,16 +631,16 @@ class TemplateAnalyzer:
         rows.append(['', '终端能源消费量', '', ''] + [''] * len(years))
         for key in ['煤炭', '石油', '天然气']:
             unit = '亿tce'
-            rows.append(['', '', key, unit] + [f"{v:.4f}" for v in results['industry']['energy'][key]])
-        rows.append(['', '', '电力', '万亿kWh'] + [f"{v:.4f}" for v in results['industry']['energy']['电力']])
-        rows.append(['', '', '氢能', '亿tce'] + [f"{v:.4f}" for v in results['industry']['energy']['氢能']])
-        rows.append(['', '', '其它非化石能源', '亿tce'] + [f"{v:.4f}" for v in results['industry']['energy']['其它非化石能源']])
-        rows.append(['', '', '生物质', '亿tce'] + [f"{v:.4f}" for v in results['industry']['energy']['生物质']])
+            rows.append(['', '', key, unit] + [fmt(v, '.4f') for v in results['industry']['energy'][key]])
+        rows.append(['', '', '电力', '万亿kWh'] + [fmt(v, '.4f') for v in results['industry']['energy']['电力']])
+        rows.append(['', '', '氢能', '亿tce'] + [fmt(v, '.4f') for v in results['industry']['energy']['氢能']])
+        rows.append(['', '', '其它非化石能源', '亿tce'] + [fmt(v, '.4f') for v in results['industry']['energy']['其它非化石能源']])
+        rows.append(['', '', '生物质', '亿tce'] + [fmt(v, '.4f') for v in results['industry']['energy']['生物质']])
         
         rows.append(['', '直接CO2排放', '', ''] + [''] * len(years))
         for key in ['直接总排放', '来自煤炭', '来自石油', '来自天然气']:
-            rows.append(['', '', key, '亿吨CO2'] + [f"{v:.4f}" for v in results['industry']['co2'][key]])
-        rows.append(['', '间接CO2排放', '来自电力', '亿吨CO2'] + [f"{v:.4f}" for v in results['industry']['co2']['来自电力']])
+            rows.append(['', '', key, '亿吨CO2'] + [fmt(v, '.4f') for v in results['industry']['co2'][key]])
+        rows.append(['', '间接CO2排放', '来自电力', '亿吨CO2'] + [fmt(v, '.4f') for v in results['industry']['co2']['来自电力']])
         
         rows.append([''] * (4 + len(years)))
         
@@ -645,16 +648,16 @@ class TemplateAnalyzer:
         rows.append(['建筑部门', '', '', ''] + [''] * len(years))
         rows.append(['', '终端能源消费量', '', ''] + [''] * len(years))
         for key in ['煤炭', '石油', '天然气']:
-            rows.append(['', '', key, '亿tce'] + [f"{v:.4f}" for v in results['building']['energy'][key]])
-        rows.append(['', '', '电力', '万亿kWh'] + [f"{v:.4f}" for v in results['building']['energy']['电力']])
-        rows.append(['', '', '氢能', '亿tce'] + [f"{v:.4f}" for v in results['building']['energy']['氢能']])
-        rows.append(['', '', '其它非化石能源', '亿tce'] + [f"{v:.4f}" for v in results['building']['energy']['其它非化石能源']])
-        rows.append(['', '', '生物质', '亿tce'] + [f"{v:.4f}" for v in results['building']['energy']['生物质']])
+            rows.append(['', '', key, '亿tce'] + [fmt(v, '.4f') for v in results['building']['energy'][key]])
+        rows.append(['', '', '电力', '万亿kWh'] + [fmt(v, '.4f') for v in results['building']['energy']['电力']])
+        rows.append(['', '', '氢能', '亿tce'] + [fmt(v, '.4f') for v in results['building']['energy']['氢能']])
+        rows.append(['', '', '其它非化石能源', '亿tce'] + [fmt(v, '.4f') for v in results['building']['energy']['其它非化石能源']])
+        rows.append(['', '', '生物质', '亿tce'] + [fmt(v, '.4f') for v in results['building']['energy']['生物质']])
         
         rows.append(['', '直接CO2排放', '', ''] + [''] * len(years))
         for key in ['直接总排放', '来自煤炭', '来自石油', '来自天然气']:
-            rows.append(['', '', key, '亿吨CO2'] + [f"{v:.4f}" for v in results['building']['co2'][key]])
-        rows.append(['', '间接CO2排放', '来自电力', '亿吨CO2'] + [f"{v:.4f}" for v in results['building']['co2']['来自电力']])
+            rows.append(['', '', key, '亿吨CO2'] + [fmt(v, '.4f') for v in results['building']['co2'][key]])
+        rows.append(['', '间接CO2排放', '来自电力', '亿吨CO2'] + [fmt(v, '.4f') for v in results['building']['co2']['来自电力']])
         
         rows.append([''] * (4 + len(years)))
         
@@ -662,16 +665,16 @@ class TemplateAnalyzer:
         rows.append(['交通部门', '', '', ''] + [''] * len(years))
         rows.append(['', '终端能源消费量', '', ''] + [''] * len(years))
         for key in ['煤炭', '石油', '天然气']:
-            rows.append(['', '', key, '亿tce'] + [f"{v:.4f}" for v in results['transport']['energy'][key]])
-        rows.append(['', '', '电力', '万亿kWh'] + [f"{v:.4f}" for v in results['transport']['energy']['电力']])
-        rows.append(['', '', '氢能', '亿tce'] + [f"{v:.4f}" for v in results['transport']['energy']['氢能']])
-        rows.append(['', '', '其它非化石能源', '亿tce'] + [f"{v:.4f}" for v in results['transport']['energy']['其它非化石能源']])
-        rows.append(['', '', '生物质', '亿tce'] + [f"{v:.4f}" for v in results['transport']['energy']['生物质']])
+            rows.append(['', '', key, '亿tce'] + [fmt(v, '.4f') for v in results['transport']['energy'][key]])
+        rows.append(['', '', '电力', '万亿kWh'] + [fmt(v, '.4f') for v in results['transport']['energy']['电力']])
+        rows.append(['', '', '氢能', '亿tce'] + [fmt(v, '.4f') for v in results['transport']['energy']['氢能']])
+        rows.append(['', '', '其它非化石能源', '亿tce'] + [fmt(v, '.4f') for v in results['transport']['energy']['其它非化石能源']])
+        rows.append(['', '', '生物质', '亿tce'] + [fmt(v, '.4f') for v in results['transport']['energy']['生物质']])
         
         rows.append(['', '直接CO2排放', '', ''] + [''] * len(years))
         for key in ['直接总排放', '来自煤炭', '来自石油', '来自天然气']:
-            rows.append(['', '', key, '亿吨CO2'] + [f"{v:.4f}" for v in results['transport']['co2'][key]])
-        rows.append(['', '间接CO2排放', '来自电力', '亿吨CO2'] + [f"{v:.4f}" for v in results['transport']['co2']['来自电力']])
+            rows.append(['', '', key, '亿吨CO2'] + [fmt(v, '.4f') for v in results['transport']['co2'][key]])
+        rows.append(['', '间接CO2排放', '来自电力', '亿吨CO2'] + [fmt(v, '.4f') for v in results['transport']['co2']['来自电力']])
         
         rows.append([''] * (4 + len(years)))
         
@@ -679,15 +682,15 @@ class TemplateAnalyzer:
         rows.append(['电力部门', '', '', ''] + [''] * len(years))
         rows.append(['', '能源消耗', '', ''] + [''] * len(years))
         for key in ['煤炭', '石油', '天然气', '其它非化石能源']:
-            rows.append(['', '', key, '亿tce'] + [f"{v:.4f}" for v in results['power']['energy'][key]])
+            rows.append(['', '', key, '亿tce'] + [fmt(v, '.4f') for v in results['power']['energy'][key]])
         
         rows.append(['', '非化石细分', '', ''] + [''] * len(years))
         for key in ['风能', '太阳能', '水能', '核能', '生物质能']:
-            rows.append(['', '', key, '亿tce'] + [f"{v:.4f}" for v in results['power']['non_fossil'][key]])
+            rows.append(['', '', key, '亿tce'] + [fmt(v, '.4f') for v in results['power']['non_fossil'][key]])
         
         rows.append(['', 'CO2排放', '', ''] + [''] * len(years))
         for key in ['来自煤炭', '来自天然气', '总直接排放', '化石能源CCS', '生物质CCS', '净排放']:
-            rows.append(['', '', key, '亿吨CO2'] + [f"{v:.4f}" for v in results['power']['co2'][key]])
+            rows.append(['', '', key, '亿吨CO2'] + [fmt(v, '.4f') for v in results['power']['co2'][key]])
         
         rows.append([''] * (4 + len(years)))
         
@@ -695,31 +698,39 @@ class TemplateAnalyzer:
         rows.append(['氢能', '', '', ''] + [''] * len(years))
         rows.append(['', '氢能供给', '', ''] + [''] * len(years))
         for key in ['灰氢', '蓝氢', '生物质制氢', '电制氢']:
-            rows.append(['', '', key, '亿tce'] + [f"{v:.4f}" for v in results['hydrogen']['supply'][key]])
+            rows.append(['', '', key, '亿tce'] + [fmt(v, '.4f') for v in results['hydrogen']['supply'][key]])
         
         rows.append(['', '氢能需求', '', ''] + [''] * len(years))
         for key in ['工业', '建筑', '交通', '总氢需求']:
-            rows.append(['', '', key, '亿tce'] + [f"{v:.4f}" for v in results['hydrogen']['demand'][key]])
-        rows.append(['', '', '总氢需求', '万吨'] + [f"{v:.4f}" for v in results['hydrogen']['demand']['万吨']])
+            rows.append(['', '', key, '亿tce'] + [fmt(v, '.4f') for v in results['hydrogen']['demand'][key]])
+        rows.append(['', '', '总氢需求', '万吨'] + [fmt(v, '.4f') for v in results['hydrogen']['demand']['万吨']])
         
         rows.append(['', '氢能比例', '', ''] + [''] * len(years))
         for key in ['灰氢比例', '蓝氢比例', '绿氢比例']:
-            rows.append(['', '', key, '%'] + [f"{v*100:.2f}" for v in results['hydrogen']['ratio'][key]])
+            rows.append(['', '', key, '%'] + [fmt(v*100, '.2f') for v in results['hydrogen']['ratio'][key]])
         
         rows.append([''] * (4 + len(years)))
         
         # 生物质
         rows.append(['生物质', '', '', ''] + [''] * len(years))
         for key in ['工业', '建筑', '交通', '电力', '氢能', '总计']:
-            rows.append(['', '', key, '亿tce'] + [f"{v:.4f}" for v in results['biomass'][key]])
+            rows.append(['', '', key, '亿tce'] + [fmt(v, '.4f') for v in results['biomass'][key]])
         
         rows.append([''] * (4 + len(years)))
         
         # 汇总
         rows.append(['汇总', '', '', ''] + [''] * len(years))
-        rows.append(['', '', '总CO2排放', '亿吨CO2'] + [f"{v:.4f}" for v in results['summary']['total_co2']])
-        rows.append(['', '', '总能源消费', '亿tce'] + [f"{v:.4f}" for v in results['summary']['total_energy']])
+        rows.append(['', '', '总CO2排放', '亿吨CO2'] + [fmt(v, '.4f') for v in results['summary']['total_co2']])
+        rows.append(['', '', '总能源消费', '亿tce'] + [fmt(v, '.4f') for v in results['summary']['total_energy']])
+        return headers, rows
+
+
+    def export_to_csv(self, results: dict, filepath: str) -> None:
+        """将计算结果导出为CSV"""
+        import os
+        os.makedirs(os.path.dirname(filepath), exist_ok=True) if os.path.dirname(filepath) else None
         
+        headers, rows = self.build_table(results)
         with open(filepath, 'w', newline='', encoding='utf-8-sig') as f:
             writer = csv.writer(f)
             writer.writerow(headers)
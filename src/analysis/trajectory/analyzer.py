@@ -3,9 +3,10 @@
 
 import csv
 import pandas as pd
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple
 from dataclasses import dataclass, field
 
+from ...utils import IOHandler
 from .variables import TrajectoryVariables
 from .formulas import TrajectoryFormulas
 
@@ -81,7 +82,7 @@ class TrajectoryAnalyzer:
     
     def load_input_from_csv(self, filepath: str) -> None:
         """从CSV文件加载输入数据"""
-        df = pd.read_csv(filepath, encoding='utf-8')
+        df = IOHandler.read_csv(filepath)
         self._parse_input_dataframe(df)
     
     def _parse_input_dataframe(self, df: pd.DataFrame) -> None:
@@ -528,10 +529,12 @@ class TrajectoryAnalyzer:
                 return self.years[i]
         return None
 
-    def export_to_csv(self, results: dict, filepath: str) -> None:
-        """将计算结果导出为CSV"""
-        import os
-        os.makedirs(os.path.dirname(filepath), exist_ok=True) if os.path.dirname(filepath) else None
+    def build_table(self, results: dict, precise: bool = False) -> Tuple[List[str], List[list]]:
+        """
+        构建输出表，返回 (表头, 数据行)
+        precise=True 时数值保留完整精度（供结果存储使用），否则格式化为导出CSV的字符串
+        """
+        fmt = (lambda value, spec: value) if precise else format
         
         years = results['years']
         rows = []
@@ -539,97 +542,97 @@ class TrajectoryAnalyzer:
         
         # 工业部门排放
         rows.append(['工业部门', '', ''] + [''] * len(years))
-        rows.append(['', '来自煤炭', '亿吨CO2'] + [f"{v:.4f}" for v in results['industry']['coal']])
-        rows.append(['', '来自石油', '亿吨CO2'] + [f"{v:.4f}" for v in results['industry']['oil']])
-        rows.append(['', '来自天然气', '亿吨CO2'] + [f"{v:.4f}" for v in results['industry']['gas']])
-        rows.append(['', '工业过程CO2', '亿吨CO2'] + [f"{v:.4f}" for v in results['industry']['process_co2']])
-        rows.append(['', '来自电力', '亿吨CO2'] + [f"{v:.4f}" for v in results['industry']['electricity']])
-        rows.append(['', '来自氢能', '亿吨CO2'] + [f"{v:.4f}" for v in results['industry']['hydrogen']])
-        rows.append(['', '工业CCS', '亿吨CO2'] + [f"{v:.4f}" for v in results['industry']['ccs']])
+        rows.append(['', '来自煤炭', '亿吨CO2'] + [fmt(v, '.4f') for v in results['industry']['coal']])
+        rows.append(['', '来自石油', '亿吨CO2'] + [fmt(v, '.4f') for v in results['industry']['oil']])
+        rows.append(['', '来自天然气', '亿吨CO2'] + [fmt(v, '.4f') for v in results['industry']['gas']])
+        rows.append(['', '工业过程CO2', '亿吨CO2'] + [fmt(v, '.4f') for v in results['industry']['process_co2']])
+        rows.append(['', '来自电力', '亿吨CO2'] + [fmt(v, '.4f') for v in results['industry']['electricity']])
+        rows.append(['', '来自氢能', '亿吨CO2'] + [fmt(v, '.4f') for v in results['industry']['hydrogen']])
+        rows.append(['', '工业CCS', '亿吨CO2'] + [fmt(v, '.4f') for v in results['industry']['ccs']])
         
         rows.append([''] * (3 + len(years)))
         
         # 建筑部门排放
         rows.append(['建筑部门', '', ''] + [''] * len(years))
-        rows.append(['', '来自煤炭', '亿吨CO2'] + [f"{v:.4f}" for v in results['building']['coal']])
-        rows.append(['', '来自石油', '亿吨CO2'] + [f"{v:.4f}" for v in results['building']['oil']])
-        rows.append(['', '来自天然气', '亿吨CO2'] + [f"{v:.4f}" for v in results['building']['gas']])
-        rows.append(['', '来自电力', '亿吨CO2'] + [f"{v:.4f}" for v in results['building']['electricity']])
+        rows.append(['', '来自煤炭', '亿吨CO2'] + [fmt(v, '.4f') for v in results['building']['coal']])
+        rows.append(['', '来自石油', '亿吨CO2'] + [fmt(v, '.4f') for v in results['building']['oil']])
+        rows.append(['', '来自天然气', '亿吨CO2'] + [fmt(v, '.4f') for v in results['building']['gas']])
+        rows.append(['', '来自电力', '亿吨CO2'] + [fmt(v, '.4f') for v in results['building']['electricity']])
         
         rows.append([''] * (3 + len(years)))
         
         # 交通部门排放
         rows.append(['交通部门', '', ''] + [''] * len(years))
-        rows.append(['', '来自煤炭', '亿吨CO2'] + [f"{v:.4f}" for v in results['transport']['coal']])
-        rows.append(['', '来自石油', '亿吨CO2'] + [f"{v:.4f}" for v in results['transport']['oil']])
-        rows.append(['', '来自天然气', '亿吨CO2'] + [f"{v:.4f}" for v in results['transport']['gas']])
-        rows.append(['', '来自电力', '亿吨CO2'] + [f"{v:.4f}" for v in results['transport']['electricity']])
+        rows.append(['', '来自煤炭', '亿吨CO2'] + [fmt(v, '.4f') for v in results['transport']['coal']])
+        rows.append(['', '来自石油', '亿吨CO2'] + [fmt(v, '.4f') for v in results['transport']['oil']])
+        rows.append(['', '来自天然气', '亿吨CO2'] + [fmt(v, '.4f') for v in results['transport']['gas']])
+        rows.append(['', '来自电力', '亿吨CO2'] + [fmt(v, '.4f') for v in results['transport']['electricity']])
         
         rows.append([''] * (3 + len(years)))
         
         # 电力部门排放
         rows.append(['电力部门', '', ''] + [''] * len(years))
-        rows.append(['', '来自煤炭', '亿吨CO2'] + [f"{v:.4f}" for v in results['power']['coal']])
-        rows.append(['', '来自天然气', '亿吨CO2'] + [f"{v:.4f}" for v in results['power']['gas']])
-        rows.append(['', '化石能源CCS', '亿吨CO2'] + [f"{v:.4f}" for v in results['power']['fossil_ccs']])
-        rows.append(['', '生物质CCS', '亿吨CO2'] + [f"{v:.4f}" for v in results['power']['biomass_ccs']])
+        rows.append(['', '来自煤炭', '亿吨CO2'] + [fmt(v, '.4f') for v in results['power']['coal']])
+        rows.append(['', '来自天然气', '亿吨CO2'] + [fmt(v, '.4f') for v in results['power']['gas']])
+        rows.append(['', '化石能源CCS', '亿吨CO2'] + [fmt(v, '.4f') for v in results['power']['fossil_ccs']])
+        rows.append(['', '生物质CCS', '亿吨CO2'] + [fmt(v, '.4f') for v in results['power']['biomass_ccs']])
         
         rows.append([''] * (3 + len(years)))
         
         # 总排放（含间接排放）
         rows.append(['总排放（含间接排放）', '', ''] + [''] * len(years))
-        rows.append(['', '工业(含工业过程）', '亿吨CO2'] + [f"{v:.4f}" for v in results['total_with_indirect']['industry']])
-        rows.append(['', '建筑', '亿吨CO2'] + [f"{v:.4f}" for v in results['total_with_indirect']['building']])
-        rows.append(['', '交通', '亿吨CO2'] + [f"{v:.4f}" for v in results['total_with_indirect']['transport']])
-        rows.append(['', '电力', '亿吨CO2'] + [f"{v:.4f}" for v in results['total_with_indirect']['power']])
+        rows.append(['', '工业(含工业过程）', '亿吨CO2'] + [fmt(v, '.4f') for v in results['total_with_indirect']['industry']])
+        rows.append(['', '建筑', '亿吨CO2'] + [fmt(v, '.4f') for v in results['total_with_indirect']['building']])
+        rows.append(['', '交通', '亿吨CO2'] + [fmt(v, '.4f') for v in results['total_with_indirect']['transport']])
+        rows.append(['', '电力', '亿吨CO2'] + [fmt(v, '.4f') for v in results['total_with_indirect']['power']])
         
         rows.append([''] * (3 + len(years)))
         
         # 总排放
         rows.append(['总排放', '', ''] + [''] * len(years))
-        rows.append(['', '工业(含工业过程）', '亿吨CO2'] + [f"{v:.4f}" for v in results['total_direct']['industry']])
-        rows.append(['', '建筑', '亿吨CO2'] + [f"{v:.4f}" for v in results['total_direct']['building']])
-        rows.append(['', '交通', '亿吨CO2'] + [f"{v:.4f}" for v in results['total_direct']['transport']])
-        rows.append(['', '电力', '亿吨CO2'] + [f"{v:.4f}" for v in results['total_direct']['power']])
+        rows.append(['', '工业(含工业过程）', '亿吨CO2'] + [fmt(v, '.4f') for v in results['total_direct']['industry']])
+        rows.append(['', '建筑', '亿吨CO2'] + [fmt(v, '.4f') for v in results['total_direct']['building']])
+        rows.append(['', '交通', '亿吨CO2'] + [fmt(v, '.4f') for v in results['total_direct']['transport']])
+        rows.append(['', '电力', '亿吨CO2'] + [fmt(v, '.4f') for v in results['total_direct']['power']])
         
         rows.append([''] * (3 + len(years)))
         
         # 汇总排放
         rows.append(['汇总', '', ''] + [''] * len(years))
-        rows.append(['', '工业排放', '亿吨CO2'] + [f"{v:.4f}" for v in results['summary']['industry_emission']])
-        rows.append(['', '工业直接排放', '亿吨CO2'] + [f"{v:.4f}" for v in results['summary']['industry_direct']])
-        rows.append(['', '工业CCS', '亿吨CO2'] + [f"{v:.4f}" for v in results['summary']['industry_ccs']])
-        rows.append(['', '建筑排放', '亿吨CO2'] + [f"{v:.4f}" for v in results['summary']['building_emission']])
-        rows.append(['', '交通排放', '亿吨CO2'] + [f"{v:.4f}" for v in results['summary']['transport_emission']])
-        rows.append(['', '电力排放', '亿吨CO2'] + [f"{v:.4f}" for v in results['summary']['power_emission']])
-        rows.append(['', '电力直接排放', '亿吨CO2'] + [f"{v:.4f}" for v in results['summary']['power_direct']])
-        rows.append(['', '电力CCS', '亿吨CO2'] + [f"{v:.4f}" for v in results['summary']['power_ccs']])
-        rows.append(['', '其他排放', '亿吨CO2'] + [f"{v:.4f}" for v in results['summary']['other_emission']])
-        rows.append(['', 'DACCS', '亿吨CO2'] + [f"{v:.4f}" for v in results['summary']['daccs']])
-        rows.append(['', '能源相关CO2', '亿吨CO2'] + [f"{v:.4f}" for v in results['summary']['energy_co2']])
-        rows.append(['', '工业过程', '亿吨CO2'] + [f"{v:.4f}" for v in results['summary']['process_co2']])
-        rows.append(['', '二氧化碳排放', '亿吨CO2'] + [f"{v:.4f}" for v in results['summary']['total_co2']])
-        rows.append(['', '非二氧化碳', '亿吨CO2当量'] + [f"{v:.4f}" for v in results['summary']['non_co2']])
-        rows.append(['', '温室气体排放', '亿吨CO2当量'] + [f"{v:.4f}" for v in results['summary']['ghg_emission']])
-        rows.append(['', '碳汇', '亿吨CO2'] + [f"{v:.4f}" for v in results['summary']['carbon_sink']])
-        rows.append(['', '温室气体净排放', '亿吨CO2当量'] + [f"{v:.4f}" for v in results['summary']['net_ghg_emission']])
+        rows.append(['', '工业排放', '亿吨CO2'] + [fmt(v, '.4f') for v in results['summary']['industry_emission']])
+        rows.append(['', '工业直接排放', '亿吨CO2'] + [fmt(v, '.4f') for v in results['summary']['industry_direct']])
+        rows.append(['', '工业CCS', '亿吨CO2'] + [fmt(v, '.4f') for v in results['summary']['industry_ccs']])
+        rows.append(['', '建筑排放', '亿吨CO2'] + [fmt(v, '.4f') for v in results['summary']['building_emission']])
+        rows.append(['', '交通排放', '亿吨CO2'] + [fmt(v, '.4f') for v in results['summary']['transport_emission']])
+        rows.append(['', '电力排放', '亿吨CO2'] + [fmt(v, '.4f') for v in results['summary']['power_emission']])
+        rows.append(['', '电力直接排放', '亿吨CO2'] + [fmt(v, '.4f') for v in results['summary']['power_direct']])
+        rows.append(['', '电力CCS', '亿吨CO2'] + [fmt(v, '.4f') for v in results['summary']['power_ccs']])
+        rows.append(['', '其他排放', '亿吨CO2'] + [fmt(v, '.4f') for v in results['summary']['other_emission']])
+        rows.append(['', 'DACCS', '亿吨CO2'] + [fmt(v, '.4f') for v in results['summary']['daccs']])
+        rows.append(['', '能源相关CO2', '亿吨CO2'] + [fmt(v, '.4f') for v in results['summary']['energy_co2']])
+        rows.append(['', '工业过程', '亿吨CO2'] + [fmt(v, '.4f') for v in results['summary']['process_co2']])
+        rows.append(['', '二氧化碳排放', '亿吨CO2'] + [fmt(v, '.4f') for v in results['summary']['total_co2']])
+        rows.append(['', '非二氧化碳', '亿吨CO2当量'] + [fmt(v, '.4f') for v in results['summary']['non_co2']])
+        rows.append(['', '温室气体排放', '亿吨CO2当量'] + [fmt(v, '.4f') for v in results['summary']['ghg_emission']])
+        rows.append(['', '碳汇', '亿吨CO2'] + [fmt(v, '.4f') for v in results['summary']['carbon_sink']])
+        rows.append(['', '温室气体净排放', '亿吨CO2当量'] + [fmt(v, '.4f') for v in results['summary']['net_ghg_emission']])
         
         rows.append([''] * (3 + len(years)))
         
         # CCS汇总
         rows.append(['CCS汇总', '', ''] + [''] * len(years))
-        rows.append(['', '煤电CCS', '亿吨CO2'] + [f"{v:.4f}" for v in results['ccs']['coal_power']])
-        rows.append(['', '气电CCS', '亿吨CO2'] + [f"{v:.4f}" for v in results['ccs']['gas_power']])
-        rows.append(['', '生物质CCS', '亿吨CO2'] + [f"{v:.4f}" for v in results['ccs']['biomass']])
-        rows.append(['', '工业CCS', '亿吨CO2'] + [f"{v:.4f}" for v in results['ccs']['industry']])
-        rows.append(['', 'DACCS', '亿吨CO2'] + [f"{v:.4f}" for v in results['ccs']['daccs']])
-        rows.append(['', '总CCS', '亿吨CO2'] + [f"{v:.4f}" for v in results['ccs']['total']])
+        rows.append(['', '煤电CCS', '亿吨CO2'] + [fmt(v, '.4f') for v in results['ccs']['coal_power']])
+        rows.append(['', '气电CCS', '亿吨CO2'] + [fmt(v, '.4f') for v in results['ccs']['gas_power']])
+        rows.append(['', '生物质CCS', '亿吨CO2'] + [fmt(v, '.4f') for v in results['ccs']['biomass']])
+        rows.append(['', '工业CCS', '亿吨CO2'] + [fmt(v, '.4f') for v in results['ccs']['industry']])
+        rows.append(['', 'DACCS', '亿吨CO2'] + [fmt(v, '.4f') for v in results['ccs']['daccs']])
+        rows.append(['', '总CCS', '亿吨CO2'] + [fmt(v, '.4f') for v in results['ccs']['total']])
         
         rows.append([''] * (3 + len(years)))
         
         # 中和分析
         rows.append(['中和分析', '', ''] + [''] * len(years))
-        rows.append(['', '能源相关CO2', '亿吨CO2'] + [f"{v:.4f}" for v in results['neutrality']['energy_co2']])
+        rows.append(['', '能源相关CO2', '亿吨CO2'] + [fmt(v, '.4f') for v in results['neutrality']['energy_co2']])
         co2_neutral = results['neutrality']['co2_neutral'] or '未达到'
         ghg_neutral = results['neutrality']['ghg_neutral'] or '未达到'
         rows.append(['', '二氧化碳中和年份', '', co2_neutral] + [''] * (len(years) - 1))
@@ -639,11 +642,20 @@ class TrajectoryAnalyzer:
         
         # 燃烧排放
         rows.append(['燃烧排放', '', ''] + [''] * len(years))
-        rows.append(['', '燃烧排放', '亿吨CO2'] + [f"{v:.4f}" for v in results['combustion']['emission']])
-        rows.append(['', '工业CCS', '亿吨CO2'] + [f"{v:.4f}" for v in results['combustion']['industry_ccs']])
-        rows.append(['', '工业过程排放', '亿吨CO2'] + [f"{v:.4f}" for v in results['combustion']['process_emission']])
+        rows.append(['', '燃烧排放', '亿吨CO2'] + [fmt(v, '.4f') for v in results['combustion']['emission']])
+        rows.append(['', '工业CCS', '亿吨CO2'] + [fmt(v, '.4f') for v in results['combustion']['industry_ccs']])
+        rows.append(['', '工业过程排放', '亿吨CO2'] + [fmt(v, '.4f') for v in results['combustion']['process_emission']])
         
         # 写入CSV
+        return headers, rows
+
+
+    def export_to_csv(self, results: dict, filepath: str) -> None:
+        """将计算结果导出为CSV"""
+        import os
+        os.makedirs(os.path.dirname(filepath), exist_ok=True) if os.path.dirname(filepath) else None
+        
+        headers, rows = self.build_table(results)
         with open(filepath, 'w', newline='', encoding='utf-8') as f:
             writer = csv.writer(f)
             writer.writerow(headers)
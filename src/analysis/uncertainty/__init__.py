@@ -0,0 +1,9 @@
+# -*- coding: utf-8 -*-
+"""不确定性分析模块（向量化蒙特卡洛）"""
+
+from .variables import UncertaintyVariables
+from .formulas import UncertaintyFormulas
+from .analyzer import UncertainParameter, UncertaintyModel, UncertaintyAnalyzer, evaluate_design
+
+__all__ = ['UncertaintyVariables', 'UncertaintyFormulas', 'UncertainParameter',
+           'UncertaintyModel', 'UncertaintyAnalyzer', 'evaluate_design']
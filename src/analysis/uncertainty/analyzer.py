@@ -0,0 +1,661 @@
+# -*- coding: utf-8 -*-
+"""不确定性分析器（向量化蒙特卡洛）
+
+对关键输入给定概率分布，抽取 N 组样本，沿一个样本维一次性传播到电力、宏观测算参考和碳排放轨迹：
+- 电力: 基准输入数组复制为 样本 × 技术 × 年份，按样本倍数修改利用小时数、装机成本、燃料成本、
+  CCS捕集率、设备寿命和CO2排放因子等后用 compute_power_arrays 一次计算
+- 宏观测算参考: 按样本的部门消费、排放因子和GDP年增长率在数组上计算能源消费量、CO2排放量和
+  GDP的CO2强度（MacroFormulas 的公式对数组同样成立）
+- 碳排放轨迹: 用 TrajectoryFormulas 在数组上计算温室气体净排放；其他排放使用样本的排放因子，
+  电力部门各项按样本电力CO2与基准电力CO2之比缩放
+统计各指标的分位数区间和碳中和年份分布。
+参数名称见 UncertaintyVariables.TARGETS，UncertaintyModel.parameter_names() 列出已加载部分的全部参数。
+
+样本分批计算，每个参数在每批中使用独立的随机数流 (种子, 参数名称, 批次序号)，
+同一种子、样本数和批大小的结果与进程数和参数顺序无关。
+"""
+
+import copy
+import csv
+import io
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import redirect_stdout
+from dataclasses import dataclass, field
+from typing import Dict, Any, List, Optional, Tuple
+
+import numpy as np
+
+from ..macro import MacroAnalyzer
+from ..trajectory import TrajectoryAnalyzer, TrajectoryFormulas
+from ...modules.power.batch import ARRAY_FIELD_TYPES, annuity_factor_array, broadcast_power_arrays
+from ...modules.power.vectorized import VectorizedPowerCalculator, compute_power_arrays
+from .variables import UncertaintyVariables
+from .formulas import UncertaintyFormulas
+
+
+# 作用于电力输入数组的参数目标：技术 × 年份 矩阵字段和单项序列字段
+POWER_MATRIX_TARGETS = tuple(ARRAY_FIELD_TYPES)
+POWER_SERIES_TARGETS = ('ccs_capture_rate', 'offshore_wind_ratio', 'distributed_solar_ratio',
+                        'cross_region_capacity')
+
+# 抽样后截断到 [0, 1] 的比例字段
+POWER_RATIO_TARGETS = ('ccs_capture_rate', 'offshore_wind_ratio', 'distributed_solar_ratio')
+
+# 宏观测算参考部门消费 参数目标 -> SectorData 字段
+MACRO_SECTOR_TARGETS = {
+    'coal_consumption': 'coal', 'oil_consumption': 'oil',
+    'gas_consumption': 'gas', 'non_fossil_consumption': 'non_fossil',
+}
+
+# 宏观测算参考非化石能源项目（生物质总量由各项计算）
+MACRO_NON_FOSSIL_ITEMS = ['工业-生物质', '建筑-生物质', '交通-生物质', '电力-生物质', '其他-生物质',
+                          '氢能-生物质', '电力-水能', '电力-核能', '电力-风光']
+
+
+@dataclass
+class UncertainParameter:
+    """不确定参数（抽样值为相对基准值的倍数）"""
+    # 参数名称，"目标" 或 "目标.类型"，如 'capacity_cost.光伏(集中)'
+    name: str
+    # 分布名称，见 UncertaintyVariables.DISTRIBUTIONS
+    distribution: str = 'fixed'
+    # 分布参数
+    params: List[float] = field(default_factory=lambda: [1.0])
+
+    @property
+    def target(self) -> str:
+        return self.name.split('.', 1)[0]
+
+    @property
+    def type_name(self) -> Optional[str]:
+        parts = self.name.split('.', 1)
+        return parts[1] if len(parts) > 1 else None
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'UncertainParameter':
+        missing = [key for key in ('name', 'distribution', 'params') if key not in data]
+        if missing:
+            raise ValueError(f"不确定参数缺少字段: {', '.join(missing)}")
+        return cls(str(data['name']), str(data['distribution']), [float(v) for v in data['params']])
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {'name': self.name, 'distribution': self.distribution, 'params': list(self.params)}
+
+
+def _series(data_list: list, num_years: int) -> np.ndarray:
+    """列表转换为定长数组，缺失部分补0（与分析器 _get_value 的默认值一致）"""
+    values = np.zeros(num_years)
+    n = min(len(data_list), num_years)
+    if n:
+        values[:n] = data_list[:n]
+    return values
+
+
+def _safe_divide(numerator: np.ndarray, denominator: np.ndarray) -> np.ndarray:
+    """逐元素除法，分母为0处结果为0"""
+    numerator, denominator = np.broadcast_arrays(numerator, denominator)
+    out = np.zeros(numerator.shape)
+    np.divide(numerator, denominator, out=out, where=denominator != 0)
+    return out
+
+
+class UncertaintyModel:
+    """
+    基准情景上的向量化模型：参数倍数 {名称: (S,)} -> 输出指标 {指标: (S, Y)}
+    倍数为1时结果与逐个运行计算模块和分析模块一致
+    """
+
+    def __init__(self):
+        self.variables = UncertaintyVariables()
+        # 各输出指标的年份
+        self.years: Dict[str, List[str]] = {}
+
+        # 电力（基准输入数组，无样本维）
+        self.power: Optional[VectorizedPowerCalculator] = None
+        self.power_arrays = None
+        self._power_base: Dict[str, np.ndarray] = {}
+
+        # 宏观测算参考（基准部门消费、排放因子和GDP年增长率）
+        self.macro: Optional[MacroAnalyzer] = None
+        self._macro: Dict[str, Any] = {}
+
+        # 碳排放轨迹
+        self.trajectory: Optional[TrajectoryAnalyzer] = None
+        self._trajectory: Dict[str, np.ndarray] = {}
+        # 电力部门排放是否随样本电力CO2缩放
+        self.link_power = True
+
+    # ==================== 数据加载 ====================
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any], store=None) -> 'UncertaintyModel':
+        """
+        按配置加载电力、宏观测算参考和碳排放轨迹的基准数据（不写输出文件）
+        分析模块使用模块结果（use_module_results）时，先在内存中运行其上游阶段；
+        也可传入已有的结果存储 store
+        """
+        import main
+        from ...pipeline import build_pipeline
+
+        config = copy.deepcopy(config)
+        for section in ('modules', 'analysis'):
+            for cfg in config.get(section, {}).values():
+                for key in list(cfg):
+                    if key.startswith('output_') and key.endswith('_file'):
+                        cfg[key] = None
+        modules = config.get('modules', {})
+        analysis = config.get('analysis', {})
+        power_config = modules.get('power', {})
+        macro_config = analysis.get('macro', {})
+        trajectory_config = analysis.get('trajectory', {})
+
+        model = cls()
+        with redirect_stdout(io.StringIO()):
+            if store is None and any(cfg.get('enabled', False) and cfg.get('use_module_results', False)
+                                     for cfg in (macro_config, trajectory_config)):
+                dependencies = build_pipeline(config).dependencies()
+                needed, pending = set(), [name for name in ('macro', 'trajectory') if name in dependencies]
+                while pending:
+                    name = pending.pop()
+                    for upstream in dependencies.get(name, set()) - needed:
+                        needed.add(upstream)
+                        pending.append(upstream)
+                store = main.run_all(config, only=needed)
+
+            if power_config.get('enabled', False):
+                calculator = main.load_calculator('power', power_config, VectorizedPowerCalculator)
+                if calculator is not None:
+                    model.load_power(calculator)
+            if macro_config.get('enabled', False):
+                model.load_macro(main.load_macro_analyzer(macro_config, store))
+            if trajectory_config.get('enabled', False):
+                model.load_trajectory(main.load_trajectory_analyzer(trajectory_config, store))
+        return model
+
+    def load_power(self, calculator: VectorizedPowerCalculator) -> None:
+        """加载电力基准数据（已加载输入的向量化计算器）"""
+        self.power = calculator
+        self.power_arrays = calculator.build_arrays()
+        self.years['lcoe'] = self.years['power_co2'] = list(self.power_arrays.years)
+        base = self._power_results({}, 1)['co2_emission']
+        self._power_base = {key: base[key][0] for key in ('来自煤炭', '来自天然气', '化石能源CCS', '生物质CCS')}
+
+    def load_macro(self, analyzer: MacroAnalyzer) -> None:
+        """加载宏观测算参考基准数据（部门消费、排放因子和GDP年增长率）"""
+        self.macro = analyzer
+        variables, sector = analyzer.variables, analyzer.sector_data
+        years = analyzer.input_data.years
+        num_years = len(years)
+        self._macro = {
+            'coal': {s: _series(sector.coal.get(s, []), num_years) for s in variables.COAL_SECTORS},
+            'oil': {s: _series(sector.oil.get(s, []), num_years) for s in variables.OIL_SECTORS},
+            'gas': {s: _series(sector.gas.get(s, []), num_years) for s in variables.GAS_SECTORS},
+            'non_fossil': {k: _series(sector.non_fossil.get(k, []), num_years)
+                           for k in MACRO_NON_FOSSIL_ITEMS},
+            'factors': {fuel: analyzer.input_data.emission_factors.get(fuel, default)
+                        for fuel, default in variables.EMISSION_FACTORS.items()},
+            'gdp_growth_rate': np.array(analyzer.input_data.gdp_growth_rate[:num_years], dtype=float),
+        }
+        for key in ('energy_consumption', 'co2_emission', 'gdp_co2_intensity'):
+            self.years[key] = list(years)
+
+    def load_trajectory(self, analyzer: TrajectoryAnalyzer) -> None:
+        """加载碳排放轨迹基准数据"""
+        self.trajectory = analyzer
+        num_years = len(analyzer.years)
+        sections = {
+            'industry': analyzer.industry, 'building': analyzer.building,
+            'transport': analyzer.transport, 'power': analyzer.power,
+            'ccs': analyzer.ccs, 'other': analyzer.other,
+        }
+        self._trajectory = {
+            f"{section}.{key}": _series(values, num_years)
+            for section, data in sections.items() for key, values in vars(data).items()
+        }
+        self.years['net_ghg_emission'] = list(analyzer.years)
+
+    def parameter_types(self) -> Dict[str, List[str]]:
+        """已加载部分的参数目标及其类型 {目标: [类型]}，类型为空的目标只能整体抽样"""
+        targets = {'emission_factor': list(self.variables.EMISSION_FUELS)}
+        if self.macro is not None:
+            targets['gdp_growth_rate'] = []
+            for target, group in MACRO_SECTOR_TARGETS.items():
+                targets[target] = list(self._macro[group])
+        if self.power is not None:
+            for target in POWER_MATRIX_TARGETS:
+                targets[target] = list(getattr(self.power.variables, ARRAY_FIELD_TYPES[target]))
+            targets['equipment_lifetime'] = list(self.power.variables.CAPACITY_COST_TYPES)
+            for target in POWER_SERIES_TARGETS:
+                targets[target] = []
+        if self.trajectory is not None:
+            targets['trajectory'] = list(self._trajectory)
+        return targets
+
+    def parameter_names(self, detailed: bool = False) -> List[str]:
+        """
+        可抽样的参数名称
+        detailed=True 时只列出最细的参数（有类型的目标只列出 "目标.类型"），供逐项敏感性分析
+        """
+        names = []
+        for target, types in self.parameter_types().items():
+            if not types or (not detailed and target != 'trajectory'):
+                names.append(target)
+            names += [f"{target}.{type_name}" for type_name in types]
+        return names
+
+    def check_parameters(self, parameters: List[UncertainParameter]) -> None:
+        """检查参数名称和分布"""
+        names = set(self.parameter_names())
+        seen = set()
+        for parameter in parameters:
+            if parameter.name in seen:
+                raise ValueError(f"不确定参数重复: {parameter.name}")
+            seen.add(parameter.name)
+            if parameter.name not in names:
+                raise ValueError(f"未知或未加载的不确定参数: {parameter.name}")
+            expected = self.variables.DISTRIBUTIONS.get(parameter.distribution)
+            if expected is None:
+                raise ValueError(f"未知的分布: {parameter.distribution}")
+            if len(parameter.params) != len(expected):
+                raise ValueError(f"{parameter.name}: {parameter.distribution} 分布需要参数 "
+                                 f"{', '.join(expected)}")
+
+    # ==================== 计算 ====================
+
+    @staticmethod
+    def _factor(factors: Dict[str, np.ndarray], target: str, type_name: str, size: int) -> np.ndarray:
+        """目标整体倍数与该类型倍数之积 (S,)"""
+        value = np.ones(size)
+        for name in (target, f"{target}.{type_name}"):
+            if name in factors:
+                value = value * factors[name]
+        return value
+
+    @staticmethod
+    def _scale(values: np.ndarray, factors: Dict[str, np.ndarray], target: str,
+               type_name: str) -> np.ndarray:
+        """基准序列 (Y,) 乘以样本倍数，得到 (S, Y)；未抽样时原样返回 (Y,)"""
+        for name in (target, f"{target}.{type_name}"):
+            if name in factors:
+                values = values * factors[name][:, None]
+        return values
+
+    def _power_results(self, factors: Dict[str, np.ndarray], size: int) -> Dict[str, Dict[str, np.ndarray]]:
+        arrays = broadcast_power_arrays(self.power_arrays, size)
+        lifetime = None
+        for name, factor in factors.items():
+            target, _, type_name = name.partition('.')
+            if target == 'equipment_lifetime':
+                if lifetime is None:
+                    data = self.power.power_data
+                    lifetime = np.tile([data.equipment_lifetime.get(k, 25)
+                                        for k in self.power.variables.CAPACITY_COST_TYPES], (size, 1))
+                    lifetime = lifetime.astype(float)
+                if type_name:
+                    lifetime[:, self.power.variables.CAPACITY_COST_TYPES.index(type_name)] *= factor
+                else:
+                    lifetime *= factor[:, None]
+            elif target in POWER_SERIES_TARGETS:
+                getattr(arrays, target)[...] *= factor[:, None]
+            elif target in POWER_MATRIX_TARGETS:
+                values = getattr(arrays, target)
+                if not type_name:
+                    values *= factor[:, None, None]
+                else:
+                    types = getattr(self.power.variables, ARRAY_FIELD_TYPES[target])
+                    values[:, types.index(type_name), :] *= factor[:, None]
+        for target in POWER_RATIO_TARGETS:
+            values = getattr(arrays, target)
+            np.clip(values, 0.0, 1.0, out=values)
+        if lifetime is not None:
+            arrays.annuity_factor = annuity_factor_array(lifetime, self.power.formulas.discount_rate)
+            arrays.lifetime = lifetime
+
+        data = self.power.power_data
+        coal_factor = data.coal_co2_factor * self._factor(factors, 'emission_factor', '煤', size)
+        gas_factor = data.gas_co2_factor * self._factor(factors, 'emission_factor', '气', size)
+        return compute_power_arrays(arrays, self.power.variables, coal_factor[:, None],
+                                    gas_factor[:, None], data.gas_conversion_factor,
+                                    catalog=self.power.catalog)
+
+    def _macro_results(self, factors: Dict[str, np.ndarray], size: int) -> Dict[str, np.ndarray]:
+        """能源消费量、CO2排放量和GDP的CO2强度，与 MacroAnalyzer.calculate 一致"""
+        base, formulas, variables = self._macro, self.macro.formulas, self.macro.variables
+        num_years = len(self.years['energy_consumption'])
+
+        def group(name):
+            target = next(t for t, g in MACRO_SECTOR_TARGETS.items() if g == name)
+            return {key: self._scale(values, factors, target, key) for key, values in base[name].items()}
+
+        coal, oil, gas, nf = group('coal'), group('oil'), group('gas'), group('non_fossil')
+        coal_total = formulas.calculate_sector_total([coal[s] for s in variables.COAL_SECTORS])
+        oil_total = formulas.calculate_sector_total([oil[s] for s in variables.OIL_SECTORS])
+        gas_total = formulas.calculate_sector_total([gas[s] for s in variables.GAS_SECTORS])
+        biomass_total = formulas.calculate_biomass_total(*[nf[k] for k in MACRO_NON_FOSSIL_ITEMS[:6]])
+        non_fossil_total = formulas.calculate_non_fossil_total(
+            biomass_total, nf['电力-水能'], nf['电力-核能'], nf['电力-风光'])
+        energy = formulas.calculate_energy_consumption(coal_total, oil_total, gas_total, non_fossil_total)
+
+        # 能源结构占比（%），能源消费量为0时为0
+        coal_ratio, oil_ratio, gas_ratio = (_safe_divide(total, energy) * 100
+                                            for total in (coal_total, oil_total, gas_total))
+        emission = {fuel: base['factors'][fuel] * self._factor(factors, 'emission_factor', fuel, size)[:, None]
+                    for fuel in self.variables.EMISSION_FUELS}
+        co2 = formulas.calculate_co2_emission(energy, coal_ratio, oil_ratio, gas_ratio,
+                                              emission['煤'], emission['油'], emission['气'])
+
+        # GDP指数：逐期累乘，超出增长率序列的年份为1
+        rates = self._scale(base['gdp_growth_rate'], factors, 'gdp_growth_rate', '')
+        rates = np.broadcast_to(rates, (size, len(base['gdp_growth_rate'])))
+        gdp_index = np.ones((size, num_years))
+        if rates.shape[1]:
+            gdp_index[:, :rates.shape[1]] = np.stack(
+                formulas.calculate_gdp_index(list(rates.T)), axis=1)
+        intensity = _safe_divide(co2, formulas.base_gdp * gdp_index)
+        shape = (size, num_years)
+        return {'energy_consumption': np.broadcast_to(energy, shape),
+                'co2_emission': np.broadcast_to(co2, shape),
+                'gdp_co2_intensity': intensity}
+
+    def _trajectory_results(self, factors: Dict[str, np.ndarray], size: int,
+                            power: Optional[Dict[str, Dict[str, np.ndarray]]]) -> np.ndarray:
+        t = {key: self._scale(values, factors, 'trajectory', key)
+             for key, values in self._trajectory.items()}
+        formulas = TrajectoryFormulas()
+        formulas.emission_factors = {
+            fuel: value * self._factor(factors, 'emission_factor', fuel, size)[:, None]
+            for fuel, value in self.trajectory.formulas.emission_factors.items()
+        }
+
+        # 电力部门各项按样本电力CO2与基准之比缩放（按年份对齐，基准为0或年份缺失时不缩放）
+        power_rows = {'power.coal': '来自煤炭', 'power.gas': '来自天然气',
+                      'power.fossil_ccs': '化石能源CCS', 'power.biomass_ccs': '生物质CCS'}
+        scaled = {key: t[key] for key in power_rows}
+        if power is not None and self.link_power:
+            power_years = self.years['power_co2']
+            index = [power_years.index(y) if y in power_years else None
+                     for y in self.years['net_ghg_emission']]
+            for key, item in power_rows.items():
+                ratio = np.ones((size, len(index)))
+                base, sampled = self._power_base[item], power['co2_emission'][item]
+                for j, i in enumerate(index):
+                    if i is not None and base[i] != 0:
+                        ratio[:, j] = sampled[:, i] / base[i]
+                scaled[key] = t[key] * ratio
+
+        industry = formulas.calculate_industry_emission(
+            t['industry.coal'], t['industry.oil'], t['industry.gas'],
+            t['industry.hydrogen'], t['industry.ccs'])
+        building = formulas.calculate_building_emission(
+            t['building.coal'], t['building.oil'], t['building.gas'])
+        transport = formulas.calculate_transport_emission(
+            t['transport.coal'], t['transport.oil'], t['transport.gas'])
+        power_emission = formulas.calculate_power_emission(
+            formulas.calculate_power_direct(scaled['power.coal'], scaled['power.gas']),
+            formulas.calculate_power_ccs(scaled['power.fossil_ccs'], scaled['power.biomass_ccs']))
+        other = formulas.calculate_other_emission(t['other.coal'], t['other.oil'], t['other.gas'])
+        energy_co2 = formulas.calculate_energy_related_co2(
+            industry, building, transport, power_emission, other, -t['ccs.daccs'])
+        total_co2 = formulas.calculate_total_co2(energy_co2, t['industry.process_co2'])
+        ghg = formulas.calculate_ghg_emission(total_co2, t['other.non_co2'])
+        net = formulas.calculate_net_ghg_emission(ghg, t['other.carbon_sink'])
+        return np.broadcast_to(net, (size, len(self.years['net_ghg_emission'])))
+
+    def evaluate(self, factors: Dict[str, np.ndarray], size: Optional[int] = None) -> Dict[str, np.ndarray]:
+        """
+        计算一批样本
+        Args:
+            factors: {参数名称: (S,) 倍数}，未给出的参数倍数为1
+            size: 样本数，为空时取 factors 中数组的长度
+        Returns:
+            {指标: (S, Y) 数组}，指标见 UncertaintyVariables.OUTPUTS（只含已加载的部分）
+        """
+        if size is None:
+            size = len(next(iter(factors.values()))) if factors else 1
+        factors = {name: np.asarray(value, dtype=float) for name, value in factors.items()}
+        outputs = {}
+        power = None
+        if self.power is not None:
+            power = self._power_results(factors, size)
+            outputs['power_co2'] = power['co2_emission']['净排放']
+            outputs['lcoe'] = power['lcoe']['LCOE']
+        if self.macro is not None:
+            outputs.update(self._macro_results(factors, size))
+        if self.trajectory is not None:
+            outputs['net_ghg_emission'] = self._trajectory_results(factors, size, power)
+        return {key: outputs[key] for key in self.variables.OUTPUTS if key in outputs}
+
+    def baseline(self) -> Dict[str, np.ndarray]:
+        """基准情景（全部倍数为1）的输出指标 {指标: (Y,)}"""
+        return {key: values[0] for key, values in self.evaluate({}, 1).items()}
+
+
+# 工作进程中的模型
+_worker_model: Optional[UncertaintyModel] = None
+
+
+def _init_worker(model: UncertaintyModel) -> None:
+    global _worker_model
+    _worker_model = model
+
+
+def evaluate_chunk(model: UncertaintyModel, parameters: List[UncertainParameter], seed: int,
+                   chunk: int, size: int) -> Tuple[Dict[str, np.ndarray], Dict[str, np.ndarray]]:
+    """抽取并计算一批样本，返回 (参数倍数, 输出指标)"""
+    formulas = UncertaintyFormulas()
+    factors = {p.name: formulas.sample(p.distribution, p.params, size,
+                                       formulas.generator(seed, p.name, chunk))
+               for p in parameters}
+    return factors, model.evaluate(factors, size)
+
+
+def _run_chunk(parameters: List[UncertainParameter], seed: int, chunk: int, size: int):
+    return evaluate_chunk(_worker_model, parameters, seed, chunk, size)
+
+
+def _run_batch(names: List[str], design: np.ndarray) -> Dict[str, np.ndarray]:
+    return _worker_model.evaluate({name: design[:, j] for j, name in enumerate(names)}, len(design))
+
+
+def evaluate_design(model: UncertaintyModel, names: List[str], design: np.ndarray,
+                    batch_size: int = 4096, workers: int = 1) -> Dict[str, np.ndarray]:
+    """
+    按行计算给定的参数倍数矩阵（如敏感性分析的抽样设计）
+    Args:
+        names: 参数名称，对应 design 的各列
+        design: (M, k) 参数倍数
+        batch_size: 每批行数
+        workers: 进程数，为1时在当前进程中计算
+    Returns:
+        {指标: (M, Y) 数组}
+    """
+    design = np.asarray(design, dtype=float)
+    batches = [design[start:start + batch_size] for start in range(0, len(design), batch_size)]
+    if workers <= 1 or len(batches) <= 1:
+        parts = [model.evaluate({name: batch[:, j] for j, name in enumerate(names)}, len(batch))
+                 for batch in batches]
+    else:
+        with ProcessPoolExecutor(max_workers=min(workers, len(batches)), initializer=_init_worker,
+                                 initargs=(model,)) as executor:
+            parts = list(executor.map(_run_batch, [names] * len(batches), batches))
+    return {key: np.concatenate([part[key] for part in parts]) for key in parts[0]}
+
+
+class UncertaintyAnalyzer:
+    """不确定性分析器"""
+
+    def __init__(self):
+        self.variables = UncertaintyVariables()
+        self.formulas = UncertaintyFormulas()
+        self.model: Optional[UncertaintyModel] = None
+        self.parameters: List[UncertainParameter] = []
+
+        # 最近一次计算的样本 {参数名称: (N,)} 和输出指标 {指标: (N, Y)}
+        self.samples: Dict[str, np.ndarray] = {}
+        self.outputs: Dict[str, np.ndarray] = {}
+
+    # ==================== 数据加载 ====================
+
+    def load_model(self, model: UncertaintyModel) -> None:
+        self.model = model
+
+    def load_from_config(self, config: Dict[str, Any], store=None) -> None:
+        """按配置加载基准情景（见 UncertaintyModel.from_config）"""
+        self.model = UncertaintyModel.from_config(config, store)
+
+    def load_parameters(self, parameters: List[Dict[str, Any]]) -> None:
+        """加载不确定参数 [{'name': ..., 'distribution': ..., 'params': [...]}]"""
+        self.parameters = [UncertainParameter.from_dict(p) for p in parameters]
+
+    def load_parameters_from_json(self, filepath: str) -> None:
+        """从JSON文件加载不确定参数（参数列表，或 {"parameters": [...]}）"""
+        with open(filepath, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        self.load_parameters(data['parameters'] if isinstance(data, dict) else data)
+
+    # ==================== 计算 ====================
+
+    def calculate(self, samples: int = None, seed: int = None, workers: int = 1,
+                  percentiles: List[float] = None, chunk_size: int = None) -> Dict[str, Any]:
+        """
+        执行蒙特卡洛计算
+        Args:
+            samples: 样本数
+            seed: 随机种子
+            workers: 进程数，为1时在当前进程中计算
+            percentiles: 输出的分位数（%）
+            chunk_size: 每批样本数
+        """
+        if self.model is None:
+            raise ValueError("尚未加载基准情景")
+        if not self.parameters:
+            self.load_parameters(self.variables.DEFAULT_PARAMETERS)
+        self.model.check_parameters(self.parameters)
+
+        samples = samples or self.variables.DEFAULT_SAMPLES
+        seed = self.variables.DEFAULT_SEED if seed is None else seed
+        percentiles = list(percentiles or self.variables.PERCENTILES)
+        chunk_size = chunk_size or self.variables.CHUNK_SIZE
+        chunks = [(k, min(chunk_size, samples - start))
+                  for k, start in enumerate(range(0, samples, chunk_size))]
+
+        if workers <= 1 or len(chunks) <= 1:
+            parts = [evaluate_chunk(self.model, self.parameters, seed, k, size) for k, size in chunks]
+        else:
+            with ProcessPoolExecutor(max_workers=min(workers, len(chunks)), initializer=_init_worker,
+                                     initargs=(self.model,)) as executor:
+                parts = list(executor.map(_run_chunk, *zip(*[
+                    (self.parameters, seed, k, size) for k, size in chunks])))
+
+        self.samples = {p.name: np.concatenate([part[0][p.name] for part in parts])
+                        for p in self.parameters}
+        self.outputs = {key: np.concatenate([part[1][key] for part in parts])
+                        for key in parts[0][1]}
+
+        baseline = self.model.baseline()
+        results = {
+            'samples': samples, 'seed': seed, 'chunk_size': chunk_size,
+            'percentiles': percentiles,
+            'parameters': [p.to_dict() for p in self.parameters],
+            'outputs': {},
+        }
+        for key, values in self.outputs.items():
+            bands = {'基准': baseline[key], **self.formulas.percentile_bands(values, percentiles)}
+            results['outputs'][key] = {'years': self.model.years[key],
+                                       **{k: [round(v, 4) for v in band.tolist()]
+                                          for k, band in bands.items()}}
+
+        if 'net_ghg_emission' in self.outputs:
+            years = self.model.years['net_ghg_emission']
+            index = self.formulas.neutral_year_index(self.outputs['net_ghg_emission'])
+            base_index = self.formulas.neutral_year_index(baseline['net_ghg_emission'][None, :])[0]
+            probability = self.formulas.neutral_probability(index, len(years))
+            results['neutrality'] = {
+                'years': years,
+                'probability': [round(v, 4) for v in probability.tolist()],
+                '基准': years[base_index] if base_index < len(years) else None,
+                **self.formulas.neutral_year_percentiles(index, years, percentiles),
+                '未中和比例': round(float(np.mean(index == len(years))), 4),
+            }
+        return results
+
+    # ==================== 输出 ====================
+
+    def build_table(self, results: dict, precise: bool = False) -> Tuple[List[str], List[list]]:
+        """
+        构建输出表，返回 (表头, 数据行)
+        precise=True 时数值保留完整精度，否则格式化为导出CSV的字符串
+        """
+        fmt = (lambda value, spec: value) if precise else format
+        years = []
+        for section in list(results['outputs'].values()) + [results.get('neutrality', {})]:
+            years += [y for y in section.get('years', []) if y not in years]
+        headers = ['项目'] + years
+
+        def row(label, section_years, values, spec='.4f'):
+            by_year = dict(zip(section_years, values))
+            return [label] + [fmt(by_year[y], spec) if y in by_year else '' for y in years]
+
+        rows = []
+        for key, section in results['outputs'].items():
+            rows.append([self.variables.OUTPUTS[key]] + [''] * len(years))
+            for label, values in section.items():
+                if label != 'years':
+                    rows.append(row(label, section['years'], values))
+            rows.append([''] * (len(years) + 1))
+
+        neutrality = results.get('neutrality')
+        if neutrality:
+            rows.append(['碳中和年份（温室气体净排放）'] + [''] * len(years))
+            rows.append(row('累计中和概率', neutrality['years'], neutrality['probability']))
+            for label, value in neutrality.items():
+                if label not in ('years', 'probability'):
+                    rows.append([label, '' if value is None else value] + [''] * (len(years) - 1))
+            rows.append([''] * (len(years) + 1))
+
+        rows.append(['不确定参数', '分布', '参数'] + [''] * (len(years) - 2))
+        for p in results['parameters']:
+            rows.append([p['name'], p['distribution'], ' '.join(f"{v:g}" for v in p['params'])]
+                        + [''] * (len(years) - 2))
+        rows.append([f"样本数 {results['samples']}，随机种子 {results['seed']}，"
+                     f"每批 {results['chunk_size']}"] + [''] * len(years))
+        return headers, rows
+
+    def export_to_csv(self, results: dict, filepath: str) -> None:
+        """导出结果到CSV"""
+        if os.path.dirname(filepath):
+            os.makedirs(os.path.dirname(filepath), exist_ok=True)
+        headers, rows = self.build_table(results)
+        with open(filepath, 'w', newline='', encoding='utf-8-sig') as f:
+            writer = csv.writer(f)
+            writer.writerow(headers)
+            writer.writerows(rows)
+        print(f"结果已导出到: {filepath}")
+
+    def print_results(self, results: dict) -> None:
+        """打印结果"""
+        print("\n" + "=" * 70)
+        print(f"不确定性分析结果（蒙特卡洛，样本数 {results['samples']}，随机种子 {results['seed']}）")
+        print("=" * 70)
+
+        print("\n【不确定参数（相对基准值的倍数）】")
+        for p in results['parameters']:
+            print(f"  {p['name']:<28}{p['distribution']:<12}{', '.join(f'{v:g}' for v in p['params'])}")
+
+        labels = ['基准'] + [f"P{p:g}" for p in results['percentiles']]
+        for key, section in results['outputs'].items():
+            print(f"\n【{self.variables.OUTPUTS[key]}】")
+            print(f"  {'':<8}" + ''.join(f"{y:>10}" for y in section['years']))
+            for label in labels:
+                print(f"  {label:<8}" + ''.join(f"{v:>10.4f}" for v in section[label]))
+
+        neutrality = results.get('neutrality')
+        if neutrality:
+            print("\n【碳中和年份（温室气体净排放）】")
+            print(f"  基准: {neutrality['基准'] or '未中和'}   " + '   '.join(
+                f"{label}: {neutrality[label] or '未中和'}" for label in labels[1:]))
+            print(f"  {'累计中和概率':<8}" + ''.join(
+                f"{y}:{v:>6.1%}  " for y, v in zip(neutrality['years'], neutrality['probability'])))
+            print(f"  期末仍未中和的样本比例: {neutrality['未中和比例']:.1%}")
@@ -0,0 +1,86 @@
+# -*- coding: utf-8 -*-
+"""不确定性分析计算公式定义
+
+抽样、分位数和中和年份统计，均在 样本 × 年份 数组上整体计算。
+"""
+
+import hashlib
+from typing import List, Dict, Sequence
+
+import numpy as np
+
+
+class UncertaintyFormulas:
+    """不确定性分析计算公式"""
+
+    # ==================== 随机数流 ====================
+
+    @staticmethod
+    def stream_key(name: str) -> int:
+        """参数名称对应的随机数流编号（与参数顺序无关，增删其他参数不影响该参数的样本）"""
+        return int.from_bytes(hashlib.sha256(name.encode('utf-8')).digest()[:8], 'little')
+
+    def generator(self, seed: int, name: str, chunk: int) -> np.random.Generator:
+        """
+        (种子, 参数, 批次) 对应的独立随机数生成器
+        公式: SeedSequence(entropy=种子, spawn_key=(参数流编号, 批次序号))
+        """
+        sequence = np.random.SeedSequence(entropy=seed, spawn_key=(self.stream_key(name), chunk))
+        return np.random.default_rng(sequence)
+
+    @staticmethod
+    def sample(distribution: str, params: Sequence[float], size: int,
+               rng: np.random.Generator) -> np.ndarray:
+        """按分布抽样，返回 (size,) 数组"""
+        if distribution == 'fixed':
+            return np.full(size, float(params[0]))
+        if distribution == 'uniform':
+            return rng.uniform(params[0], params[1], size)
+        if distribution == 'normal':
+            return rng.normal(params[0], params[1], size)
+        if distribution == 'lognormal':
+            return rng.lognormal(params[0], params[1], size)
+        if distribution == 'triangular':
+            left, mode, right = params
+            if left == right:
+                return np.full(size, float(mode))
+            return rng.triangular(left, mode, right, size)
+        raise ValueError(f"未知的分布: {distribution}")
+
+    # ==================== 统计量 ====================
+
+    @staticmethod
+    def percentile_bands(values: np.ndarray, percentiles: Sequence[float]) -> Dict[str, np.ndarray]:
+        """
+        沿样本维（首维）计算分位数和均值
+        Returns:
+            {'P5': (Y,), ..., '均值': (Y,)}
+        """
+        bands = {f"P{p:g}": np.percentile(values, p, axis=0) for p in percentiles}
+        bands['均值'] = values.mean(axis=0)
+        return bands
+
+    @staticmethod
+    def neutral_year_index(values: np.ndarray) -> np.ndarray:
+        """
+        各样本首个排放 <= 0 的年份序号，未中和为年份数
+        与 TrajectoryAnalyzer._find_neutral_year 逐样本一致
+        """
+        reached = values <= 0
+        return np.where(reached.any(axis=1), reached.argmax(axis=1), values.shape[1])
+
+    @staticmethod
+    def neutral_probability(index: np.ndarray, num_years: int) -> np.ndarray:
+        """各年份前（含当年）已实现中和的样本比例 (Y,)"""
+        counts = np.bincount(index, minlength=num_years + 1)[:num_years]
+        return np.cumsum(counts) / max(len(index), 1)
+
+    @staticmethod
+    def neutral_year_percentiles(index: np.ndarray, years: List[str],
+                                 percentiles: Sequence[float]) -> Dict[str, str]:
+        """中和年份的分位数（取样本中实际出现的年份），未中和记为空"""
+        result = {}
+        for p in percentiles:
+            i = int(np.percentile(index, p, method='inverted_cdf')) if len(index) else len(years)
+            result[f"P{p:g}"] = years[i] if i < len(years) else None
+        return result
@@ -0,0 +1,88 @@
+# -*- coding: utf-8 -*-
+"""不确定性分析变量定义"""
+
+from dataclasses import dataclass, field
+from typing import List, Dict, Any
+
+
+@dataclass
+class UncertaintyVariables:
+    """不确定性分析变量定义"""
+
+    # ==================== 不确定参数 ====================
+    # 参数名称为 "目标" 或 "目标.类型"，抽样值为相对基准值的倍数
+    # 如 'capacity_cost' 对全部装机成本类型取同一倍数，'capacity_cost.光伏(集中)' 只作用于该类型
+    TARGETS: Dict[str, str] = field(default_factory=lambda: {
+        # 宏观测算参考、碳排放轨迹和电力CO2共用，类型: 煤/油/气
+        'emission_factor': '排放因子',
+        # 宏观测算参考
+        'gdp_growth_rate': 'GDP年增长率',
+        'coal_consumption': '煤炭消费',               # 类型: 部门
+        'oil_consumption': '石油消费',                # 类型: 部门
+        'gas_consumption': '天然气消费',              # 类型: 部门
+        'non_fossil_consumption': '非化石能源',       # 类型: 工业-生物质、电力-水能等
+        # 电力（PowerArrays 字段，类型: 该字段的技术类型）
+        'generation': '发电量',
+        'utilization_hours': '利用小时数',
+        'storage': '储能装机',
+        'capacity_cost': '装机成本',
+        'om_ratio': '运维成本占比',
+        'fuel_cost': '燃料成本',
+        'fuel_rate': '燃料消耗率',
+        'equipment_lifetime': '设备寿命',             # 类型: 装机成本类型，年金系数随之重算
+        'ccs_capture_rate': 'CCS捕集率',              # 以下比例抽样后截断到 [0, 1]
+        'offshore_wind_ratio': '海上风电占比',
+        'distributed_solar_ratio': '分布式光伏占比',
+        'cross_region_capacity': '跨区传输',
+        # 碳排放轨迹输入行，类型: 部分.项目，如 'trajectory.other.carbon_sink'
+        'trajectory': '碳排放轨迹输入',
+    })
+
+    # 排放因子类型
+    EMISSION_FUELS: List[str] = field(default_factory=lambda: ['煤', '油', '气'])
+
+    # ==================== 概率分布 ====================
+    # 分布名称 -> 参数
+    DISTRIBUTIONS: Dict[str, List[str]] = field(default_factory=lambda: {
+        'fixed': ['value'],
+        'uniform': ['low', 'high'],
+        'normal': ['mean', 'std'],
+        'lognormal': ['mu', 'sigma'],               # 倍数 = exp(N(mu, sigma))
+        'triangular': ['left', 'mode', 'right'],
+    })
+
+    # 默认不确定参数（未指定参数文件时使用）
+    DEFAULT_PARAMETERS: List[Dict[str, Any]] = field(default_factory=lambda: [
+        {'name': 'emission_factor.煤', 'distribution': 'normal', 'params': [1.0, 0.03]},
+        {'name': 'emission_factor.油', 'distribution': 'normal', 'params': [1.0, 0.03]},
+        {'name': 'emission_factor.气', 'distribution': 'normal', 'params': [1.0, 0.03]},
+        {'name': 'gdp_growth_rate', 'distribution': 'triangular', 'params': [0.8, 1.0, 1.15]},
+        {'name': 'utilization_hours', 'distribution': 'uniform', 'params': [0.9, 1.1]},
+        {'name': 'capacity_cost', 'distribution': 'lognormal', 'params': [0.0, 0.15]},
+        {'name': 'fuel_cost', 'distribution': 'lognormal', 'params': [0.0, 0.2]},
+        {'name': 'ccs_capture_rate', 'distribution': 'uniform', 'params': [0.9, 1.05]},
+    ])
+
+    # ==================== 抽样 ====================
+    # 默认样本数
+    DEFAULT_SAMPLES: int = 10000
+
+    # 默认随机种子
+    DEFAULT_SEED: int = 20240101
+
+    # 每批样本数（随机数流按 (种子, 参数, 批次) 划分，结果与进程数无关）
+    CHUNK_SIZE: int = 1000
+
+    # 默认分位数（%）
+    PERCENTILES: List[float] = field(default_factory=lambda: [5, 50, 95])
+
+    # ==================== 输出指标 ====================
+    # 指标 -> 中文名称
+    OUTPUTS: Dict[str, str] = field(default_factory=lambda: {
+        'net_ghg_emission': '温室气体净排放(亿吨CO2当量)',
+        'energy_consumption': '能源消费量',
+        'co2_emission': 'CO2排放量',
+        'gdp_co2_intensity': 'GDP的CO2强度',
+        'power_co2': '电力净排放(亿吨CO2)',
+        'lcoe': 'LCOE(元/kWh)',
+    })
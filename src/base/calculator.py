@@ -5,6 +5,7 @@ from abc import ABC, abstractmethod
 from typing import Dict, Any
 import pandas as pd
 import json
+from ..utils import IOHandler
 
 
 class BaseCalculator(ABC):
@@ -16,7 +17,7 @@ class BaseCalculator(ABC):
     
     def load_from_csv(self, filepath: str) -> None:
         """从CSV文件加载数据"""
-        df = pd.read_csv(filepath, encoding='utf-8')
+        df = IOHandler.read_csv(filepath)
         self._parse_dataframe(df)
     
     def load_from_json(self, filepath: str) -> None:
@@ -0,0 +1,36 @@
+# -*- coding: utf-8 -*-
+"""批量情景计算 - 在进程池中运行多个情景的完整计算链"""
+
+from .scenarios import (ScenarioSpec, load_scenarios, scenario_config, merge_config,
+                        DEFAULT_OUTPUT_ROOT)
+from .shared import SharedInputs, SharedTableMeta, shared_input_files
+from .journal import BatchJournal, ScenarioState, config_key
+from .runner import BatchRunner, ScenarioResult, run_scenario
+from .jobs import (JobQueue, Job, JobWorkerPool, default_priority, job_output_dir,
+                   DEFAULT_QUEUE_DB, DEFAULT_QUEUE_ROOT,
+                   JOB_QUEUED, JOB_RUNNING, JOB_DONE, JOB_FAILED, JOB_CANCELLED)
+from .shards import (shard_of, shard_scenarios, parse_shard, run_shard, merge_results,
+                     flatten_results)
+from .overrides import InputOverrides, ScenarioEvaluator, apply_override, input_paths
+from .design import (DesignParameter, DesignPoint, DesignRunner, generate_design, unit_design,
+                     load_design_parameters, save_design, load_design, DESIGN_METHODS)
+from .goal_seek import (GoalSeeker, GoalTarget, GoalLever, GoalSeekResult, load_goal_problem,
+                        SOLVE_METHODS, TARGET_TYPES)
+from .surrogate import (SurrogateModel, train_surrogate, surrogate_path, export_report, print_report,
+                        SURROGATE_OUTPUTS)
+
+__all__ = ['ScenarioSpec', 'load_scenarios', 'scenario_config', 'merge_config',
+           'DEFAULT_OUTPUT_ROOT', 'BatchRunner', 'ScenarioResult', 'run_scenario',
+           'SharedInputs', 'SharedTableMeta', 'shared_input_files',
+           'shard_of', 'shard_scenarios', 'parse_shard', 'run_shard', 'merge_results',
+           'flatten_results', 'BatchJournal', 'ScenarioState', 'config_key',
+           'JobQueue', 'Job', 'JobWorkerPool', 'default_priority', 'job_output_dir',
+           'DEFAULT_QUEUE_DB', 'DEFAULT_QUEUE_ROOT',
+           'JOB_QUEUED', 'JOB_RUNNING', 'JOB_DONE', 'JOB_FAILED', 'JOB_CANCELLED',
+           'InputOverrides', 'ScenarioEvaluator', 'apply_override', 'input_paths',
+           'DesignParameter', 'DesignPoint', 'DesignRunner', 'generate_design', 'unit_design',
+           'load_design_parameters', 'save_design', 'load_design', 'DESIGN_METHODS',
+           'GoalSeeker', 'GoalTarget', 'GoalLever', 'GoalSeekResult', 'load_goal_problem',
+           'SOLVE_METHODS', 'TARGET_TYPES',
+           'SurrogateModel', 'train_surrogate', 'surrogate_path', 'export_report', 'print_report',
+           'SURROGATE_OUTPUTS']
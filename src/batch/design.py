@@ -0,0 +1,298 @@
+# -*- coding: utf-8 -*-
+"""实验设计（拉丁超立方、Sobol序列、全因子）
+
+在声明的参数范围内生成设计点，每个设计点是一组输入覆盖项（见 overrides.py），
+由 ScenarioEvaluator 直接作用于内存中已解析的输入数据，不写任何输入CSV：
+
+设计文件（JSON）格式:
+{
+  "method": "lhs",                          lhs / sobol / factorial（可由命令行覆盖）
+  "samples": 1000,                          设计点数（全因子设计由各参数水平数决定）
+  "parameters": [
+    {"name": "power.capacity_cost.光伏(集中)", "range": [0.7, 1.1]},             倍数（默认）
+    {"name": "trajectory.other.carbon_sink", "range": [-15, -8], "mode": "value"},  直接取值
+    {"name": "macro.input_data.gdp_growth_rate", "range": [0.9, 1.1], "levels": 5}
+  ]
+}
+生成的设计点可保存为情景定义 {"parameters": [...], "points": [{"name", "scale", "values"}]}。
+Sobol 序列需要 scipy（scipy.stats.qmc）。
+"""
+
+import csv
+import itertools
+import json
+import os
+import warnings
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Dict, Any, List, Optional, Tuple
+
+import numpy as np
+
+try:
+    from scipy.stats import qmc
+except ImportError:  # pragma: no cover - 可选依赖
+    qmc = None
+
+from ..utils import KEY_INDICATORS, indicator_values
+from .overrides import InputOverrides, ScenarioEvaluator, split_path
+
+
+# 设计方法
+DESIGN_METHODS = {'lhs': '拉丁超立方', 'sobol': 'Sobol序列', 'factorial': '全因子'}
+
+# 覆盖方式
+DESIGN_MODES = {'scale': '倍数', 'value': '取值'}
+
+# 默认输出指标 (名称, 阶段, 结果中的路径)
+DEFAULT_OUTPUTS = KEY_INDICATORS + [
+    ('CO2排放量', 'macro', ('co2_indicators', 'CO2排放量')),
+]
+
+# 每个任务计算的设计点数
+BATCH_SIZE = 256
+
+
+@dataclass
+class DesignParameter:
+    """设计参数"""
+    # 输入路径
+    name: str
+    low: float
+    high: float
+    # scale: 相对基础情景的倍数；value: 直接取值
+    mode: str = 'scale'
+    # 全因子设计的水平数（含上下限）
+    levels: int = 3
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'DesignParameter':
+        missing = [key for key in ('name', 'range') if key not in data]
+        if missing:
+            raise ValueError(f"设计参数缺少字段: {', '.join(missing)}")
+        low, high = (float(v) for v in data['range'])
+        parameter = cls(str(data['name']), low, high, data.get('mode', 'scale'),
+                        int(data.get('levels', 3)))
+        if parameter.mode not in DESIGN_MODES:
+            raise ValueError(f"{parameter.name}: 未知的覆盖方式 {parameter.mode}")
+        if parameter.low > parameter.high:
+            raise ValueError(f"{parameter.name}: 范围下限大于上限")
+        if parameter.levels < 1:
+            raise ValueError(f"{parameter.name}: 水平数应不小于1")
+        split_path(parameter.name)
+        return parameter
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {'name': self.name, 'range': [self.low, self.high],
+                'mode': self.mode, 'levels': self.levels}
+
+
+@dataclass
+class DesignPoint:
+    """设计点（情景定义）"""
+    name: str
+    overrides: InputOverrides = field(default_factory=InputOverrides)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'DesignPoint':
+        return cls(str(data['name']), InputOverrides.from_dict(data))
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {'name': self.name, **self.overrides.to_dict()}
+
+
+# ==================== 设计生成 ====================
+
+def unit_design(method: str, samples: int, num_parameters: int, seed: Optional[int] = None,
+                levels: List[int] = None) -> np.ndarray:
+    """
+    单位超立方体上的设计 (点数, 参数数)
+    - lhs: 每个参数的 [0, 1] 等分为 samples 段，每段恰有一个点，段内随机、各参数独立随机排列
+    - sobol: 加扰 Sobol 序列（点数为2的幂时均衡性最好）
+    - factorial: 各参数 levels 个等距水平的全部组合（samples 不使用，单水平取中点）
+    """
+    if method == 'lhs':
+        rng = np.random.default_rng(seed)
+        strata = rng.permuted(np.tile(np.arange(samples), (num_parameters, 1)), axis=1).T
+        return (strata + rng.random((samples, num_parameters))) / samples
+    if method == 'sobol':
+        if qmc is None:
+            raise ImportError("Sobol序列需要 scipy，请先安装: pip install scipy")
+        sampler = qmc.Sobol(d=num_parameters, scramble=True, seed=seed)
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore', UserWarning)
+            return sampler.random(samples)
+    if method == 'factorial':
+        axes = [np.linspace(0.0, 1.0, n) if n > 1 else np.array([0.5]) for n in levels]
+        return np.array(list(itertools.product(*axes)), dtype=float).reshape(-1, num_parameters)
+    raise ValueError(f"未知的设计方法: {method}")
+
+
+def generate_design(parameters: List[DesignParameter], method: str = 'lhs', samples: int = 100,
+                    seed: Optional[int] = None, prefix: str = 'd') -> List[DesignPoint]:
+    """生成设计点，名称为 {prefix}{序号}"""
+    if not parameters:
+        raise ValueError("没有设计参数")
+    names = [p.name for p in parameters]
+    duplicates = sorted({name for name in names if names.count(name) > 1})
+    if duplicates:
+        raise ValueError(f"设计参数重复: {', '.join(duplicates)}")
+
+    unit = unit_design(method, samples, len(parameters), seed, [p.levels for p in parameters])
+    low = np.array([p.low for p in parameters])
+    high = np.array([p.high for p in parameters])
+    values = low + unit * (high - low)
+
+    width = len(str(len(values)))
+    points = []
+    for i, row in enumerate(values.tolist()):
+        overrides = InputOverrides()
+        for parameter, value in zip(parameters, row):
+            target = overrides.scale if parameter.mode == 'scale' else overrides.values
+            target[parameter.name] = value
+        points.append(DesignPoint(f"{prefix}{i + 1:0{width}d}", overrides))
+    return points
+
+
+def load_design_parameters(filepath: str) -> Tuple[List[DesignParameter], Dict[str, Any]]:
+    """读取设计文件，返回 (设计参数, 文件级设置 {'method': ..., 'samples': ..., 'seed': ...})"""
+    with open(filepath, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    if isinstance(data, list):
+        data = {'parameters': data}
+    parameters = [DesignParameter.from_dict(item) for item in data.get('parameters', [])]
+    return parameters, {k: v for k, v in data.items() if k != 'parameters'}
+
+
+def save_design(points: List[DesignPoint], filepath: str,
+                parameters: List[DesignParameter] = None) -> None:
+    """保存设计点（情景定义）"""
+    if os.path.dirname(filepath):
+        os.makedirs(os.path.dirname(filepath), exist_ok=True)
+    data = {'parameters': [p.to_dict() for p in parameters or []],
+            'points': [point.to_dict() for point in points]}
+    with open(filepath, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, indent=1)
+    print(f"设计点已保存到: {filepath}")
+
+
+def load_design(filepath: str) -> List[DesignPoint]:
+    """读取 save_design 保存的设计点"""
+    with open(filepath, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    return [DesignPoint.from_dict(item) for item in data.get('points', [])]
+
+
+# ==================== 设计计算 ====================
+
+# 工作进程中的求值器
+_worker_evaluator: Optional[ScenarioEvaluator] = None
+
+
+def _init_worker(evaluator: ScenarioEvaluator) -> None:
+    """工作进程初始化：接收主进程已解析的输入（工作进程不读取输入文件）"""
+    global _worker_evaluator
+    _worker_evaluator = evaluator
+
+
+def _evaluate_points(evaluator: ScenarioEvaluator, batch: List[Dict[str, Any]],
+                     outputs: List[Tuple[str, str, tuple]]) -> List[Dict[str, Any]]:
+    targets = {stage for _, stage, _ in outputs}
+    rows = []
+    for item in batch:
+        try:
+            results = evaluator.evaluate(InputOverrides.from_dict(item), targets)
+            rows.append({'outputs': indicator_values(results, outputs), 'error': ''})
+        except Exception as e:
+            rows.append({'outputs': {}, 'error': f"{type(e).__name__}: {e}"})
+    return rows
+
+
+def _run_batch(batch: List[Dict[str, Any]], outputs: List[Tuple[str, str, tuple]]):
+    return _evaluate_points(_worker_evaluator, batch, outputs)
+
+
+class DesignRunner:
+    """设计点批量计算（输入只解析一次，各设计点在内存中覆盖输入）"""
+
+    def __init__(self, evaluator: ScenarioEvaluator,
+                 outputs: List[Tuple[str, str, tuple]] = None):
+        self.evaluator = evaluator
+        self.outputs = [o for o in (outputs or DEFAULT_OUTPUTS) if o[1] in evaluator.stages]
+
+    def run(self, points: List[DesignPoint], workers: int = 1,
+            batch_size: int = BATCH_SIZE) -> Dict[str, Dict[str, Any]]:
+        """
+        计算全部设计点
+        Returns:
+            {设计点名称: {'outputs': {指标: {年份: 数值}}, 'error': 错误信息}}
+        """
+        if points:
+            self.evaluator.check(points[0].overrides)
+        items = [point.overrides.to_dict() for point in points]
+        batches = [items[i:i + batch_size] for i in range(0, len(items), batch_size)]
+
+        rows = []
+        if workers <= 1 or len(batches) <= 1:
+            for batch in batches:
+                rows += _evaluate_points(self.evaluator, batch, self.outputs)
+        else:
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                     initargs=(self.evaluator,)) as executor:
+                for batch_rows in executor.map(_run_batch, batches,
+                                               itertools.repeat(self.outputs)):
+                    rows += batch_rows
+        return {point.name: row for point, row in zip(points, rows)}
+
+    def build_table(self, points: List[DesignPoint], results: Dict[str, Dict[str, Any]],
+                    years: List[str] = None) -> Tuple[List[str], List[list]]:
+        """构建输出表：每个设计点一行，列为覆盖项和 指标-年份"""
+        paths = []
+        for point in points:
+            paths += [p for p in point.overrides.paths() if p not in paths]
+        columns = []
+        for label, _, _ in self.outputs:
+            for row in results.values():
+                if label in row['outputs']:
+                    columns += [(label, y) for y in row['outputs'][label] if years is None or y in years]
+                    break
+        headers = ['名称'] + paths + [f"{label}-{year}" for label, year in columns] + ['错误']
+
+        table = []
+        for point in points:
+            row = results[point.name]
+            settings = {**point.overrides.scale, **point.overrides.values}
+            table.append([point.name] + [format(settings[p], '.6g') if p in settings else ''
+                                         for p in paths]
+                         + [format(row['outputs'][label][year], '.4f')
+                            if year in row['outputs'].get(label, {}) else ''
+                            for label, year in columns]
+                         + [row['error']])
+        return headers, table
+
+    def export_to_csv(self, points: List[DesignPoint], results: Dict[str, Dict[str, Any]],
+                      filepath: str, years: List[str] = None) -> None:
+        """导出结果到CSV"""
+        if os.path.dirname(filepath):
+            os.makedirs(os.path.dirname(filepath), exist_ok=True)
+        headers, rows = self.build_table(points, results, years)
+        with open(filepath, 'w', newline='', encoding='utf-8-sig') as f:
+            writer = csv.writer(f)
+            writer.writerow(headers)
+            writer.writerows(rows)
+        print(f"结果已导出到: {filepath}")
+
+    def print_summary(self, results: Dict[str, Dict[str, Any]], seconds: float) -> None:
+        """打印计算耗时和各指标最后一年的范围"""
+        failed = [name for name, row in results.items() if row['error']]
+        print(f"\n完成 {len(results) - len(failed)}/{len(results)} 个设计点，耗时 {seconds:.2f}s"
+              f"（{seconds / max(len(results), 1) * 1000:.2f} ms/点）")
+        for name in failed[:5]:
+            print(f"  失败 {name}: {results[name]['error']}")
+        for label, _, _ in self.outputs:
+            last = [list(row['outputs'][label].items())[-1] for row in results.values()
+                    if row['outputs'].get(label)]
+            if last:
+                values = np.array([value for _, value in last])
+                print(f"  {label}（{last[0][0]}年）: 最小 {values.min():.4f}  中位 "
+                      f"{np.median(values):.4f}  最大 {values.max():.4f}")
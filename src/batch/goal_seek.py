@@ -0,0 +1,379 @@
+# -*- coding: utf-8 -*-
+"""目标求解（单变量求解）
+
+给定目标输出（如碳中和年份为2060年、2030年相对下降比例达到政策目标）和可调输入（杠杆），
+用区间求根（Illinois 试位法）或 Newton 迭代（有限差分雅可比）求出所需的输入值。
+每次迭代由 ScenarioEvaluator 在内存中覆盖输入，只重算杠杆所在阶段到目标阶段之间受影响的阶段。
+
+问题文件（JSON）格式:
+{
+  "method": "auto",                     auto / bracket / newton（auto: 单目标单杠杆用 bracket，否则 newton）
+  "targets": [
+    {"type": "neutral_year", "year": "2060"},                       温室气体净排放首次 <= 0 的年份
+    {"type": "decline_ratio", "year": "2030", "value": 0.1},         (基准 - 该年值) / 基准
+    {"type": "value", "output": "macro.co2_indicators.CO2排放量", "year": "2030", "value": 100}
+  ],
+  "levers": [
+    {"name": "trajectory.other.carbon_sink", "range": [0.5, 2.0]},               倍数（默认）
+    {"name": "power.ccs_capture_rate", "range": [0.8, 0.99], "mode": "value"}    直接取值
+  ]
+}
+目标输出为 "阶段.结果键[.子键]"，neutral_year 默认为 trajectory.summary.net_ghg_emission，
+decline_ratio 默认为 trajectory.summary.energy_co2（能源相关CO2），基准默认 110
+（同情景数据一览表 calculate_2030_decline_ratio）。
+"""
+
+import json
+import time
+from dataclasses import dataclass, field
+from typing import Dict, Any, List, Optional, Tuple
+
+import numpy as np
+
+from ..analysis.scenario_summary.formulas import ScenarioSummaryFormulas
+from .overrides import InputOverrides, ScenarioEvaluator, split_path
+
+
+# 目标类型
+TARGET_TYPES = {'value': '指标取值', 'neutral_year': '碳中和年份', 'decline_ratio': '相对下降比例'}
+
+# 求解方法
+SOLVE_METHODS = {'auto': '自动', 'bracket': '区间求根', 'newton': 'Newton迭代'}
+
+# 各目标类型的默认输出
+DEFAULT_TARGET_OUTPUTS = {
+    'neutral_year': 'trajectory.summary.net_ghg_emission',
+    'decline_ratio': 'trajectory.summary.energy_co2',
+}
+
+# 默认残差容差（结果字典按4位小数取整）
+DEFAULT_TOLERANCE = 1e-4
+
+# 默认最大迭代次数
+MAX_ITERATIONS = 60
+
+# Newton 迭代有限差分步长（杠杆范围的比例）
+DIFFERENCE_STEP = 1e-3
+
+# Newton 步长不能减小残差时依次尝试的 Levenberg-Marquardt 阻尼系数
+DAMPING_LEVELS = (0.0, 1e-3, 1e-2, 0.1, 1.0, 10.0, 100.0, 1e3, 1e4)
+
+
+def output_series(results: Dict[str, Dict[str, Any]], output: str) -> Tuple[List[str], List[float]]:
+    """情景结果中输出序列的 (年份, 数值)"""
+    stage, parts = split_path(output)
+    item = results.get(stage)
+    if item is None:
+        raise ValueError(f"阶段未启用: {output}")
+    years = [str(y) for y in item.get('years', [])]
+    for key in parts:
+        item = item.get(key) if isinstance(item, dict) else None
+    if not isinstance(item, list):
+        raise ValueError(f"结果中没有该输出序列: {output}")
+    return years, [float(v) for v in item]
+
+
+@dataclass
+class GoalTarget:
+    """求解目标"""
+    type: str
+    year: str
+    # 目标值（neutral_year 为 0：该年净排放降到 0）
+    value: float = 0.0
+    output: str = ''
+    # decline_ratio 的基准
+    baseline: float = 110.0
+    # 残差容差
+    tolerance: float = DEFAULT_TOLERANCE
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'GoalTarget':
+        kind = data.get('type', 'value')
+        if kind not in TARGET_TYPES:
+            raise ValueError(f"未知的目标类型: {kind}")
+        if 'year' not in data:
+            raise ValueError("求解目标缺少字段: year")
+        if kind != 'neutral_year' and 'value' not in data:
+            raise ValueError("求解目标缺少字段: value")
+        output = data.get('output') or DEFAULT_TARGET_OUTPUTS.get(kind)
+        if not output:
+            raise ValueError("求解目标缺少字段: output")
+        split_path(output)
+        return cls(kind, str(data['year']), float(data.get('value', 0.0)), output,
+                   float(data.get('baseline', 110.0)),
+                   float(data.get('tolerance', DEFAULT_TOLERANCE)))
+
+    @property
+    def stage(self) -> str:
+        return split_path(self.output)[0]
+
+    @property
+    def label(self) -> str:
+        if self.type == 'neutral_year':
+            return f"{TARGET_TYPES[self.type]} = {self.year}"
+        return f"{self.output} {self.year}年{TARGET_TYPES[self.type]} = {self.value:g}"
+
+    def measure(self, results: Dict[str, Dict[str, Any]]) -> float:
+        """目标年份的指标值（decline_ratio 为下降比例）"""
+        years, values = output_series(results, self.output)
+        if self.year not in years:
+            raise ValueError(f"{self.output} 中没有年份 {self.year}")
+        value = values[years.index(self.year)]
+        if self.type == 'decline_ratio':
+            return ScenarioSummaryFormulas().calculate_2030_decline_ratio(value, self.baseline)
+        return value
+
+    def residual(self, results: Dict[str, Dict[str, Any]]) -> float:
+        """残差；neutral_year 以 -tolerance 为目标，残差在容差内时目标年份净排放 <= 0"""
+        if self.type == 'neutral_year':
+            return self.measure(results) + self.tolerance
+        return self.measure(results) - self.value
+
+    def achieved(self, results: Dict[str, Dict[str, Any]]) -> Any:
+        """实际达到的结果：neutral_year 为首次 <= 0 的年份（同 TrajectoryAnalyzer._find_neutral_year），否则为指标值"""
+        if self.type == 'neutral_year':
+            years, values = output_series(results, self.output)
+            return next((year for year, v in zip(years, values) if v <= 0), None)
+        return round(self.measure(results), 6)
+
+    def satisfied(self, results: Dict[str, Dict[str, Any]]) -> bool:
+        if self.type == 'neutral_year':
+            return self.achieved(results) == self.year
+        return abs(self.residual(results)) <= self.tolerance
+
+
+@dataclass
+class GoalLever:
+    """可调输入（杠杆）"""
+    # 输入路径（见 overrides.py）
+    name: str
+    low: float
+    high: float
+    # scale: 相对基础情景的倍数；value: 直接取值
+    mode: str = 'scale'
+    # Newton 迭代初值，为空时倍数取 1（在范围外时取中点），取值取中点
+    initial: Optional[float] = None
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'GoalLever':
+        missing = [key for key in ('name', 'range') if key not in data]
+        if missing:
+            raise ValueError(f"杠杆缺少字段: {', '.join(missing)}")
+        low, high = (float(v) for v in data['range'])
+        if not low < high:
+            raise ValueError(f"{data['name']}: 范围下限应小于上限")
+        mode = data.get('mode', 'scale')
+        if mode not in ('scale', 'value'):
+            raise ValueError(f"{data['name']}: 未知的覆盖方式 {mode}")
+        split_path(str(data['name']))
+        initial = data.get('initial')
+        return cls(str(data['name']), low, high, mode, None if initial is None else float(initial))
+
+    def start(self) -> float:
+        if self.initial is not None:
+            return min(max(self.initial, self.low), self.high)
+        if self.mode == 'scale' and self.low <= 1.0 <= self.high:
+            return 1.0
+        return (self.low + self.high) / 2
+
+
+def load_goal_problem(filepath: str) -> Tuple[List[GoalTarget], List[GoalLever], Dict[str, Any]]:
+    """读取问题文件，返回 (目标, 杠杆, 文件级设置 {'method': ..., 'max_iterations': ...})"""
+    with open(filepath, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    targets = [GoalTarget.from_dict(item) for item in data.get('targets', [])]
+    levers = [GoalLever.from_dict(item) for item in data.get('levers', [])]
+    return targets, levers, {k: v for k, v in data.items() if k not in ('targets', 'levers')}
+
+
+@dataclass
+class GoalSeekResult:
+    """求解结果"""
+    converged: bool
+    method: str
+    # 杠杆取值 {输入路径: 值}
+    levers: Dict[str, float]
+    # [{'target', 'value', 'achieved', 'residual', 'satisfied'}]
+    targets: List[Dict[str, Any]]
+    iterations: int = 0
+    evaluations: int = 0
+    seconds: float = 0.0
+    message: str = ''
+    overrides: InputOverrides = field(default_factory=InputOverrides)
+    # 每次计算的 (杠杆取值, 残差)
+    history: List[Tuple[List[float], List[float]]] = field(default_factory=list)
+
+
+class GoalSeeker:
+    """目标求解器"""
+
+    def __init__(self, evaluator: ScenarioEvaluator):
+        self.evaluator = evaluator
+
+    @staticmethod
+    def overrides(levers: List[GoalLever], values: List[float]) -> InputOverrides:
+        overrides = InputOverrides()
+        for lever, value in zip(levers, values):
+            target = overrides.scale if lever.mode == 'scale' else overrides.values
+            target[lever.name] = float(value)
+        return overrides
+
+    def solve(self, targets: List[GoalTarget], levers: List[GoalLever], method: str = 'auto',
+              max_iterations: int = MAX_ITERATIONS) -> GoalSeekResult:
+        """
+        求解杠杆取值，使各目标残差在容差内
+        - bracket: 单目标单杠杆，要求杠杆范围两端残差异号
+        - newton: 有限差分雅可比 + 最小二乘步长，杠杆截断到范围内，步长不能减小残差时加阻尼；
+          杠杆多于目标时取最小范数步长，目标无法同时满足时停在残差平方和最小的点
+        """
+        if not targets or not levers:
+            raise ValueError("需要至少一个目标和一个杠杆")
+        if method not in SOLVE_METHODS:
+            raise ValueError(f"未知的求解方法: {method}")
+        if method == 'auto':
+            method = 'bracket' if len(targets) == 1 and len(levers) == 1 else 'newton'
+        if method == 'bracket' and (len(targets) != 1 or len(levers) != 1):
+            raise ValueError("区间求根只支持单目标单杠杆")
+        self.evaluator.check(self.overrides(levers, [lever.start() for lever in levers]))
+
+        stages = {target.stage for target in targets}
+        history: List[Tuple[List[float], List[float]]] = []
+
+        def evaluate(values):
+            results = self.evaluator.evaluate(self.overrides(levers, values), stages)
+            residuals = [target.residual(results) for target in targets]
+            history.append(([float(v) for v in values], residuals))
+            return results, residuals
+
+        start = time.perf_counter()
+        if method == 'bracket':
+            values, iterations, message = self._bracket(targets[0], levers[0], evaluate, max_iterations)
+        else:
+            values, iterations, message = self._newton(targets, levers, evaluate, max_iterations)
+        values = self._feasible(targets, history, values)
+
+        results, residuals = evaluate(values)
+        report = [{'target': target.label, 'value': target.value,
+                   'achieved': target.achieved(results), 'residual': round(residual, 6),
+                   'satisfied': target.satisfied(results)}
+                  for target, residual in zip(targets, residuals)]
+        return GoalSeekResult(
+            converged=all(item['satisfied'] for item in report), method=method,
+            levers={lever.name: round(value, 10) for lever, value in zip(levers, values)},
+            targets=report, iterations=iterations, evaluations=len(history),
+            seconds=time.perf_counter() - start, message=message,
+            overrides=self.overrides(levers, values), history=history)
+
+    @staticmethod
+    def _feasible(targets: List[GoalTarget], history, values: List[float]) -> List[float]:
+        """碳中和年份目标：在已计算的点中优先取目标年份净排放 <= 0 且残差最小的点"""
+        if len(targets) != 1 or targets[0].type != 'neutral_year':
+            return values
+        candidates = [(abs(r[0]), x) for x, r in history if r[0] <= targets[0].tolerance]
+        return min(candidates)[1] if candidates else values
+
+    @staticmethod
+    def _bracket(target: GoalTarget, lever: GoalLever, evaluate, max_iterations: int):
+        """Illinois 试位法：保持两端残差异号，收敛慢的一端函数值减半"""
+        a, b = lever.low, lever.high
+        fa = evaluate([a])[1][0]
+        fb = evaluate([b])[1][0]
+        if abs(fa) <= target.tolerance:
+            return [a], 0, '下限即满足目标'
+        if abs(fb) <= target.tolerance:
+            return [b], 0, '上限即满足目标'
+        if fa * fb > 0:
+            return ([a] if abs(fa) < abs(fb) else [b]), 0, \
+                f"杠杆范围两端残差同号（{fa:.4g}, {fb:.4g}），范围内无解，取残差较小的一端"
+
+        side, c = 0, a
+        x_tolerance = 1e-12 * (lever.high - lever.low)
+        for iteration in range(1, max_iterations + 1):
+            c = (a * fb - b * fa) / (fb - fa)
+            fc = evaluate([c])[1][0]
+            if abs(fc) <= target.tolerance or abs(b - a) <= x_tolerance:
+                return [c], iteration, '收敛'
+            if fc * fb > 0:
+                b, fb = c, fc
+                if side == -1:
+                    fa /= 2
+                side = -1
+            else:
+                a, fa = c, fc
+                if side == 1:
+                    fb /= 2
+                side = 1
+        return [c], max_iterations, '达到最大迭代次数'
+
+    @staticmethod
+    def _damped_step(jacobian: np.ndarray, f: np.ndarray, damping: float) -> np.ndarray:
+        """Levenberg-Marquardt 步长：damping 为 0 时即 Newton（最小二乘）步长"""
+        if damping == 0:
+            return np.linalg.lstsq(jacobian, -f, rcond=None)[0]
+        jtj = jacobian.T @ jacobian
+        scale = np.diag(np.maximum(np.diag(jtj), 1e-12))
+        return np.linalg.solve(jtj + damping * scale, -jacobian.T @ f)
+
+    @classmethod
+    def _newton(cls, targets: List[GoalTarget], levers: List[GoalLever], evaluate, max_iterations: int):
+        """
+        有限差分 Newton 迭代（截断到杠杆范围）
+        Newton 步长不能减小残差时（如雅可比接近奇异）逐级加大 Levenberg-Marquardt 阻尼，
+        目标在杠杆范围内无法同时满足时停在残差平方和最小的点
+        """
+        low = np.array([lever.low for lever in levers])
+        high = np.array([lever.high for lever in levers])
+        tolerance = np.array([target.tolerance for target in targets])
+        steps = DIFFERENCE_STEP * (high - low)
+
+        x = np.array([lever.start() for lever in levers])
+        f = np.array(evaluate(x)[1]) / tolerance
+        for iteration in range(1, max_iterations + 1):
+            if np.all(np.abs(f) <= 1):
+                return x.tolist(), iteration - 1, '收敛'
+            jacobian = np.empty((len(targets), len(levers)))
+            for j in range(len(levers)):
+                h = steps[j] if x[j] + steps[j] <= high[j] else -steps[j]
+                shifted = x.copy()
+                shifted[j] += h
+                jacobian[:, j] = (np.array(evaluate(shifted)[1]) / tolerance - f) / h
+            if not np.any(jacobian):
+                return x.tolist(), iteration, '目标对杠杆不敏感（雅可比为零）'
+            # 已在边界且步长指向范围外的杠杆固定不动
+            step = cls._damped_step(jacobian, f, 0)
+            free = ~(((x <= low) & (step < 0)) | ((x >= high) & (step > 0)))
+            if not free.any():
+                return x.tolist(), iteration, '杠杆已到范围边界，无法继续减小残差'
+
+            norm = np.linalg.norm(f)
+            for damping in DAMPING_LEVELS:
+                step = np.zeros_like(x)
+                step[free] = cls._damped_step(jacobian[:, free], f, damping)
+                candidate = np.clip(x + step, low, high)
+                f_candidate = np.array(evaluate(candidate)[1]) / tolerance
+                if np.linalg.norm(f_candidate) < norm:
+                    break
+            else:
+                return x.tolist(), iteration, '残差已无法减小（目标在杠杆范围内无法同时满足）'
+            improvement = norm - np.linalg.norm(f_candidate)
+            x, f = candidate, f_candidate
+            if improvement <= 1e-9 * norm:
+                return x.tolist(), iteration, '残差已无法减小（目标在杠杆范围内无法同时满足）'
+        converged = np.all(np.abs(f) <= 1)
+        return x.tolist(), max_iterations, '收敛' if converged else '达到最大迭代次数'
+
+    @staticmethod
+    def print_results(result: GoalSeekResult) -> None:
+        """打印求解结果"""
+        print("\n" + "=" * 70)
+        print(f"目标求解结果（{SOLVE_METHODS[result.method]}）: {'已满足' if result.converged else '未满足'}"
+              f" - {result.message}")
+        print(f"迭代 {result.iterations} 次，计算 {result.evaluations} 次，耗时 {result.seconds:.3f}s")
+        print("=" * 70)
+        print("\n【杠杆】")
+        for name, value in result.levers.items():
+            print(f"  {name:<40} {value:.6g}")
+        print("\n【目标】")
+        for item in result.targets:
+            mark = '✓' if item['satisfied'] else '✗'
+            print(f"  {mark} {item['target']:<50} 实际: {item['achieved']}  残差: {item['residual']:.4g}")
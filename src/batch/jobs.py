@@ -0,0 +1,465 @@
+# -*- coding: utf-8 -*-
+"""本地作业队列
+
+情景计算作业保存在本地 SQLite 文件中，由工作进程池按优先级领取执行：
+- 每个作业是一个情景配置加上要运行的阶段子集（如只运行 macro 和 scenario_summary），
+  未指定优先级时按作业规模估计（只含分析的作业最优先，逐时调度等重型电力引擎最后）
+- 工作进程池中保留若干进程只领取小作业，小作业不会排在大作业后面等待全部进程空闲
+- 作业可随时取消：排队中的作业直接取消，运行中的作业在当前阶段结束后停止
+- 每个作业写入自己的输出目录 {输出根目录}/{情景名称}/job-{编号}，同一情景的多个作业互不覆盖
+- 运行中的作业定期写心跳；工作进程异常退出或心跳超时的作业重新排队（超过最大尝试次数时记为失败），
+  进程池补充新的工作进程，吞吐量不受个别进程崩溃影响
+多个进程通过 SQLite 的事务领取作业（BEGIN IMMEDIATE），同一作业只会被一个进程领取。
+"""
+
+import io
+import json
+import os
+import pickle
+import socket
+import sqlite3
+import threading
+import time
+import traceback
+import multiprocessing
+from contextlib import redirect_stdout
+from typing import Dict, Any, List, Optional
+from dataclasses import dataclass, field, replace
+
+from ..pipeline.runner import STATUS_DONE, STATUS_FAILED
+from .scenarios import ScenarioSpec, scenario_config
+
+
+# 默认作业输出根目录和队列文件（与批量计算的输出根目录分开）
+DEFAULT_QUEUE_ROOT = 'data/output/queue'
+DEFAULT_QUEUE_DB = os.path.join(DEFAULT_QUEUE_ROOT, 'jobs.sqlite')
+
+# 作业状态（完成、失败与流水线节点状态相同）
+JOB_QUEUED = '排队'
+JOB_RUNNING = '运行'
+JOB_DONE = STATUS_DONE
+JOB_FAILED = STATUS_FAILED
+JOB_CANCELLED = '取消'
+
+# 默认优先级（数值越大越先执行）
+PRIORITY_LARGE = 0
+PRIORITY_MEDIUM = 5
+PRIORITY_SMALL = 10
+
+# 重型电力计算引擎（逐时调度、装机规划等）
+HEAVY_ENGINES = ('hourly', 'ldc', 'expansion', 'regional')
+
+# 心跳间隔和超时（秒）
+HEARTBEAT_SECONDS = 5.0
+STALE_SECONDS = 60.0
+
+# 作业结果文件和日志文件（作业输出目录下）
+RESULTS_FILENAME = 'results.pkl'
+LOG_FILENAME = 'run.log'
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    name TEXT NOT NULL,
+    priority INTEGER NOT NULL DEFAULT 0,
+    status TEXT NOT NULL,
+    config TEXT NOT NULL,
+    stages TEXT,
+    output_dir TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    max_attempts INTEGER NOT NULL DEFAULT 3,
+    cancel_requested INTEGER NOT NULL DEFAULT 0,
+    worker TEXT,
+    submitted REAL,
+    started REAL,
+    finished REAL,
+    heartbeat REAL,
+    progress TEXT,
+    error TEXT
+);
+CREATE INDEX IF NOT EXISTS jobs_queue ON jobs (status, priority DESC, id);
+"""
+
+
+class JobCancelled(Exception):
+    """作业在运行中被取消"""
+
+
+@dataclass
+class Job:
+    """作业记录"""
+    id: int
+    name: str
+    priority: int
+    status: str
+    config: Dict[str, Any]
+    # 运行的阶段，为空时运行全部已启用的阶段
+    stages: Optional[List[str]]
+    output_dir: str
+    attempts: int = 0
+    max_attempts: int = 3
+    cancel_requested: bool = False
+    worker: Optional[str] = None
+    submitted: Optional[float] = None
+    started: Optional[float] = None
+    finished: Optional[float] = None
+    heartbeat: Optional[float] = None
+    # 已完成的阶段
+    progress: List[str] = field(default_factory=list)
+    error: str = ''
+
+    @classmethod
+    def from_row(cls, row: sqlite3.Row) -> 'Job':
+        data = dict(row)
+        data['config'] = json.loads(data['config'])
+        data['stages'] = json.loads(data['stages']) if data['stages'] else None
+        data['progress'] = json.loads(data['progress']) if data['progress'] else []
+        data['cancel_requested'] = bool(data['cancel_requested'])
+        data['error'] = data['error'] or ''
+        return cls(**data)
+
+
+def default_priority(config: Dict[str, Any], stages: Optional[List[str]] = None) -> int:
+    """按作业规模估计优先级：只含分析的作业为小作业，含重型电力引擎的为大作业"""
+    modules = {name: cfg for name, cfg in config.get('modules', {}).items()
+               if cfg.get('enabled', False) and (stages is None or name in stages)}
+    if not modules:
+        return PRIORITY_SMALL
+    if modules.get('power', {}).get('engine') in HEAVY_ENGINES:
+        return PRIORITY_LARGE
+    return PRIORITY_MEDIUM
+
+
+def job_output_dir(output_root: str, spec: ScenarioSpec, job_id: int) -> str:
+    """作业输出目录: {情景输出目录}/job-{编号}（情景输出目录默认为 {输出根目录}/{情景名称}）"""
+    return os.path.join(spec.output_dir or os.path.join(output_root, spec.name), f"job-{job_id}")
+
+
+def worker_name(pid: Optional[int] = None) -> str:
+    """工作进程标识（主机名-进程号）"""
+    return f"{socket.gethostname()}-{pid or os.getpid()}"
+
+
+class JobQueue:
+    """SQLite 作业队列（每个进程、每个线程使用自己的 JobQueue 实例）"""
+
+    def __init__(self, db_path: str = DEFAULT_QUEUE_DB):
+        self.db_path = db_path
+        directory = os.path.dirname(os.path.abspath(db_path))
+        os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(db_path, timeout=30, isolation_level=None)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def _execute(self, sql: str, params: tuple = ()) -> sqlite3.Cursor:
+        return self._conn.execute(sql, params)
+
+    # ==================== 提交和查询 ====================
+
+    def submit(self, name: str, config: Dict[str, Any], output_dir: str,
+               stages: Optional[List[str]] = None, priority: Optional[int] = None,
+               max_attempts: int = 3) -> int:
+        """提交作业，返回作业编号（priority 为空时按作业规模估计）"""
+        if priority is None:
+            priority = default_priority(config, stages)
+        cursor = self._execute(
+            "INSERT INTO jobs (name, priority, status, config, stages, output_dir, max_attempts, submitted) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (name, priority, JOB_QUEUED, json.dumps(config, ensure_ascii=False),
+             json.dumps(stages, ensure_ascii=False) if stages is not None else None,
+             output_dir, max_attempts, time.time()))
+        return cursor.lastrowid
+
+    def submit_scenario(self, base_config: Dict[str, Any], spec: ScenarioSpec,
+                        output_root: str = DEFAULT_QUEUE_ROOT, stages: Optional[List[str]] = None,
+                        priority: Optional[int] = None, max_attempts: int = 3) -> int:
+        """
+        提交情景作业，返回作业编号
+        作业编号在同一事务中分配，情景配置的输出路径改写到作业自己的输出目录（见 job_output_dir）
+        """
+        self._execute("BEGIN IMMEDIATE")
+        try:
+            job_id = self.submit(spec.name, {}, '', stages, PRIORITY_LARGE, max_attempts)
+            output_dir = job_output_dir(output_root, spec, job_id)
+            config, _ = scenario_config(base_config, replace(spec, output_dir=output_dir))
+            if priority is None:
+                priority = default_priority(config, stages)
+            self._execute("UPDATE jobs SET config = ?, output_dir = ?, priority = ? WHERE id = ?",
+                          (json.dumps(config, ensure_ascii=False), output_dir, priority, job_id))
+        except BaseException:
+            self._execute("ROLLBACK")
+            raise
+        self._execute("COMMIT")
+        return job_id
+
+    def get(self, job_id: int) -> Optional[Job]:
+        row = self._execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return Job.from_row(row) if row else None
+
+    def jobs(self, status: Optional[str] = None) -> List[Job]:
+        """作业列表（按编号）"""
+        if status is None:
+            rows = self._execute("SELECT * FROM jobs ORDER BY id").fetchall()
+        else:
+            rows = self._execute("SELECT * FROM jobs WHERE status = ? ORDER BY id", (status,)).fetchall()
+        return [Job.from_row(row) for row in rows]
+
+    def counts(self) -> Dict[str, int]:
+        """各状态的作业数"""
+        rows = self._execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall()
+        return {row[0]: row[1] for row in rows}
+
+    def active(self) -> int:
+        """排队和运行中的作业数"""
+        return self._execute("SELECT COUNT(*) FROM jobs WHERE status IN (?, ?)",
+                             (JOB_QUEUED, JOB_RUNNING)).fetchone()[0]
+
+    def cancel(self, job_id: int) -> bool:
+        """取消作业：排队中的直接取消，运行中的请求在当前阶段结束后停止；已结束的返回 False"""
+        self._execute("BEGIN IMMEDIATE")
+        try:
+            job = self.get(job_id)
+            if job is None or job.status not in (JOB_QUEUED, JOB_RUNNING):
+                return False
+            if job.status == JOB_QUEUED:
+                self._execute("UPDATE jobs SET status = ?, finished = ? WHERE id = ?",
+                              (JOB_CANCELLED, time.time(), job_id))
+            else:
+                self._execute("UPDATE jobs SET cancel_requested = 1 WHERE id = ?", (job_id,))
+            return True
+        finally:
+            self._execute("COMMIT")
+
+    # ==================== 工作进程 ====================
+
+    def claim(self, worker: str, min_priority: Optional[int] = None) -> Optional[Job]:
+        """领取优先级最高（同优先级先提交）的排队作业，min_priority 不为空时只领取不低于该优先级的作业"""
+        self._execute("BEGIN IMMEDIATE")
+        try:
+            sql = "SELECT id FROM jobs WHERE status = ?"
+            params: tuple = (JOB_QUEUED,)
+            if min_priority is not None:
+                sql += " AND priority >= ?"
+                params += (min_priority,)
+            row = self._execute(sql + " ORDER BY priority DESC, id LIMIT 1", params).fetchone()
+            if row is None:
+                return None
+            now = time.time()
+            self._execute(
+                "UPDATE jobs SET status = ?, worker = ?, started = ?, heartbeat = ?, "
+                "attempts = attempts + 1, progress = NULL, error = NULL WHERE id = ?",
+                (JOB_RUNNING, worker, now, now, row[0]))
+            return self.get(row[0])
+        finally:
+            self._execute("COMMIT")
+
+    def heartbeat(self, job_id: int, worker: str) -> bool:
+        """更新心跳，返回是否收到取消请求"""
+        self._execute("UPDATE jobs SET heartbeat = ? WHERE id = ? AND worker = ? AND status = ?",
+                      (time.time(), job_id, worker, JOB_RUNNING))
+        row = self._execute("SELECT cancel_requested FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return bool(row and row[0])
+
+    def record_progress(self, job_id: int, worker: str, stages: List[str]) -> bool:
+        """记录已完成的阶段，返回是否收到取消请求"""
+        self._execute("UPDATE jobs SET progress = ?, heartbeat = ? WHERE id = ? AND worker = ?",
+                      (json.dumps(stages, ensure_ascii=False), time.time(), job_id, worker))
+        return self.heartbeat(job_id, worker)
+
+    def finish(self, job_id: int, worker: str, status: str, error: str = '') -> bool:
+        """结束作业（只在作业仍由该进程运行时生效，返回是否生效）"""
+        cursor = self._execute(
+            "UPDATE jobs SET status = ?, finished = ?, error = ? "
+            "WHERE id = ? AND worker = ? AND status = ?",
+            (status, time.time(), error or None, job_id, worker, JOB_RUNNING))
+        return cursor.rowcount > 0
+
+    # ==================== 故障恢复 ====================
+
+    def requeue(self, where: str, params: tuple, reason: str) -> List[int]:
+        """满足条件的运行中作业重新排队（已达最大尝试次数的记为失败），返回涉及的作业编号"""
+        self._execute("BEGIN IMMEDIATE")
+        try:
+            rows = self._execute(f"SELECT id, attempts, max_attempts, cancel_requested FROM jobs "
+                                 f"WHERE status = ? AND {where}", (JOB_RUNNING,) + params).fetchall()
+            now = time.time()
+            for job_id, attempts, max_attempts, cancel_requested in rows:
+                if cancel_requested:
+                    self._execute("UPDATE jobs SET status = ?, finished = ?, error = ? WHERE id = ?",
+                                  (JOB_CANCELLED, now, reason, job_id))
+                elif attempts >= max_attempts:
+                    self._execute("UPDATE jobs SET status = ?, finished = ?, error = ? WHERE id = ?",
+                                  (JOB_FAILED, now, f"{reason}（已尝试 {attempts} 次）", job_id))
+                else:
+                    self._execute("UPDATE jobs SET status = ?, worker = NULL, error = ? WHERE id = ?",
+                                  (JOB_QUEUED, reason, job_id))
+            return [row[0] for row in rows]
+        finally:
+            self._execute("COMMIT")
+
+    def requeue_worker(self, worker: str) -> List[int]:
+        """工作进程退出后，其运行中的作业重新排队"""
+        return self.requeue("worker = ?", (worker,), f"工作进程异常退出: {worker}")
+
+    def requeue_stale(self, timeout: float = STALE_SECONDS) -> List[int]:
+        """心跳超时的运行中作业重新排队（如所在节点已宕机）"""
+        return self.requeue("heartbeat < ?", (time.time() - timeout,), f"心跳超时 {timeout:.0f}s")
+
+
+# ==================== 作业执行 ====================
+
+def execute_job(queue: JobQueue, job: Job, worker: str) -> str:
+    """
+    在当前进程中运行作业，返回作业状态
+    运行的阶段在作业输出目录下写 run.log，成功时原子写入 results.pkl
+    （输出目录只属于本作业，重新排队的作业先删除上次尝试留下的结果）
+    """
+    import main
+    os.makedirs(job.output_dir, exist_ok=True)
+    results_file = os.path.join(job.output_dir, RESULTS_FILENAME)
+    if os.path.exists(results_file):
+        os.remove(results_file)
+
+    stop = threading.Event()
+
+    def beat():
+        beat_queue = JobQueue(queue.db_path)
+        try:
+            while not stop.wait(HEARTBEAT_SECONDS):
+                beat_queue.heartbeat(job.id, worker)
+        finally:
+            beat_queue.close()
+
+    heartbeat = threading.Thread(target=beat, daemon=True)
+    heartbeat.start()
+
+    completed: List[str] = []
+
+    def on_stage(stage, store):
+        completed.append(stage)
+        if queue.record_progress(job.id, worker, completed):
+            raise JobCancelled(f"作业 {job.id} 已取消（完成阶段: {', '.join(completed)}）")
+
+    buffer = io.StringIO()
+    status, error = JOB_DONE, ''
+    try:
+        with redirect_stdout(buffer):
+            store = main.run_all(job.config, on_stage=on_stage, only=job.stages)
+        temp = os.path.join(job.output_dir, f'.{RESULTS_FILENAME}.tmp')
+        with open(temp, 'wb') as f:
+            pickle.dump(dict(store), f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temp, results_file)
+    except JobCancelled as e:
+        status, error = JOB_CANCELLED, str(e)
+    except Exception:
+        status, error = JOB_FAILED, traceback.format_exc()
+    finally:
+        stop.set()
+        heartbeat.join()
+
+    with open(os.path.join(job.output_dir, LOG_FILENAME), 'w', encoding='utf-8') as f:
+        f.write(buffer.getvalue())
+        f.write(error)
+    queue.finish(job.id, worker, status, error)
+    return status
+
+
+def worker_loop(db_path: str, min_priority: Optional[int] = None, poll: float = 0.5,
+                stop=None) -> None:
+    """
+    工作进程主循环：领取并执行作业；没有作业时等待 poll 秒，stop（事件）置位后退出
+    """
+    import main  # noqa: F401  预先导入计算代码
+    worker = worker_name()
+    queue = JobQueue(db_path)
+    try:
+        while stop is None or not stop.is_set():
+            job = queue.claim(worker, min_priority)
+            if job is None:
+                time.sleep(poll)
+                continue
+            execute_job(queue, job, worker)
+    finally:
+        queue.close()
+
+
+class JobWorkerPool:
+    """作业工作进程池（监视工作进程，崩溃后将其作业重新排队并补充进程）"""
+
+    def __init__(self, db_path: str = DEFAULT_QUEUE_DB, workers: Optional[int] = None,
+                 small_workers: int = 1, small_priority: int = PRIORITY_SMALL,
+                 poll: float = 0.5, stale_after: float = STALE_SECONDS, verbose: bool = True):
+        """
+        Args:
+            db_path: 队列文件
+            workers: 工作进程数，为空时取CPU核数
+            small_workers: 只领取小作业（优先级不低于 small_priority）的保留进程数，
+                           至少保留一个领取任意作业的进程
+            poll: 队列为空时的轮询间隔（秒）
+            stale_after: 心跳超时（秒），超时的运行中作业重新排队
+        """
+        self.db_path = db_path
+        self.workers = max(workers or os.cpu_count() or 1, 1)
+        self.small_workers = max(min(small_workers, self.workers - 1), 0)
+        self.small_priority = small_priority
+        self.poll = poll
+        self.stale_after = stale_after
+        self.verbose = verbose
+
+    def run(self, until_empty: bool = True) -> Dict[str, int]:
+        """
+        运行工作进程池；until_empty 时队列中没有排队和运行中的作业后退出，否则一直运行到中断
+        Returns:
+            各状态的作业数
+        """
+        queue = JobQueue(self.db_path)
+        stop = multiprocessing.Event()
+        processes: List[tuple] = []
+
+        def spawn(slot):
+            min_priority = self.small_priority if slot < self.small_workers else None
+            process = multiprocessing.Process(target=worker_loop,
+                                              args=(self.db_path, min_priority, self.poll, stop))
+            process.start()
+            return slot, process
+
+        if self.verbose:
+            print(f"作业工作进程: {self.workers} 个（其中只领取小作业的 {self.small_workers} 个），"
+                  f"队列: {self.db_path}")
+        processes = [spawn(slot) for slot in range(self.workers)]
+        try:
+            while True:
+                time.sleep(self.poll)
+                for i, (slot, process) in enumerate(processes):
+                    if process.is_alive():
+                        continue
+                    worker = worker_name(process.pid)
+                    requeued = queue.requeue_worker(worker)
+                    if stop.is_set():
+                        continue
+                    if self.verbose:
+                        print(f"工作进程 {worker} 退出（返回码 {process.exitcode}），"
+                              f"作业 {requeued or '无'} 重新排队，补充新进程")
+                    processes[i] = spawn(slot)
+                requeued = queue.requeue_stale(self.stale_after)
+                if requeued and self.verbose:
+                    print(f"心跳超时，作业 {requeued} 重新排队")
+                if until_empty and queue.active() == 0:
+                    break
+        except KeyboardInterrupt:
+            pass
+        finally:
+            stop.set()
+            for _, process in processes:
+                process.join()
+            for _, process in processes:
+                queue.requeue_worker(worker_name(process.pid))
+            counts = queue.counts()
+            queue.close()
+        if self.verbose:
+            print("作业状态: " + "，".join(f"{status} {count}" for status, count in counts.items()))
+        return counts
@@ -0,0 +1,184 @@
+# -*- coding: utf-8 -*-
+"""批量计算检查点日志
+
+长时间批量计算中断后重新运行同一批情景时，跳过已完成的情景和阶段：
+- 每个阶段（计算模块/分析模块）完成后，其结果和输出表写入情景目录下的 _stages/{阶段}.pkl，
+  并在日志中追加一条阶段完成记录；情景全部完成后追加一条情景完成记录
+- 日志只追加（JSON Lines），每个工作进程写自己的文件 {output_root}/_journal/{主机}-{进程号}.jsonl，
+  不需要加锁，也不在每个情景后重写清单文件
+- 重新运行时主进程回放全部日志文件：已完成的情景直接跳过，未完成情景中已完成的阶段从 _stages/ 恢复
+记录中含情景配置及其引用的输入文件内容的哈希（与流水线阶段缓存相同，按内容计算），
+情景定义或输入文件变化后该情景重新计算。
+"""
+
+import hashlib
+import json
+import os
+import pickle
+import socket
+import time
+from typing import Dict, Any, List, Optional, Set, Tuple
+from dataclasses import dataclass, field
+
+from ..pipeline.cache import file_digest
+
+
+# 日志目录和阶段结果目录
+JOURNAL_DIRNAME = '_journal'
+STAGES_DIRNAME = '_stages'
+
+# 情景完成记录的阶段名称
+SCENARIO_DONE = '*'
+
+
+# 本进程中的文件哈希 {(路径, 修改时间, 大小): 哈希}
+_digests: Dict[Tuple[str, int, int], Optional[str]] = {}
+
+
+def input_files(config: Dict[str, Any]) -> List[str]:
+    """情景配置引用的输入文件（各模块/分析中除 output_*_file 外的 *_file）"""
+    paths = set()
+    for section in ('modules', 'analysis'):
+        for cfg in config.get(section, {}).values():
+            for key, value in cfg.items():
+                if isinstance(value, str) and key.endswith('_file') and not key.startswith('output_'):
+                    paths.add(value)
+    return sorted(paths)
+
+
+def _digest(filepath: str) -> Optional[str]:
+    try:
+        stat = os.stat(filepath)
+    except OSError:
+        return None
+    key = (os.path.abspath(filepath), stat.st_mtime_ns, stat.st_size)
+    if key not in _digests:
+        _digests[key] = file_digest(filepath)
+    return _digests[key]
+
+
+def config_key(config: Dict[str, Any]) -> str:
+    """情景配置及其输入文件内容的哈希"""
+    digest = hashlib.sha256()
+    digest.update(json.dumps(config, sort_keys=True, ensure_ascii=False, default=str).encode('utf-8'))
+    for path in input_files(config):
+        digest.update(b'\0' + path.encode('utf-8') + b'\0')
+        digest.update((_digest(path) or 'missing').encode('utf-8'))
+    return digest.hexdigest()[:16]
+
+
+@dataclass
+class ScenarioState:
+    """日志回放得到的情景状态"""
+    key: str
+    # 已完成的阶段
+    stages: Set[str] = field(default_factory=set)
+    # 情景是否全部完成
+    done: bool = False
+
+
+class BatchJournal:
+    """批量计算检查点日志"""
+
+    def __init__(self, output_root: str):
+        self.directory = os.path.join(output_root, JOURNAL_DIRNAME)
+        self._file = None
+
+    # ==================== 写入（工作进程） ====================
+
+    def _open(self):
+        if self._file is None:
+            os.makedirs(self.directory, exist_ok=True)
+            name = f"{socket.gethostname()}-{os.getpid()}.jsonl"
+            self._file = open(os.path.join(self.directory, name), 'a', encoding='utf-8')
+        return self._file
+
+    def record(self, scenario: str, key: str, stage: str, sync: bool = False) -> None:
+        """
+        追加完成记录
+        Args:
+            stage: 阶段名称，SCENARIO_DONE 表示情景全部完成
+            sync: 是否立即落盘（fsync），情景完成记录使用
+        """
+        f = self._open()
+        f.write(json.dumps({'scenario': scenario, 'key': key, 'stage': stage,
+                            'time': round(time.time(), 3)}, ensure_ascii=False) + '\n')
+        f.flush()
+        if sync:
+            os.fsync(f.fileno())
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    # ==================== 回放（主进程） ====================
+
+    def load(self) -> Dict[str, ScenarioState]:
+        """回放全部日志文件，返回 {情景: ScenarioState}（按记录时间，配置哈希变化时重置状态）"""
+        records = []
+        if os.path.isdir(self.directory):
+            for filename in sorted(os.listdir(self.directory)):
+                if not filename.endswith('.jsonl'):
+                    continue
+                with open(os.path.join(self.directory, filename), 'r', encoding='utf-8') as f:
+                    for line in f:
+                        try:
+                            records.append(json.loads(line))
+                        except ValueError:
+                            # 进程中断时最后一行可能不完整
+                            continue
+        records.sort(key=lambda r: r.get('time', 0))
+
+        states: Dict[str, ScenarioState] = {}
+        for record in records:
+            name, key = record['scenario'], record['key']
+            state = states.get(name)
+            if state is None or state.key != key:
+                state = states[name] = ScenarioState(key)
+            if record['stage'] == SCENARIO_DONE:
+                state.done = True
+            else:
+                state.stages.add(record['stage'])
+        return states
+
+    def clear(self) -> None:
+        """删除全部日志（重新开始）"""
+        if os.path.isdir(self.directory):
+            for filename in os.listdir(self.directory):
+                os.remove(os.path.join(self.directory, filename))
+
+
+# ==================== 阶段结果 ====================
+
+def stage_path(output_dir: str, stage: str) -> str:
+    return os.path.join(output_dir, STAGES_DIRNAME, f"{stage}.pkl")
+
+
+def save_stage(output_dir: str, stage: str, entry: Any) -> None:
+    """保存阶段结果（写临时文件后改名）"""
+    path = stage_path(output_dir, stage)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    temp = f"{path}.{os.getpid()}.tmp"
+    with open(temp, 'wb') as f:
+        pickle.dump(entry, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(temp, path)
+
+
+def load_stage(output_dir: str, stage: str) -> Optional[Any]:
+    """读取阶段结果，不存在或损坏时返回 None"""
+    try:
+        with open(stage_path(output_dir, stage), 'rb') as f:
+            return pickle.load(f)
+    except (OSError, pickle.UnpicklingError, EOFError):
+        return None
+
+
+def completed_stages(output_dir: str, stages: List[str]) -> Dict[str, Any]:
+    """可恢复的阶段 {阶段: 保存的结果}（日志中已完成且结果文件完好）"""
+    restored = {}
+    for stage in stages:
+        entry = load_stage(output_dir, stage)
+        if entry is not None:
+            restored[stage] = entry
+    return restored
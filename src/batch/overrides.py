@@ -0,0 +1,314 @@
+# -*- coding: utf-8 -*-
+"""输入数据的内存覆盖
+
+实验设计、目标求解等大量情景只改动少数输入项，不再为每个情景复制并修改输入CSV：
+ScenarioEvaluator 在进程内按配置解析一次全部输入（计算模块的 {模块}_data、宏观测算参考、
+数据模板、能源结构、碳排放轨迹分析器的数据类），计算一次基础情景；之后每个情景是一组覆盖项，
+直接作用于已解析数据对象的副本，只重算覆盖项所在阶段及其下游阶段，其余阶段沿用基础情景的结果。
+
+输入路径为 "阶段.属性[.属性或键...]"：计算模块从 {模块}_data 开始，分析模块从分析器开始，如
+    power.capacity_cost.光伏(集中)      PowerData.capacity_cost['光伏(集中)']
+    power.ccs_capture_rate              PowerData.ccs_capture_rate
+    macro.input_data.gdp_growth_rate    MacroInputData.gdp_growth_rate
+    macro.sector_data.coal.工业         宏观部门数据（煤炭消费-工业）
+    template.power.generation.风电      数据模板电力发电量
+    trajectory.other.carbon_sink        碳排放轨迹碳汇
+路径指向序列时作用于每一年，指向字典时作用于其中全部项。
+情景数据一览表和统计表格按输出表重新解析，不在内存求值的阶段之列。
+"""
+
+import copy
+import io
+import numbers
+from contextlib import redirect_stdout
+from dataclasses import dataclass, field, is_dataclass, fields
+from typing import Dict, Any, List, Optional, Set, Iterable, Tuple
+
+from ..pipeline import build_pipeline
+
+
+# 内存求值的分析阶段（按 main.run_all 的顺序）
+EVALUATED_ANALYSES = ('macro', 'template', 'structure', 'trajectory')
+
+# 计算参数、公式和技术目录：各情景共享，不复制，也不列入输入路径
+SHARED_ATTRIBUTES = {'variables', 'formulas', 'catalog'}
+
+# 列出输入路径时跳过的属性
+SKIPPED_ATTRIBUTES = SHARED_ATTRIBUTES | {'module_results', 'years'}
+
+
+@dataclass
+class InputOverrides:
+    """一个情景的输入覆盖项"""
+    # 输入路径 -> 倍数（相对基础情景）
+    scale: Dict[str, float] = field(default_factory=dict)
+    # 输入路径 -> 取值（序列每一年取同一值）
+    values: Dict[str, float] = field(default_factory=dict)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'InputOverrides':
+        return cls({k: float(v) for k, v in data.get('scale', {}).items()},
+                   {k: float(v) for k, v in data.get('values', {}).items()})
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = {}
+        if self.scale:
+            data['scale'] = dict(self.scale)
+        if self.values:
+            data['values'] = dict(self.values)
+        return data
+
+    def paths(self) -> List[str]:
+        return list(self.scale) + list(self.values)
+
+    def stages(self) -> Set[str]:
+        """覆盖项所在的阶段"""
+        return {split_path(path)[0] for path in self.paths()}
+
+
+def split_path(path: str) -> Tuple[str, List[str]]:
+    """输入路径拆分为 (阶段, [属性或键, ...])"""
+    parts = path.split('.')
+    if len(parts) < 2 or not all(parts):
+        raise ValueError(f"无效的输入路径: {path}")
+    return parts[0], parts[1:]
+
+
+def _get(container, key: str):
+    if isinstance(container, dict):
+        return container[key]
+    return getattr(container, key)
+
+
+def _set(container, key: str, value) -> None:
+    if isinstance(container, dict):
+        container[key] = value
+    else:
+        setattr(container, key, value)
+
+
+def _transform(value, func):
+    """对数值、序列和字典中的全部数值调用 func，返回新值"""
+    if isinstance(value, dict):
+        return {k: _transform(v, func) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_transform(v, func) for v in value]
+    if isinstance(value, numbers.Number) and not isinstance(value, bool):
+        return func(value)
+    raise TypeError(f"不支持覆盖的数据类型: {type(value).__name__}")
+
+
+def apply_override(root, parts: List[str], value: float, scale: bool, path: str = '') -> None:
+    """在数据对象 root 上原地应用一个覆盖项（scale 为 True 时乘以 value，否则取值为 value）"""
+    container = root
+    try:
+        for key in parts[:-1]:
+            container = _get(container, key)
+        current = _get(container, parts[-1])
+    except (KeyError, AttributeError):
+        raise ValueError(f"输入路径不存在: {path or '.'.join(parts)}")
+    func = (lambda v: v * value) if scale else (lambda v: value)
+    _set(container, parts[-1], _transform(current, func))
+
+
+def copy_data(value):
+    """复制输入数据：数据类、字典和列表逐层复制，数值、字符串和其他对象共享（比 deepcopy 快）"""
+    if isinstance(value, list):
+        if value and isinstance(value[0], (list, dict)):
+            return [copy_data(v) for v in value]
+        return value[:]
+    if isinstance(value, dict):
+        return {k: copy_data(v) for k, v in value.items()}
+    if is_dataclass(value) and not isinstance(value, type):
+        copied = copy.copy(value)
+        for f in fields(value):
+            setattr(copied, f.name, copy_data(getattr(value, f.name)))
+        return copied
+    return value
+
+
+def copy_stage_object(obj):
+    """复制阶段数据对象（计算器或分析器），计算参数、公式和技术目录共享"""
+    copied = copy.copy(obj)
+    for name, value in vars(obj).items():
+        if name not in SHARED_ATTRIBUTES:
+            setattr(copied, name, copy_data(value))
+    return copied
+
+
+def data_root(stage: str, obj):
+    """阶段数据对象中覆盖路径的起点：计算模块为 {模块}_data，分析模块为分析器本身"""
+    return getattr(obj, f"{stage}_data", obj)
+
+
+def input_paths(stage: str, obj) -> List[str]:
+    """阶段数据对象中可覆盖的输入路径（数值、数值序列和数值字典）"""
+    paths = []
+
+    def walk(value, path, depth):
+        if isinstance(value, bool):
+            return
+        if isinstance(value, numbers.Number) or (
+                isinstance(value, list) and value and
+                all(isinstance(v, numbers.Number) for v in value)):
+            paths.append(path)
+        elif isinstance(value, dict) and depth < 3:
+            for key, item in value.items():
+                if isinstance(key, str):
+                    walk(item, f"{path}.{key}", depth + 1)
+        elif (is_dataclass(value) and not isinstance(value, type)) and depth < 3:
+            for f in fields(value):
+                if f.name not in SKIPPED_ATTRIBUTES:
+                    walk(getattr(value, f.name), f"{path}.{f.name}", depth + 1)
+
+    root = data_root(stage, obj)
+    items = ((f.name, getattr(root, f.name)) for f in fields(root)) if is_dataclass(root) \
+        else vars(root).items()
+    for name, value in items:
+        if name not in SKIPPED_ATTRIBUTES and not name.startswith('_'):
+            walk(value, f"{stage}.{name}", 1)
+    return paths
+
+
+class ScenarioEvaluator:
+    """按覆盖项在内存中计算情景（输入只解析一次）"""
+
+    def __init__(self, config: Dict[str, Any]):
+        self.config = config
+        # 阶段 -> 已解析的数据对象（计算器或分析器，未计算）
+        self.objects: Dict[str, Any] = {}
+        # 阶段 -> 基础情景结果
+        self.base: Dict[str, Dict[str, Any]] = {}
+        # 按计算顺序排列的阶段
+        self.stages: List[str] = []
+        # 阶段 -> 上游阶段
+        self.dependencies: Dict[str, Set[str]] = {}
+
+    # ==================== 加载 ====================
+
+    def load(self) -> 'ScenarioEvaluator':
+        """解析全部输入并计算基础情景（打印输出不显示）"""
+        import main
+        loaders = {
+            'macro': main.load_macro_analyzer,
+            'template': main.load_template_analyzer,
+            'structure': main.load_structure_analyzer,
+            'trajectory': main.load_trajectory_analyzer,
+        }
+        modules = self.config.get('modules', {})
+        analysis = self.config.get('analysis', {})
+        self.objects, self.base, self.stages = {}, {}, []
+
+        with redirect_stdout(io.StringIO()):
+            for name, cfg in modules.items():
+                if not cfg.get('enabled', False) or name not in main.CALCULATORS:
+                    continue
+                calculator = main.load_calculator(name, cfg)
+                if calculator is not None:
+                    self.objects[name] = calculator
+            for name in self.objects:
+                self.base[name] = copy_stage_object(self.objects[name]).calculate()
+            self.stages = list(self.objects)
+
+            for name in EVALUATED_ANALYSES:
+                cfg = analysis.get(name, {})
+                if not cfg.get('enabled', False):
+                    continue
+                analyzer = loaders[name](cfg, self.base)
+                # 模块结果已提取到数据类中，每个情景按自己的上游结果重新提取
+                analyzer.module_results = {}
+                self.objects[name] = analyzer
+                self.base[name] = copy_stage_object(analyzer).calculate()
+                self.stages.append(name)
+
+        dependencies = build_pipeline(self.config).dependencies()
+        self.dependencies = {name: dependencies.get(name, set()) & set(self.stages)
+                             for name in self.stages}
+        return self
+
+    def input_paths(self, stages: Iterable[str] = None) -> List[str]:
+        """可覆盖的输入路径"""
+        paths = []
+        for name in stages or self.stages:
+            paths += input_paths(name, self.objects[name])
+        return paths
+
+    def check(self, overrides: InputOverrides) -> None:
+        """检查覆盖项的路径（在基础数据对象的副本上试用）"""
+        for path in overrides.paths():
+            stage, parts = split_path(path)
+            if stage not in self.objects:
+                raise ValueError(f"阶段未启用或不支持内存覆盖: {path}")
+            apply_override(data_root(stage, copy_stage_object(self.objects[stage])), parts, 1.0, True, path)
+
+    # ==================== 计算 ====================
+
+    def affected(self, stages: Iterable[str]) -> Set[str]:
+        """阶段及其全部下游阶段"""
+        affected = set(stages)
+        for name in self.stages:
+            if self.dependencies[name] & affected:
+                affected.add(name)
+        return affected
+
+    def upstream(self, targets: Iterable[str]) -> Set[str]:
+        """阶段及其全部上游阶段"""
+        needed = set(targets)
+        for name in reversed(self.stages):
+            if name in needed:
+                needed |= self.dependencies[name]
+        return needed
+
+    def _use_module_results(self, name: str) -> bool:
+        if name in self.config.get('modules', {}):
+            return False
+        return bool(self.config.get('analysis', {}).get(name, {}).get('use_module_results', False))
+
+    def _stage_object(self, name: str, results: Dict[str, Dict[str, Any]]):
+        """基础数据对象的副本；使用模块结果的分析器按当前上游结果重新提取数据"""
+        obj = copy_stage_object(self.objects[name])
+        if self._use_module_results(name) and results:
+            for module_name, module_results in results.items():
+                obj.load_module_results(module_name, module_results)
+            if name == 'macro':
+                obj.load_sector_data_from_modules()
+            else:
+                obj.load_from_modules()
+            obj.module_results = {}
+        return obj
+
+    def evaluate(self, overrides: InputOverrides = None,
+                 targets: Iterable[str] = None) -> Dict[str, Dict[str, Any]]:
+        """
+        计算一个情景
+        Args:
+            overrides: 输入覆盖项，为空时返回基础情景
+            targets: 需要的阶段，为空时为全部阶段（只计算这些阶段的上游中受影响的阶段）
+        Returns:
+            {阶段: 结果字典}，未受影响的阶段为基础情景结果（共享，不应修改）
+        """
+        overrides = overrides or InputOverrides()
+        by_stage: Dict[str, List[Tuple[List[str], float, bool, str]]] = {}
+        for scale, items in ((True, overrides.scale), (False, overrides.values)):
+            for path, value in items.items():
+                stage, parts = split_path(path)
+                if stage not in self.objects:
+                    raise ValueError(f"阶段未启用或不支持内存覆盖: {path}")
+                by_stage.setdefault(stage, []).append((parts, value, scale, path))
+
+        recompute = self.affected(by_stage)
+        if targets is not None:
+            recompute &= self.upstream(targets)
+
+        results: Dict[str, Dict[str, Any]] = {}
+        with redirect_stdout(io.StringIO()):
+            for name in self.stages:
+                if name not in recompute:
+                    results[name] = self.base[name]
+                    continue
+                obj = self._stage_object(name, results)
+                root = data_root(name, obj)
+                for parts, value, scale, path in by_stage.get(name, []):
+                    apply_override(root, parts, value, scale, path)
+                results[name] = obj.calculate()
+        return results
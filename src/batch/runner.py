@@ -0,0 +1,261 @@
+# -*- coding: utf-8 -*-
+"""批量情景执行器
+
+在进程池中运行多个情景，每个情景在工作进程内完整执行一遍计算模块和分析模块（main.run_all），
+输出写入各自的情景目录。工作进程在启动时导入一次计算代码（pandas 等），之后连续处理多个情景，
+不再为每个情景重复启动解释器和导入依赖；各情景互不依赖，吞吐量随进程数近似线性增长。
+每个情景的打印输出在工作进程中捕获，写入情景目录下的 run.log。
+多个情景共用的输入文件由主进程解析一次后放入共享内存（见 shared.py），工作进程直接映射使用。
+启用检查点时各阶段完成后记入只追加的日志（见 journal.py），重新运行同一批情景时跳过已完成的情景和阶段。
+"""
+
+import io
+import os
+import pickle
+import time
+import traceback
+from contextlib import redirect_stdout
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Dict, Any, List, Optional
+from dataclasses import dataclass, field
+
+from ..pipeline.runner import STATUS_DONE, STATUS_FAILED
+from ..utils import IOHandler, ResultStore
+from .scenarios import ScenarioSpec, scenario_config, DEFAULT_OUTPUT_ROOT
+from .shared import SharedInputs, SharedTableMeta, shared_input_files
+from .journal import BatchJournal, SCENARIO_DONE, config_key, save_stage, completed_stages
+
+
+# 情景日志文件名
+LOG_FILENAME = 'run.log'
+
+# 情景结果文件名（save_results 时保存 {名称: 结果字典}）
+RESULTS_FILENAME = 'results.pkl'
+
+
+@dataclass
+class ScenarioResult:
+    """情景执行结果"""
+    name: str
+    status: str
+    seconds: float = 0.0
+    output_dir: str = ''
+    error: str = ''
+    # 情景输出目录中的文件
+    written: List[str] = field(default_factory=list)
+    # 各模块/分析的结果字典（collect=True 时返回）
+    results: Dict[str, Any] = field(default_factory=dict)
+    # 是否由检查点跳过（上次运行已完成）
+    resumed: bool = False
+
+
+# 工作进程中映射的共享输入表
+_worker_inputs: Optional[SharedInputs] = None
+
+# 工作进程中的检查点日志 {输出根目录: BatchJournal}
+_worker_journals: Dict[str, BatchJournal] = {}
+
+
+def _init_worker(shared_index: Dict[str, SharedTableMeta] = None) -> None:
+    """工作进程初始化：预先导入计算代码，映射共享输入表"""
+    global _worker_inputs
+    import main  # noqa: F401
+    if shared_index:
+        _worker_inputs = SharedInputs.attach(shared_index)
+        IOHandler.register_table_source(_worker_inputs)
+
+
+def run_scenario(name: str, config: Dict[str, Any], output_dir: str,
+                 collect: bool = False, save_results: bool = False,
+                 checkpoint_root: Optional[str] = None, completed: List[str] = ()) -> ScenarioResult:
+    """
+    在当前进程中运行单个情景（工作进程的任务函数）
+    - save_results 时将结果字典保存为情景目录下的 results.pkl（成功后原子写入，失败时不留旧文件）
+    - checkpoint_root 不为空时，各阶段结果写入 _stages/ 并在该输出根目录的日志中记录完成；
+      completed 中的阶段从 _stages/ 恢复后跳过
+    """
+    import main
+    start = time.perf_counter()
+    buffer = io.StringIO()
+    os.makedirs(output_dir, exist_ok=True)
+    results_file = os.path.join(output_dir, RESULTS_FILENAME)
+    if save_results and os.path.exists(results_file):
+        os.remove(results_file)
+
+    store = ResultStore()
+    journal, key, on_stage, restored = None, config_key(config), None, []
+    if checkpoint_root:
+        journal = _worker_journals.setdefault(checkpoint_root, BatchJournal(checkpoint_root))
+        for stage, saved in completed_stages(output_dir, list(completed)).items():
+            if saved['entry'] is not None:
+                store.restore(stage, *saved['entry'])
+            restored.append(stage)
+
+        def on_stage(stage, store):
+            save_stage(output_dir, stage, {'entry': store.entry(stage) if stage in store else None})
+            journal.record(name, key, stage)
+
+    status, error, results = STATUS_DONE, '', {}
+    try:
+        with redirect_stdout(buffer):
+            store = main.run_all(config, store, restored, on_stage)
+        if save_results:
+            temp = os.path.join(output_dir, f'.{RESULTS_FILENAME}.tmp')
+            with open(temp, 'wb') as f:
+                pickle.dump(dict(store), f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temp, results_file)
+        if journal is not None:
+            journal.record(name, key, SCENARIO_DONE, sync=True)
+        if collect:
+            results = dict(store)
+    except Exception:
+        status, error = STATUS_FAILED, traceback.format_exc()
+
+    with open(os.path.join(output_dir, LOG_FILENAME), 'a' if restored else 'w',
+              encoding='utf-8') as f:
+        f.write(buffer.getvalue())
+        f.write(error)
+    return ScenarioResult(name, status, time.perf_counter() - start, output_dir,
+                          error, _output_files(output_dir), results)
+
+
+def _output_files(output_dir: str) -> List[str]:
+    return sorted(os.path.join(output_dir, filename) for filename in os.listdir(output_dir)
+                  if filename != LOG_FILENAME and os.path.isfile(os.path.join(output_dir, filename)))
+
+
+def _resumed_result(name: str, output_dir: str, stages: List[str], collect: bool) -> ScenarioResult:
+    """上次运行已完成的情景（collect 时从 _stages/ 读取结果）"""
+    results = {}
+    if collect:
+        for stage, saved in completed_stages(output_dir, stages).items():
+            if saved['entry'] is not None:
+                results[stage] = saved['entry'][0]
+    return ScenarioResult(name, STATUS_DONE, 0.0, output_dir, '', _output_files(output_dir),
+                          results, resumed=True)
+
+
+class BatchRunner:
+    """批量情景执行器"""
+
+    def __init__(self, scenarios: List[ScenarioSpec], base_config: Dict[str, Any],
+                 output_root: str = DEFAULT_OUTPUT_ROOT, max_workers: Optional[int] = None,
+                 verbose: bool = True, collect: bool = False, share_inputs: bool = True,
+                 save_results: bool = False, checkpoint: bool = True):
+        """
+        Args:
+            scenarios: 情景列表
+            base_config: 基础配置（config.json 的内容）
+            output_root: 输出根目录，各情景输出到 {output_root}/{情景名称}/
+            max_workers: 进程数，为空时取CPU核数；为1时在当前进程中顺序执行
+            verbose: 是否打印各情景的状态
+            collect: 是否将各情景的结果字典传回主进程
+            share_inputs: 是否将多个情景共用的输入文件解析一次后通过共享内存传给工作进程
+            save_results: 是否将各情景的结果字典保存为情景目录下的 results.pkl
+            checkpoint: 是否记录检查点日志并跳过上次运行已完成的情景和阶段
+        """
+        self.scenarios = scenarios
+        self.base_config = base_config
+        self.output_root = output_root
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.verbose = verbose
+        self.collect = collect
+        self.share_inputs = share_inputs
+        self.save_results = save_results
+        self.checkpoint = checkpoint
+
+    def jobs(self) -> List[tuple]:
+        """各情景的 (名称, 配置, 输出目录)"""
+        jobs = []
+        for spec in self.scenarios:
+            config, output_dir = scenario_config(self.base_config, spec, self.output_root)
+            jobs.append((spec.name, config, output_dir))
+        return jobs
+
+    def run(self) -> Dict[str, ScenarioResult]:
+        """运行全部情景，返回 {情景名称: ScenarioResult}（按情景顺序）"""
+        jobs = self.jobs()
+        results: Dict[str, ScenarioResult] = {}
+        start = time.perf_counter()
+        pending = self._resume(jobs, results) if self.checkpoint else [(*job, []) for job in jobs]
+        checkpoint_root = self.output_root if self.checkpoint else None
+        tasks = [(name, config, output_dir, self.collect, self.save_results, checkpoint_root, stages)
+                 for name, config, output_dir, stages in pending]
+        workers = min(self.max_workers, len(tasks))
+
+        if workers <= 1:
+            for task in tasks:
+                self._record(run_scenario(*task), results)
+            for journal in _worker_journals.values():
+                journal.close()
+            _worker_journals.clear()
+        else:
+            shared = self._publish_inputs([task[1] for task in tasks])
+            try:
+                with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                         initargs=(shared.index if shared else None,)) as executor:
+                    futures = [executor.submit(run_scenario, *task) for task in tasks]
+                    for future in as_completed(futures):
+                        self._record(future.result(), results)
+            finally:
+                if shared is not None:
+                    shared.unlink()
+
+        ordered = {name: results[name] for name, _, _ in jobs}
+        if self.verbose:
+            self.print_summary(ordered, time.perf_counter() - start, workers)
+        return ordered
+
+    def _resume(self, jobs: List[tuple], results: Dict[str, ScenarioResult]) -> List[tuple]:
+        """
+        回放检查点日志：上次已完成的情景记入 results，
+        返回待运行的 (名称, 配置, 输出目录, 已完成阶段)
+        """
+        states = BatchJournal(self.output_root).load()
+        pending = []
+        for name, config, output_dir in jobs:
+            state = states.get(name)
+            if state is None or state.key != config_key(config):
+                pending.append((name, config, output_dir, []))
+            elif state.done and (not self.save_results or
+                                 os.path.exists(os.path.join(output_dir, RESULTS_FILENAME))):
+                results[name] = _resumed_result(name, output_dir, sorted(state.stages), self.collect)
+            else:
+                pending.append((name, config, output_dir, sorted(state.stages)))
+        if self.verbose and results:
+            partial = sum(1 for task in pending if task[3])
+            print(f"检查点: 跳过已完成的情景 {len(results)} 个，从中断处继续的情景 {partial} 个")
+        return pending
+
+    def _publish_inputs(self, configs: List[Dict[str, Any]]) -> Optional[SharedInputs]:
+        """发布多个情景共用的输入文件"""
+        if not self.share_inputs:
+            return None
+        paths = shared_input_files(configs)
+        if not paths:
+            return None
+        shared = SharedInputs.publish(paths)
+        if self.verbose:
+            print(f"共享输入文件: {len(paths)} 个，共享内存 {shared.nbytes / 1024:.1f} KB")
+        return shared
+
+    def _record(self, result: ScenarioResult, results: Dict[str, ScenarioResult]) -> None:
+        results[result.name] = result
+        if not self.verbose:
+            return
+        print(f"[{result.status}] {result.name} ({result.seconds:.2f}s) -> {result.output_dir}")
+        if result.error:
+            print(result.error)
+
+    @staticmethod
+    def print_summary(results: Dict[str, ScenarioResult], seconds: float, workers: int) -> None:
+        """打印各情景状态、耗时和吞吐量"""
+        done = sum(1 for result in results.values() if result.status == STATUS_DONE)
+        print("\n" + "=" * 70)
+        print(f"批量计算完成: {done}/{len(results)} 个情景成功，进程数 {max(workers, 1)}，"
+              f"总耗时 {seconds:.2f}s（{len(results) / seconds if seconds else 0:.2f} 个情景/秒）")
+        print("=" * 70)
+        for name, result in results.items():
+            timing = '已完成' if result.resumed else f"{result.seconds:.2f}s"
+            print(f"  {name:<24}{result.status:<6}{timing:>9}  {result.output_dir}")
+        print("=" * 70)
@@ -0,0 +1,104 @@
+# -*- coding: utf-8 -*-
+"""批量情景定义
+
+情景文件（JSON）格式:
+{
+  "config": "config/config.json",          基础配置（可选，默认 config/config.json）
+  "output_root": "data/output/batch",      输出根目录（可选）
+  "scenarios": [
+    {"name": "基准"},
+    {"name": "高比例可再生", "input_dir": "data/input/high_re"},
+    {"name": "向量化", "overrides": {"modules": {"power": {"engine": "vectorized"}}}}
+  ]
+}
+也可直接为情景列表。每个情景的全部输出写入 {output_root}/{name}/ 下。
+"""
+
+import copy
+import json
+import os
+from typing import Dict, Any, List, Optional, Tuple
+from dataclasses import dataclass, field
+
+
+# 默认输出根目录
+DEFAULT_OUTPUT_ROOT = 'data/output/batch'
+
+
+@dataclass
+class ScenarioSpec:
+    """情景定义"""
+    # 情景名称（同时作为输出子目录名）
+    name: str
+    # 输入目录：配置中的输入文件改为从该目录读取同名文件（目录中没有的文件仍用基础配置的路径）
+    input_dir: Optional[str] = None
+    # 配置覆盖项，按层级合并到基础配置，如 {"modules": {"power": {"engine": "vectorized"}}}
+    overrides: Dict[str, Any] = field(default_factory=dict)
+    # 输出目录，为空时为 {output_root}/{name}
+    output_dir: Optional[str] = None
+
+
+def merge_config(base: Dict[str, Any], overrides: Dict[str, Any]) -> Dict[str, Any]:
+    """按层级合并配置（字典递归合并，其他值直接替换），不修改 base"""
+    merged = copy.deepcopy(base)
+    for key, value in overrides.items():
+        if isinstance(value, dict) and isinstance(merged.get(key), dict):
+            merged[key] = merge_config(merged[key], value)
+        else:
+            merged[key] = copy.deepcopy(value)
+    return merged
+
+
+def scenario_config(base: Dict[str, Any], spec: ScenarioSpec,
+                    output_root: str = DEFAULT_OUTPUT_ROOT) -> Tuple[Dict[str, Any], str]:
+    """
+    生成情景配置，返回 (配置, 输出目录)
+    - 各模块/分析的 output_*_file 改写到情景输出目录，statistics 的 data_dir 指向情景输出目录
+    - 指定 input_dir 时，其他 *_file 改为 input_dir 下的同名文件（存在时）
+    - 最后合并 overrides，显式覆盖的路径不再改写
+    """
+    output_dir = spec.output_dir or os.path.join(output_root, spec.name)
+    config = copy.deepcopy(base)
+    for section in ('modules', 'analysis'):
+        for cfg in config.get(section, {}).values():
+            for key, value in list(cfg.items()):
+                if not isinstance(value, str):
+                    continue
+                if key.startswith('output_') and key.endswith('_file'):
+                    cfg[key] = os.path.join(output_dir, os.path.basename(value))
+                elif key == 'data_dir':
+                    cfg[key] = output_dir
+                elif key.endswith('_file') and spec.input_dir:
+                    candidate = os.path.join(spec.input_dir, os.path.basename(value))
+                    if os.path.exists(candidate):
+                        cfg[key] = candidate
+    return merge_config(config, spec.overrides), output_dir
+
+
+def load_scenarios(filepath: str) -> Tuple[List[ScenarioSpec], Dict[str, Any]]:
+    """
+    读取情景文件，返回 (情景列表, 文件级设置 {'config': ..., 'output_root': ...})
+    """
+    with open(filepath, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    settings = {}
+    if isinstance(data, dict):
+        settings = {k: v for k, v in data.items() if k != 'scenarios'}
+        data = data.get('scenarios', [])
+
+    scenarios = []
+    for i, item in enumerate(data):
+        if isinstance(item, str):
+            item = {'name': item}
+        spec = ScenarioSpec(
+            name=str(item.get('name', f"scenario_{i + 1}")),
+            input_dir=item.get('input_dir'),
+            overrides=item.get('overrides', {}),
+            output_dir=item.get('output_dir'))
+        scenarios.append(spec)
+
+    names = [spec.name for spec in scenarios]
+    duplicates = sorted({name for name in names if names.count(name) > 1})
+    if duplicates:
+        raise ValueError(f"情景名称重复: {', '.join(duplicates)}")
+    return scenarios, settings
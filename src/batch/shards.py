@@ -0,0 +1,226 @@
+# -*- coding: utf-8 -*-
+"""分片执行和结果合并
+
+多节点运行同一情景列表时：
+- shard_scenarios() 按情景名称的哈希把情景确定性地分到 N 个分片，与情景顺序和节点无关
+- 每个节点运行一个分片（run_shard），输出写入共享文件系统上的同一输出根目录：
+  各情景目录下的 results.pkl（成功时原子写入）和 {output_root}/_shards/ 下的分片记录
+- merge_results() 汇总所有已完成情景的 results.pkl，生成合并数据集
+  {output_root}/_merged/results.pkl（{情景: 结果}）和 results_long.csv（情景,结果,项目,年份,数值）
+
+合并只依赖已完成情景的结果文件，情景和各情景的结果均按名称排序后原子写出，可重复执行：
+分片失败后重新运行该分片（或从检查点恢复）再合并，得到的数据集与一次全部成功逐字节相同。
+不依赖外部调度器，本机启动多个分片进程即可测试。
+"""
+
+import copy
+import csv
+import hashlib
+import json
+import os
+import pickle
+import sys
+import tempfile
+from typing import Dict, Any, List, Optional, Tuple
+
+from .scenarios import ScenarioSpec, DEFAULT_OUTPUT_ROOT
+from .runner import BatchRunner, ScenarioResult, RESULTS_FILENAME
+
+
+# 分片记录目录和合并结果目录（输出根目录下）
+SHARDS_DIRNAME = '_shards'
+MERGED_DIRNAME = '_merged'
+
+
+def shard_of(name: str, num_shards: int) -> int:
+    """情景所属分片（情景名称 SHA-256 取模，与 Python 哈希随机化无关）"""
+    digest = hashlib.sha256(name.encode('utf-8')).hexdigest()
+    return int(digest[:16], 16) % num_shards
+
+
+def shard_scenarios(scenarios: List[ScenarioSpec], num_shards: int,
+                    shard_index: int) -> List[ScenarioSpec]:
+    """第 shard_index 个分片（从0开始）的情景，保持原顺序"""
+    if num_shards < 1 or not 0 <= shard_index < num_shards:
+        raise ValueError(f"分片编号无效: {shard_index}/{num_shards}")
+    return [spec for spec in scenarios if shard_of(spec.name, num_shards) == shard_index]
+
+
+def parse_shard(text: str) -> Tuple[int, int]:
+    """解析 '编号/分片数'，如 '0/4'"""
+    try:
+        index, count = (int(part) for part in text.split('/'))
+    except ValueError:
+        raise ValueError(f"分片格式应为 编号/分片数，如 0/4: {text}")
+    if count < 1 or not 0 <= index < count:
+        raise ValueError(f"分片编号无效: {text}")
+    return index, count
+
+
+def _atomic_write(filepath: str, write, mode: str = 'w', **kwargs) -> None:
+    """写入同目录临时文件后改名"""
+    directory = os.path.dirname(os.path.abspath(filepath))
+    os.makedirs(directory, exist_ok=True)
+    handle, temp = tempfile.mkstemp(prefix=f'.{os.path.basename(filepath)}-', dir=directory)
+    try:
+        with os.fdopen(handle, mode, **kwargs) as f:
+            write(f)
+        os.replace(temp, filepath)
+    except BaseException:
+        if os.path.exists(temp):
+            os.remove(temp)
+        raise
+
+
+# ==================== 分片执行 ====================
+
+def run_shard(scenarios: List[ScenarioSpec], base_config: Dict[str, Any], shard_index: int,
+              num_shards: int, output_root: str = DEFAULT_OUTPUT_ROOT,
+              max_workers: Optional[int] = None, verbose: bool = True,
+              checkpoint: bool = True) -> Dict[str, ScenarioResult]:
+    """
+    运行一个分片，各情景的结果保存为情景目录下的 results.pkl，分片记录写入 _shards/
+    启用检查点时重新运行失败的分片只计算未完成的情景
+    """
+    specs = shard_scenarios(scenarios, num_shards, shard_index)
+    if verbose:
+        print(f"分片 {shard_index}/{num_shards}: {len(specs)} 个情景")
+    runner = BatchRunner(specs, base_config, output_root, max_workers=max_workers,
+                         verbose=verbose, save_results=True, checkpoint=checkpoint)
+    results = runner.run()
+
+    record = {
+        'shard': shard_index,
+        'num_shards': num_shards,
+        'scenarios': {name: {'status': result.status, 'seconds': round(result.seconds, 3),
+                             'output_dir': result.output_dir}
+                      for name, result in results.items()},
+    }
+    _atomic_write(shard_record_path(output_root, shard_index, num_shards),
+                  lambda f: json.dump(record, f, ensure_ascii=False, indent=2), encoding='utf-8')
+    return results
+
+
+def shard_record_path(output_root: str, shard_index: int, num_shards: int) -> str:
+    return os.path.join(output_root, SHARDS_DIRNAME,
+                        f"shard-{shard_index:03d}-of-{num_shards:03d}.json")
+
+
+def recorded_num_shards(output_root: str) -> Optional[int]:
+    """分片记录中的分片数（有多种分片数时取最近写入的）"""
+    shards_dir = os.path.join(output_root, SHARDS_DIRNAME)
+    if not os.path.isdir(shards_dir):
+        return None
+    records = [os.path.join(shards_dir, f) for f in os.listdir(shards_dir)
+               if f.startswith('shard-') and f.endswith('.json')]
+    if not records:
+        return None
+    latest = max(records, key=os.path.getmtime)
+    return int(os.path.basename(latest)[:-len('.json')].rsplit('-of-', 1)[1])
+
+
+# ==================== 合并 ====================
+
+def flatten_results(results: Dict[str, Any]) -> List[Tuple[str, str, float]]:
+    """
+    结果字典展开为 (项目, 年份, 数值)
+    项目为嵌套键以 '/' 连接；与年份等长的数值列表按年份展开，其他列表按序号展开
+    """
+    years = [str(y) for y in results.get('years', [])]
+    rows = []
+
+    def walk(value, path):
+        if isinstance(value, dict):
+            for key, item in value.items():
+                if path == '' and key == 'years':
+                    continue
+                walk(item, f"{path}/{key}" if path else str(key))
+        elif isinstance(value, (list, tuple)):
+            labels = years if years and len(value) == len(years) else [str(i) for i in range(len(value))]
+            for label, item in zip(labels, value):
+                if isinstance(item, (int, float)) and not isinstance(item, bool):
+                    rows.append((path, label, float(item)))
+                elif isinstance(item, (dict, list, tuple)):
+                    walk(item, f"{path}/{label}")
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            rows.append((path, '', float(value)))
+
+    walk(results, '')
+    return rows
+
+
+def canonical_copy(value: Any) -> Any:
+    """
+    结果的规范副本：字典、列表和元组逐层重建（互不共享），字符串驻留（相同内容为同一对象）
+    从检查点恢复的阶段与一次运行完成的阶段对象共享关系不同，规范化后 pickle 输出只取决于内容
+    """
+    if type(value) is str:
+        return sys.intern(value)
+    if type(value) is dict:
+        return {canonical_copy(k): canonical_copy(v) for k, v in value.items()}
+    if type(value) is list:
+        return [canonical_copy(v) for v in value]
+    if type(value) is tuple:
+        return tuple(canonical_copy(v) for v in value)
+    return copy.deepcopy(value)
+
+
+def merge_results(output_root: str = DEFAULT_OUTPUT_ROOT,
+                  scenarios: List[ScenarioSpec] = None, num_shards: int = None,
+                  verbose: bool = True) -> Dict[str, Any]:
+    """
+    合并已完成情景的结果
+    Args:
+        output_root: 输出根目录（各分片共用）
+        scenarios: 完整情景列表，给出时报告未完成的情景及其分片；为空时合并输出根目录下全部结果
+        num_shards: 分片数（报告未完成情景所属分片），为空时取分片记录中的分片数
+    Returns:
+        {'merged': [情景], 'missing': [情景], 'missing_shards': [分片编号], 'files': [合并输出文件]}
+    """
+    if scenarios is not None:
+        names = [spec.name for spec in scenarios]
+        output_dirs = {spec.name: spec.output_dir or os.path.join(output_root, spec.name)
+                       for spec in scenarios}
+    else:
+        names = sorted(d for d in os.listdir(output_root)
+                       if not d.startswith(('_', '.')) and
+                       os.path.isdir(os.path.join(output_root, d)))
+        output_dirs = {name: os.path.join(output_root, name) for name in names}
+
+    merged: Dict[str, Any] = {}
+    missing = []
+    for name in sorted(names):
+        results_file = os.path.join(output_dirs[name], RESULTS_FILENAME)
+        if not os.path.exists(results_file):
+            missing.append(name)
+            continue
+        with open(results_file, 'rb') as f:
+            store = pickle.load(f)
+        merged[name] = {key: canonical_copy(store[key]) for key in sorted(store)}
+
+    merged_dir = os.path.join(output_root, MERGED_DIRNAME)
+    results_path = os.path.join(merged_dir, 'results.pkl')
+    long_path = os.path.join(merged_dir, 'results_long.csv')
+    _atomic_write(results_path, lambda f: pickle.dump(merged, f, protocol=pickle.HIGHEST_PROTOCOL),
+                  mode='wb')
+
+    def write_long(f):
+        writer = csv.writer(f)
+        writer.writerow(['情景', '结果', '项目', '年份', '数值'])
+        for name, store in merged.items():
+            for result_name in store:
+                for item, year, value in flatten_results(store[result_name]):
+                    writer.writerow([name, result_name, item, year, repr(value)])
+    _atomic_write(long_path, write_long, newline='', encoding='utf-8')
+
+    num_shards = num_shards or recorded_num_shards(output_root)
+    missing_shards = sorted({shard_of(name, num_shards) for name in missing}) if num_shards else []
+    if verbose:
+        print(f"合并完成: {len(merged)} 个情景 -> {merged_dir}")
+        if missing:
+            print(f"未完成的情景 {len(missing)} 个: {', '.join(missing[:20])}"
+                  f"{' ...' if len(missing) > 20 else ''}")
+            if missing_shards:
+                print(f"需要重新运行的分片: {', '.join(f'{i}/{num_shards}' for i in missing_shards)}")
+    return {'merged': list(merged), 'missing': missing, 'missing_shards': missing_shards,
+            'files': [results_path, long_path]}
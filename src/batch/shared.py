@@ -0,0 +1,162 @@
+# -*- coding: utf-8 -*-
+"""共享内存输入表
+
+批量计算中多个情景共用的输入文件（未被情景输入目录覆盖的基础输入、逐时曲线等）由主进程解析一次：
+- 数值列按列连续存放在一个只读的 multiprocessing.shared_memory 缓冲区中
+- 列名、数据类型、文本列内容和文件时间戳记入元数据索引（随进程池初始化参数传给工作进程）
+工作进程按索引映射缓冲区（零拷贝），注册为 IOHandler 的输入表来源，
+计算器读取这些文件时直接由共享数据构造 DataFrame，不再重复读取和解析CSV。
+文件在发布后被修改（时间戳或大小变化）时回退为读取文件。
+"""
+
+import os
+from multiprocessing import shared_memory
+from typing import Dict, Any, List, Optional, Iterable, Tuple
+from dataclasses import dataclass, field
+
+import numpy as np
+import pandas as pd
+
+from ..utils import file_stamp
+
+
+# 情景配置中可共享的输入文件键（由 IOHandler.read_csv 读取的文件）
+SHARED_INPUT_KEYS = ('input_csv_file', 'sector_data_csv_file', 'profile_csv_file')
+
+
+@dataclass
+class SharedTableMeta:
+    """共享输入表的元数据"""
+    # 共享内存块名称
+    shm_name: str
+    rows: int
+    columns: List[str]
+    # 数值列 {列名: 原数据类型}，按此顺序存放在缓冲区中
+    numeric: Dict[str, str] = field(default_factory=dict)
+    # 文本列 {列名: 值列表}
+    objects: Dict[str, list] = field(default_factory=dict)
+    # 文件 (修改时间, 大小)，用于检查发布后文件是否被修改
+    stamp: Tuple[int, int] = (0, 0)
+
+
+def shared_input_files(configs: Iterable[Dict[str, Any]], min_uses: int = 2) -> List[str]:
+    """各情景配置中被至少 min_uses 个情景使用的输入文件（绝对路径）"""
+    uses: Dict[str, int] = {}
+    for config in configs:
+        paths = set()
+        for section in ('modules', 'analysis'):
+            for cfg in config.get(section, {}).values():
+                if not cfg.get('enabled', True):
+                    continue
+                for key in SHARED_INPUT_KEYS:
+                    path = cfg.get(key)
+                    if path and os.path.exists(path):
+                        paths.add(os.path.abspath(path))
+        for path in paths:
+            uses[path] = uses.get(path, 0) + 1
+    return sorted(path for path, count in uses.items() if count >= min_uses)
+
+
+class SharedInputs:
+    """共享内存输入表集合（主进程发布，工作进程映射）"""
+
+    def __init__(self, index: Dict[str, SharedTableMeta], owner: bool = False):
+        self.index = index
+        self.owner = owner
+        self._blocks: Dict[str, shared_memory.SharedMemory] = {}
+        self._arrays: Dict[str, np.ndarray] = {}
+
+    # ==================== 主进程 ====================
+
+    @classmethod
+    def publish(cls, paths: Iterable[str]) -> 'SharedInputs':
+        """解析输入文件并写入共享内存"""
+        inputs = cls({}, owner=True)
+        try:
+            for path in paths:
+                inputs._publish_table(os.path.abspath(path), pd.read_csv(path, encoding='utf-8'))
+        except Exception:
+            inputs.unlink()
+            raise
+        return inputs
+
+    def _publish_table(self, path: str, df: pd.DataFrame) -> None:
+        numeric = {str(c): str(df[c].dtype) for c in df.columns if df[c].dtype.kind in 'fiub'}
+        objects = {str(c): df[c].tolist() for c in df.columns if str(c) not in numeric}
+        rows = len(df)
+        block = shared_memory.SharedMemory(create=True, size=max(rows * len(numeric) * 8, 1))
+        array = np.ndarray((rows, len(numeric)), dtype=np.float64, buffer=block.buf, order='F')
+        for j, column in enumerate(numeric):
+            array[:, j] = df[column].to_numpy(dtype=np.float64)
+        self.index[path] = SharedTableMeta(block.name, rows, [str(c) for c in df.columns],
+                                           numeric, objects, file_stamp(path))
+        self._blocks[path] = block
+        self._arrays[path] = array
+
+    @property
+    def nbytes(self) -> int:
+        """共享内存总字节数"""
+        return sum(block.size for block in self._blocks.values())
+
+    # ==================== 工作进程 ====================
+
+    @classmethod
+    def attach(cls, index: Dict[str, SharedTableMeta]) -> 'SharedInputs':
+        """按元数据索引映射共享内存（只读视图）"""
+        inputs = cls(index, owner=False)
+        for path, meta in index.items():
+            block = shared_memory.SharedMemory(name=meta.shm_name)
+            array = np.ndarray((meta.rows, len(meta.numeric)), dtype=np.float64,
+                               buffer=block.buf, order='F')
+            array.flags.writeable = False
+            inputs._blocks[path] = block
+            inputs._arrays[path] = array
+        return inputs
+
+    def array(self, filepath: str) -> Optional[np.ndarray]:
+        """数值列矩阵（行 × 数值列，只读视图），未共享时返回 None"""
+        return self._arrays.get(os.path.abspath(filepath))
+
+    def get(self, filepath: str) -> Optional[pd.DataFrame]:
+        """输入表（与 pd.read_csv 结果相同），未共享或文件已修改时返回 None"""
+        path = os.path.abspath(filepath)
+        meta = self.index.get(path)
+        if meta is None or path not in self._arrays or file_stamp(path) != tuple(meta.stamp):
+            return None
+        array = self._arrays[path]
+        data = {}
+        positions = {column: j for j, column in enumerate(meta.numeric)}
+        for column in meta.columns:
+            if column in positions:
+                values = array[:, positions[column]]
+                dtype = meta.numeric[column]
+                data[column] = values if dtype == 'float64' else values.astype(dtype)
+            else:
+                data[column] = meta.objects[column]
+        return pd.DataFrame(data, columns=meta.columns)
+
+    # ==================== 释放 ====================
+
+    def close(self) -> None:
+        """解除映射"""
+        self._arrays.clear()
+        for block in self._blocks.values():
+            block.close()
+        self._blocks.clear()
+
+    def unlink(self) -> None:
+        """解除映射并删除共享内存（仅主进程）"""
+        blocks = list(self._blocks.values())
+        self.close()
+        if self.owner:
+            for block in blocks:
+                try:
+                    block.unlink()
+                except FileNotFoundError:
+                    pass
+
+    def __enter__(self) -> 'SharedInputs':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.unlink()
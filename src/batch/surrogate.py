@@ -0,0 +1,335 @@
+# -*- coding: utf-8 -*-
+"""情景计算的代理模型（多项式混沌展开）
+
+交互式探索（仪表盘滑块等）不必每次重算计算链：在设计参数范围内用实验设计（design.py）
+完整计算一组训练点，拟合输入参数到关键输出逐年数值的多项式混沌展开，预测一个情景只需微秒级。
+
+- 基函数：各参数换算到 [-1, 1] 后的 Legendre 多项式乘积（总阶数不超过 degree）
+- 拟合：最小二乘（QR 分解），阶数在 1..max_degree 中按留一交叉验证误差选择（由帽子矩阵直接算出，不重复拟合）
+- 误差估计：残差标准差 σ 乘以 sqrt(1 + h(x))，h(x) 为预测点的杠杆值，训练点稀疏处误差估计变大
+- 验证：在另一组设计点上比较预测与完整计算，报告各指标逐年的 R²、RMSE、最大误差和误差估计的覆盖率
+
+模型保存为 .npz（默认在设计文件或设计点文件旁，名称为 {文件名}.surrogate.npz），读取不需要输入数据。
+"""
+
+import csv
+import json
+import os
+from typing import Dict, Any, List, Tuple
+
+import numpy as np
+
+from .design import DesignParameter, DesignPoint, DesignRunner
+
+
+# 代理模型的默认输出指标 (名称, 阶段, 结果中的路径)
+SURROGATE_OUTPUTS = [
+    ('温室气体净排放', 'trajectory', ('summary', 'net_ghg_emission')),
+    ('煤炭占比', 'structure', ('structure', 'coal_ratio')),
+    ('石油占比', 'structure', ('structure', 'oil_ratio')),
+    ('天然气占比', 'structure', ('structure', 'gas_ratio')),
+    ('非化石能源占比', 'structure', ('structure', 'non_fossil_ratio')),
+    ('LCOE', 'power', ('lcoe', 'LCOE')),
+]
+
+# 默认最高阶数
+MAX_DEGREE = 3
+
+# 误差估计覆盖率的区间倍数（±2σ 约 95%）
+COVERAGE_FACTOR = 2.0
+
+
+def surrogate_path(source: str) -> str:
+    """设计文件或设计点文件旁的代理模型文件"""
+    return os.path.splitext(source)[0] + '.surrogate.npz'
+
+
+def multi_indices(num_parameters: int, degree: int) -> np.ndarray:
+    """总阶数不超过 degree 的多重指标 (项数, 参数数)，按总阶数排列"""
+    indices = [()]
+    for _ in range(num_parameters):
+        indices = [index + (d,) for index in indices for d in range(degree + 1 - sum(index))]
+    return np.array(sorted(indices, key=lambda index: (sum(index), tuple(-d for d in index))),
+                    dtype=int).reshape(-1, num_parameters)
+
+
+def legendre_basis(unit: np.ndarray, alpha: np.ndarray) -> np.ndarray:
+    """[-1, 1] 上的输入 (点数, 参数数) 的 Legendre 乘积基函数值 (点数, 项数)"""
+    degree = int(alpha.max()) if alpha.size else 0
+    values = np.empty(unit.shape + (degree + 1,))
+    values[..., 0] = 1.0
+    if degree >= 1:
+        values[..., 1] = unit
+    for n in range(1, degree):
+        values[..., n + 1] = ((2 * n + 1) * unit * values[..., n] - n * values[..., n - 1]) / (n + 1)
+    columns = np.arange(alpha.shape[1])
+    return values[:, columns, alpha].prod(axis=2)
+
+
+def design_matrix(points: List[DesignPoint], parameters: List[DesignParameter]) -> np.ndarray:
+    """设计点的参数取值 (点数, 参数数)"""
+    rows = []
+    for point in points:
+        row = []
+        for parameter in parameters:
+            settings = point.overrides.scale if parameter.mode == 'scale' else point.overrides.values
+            if parameter.name not in settings:
+                raise ValueError(f"设计点 {point.name} 缺少参数: {parameter.name}")
+            row.append(settings[parameter.name])
+        rows.append(row)
+    return np.array(rows, dtype=float).reshape(-1, len(parameters))
+
+
+def output_matrix(points: List[DesignPoint], results: Dict[str, Dict[str, Any]],
+                  columns: List[Tuple[str, str]] = None) -> Tuple[np.ndarray, List[Tuple[str, str]], np.ndarray]:
+    """
+    设计点计算结果整理为矩阵
+    Returns:
+        (输出 (点数, 列数), 列 [(指标, 年份)], 有效行掩码)；columns 为空时按第一个成功的设计点确定列
+    """
+    if columns is None:
+        columns = []
+        for point in points:
+            row = results[point.name]
+            if not row['error'] and row['outputs']:
+                columns = [(label, year) for label, by_year in row['outputs'].items() for year in by_year]
+                break
+    matrix = np.full((len(points), len(columns)), np.nan)
+    for i, point in enumerate(points):
+        outputs = results[point.name]['outputs']
+        for j, (label, year) in enumerate(columns):
+            value = outputs.get(label, {}).get(year)
+            if value is not None:
+                matrix[i, j] = value
+    valid = ~np.isnan(matrix).any(axis=1) if columns else np.zeros(len(points), dtype=bool)
+    return matrix, columns, valid
+
+
+class SurrogateModel:
+    """多项式混沌展开代理模型"""
+
+    def __init__(self, parameters: List[DesignParameter], columns: List[Tuple[str, str]],
+                 alpha: np.ndarray, coefficients: np.ndarray, rinv: np.ndarray,
+                 sigma: np.ndarray, loo_rmse: np.ndarray, samples: int):
+        self.parameters = parameters
+        # 输出列 [(指标, 年份)]
+        self.columns = columns
+        # 多重指标 (项数, 参数数)
+        self.alpha = alpha
+        # 系数 (项数, 列数)
+        self.coefficients = coefficients
+        # 基函数矩阵 QR 分解中 R 的逆，用于预测点的杠杆值
+        self.rinv = rinv
+        # 各列残差标准差和留一交叉验证 RMSE
+        self.sigma = sigma
+        self.loo_rmse = loo_rmse
+        # 训练点数
+        self.samples = samples
+        # 保存时的附加说明（训练来源、验证摘要等）
+        self.metadata: Dict[str, Any] = {}
+        self.low = np.array([p.low for p in parameters])
+        self.high = np.array([p.high for p in parameters])
+
+    @property
+    def degree(self) -> int:
+        return int(self.alpha.sum(axis=1).max())
+
+    @property
+    def names(self) -> List[str]:
+        return [p.name for p in self.parameters]
+
+    # ==================== 拟合 ====================
+
+    @staticmethod
+    def _unit(x: np.ndarray, low: np.ndarray, high: np.ndarray) -> np.ndarray:
+        width = np.where(high > low, high - low, 1.0)
+        return 2.0 * (x - low) / width - 1.0
+
+    @staticmethod
+    def _least_squares(basis: np.ndarray, y: np.ndarray):
+        """QR 最小二乘，返回 (系数, R的逆, 留一残差)；基函数矩阵秩亏时返回 None"""
+        q, r = np.linalg.qr(basis)
+        diagonal = np.abs(np.diag(r))
+        if diagonal.min() <= 1e-10 * diagonal.max():
+            return None
+        rinv = np.linalg.inv(r)
+        coefficients = rinv @ (q.T @ y)
+        leverage = (q ** 2).sum(axis=1)
+        loo = (y - basis @ coefficients) / np.maximum(1.0 - leverage, 1e-12)[:, None]
+        return coefficients, rinv, loo
+
+    @classmethod
+    def fit(cls, parameters: List[DesignParameter], x: np.ndarray, y: np.ndarray,
+            columns: List[Tuple[str, str]], max_degree: int = MAX_DEGREE) -> 'SurrogateModel':
+        """
+        拟合代理模型
+        Args:
+            x: 参数取值 (点数, 参数数)
+            y: 输出 (点数, 列数)
+            max_degree: 最高阶数，在 1..max_degree 中按留一交叉验证误差（按各列方差归一）选择
+        """
+        if len(x) != len(y):
+            raise ValueError("参数取值与输出的点数不一致")
+        low = np.array([p.low for p in parameters])
+        high = np.array([p.high for p in parameters])
+        unit = cls._unit(x, low, high)
+        variance = y.var(axis=0)
+        weights = np.where(variance > 0, 1.0 / np.where(variance > 0, variance, 1.0), 0.0)
+
+        best = None
+        for degree in range(1, max_degree + 1):
+            alpha = multi_indices(len(parameters), degree)
+            if len(alpha) + 2 > len(x):
+                break
+            basis = legendre_basis(unit, alpha)
+            solved = cls._least_squares(basis, y)
+            if solved is None:
+                continue
+            coefficients, rinv, loo = solved
+            score = float(((loo ** 2).mean(axis=0) * weights).sum())
+            if best is None or score < best[0]:
+                residuals = y - basis @ coefficients
+                sigma = np.sqrt((residuals ** 2).sum(axis=0) / (len(x) - len(alpha)))
+                loo_rmse = np.sqrt((loo ** 2).mean(axis=0))
+                best = (score, alpha, coefficients, rinv, sigma, loo_rmse)
+        if best is None:
+            raise ValueError(f"训练点不足：{len(parameters)} 个参数的一阶模型至少需要 "
+                             f"{len(parameters) + 3} 个有效训练点")
+        _, alpha, coefficients, rinv, sigma, loo_rmse = best
+        return cls(parameters, columns, alpha, coefficients, rinv, sigma, loo_rmse, len(x))
+
+    # ==================== 预测 ====================
+
+    def predict(self, x: np.ndarray, error: bool = False):
+        """
+        预测 (点数, 列数)；error=True 时同时返回误差估计（1σ）
+        x 为参数取值 (点数, 参数数) 或单个点 (参数数,)
+        """
+        x = np.asarray(x, dtype=float)
+        single = x.ndim == 1
+        basis = legendre_basis(self._unit(np.atleast_2d(x), self.low, self.high), self.alpha)
+        y = basis @ self.coefficients
+        if error:
+            leverage = ((basis @ self.rinv) ** 2).sum(axis=1)
+            e = np.sqrt(1.0 + leverage)[:, None] * self.sigma
+            return (y[0], e[0]) if single else (y, e)
+        return y[0] if single else y
+
+    def values(self, settings: Dict[str, float]) -> np.ndarray:
+        """{参数名称: 取值} 换算为参数向量，未给出的参数取基础情景（倍数 1，取值取范围中点）"""
+        unknown = [name for name in settings if name not in self.names]
+        if unknown:
+            raise ValueError(f"代理模型中没有参数: {', '.join(unknown)}")
+        return np.array([settings.get(p.name, 1.0 if p.mode == 'scale' else (p.low + p.high) / 2)
+                         for p in self.parameters], dtype=float)
+
+    def outside(self, x: np.ndarray) -> List[str]:
+        """超出训练范围的参数（外推时误差估计不可靠）"""
+        return [p.name for p, value in zip(self.parameters, x) if not p.low <= value <= p.high]
+
+    def predict_outputs(self, settings: Dict[str, float]) -> Dict[str, Dict[str, Tuple[float, float]]]:
+        """预测一个情景 {指标: {年份: (预测值, 误差估计)}}"""
+        y, e = self.predict(self.values(settings), error=True)
+        outputs: Dict[str, Dict[str, Tuple[float, float]]] = {}
+        for (label, year), value, err in zip(self.columns, y.tolist(), e.tolist()):
+            outputs.setdefault(label, {})[year] = (value, err)
+        return outputs
+
+    # ==================== 验证 ====================
+
+    def validate(self, x: np.ndarray, y: np.ndarray) -> List[Dict[str, Any]]:
+        """在验证点上比较预测与完整计算，返回各列的 R²、RMSE、最大误差、覆盖率"""
+        predicted, error = self.predict(x, error=True)
+        residuals = y - predicted
+        report = []
+        for j, (label, year) in enumerate(self.columns):
+            variance = y[:, j].var()
+            mse = float((residuals[:, j] ** 2).mean())
+            report.append({
+                'label': label, 'year': year,
+                'r2': float(1.0 - mse / variance) if variance > 0 else (1.0 if mse < 1e-12 else 0.0),
+                'rmse': float(np.sqrt(mse)),
+                'max_error': float(np.abs(residuals[:, j]).max()),
+                'loo_rmse': float(self.loo_rmse[j]),
+                'error_estimate': float(error[:, j].mean()),
+                'coverage': float((np.abs(residuals[:, j]) <= COVERAGE_FACTOR * error[:, j] + 1e-9).mean()),
+            })
+        return report
+
+    # ==================== 保存与读取 ====================
+
+    def save(self, filepath: str, metadata: Dict[str, Any] = None) -> None:
+        """保存为 .npz（metadata 为附加说明，如训练来源和验证摘要）"""
+        if os.path.dirname(filepath):
+            os.makedirs(os.path.dirname(filepath), exist_ok=True)
+        info = {'parameters': [p.to_dict() for p in self.parameters],
+                'columns': [list(column) for column in self.columns],
+                'samples': self.samples, **(metadata or {})}
+        with open(filepath, 'wb') as f:
+            np.savez(f, alpha=self.alpha, coefficients=self.coefficients, rinv=self.rinv,
+                     sigma=self.sigma, loo_rmse=self.loo_rmse,
+                     metadata=np.array(json.dumps(info, ensure_ascii=False)))
+        print(f"代理模型已保存到: {filepath}")
+
+    @classmethod
+    def load(cls, filepath: str) -> 'SurrogateModel':
+        """读取 save 保存的代理模型"""
+        with np.load(filepath, allow_pickle=False) as data:
+            info = json.loads(str(data['metadata']))
+            model = cls([DesignParameter.from_dict(p) for p in info['parameters']],
+                        [tuple(column) for column in info['columns']],
+                        data['alpha'], data['coefficients'], data['rinv'],
+                        data['sigma'], data['loo_rmse'], int(info['samples']))
+        model.metadata = info
+        return model
+
+
+def train_surrogate(runner: DesignRunner, parameters: List[DesignParameter],
+                    training: List[DesignPoint], validation: List[DesignPoint] = None,
+                    max_degree: int = MAX_DEGREE, workers: int = 1):
+    """
+    完整计算训练点和验证点并拟合代理模型
+    Returns:
+        (代理模型, 验证报告)，没有验证点时验证报告为空
+    """
+    results = runner.run(training + (validation or []), workers)
+    y, columns, valid = output_matrix(training, results)
+    if not columns:
+        raise ValueError("训练点全部计算失败或没有可用的输出指标")
+    x = design_matrix(training, parameters)
+    model = SurrogateModel.fit(parameters, x[valid], y[valid], columns, max_degree)
+
+    report = []
+    if validation:
+        y_check, _, valid_check = output_matrix(validation, results, columns)
+        if valid_check.any():
+            report = model.validate(design_matrix(validation, parameters)[valid_check],
+                                    y_check[valid_check])
+    return model, report
+
+
+def export_report(report: List[Dict[str, Any]], filepath: str) -> None:
+    """导出验证报告到CSV"""
+    if os.path.dirname(filepath):
+        os.makedirs(os.path.dirname(filepath), exist_ok=True)
+    headers = ['指标', '年份', 'R2', 'RMSE', '最大误差', '留一RMSE', '平均误差估计', f'±{COVERAGE_FACTOR:g}σ覆盖率']
+    keys = ['r2', 'rmse', 'max_error', 'loo_rmse', 'error_estimate', 'coverage']
+    with open(filepath, 'w', newline='', encoding='utf-8-sig') as f:
+        writer = csv.writer(f)
+        writer.writerow(headers)
+        for item in report:
+            writer.writerow([item['label'], item['year']] + [format(item[key], '.6g') for key in keys])
+    print(f"验证报告已导出到: {filepath}")
+
+
+def print_report(model: SurrogateModel, report: List[Dict[str, Any]]) -> None:
+    """打印模型概况和各指标验证结果（取各年份中最差的 R² 和最大误差）"""
+    print(f"\n代理模型: {len(model.parameters)} 个参数，{model.degree} 阶，{len(model.alpha)} 项，"
+          f"训练点 {model.samples} 个，输出 {len(model.columns)} 列")
+    if not report:
+        return
+    print(f"\n  {'指标':<16}{'最小R2':>10}{'最大RMSE':>12}{'最大误差':>12}{'覆盖率':>10}")
+    for label in dict.fromkeys(item['label'] for item in report):
+        items = [item for item in report if item['label'] == label]
+        print(f"  {label:<16}{min(i['r2'] for i in items):>10.4f}{max(i['rmse'] for i in items):>12.4g}"
+              f"{max(i['max_error'] for i in items):>12.4g}{min(i['coverage'] for i in items):>10.2f}")
@@ -5,7 +5,8 @@ from .balance import BalanceCalculator
 from .industry import IndustryCalculator
 from .transport import TransportCalculator
 from .building import BuildingCalculator
-from .power import PowerCalculator
+from .power import PowerCalculator, VectorizedPowerCalculator, PowerBatchCalculator
 
 __all__ = ['BalanceCalculator', 'IndustryCalculator', 'TransportCalculator', 
-           'BuildingCalculator', 'PowerCalculator']
+           'BuildingCalculator', 'PowerCalculator', 'VectorizedPowerCalculator',
+           'PowerBatchCalculator']
@@ -4,5 +4,34 @@
 from .variables import PowerVariables
 from .formulas import PowerFormulas
 from .calculator import PowerCalculator, PowerData
+from .catalog import TechnologyCatalog, TechnologySpec, DEFAULT_CATALOG
+from .vectorized import (VectorizedPowerCalculator, PowerArrays,
+                         build_power_arrays, compute_power_arrays)
+from .batch import (PowerBatchCalculator, stack_power_arrays,
+                    broadcast_power_arrays, annuity_factor_array)
+from .stock import CapacityStockModel
+from .dispatch import (PowerDispatchCalculator, HourlyDispatchEngine,
+                       HourlyProfiles, load_hourly_profiles)
+from .ldc import LdcPowerCalculator, LoadDurationDispatch
+from .expansion import CapacityExpansionPlanner, ExpansionPowerCalculator
+from .sensitivity import calculate_power_sensitivity, export_sensitivity_to_csv
+from .npv import calculate_power_npv, export_npv_to_csv
+from .regional import (RegionalPowerCalculator, TransmissionNetwork, TransmissionLine,
+                       solve_transmission, aggregate_power_arrays,
+                       check_regional_totals)
 
-__all__ = ['PowerVariables', 'PowerFormulas', 'PowerCalculator', 'PowerData']
+__all__ = ['PowerVariables', 'PowerFormulas', 'PowerCalculator', 'PowerData',
+           'TechnologyCatalog', 'TechnologySpec', 'DEFAULT_CATALOG',
+           'VectorizedPowerCalculator', 'PowerArrays',
+           'build_power_arrays', 'compute_power_arrays',
+           'PowerBatchCalculator', 'stack_power_arrays',
+           'broadcast_power_arrays', 'annuity_factor_array',
+           'CapacityStockModel', 'PowerDispatchCalculator', 'HourlyDispatchEngine',
+           'HourlyProfiles', 'load_hourly_profiles',
+           'LdcPowerCalculator', 'LoadDurationDispatch',
+           'CapacityExpansionPlanner', 'ExpansionPowerCalculator',
+           'calculate_power_sensitivity', 'export_sensitivity_to_csv',
+           'calculate_power_npv', 'export_npv_to_csv',
+           'RegionalPowerCalculator', 'TransmissionNetwork', 'TransmissionLine',
+           'solve_transmission', 'aggregate_power_arrays',
+           'check_regional_totals']
@@ -0,0 +1,244 @@
+# -*- coding: utf-8 -*-
+"""电力结果批量情景计算器
+
+将 N 个情景堆叠为 情景 × 技术 × 年份 的输入数组，一次数组运算得到全部情景结果，
+结果中每个指标为 情景 × 年份 数组。
+"""
+
+import os
+import numpy as np
+from typing import Dict, Any, List, Union, Optional
+from dataclasses import fields
+
+from ...utils import IOHandler
+from .calculator import PowerCalculator, PowerData
+from .formulas import PowerFormulas
+from .catalog import TechnologyCatalog, DEFAULT_CATALOG
+from .vectorized import (PowerArrays, build_power_arrays, compute_power_arrays,
+                         pack_power_results)
+
+
+# PowerArrays 矩阵字段 -> PowerVariables 中的类型列表
+ARRAY_FIELD_TYPES = {
+    'generation': 'GENERATION_TYPES',
+    'utilization_hours': 'UTILIZATION_HOURS_TYPES',
+    'storage': 'STORAGE_TYPES',
+    'capacity_cost': 'CAPACITY_COST_TYPES',
+    'om_ratio': 'OM_COST_RATIO_TYPES',
+    'fuel_cost': 'FUEL_COST_TYPES',
+    'fuel_rate': 'FUEL_RATE_TYPES',
+}
+
+
+def annuity_factor_array(lifetime, rate: float = 0.06) -> np.ndarray:
+    """
+    向量化年金系数
+    公式: 年金系数 = (1-rate) / (1-(1-rate)^lifetime)，寿命<=0时为0
+    与 PowerFormulas.calculate_annuity_factor 逐元素一致
+    """
+    lifetime = np.asarray(lifetime, dtype=float)
+    factor = 1 - rate
+    out = np.zeros(lifetime.shape)
+    valid = lifetime > 0
+    out[valid] = factor / (1 - factor ** lifetime[valid])
+    return out
+
+
+def stack_power_arrays(arrays_list: List[PowerArrays]) -> PowerArrays:
+    """将多个单情景 PowerArrays 沿新的首维堆叠为情景数组"""
+    if not arrays_list:
+        raise ValueError("情景列表为空")
+    years = arrays_list[0].years
+    for arrays in arrays_list[1:]:
+        if arrays.years != years:
+            raise ValueError(f"情景年份不一致: {arrays.years} != {years}")
+
+    stacked = {'years': list(years)}
+    for f in fields(PowerArrays):
+        if f.name != 'years' and all(getattr(a, f.name) is not None for a in arrays_list):
+            stacked[f.name] = np.stack([getattr(a, f.name) for a in arrays_list])
+    return PowerArrays(**stacked)
+
+
+def broadcast_power_arrays(arrays: PowerArrays, num_scenarios: int) -> PowerArrays:
+    """将单情景 PowerArrays 复制为 num_scenarios 个情景（可写副本）"""
+    broadcast = {'years': list(arrays.years)}
+    for f in fields(PowerArrays):
+        if f.name != 'years':
+            value = getattr(arrays, f.name)
+            if value is not None:
+                broadcast[f.name] = np.repeat(value[None, ...], num_scenarios, axis=0)
+    return PowerArrays(**broadcast)
+
+
+class PowerBatchCalculator:
+    """电力结果批量情景计算器"""
+
+    def __init__(self, catalog: TechnologyCatalog = None):
+        # 类型列表与技术目录一致
+        self.catalog = catalog or DEFAULT_CATALOG
+        self.variables = self.catalog.to_variables()
+        self.formulas = PowerFormulas()
+        self.scenarios: List[str] = []
+        self.arrays: Optional[PowerArrays] = None
+
+        # 各情景CO2排放系数 (S,)
+        self.coal_co2_factor = np.zeros(0)
+        self.gas_co2_factor = np.zeros(0)
+        self.gas_conversion_factor = np.zeros(0)
+
+    # ==================== 数据加载 ====================
+
+    def load_scenarios(self, scenarios: Dict[str, Union[PowerData, dict]]) -> None:
+        """
+        加载多个情景
+        Args:
+            scenarios: {情景名称: PowerData 或 PowerCalculator.load_from_dict 格式的字典}
+        """
+        parser = PowerCalculator()
+        parser.variables = self.variables
+        data_list = []
+        for name, data in scenarios.items():
+            if isinstance(data, dict):
+                parser.power_data = PowerData()
+                parser.load_from_dict(data)
+                data = parser.power_data
+            data_list.append(data)
+        self._load_power_data(list(scenarios.keys()), data_list)
+
+    def load_from_csv_files(self, filepaths: Dict[str, str]) -> None:
+        """
+        从多个CSV文件加载情景（复用同一个解析器）
+        Args:
+            filepaths: {情景名称: CSV文件路径}
+        """
+        parser = PowerCalculator()
+        parser.variables = self.variables
+        data_list = []
+        for name, filepath in filepaths.items():
+            parser.power_data = PowerData()
+            parser._parse_dataframe(IOHandler.read_csv(filepath))
+            data_list.append(parser.power_data)
+        self._load_power_data(list(filepaths.keys()), data_list)
+
+    def load_from_base(self, base: PowerData, scenarios: List[str],
+                       overrides: Dict[Any, Any] = None) -> None:
+        """
+        以一个基准情景为模板生成情景批次，并按字段覆盖参数（敏感性扫描）
+        Args:
+            base: 基准情景数据
+            scenarios: 情景名称列表
+            overrides: 覆盖值，键可以是:
+                - PowerArrays 字段名，如 'capacity_cost'，值可广播到 (S, 类型, Y) 或 (S, Y)
+                - (字段名, 类型名)，如 ('capacity_cost', '光伏(集中)')，值可广播到 (S, Y)
+                - ('equipment_lifetime', 类型名)，值为 (S,) 的寿命，年金系数随之重算
+        """
+        arrays = build_power_arrays(base, self.variables, self.formulas)
+        self.arrays = broadcast_power_arrays(arrays, len(scenarios))
+        self.scenarios = list(scenarios)
+        self._set_factors([base] * len(scenarios))
+        for key, value in (overrides or {}).items():
+            self.set_override(key, value)
+
+    def load_arrays(self, arrays: PowerArrays, scenarios: List[str]) -> None:
+        """直接加载已构建的情景数组（首维为情景）"""
+        if arrays.generation.shape[0] != len(scenarios):
+            raise ValueError("情景数量与数组首维不一致")
+        self.arrays = arrays
+        self.scenarios = list(scenarios)
+        self._set_factors([PowerData()] * len(scenarios))
+
+    def set_override(self, key: Any, value: Any) -> None:
+        """覆盖情景数组中的一个字段或一行"""
+        if isinstance(key, tuple):
+            field_name, type_name = key
+            if field_name == 'equipment_lifetime':
+                index = self.variables.CAPACITY_COST_TYPES.index(type_name)
+                lifetime = np.broadcast_to(value, (len(self.scenarios),))
+                self.arrays.annuity_factor[:, index] = annuity_factor_array(
+                    lifetime, self.formulas.discount_rate)
+                if self.arrays.lifetime is not None:
+                    self.arrays.lifetime[:, index] = lifetime
+                return
+            types = getattr(self.variables, ARRAY_FIELD_TYPES[field_name])
+            target = getattr(self.arrays, field_name)
+            target[:, types.index(type_name), :] = value
+        else:
+            target = getattr(self.arrays, key)
+            target[...] = value
+
+    def _load_power_data(self, names: List[str], data_list: List[PowerData]) -> None:
+        """从 PowerData 列表构建情景数组"""
+        self.scenarios = names
+        self.arrays = stack_power_arrays([
+            build_power_arrays(data, self.variables, self.formulas) for data in data_list
+        ])
+        self._set_factors(data_list)
+
+    def _set_factors(self, data_list: List[PowerData]) -> None:
+        """记录各情景CO2排放系数"""
+        self.coal_co2_factor = np.array([d.coal_co2_factor for d in data_list])
+        self.gas_co2_factor = np.array([d.gas_co2_factor for d in data_list])
+        self.gas_conversion_factor = np.array([d.gas_conversion_factor for d in data_list])
+
+    # ==================== 计算 ====================
+
+    def calculate(self) -> Dict[str, Any]:
+        """
+        执行批量计算
+        Returns:
+            {'years': [...], 'scenarios': [...], 分组: {指标: (S, Y) 数组}}，未取整
+        """
+        if self.arrays is None:
+            raise ValueError("尚未加载情景数据")
+        raw = compute_power_arrays(self.arrays, self.variables,
+                                   self.coal_co2_factor[:, None],
+                                   self.gas_co2_factor[:, None],
+                                   self.gas_conversion_factor[:, None],
+                                   catalog=self.catalog)
+        results = {'years': list(self.arrays.years), 'scenarios': list(self.scenarios)}
+        results.update(raw)
+        return results
+
+    @staticmethod
+    def scenario_results(results: Dict[str, Any], index: int) -> Dict[str, Any]:
+        """取出单个情景，转换为与 PowerCalculator.calculate 相同格式的结果字典"""
+        raw = {section: {key: values[index] for key, values in items.items()}
+               for section, items in results.items()
+               if section not in ('years', 'scenarios')}
+        return pack_power_results(raw, results['years'])
+
+    # ==================== 输出 ====================
+
+    def export_to_csv(self, results: Dict[str, Any], output_dir: str) -> None:
+        """按情景导出结果，文件名为 {情景名称}_power_output.csv"""
+        exporter = PowerCalculator()
+        for i, name in enumerate(results['scenarios']):
+            filepath = os.path.join(output_dir, f"{name}_power_output.csv")
+            exporter.export_to_csv(self.scenario_results(results, i), filepath)
+
+    def print_results(self, results: Dict[str, Any]) -> None:
+        """打印各情景LCOE和总成本"""
+        years = results['years']
+
+        print("\n" + "=" * 120)
+        print(f"电力结果批量计算（{len(results['scenarios'])} 个情景）")
+        print("=" * 120)
+
+        header = f"{'情景':<20}" + "".join([f"{y:>12}" for y in years])
+        print(header)
+        print("-" * 120)
+
+        print("LCOE(元/kWh)")
+        for i, name in enumerate(results['scenarios']):
+            values = results['lcoe']['LCOE'][i]
+            print(f"  {name:<18}" + "".join([f"{v:>12.4f}" for v in values]))
+
+        print("-" * 120)
+
+        print("总成本(亿元)")
+        for i, name in enumerate(results['scenarios']):
+            values = results['total_cost']['总成本'][i]
+            print(f"  {name:<18}" + "".join([f"{v:>12.2f}" for v in values]))
+
+        print("=" * 120)
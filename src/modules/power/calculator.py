@@ -111,12 +111,11 @@ class PowerCalculator(BaseCalculator):
         self.power_data.years = [str(c) for c in df.columns[1:]]
         
         # 初始化数据字典
-        generation_types = ['煤电', '煤电+CCS', '气电', '气电+CCS', '核电', '水电', 
-                           '风电', '光伏', '生物质', '生物质+CCS', '其他']
+        generation_types = self.variables.GENERATION_TYPES
         self.power_data.generation = {k: [] for k in generation_types}
         self.power_data.utilization_hours = {k: [] for k in generation_types}
         
-        storage_types = ['抽蓄', '电化学']
+        storage_types = self.variables.STORAGE_TYPES
         self.power_data.storage = {k: [] for k in storage_types}
         
         ccs_types = ['煤电', '气电', '生物质']
@@ -125,14 +124,10 @@ class PowerCalculator(BaseCalculator):
         fuel_types = ['煤炭', '煤炭CCS', '天然气', '天然气CCS', '生物质', '生物质CCS', '浓缩铀']
         self.power_data.fuel_rate = {k: [] for k in fuel_types}
         
-        cost_types = ['煤电', '煤电+CCS', '气电', '气电+CCS', '核电', '水电',
-                     '风电(陆上)', '风电(海上)', '光伏(集中)', '光伏(分布式)',
-                     '生物质', '生物质+CCS', '抽蓄', '电化学']
+        cost_types = self.variables.CAPACITY_COST_TYPES
         self.power_data.capacity_cost = {k: [] for k in cost_types}
         
-        om_types = ['煤电', '煤电+CCS', '气电', '气电+CCS', '核电', '水电',
-                   '风电(陆上)', '风电(海上)', '光伏(集中)', '光伏(分布式)',
-                   '生物质', '生物质+CCS']
+        om_types = self.variables.OM_COST_RATIO_TYPES
         self.power_data.om_ratio = {k: [] for k in om_types}
         self.power_data.fuel_cost = {k: [] for k in om_types}
         
@@ -467,7 +462,40 @@ class PowerCalculator(BaseCalculator):
             results['ccs_ratio']['气电+CCS'].append(round(gas_ccs_ratio_comp, 4))
             results['ccs_ratio']['生物质'].append(round(bio_ccs_ratio, 4))
             results['ccs_ratio']['生物质+CCS'].append(round(bio_ccs_ratio_comp, 4))
-            
+
+            # ==================== CO2排放 ====================
+            rate = self.power_data.fuel_rate
+            coal_rate = self._get_value(rate, '煤炭', i)
+            coal_ccs_rate = self._get_value(rate, '煤炭CCS', i)
+            gas_rate = self._get_value(rate, '天然气', i)
+            gas_ccs_rate = self._get_value(rate, '天然气CCS', i)
+            biomass_ccs_rate = self._get_value(rate, '生物质CCS', i)
+            capture_rate = self._get_list_value(self.power_data.ccs_capture_rate, i)
+            coal_co2_factor = self.power_data.coal_co2_factor
+            gas_co2_factor = self.power_data.gas_co2_factor
+            gas_conversion = self.power_data.gas_conversion_factor
+
+            coal_consumption = self.formulas.calculate_coal_consumption(
+                coal_gen, coal_rate, coal_ccs_gen, coal_ccs_rate)
+            gas_consumption = self.formulas.calculate_gas_consumption(
+                gas_gen, gas_rate, gas_ccs_gen, gas_ccs_rate, gas_conversion)
+            coal_co2 = self.formulas.calculate_coal_co2(coal_consumption, coal_co2_factor)
+            gas_co2 = self.formulas.calculate_gas_co2(gas_consumption, gas_co2_factor)
+            total_direct_co2 = self.formulas.calculate_total_direct_co2(coal_co2, gas_co2)
+            fossil_ccs = self.formulas.calculate_fossil_ccs_capture(
+                coal_ccs_rate, coal_ccs_gen, coal_co2_factor, gas_ccs_rate,
+                gas_ccs_gen, gas_co2_factor, gas_conversion, capture_rate)
+            biomass_ccs = self.formulas.calculate_biomass_ccs_capture(
+                biomass_ccs_rate, biomass_ccs_gen, self.variables.BIOMASS_CO2_FACTOR, capture_rate)
+            net_co2 = self.formulas.calculate_net_co2(total_direct_co2, fossil_ccs, biomass_ccs)
+
+            results['co2_emission']['来自煤炭'].append(round(coal_co2, 4))
+            results['co2_emission']['来自天然气'].append(round(gas_co2, 4))
+            results['co2_emission']['总直接排放'].append(round(total_direct_co2, 4))
+            results['co2_emission']['化石能源CCS'].append(round(fossil_ccs, 4))
+            results['co2_emission']['生物质CCS'].append(round(biomass_ccs, 4))
+            results['co2_emission']['净排放'].append(round(net_co2, 4))
+
             # ==================== 成本计算 ====================
             self._calculate_costs(results, i, coal_cap, coal_ccs_cap, gas_cap, gas_ccs_cap,
                                  nuclear_cap, hydro_cap, wind_cap, solar_cap,
@@ -783,8 +811,7 @@ class PowerCalculator(BaseCalculator):
         
         # 装机容量
         rows.append(['电力装机数据(GW)'] + [''] * len(years))
-        for key in ['煤电', '煤电+CCS', '气电', '气电+CCS', '核电', '水电',
-                   '风电', '光伏', '生物质', '生物质+CCS', '其他', '总装机']:
+        for key in self.variables.GENERATION_TYPES + ['总装机']:
             rows.append([key] + results['capacity'][key])
         
         rows.append([''] * (len(years) + 1))
@@ -799,7 +826,7 @@ class PowerCalculator(BaseCalculator):
         
         # 储能
         rows.append(['储能配置(GW)'] + [''] * len(years))
-        for key in ['抽蓄', '电化学', '总装机']:
+        for key in self.variables.STORAGE_TYPES + ['总装机']:
             rows.append([key] + results['storage'][key])
         pct_values = [f"{v*100:.2f}%" for v in results['storage']['储能/新能源']]
         rows.append(['储能/新能源'] + pct_values)
@@ -808,16 +835,14 @@ class PowerCalculator(BaseCalculator):
         
         # 发电量
         rows.append(['发电量数据(万亿kWh)'] + [''] * len(years))
-        for key in ['煤电', '煤电+CCS', '气电', '气电+CCS', '核电', '水电',
-                   '风电', '光伏', '生物质', '生物质+CCS', '其他', '总发电量']:
+        for key in self.variables.GENERATION_TYPES + ['总发电量']:
             rows.append([key] + results['generation'][key])
         
         rows.append([''] * (len(years) + 1))
         
         # 发电量占比
         rows.append(['发电量占比'] + [''] * len(years))
-        for key in ['煤电', '煤电+CCS', '气电', '气电+CCS', '核电', '水电',
-                   '风电', '光伏', '生物质', '生物质+CCS', '其他', '风光占比']:
+        for key in self.variables.GENERATION_TYPES + ['风光占比']:
             pct_values = [f"{v*100:.2f}%" for v in results['generation_ratio'][key]]
             rows.append([key] + pct_values)
         
@@ -840,27 +865,22 @@ class PowerCalculator(BaseCalculator):
         
         # 投资成本
         rows.append(['投资成本(亿元)'] + [''] * len(years))
-        for key in ['煤电', '煤电+CCS', '气电', '气电+CCS', '核电', '水电',
-                   '风电(陆上)', '风电(海上)', '光伏(集中)', '光伏(分布式)',
-                   '生物质', '生物质+CCS', '抽蓄', '电化学',
-                   '总电源投资', '总储能投资', '跨省电网', '省内电网']:
+        for key in self.variables.CAPACITY_COST_TYPES + ['总电源投资', '总储能投资',
+                                                          '跨省电网', '省内电网']:
             rows.append([key] + results['investment'][key])
         
         rows.append([''] * (len(years) + 1))
         
         # 运维成本
         rows.append(['运维成本(亿元)'] + [''] * len(years))
-        for key in ['煤电', '煤电+CCS', '气电', '气电+CCS', '核电', '水电',
-                   '风电(陆上)', '风电(海上)', '光伏(集中)', '光伏(分布式)',
-                   '生物质', '生物质+CCS', '总运维成本']:
+        for key in self.variables.OM_COST_RATIO_TYPES + ['总运维成本']:
             rows.append([key] + results['om_cost'][key])
         
         rows.append([''] * (len(years) + 1))
         
         # 燃料成本
         rows.append(['燃料成本(亿元)'] + [''] * len(years))
-        for key in ['煤电', '煤电+CCS', '气电', '气电+CCS', '核电', '水电',
-                   '生物质', '生物质+CCS', '总燃料成本']:
+        for key in self.variables.FUEL_COST_OUTPUT_TYPES + ['总燃料成本']:
             rows.append([key] + results['fuel_cost_total'][key])
         
         rows.append([''] * (len(years) + 1))
@@ -898,8 +918,7 @@ class PowerCalculator(BaseCalculator):
         
         # 装机容量
         print("电力装机数据(GW)")
-        for key in ['煤电', '煤电+CCS', '气电', '气电+CCS', '核电', '水电',
-                   '风电', '光伏', '生物质', '生物质+CCS', '其他', '总装机']:
+        for key in self.variables.GENERATION_TYPES + ['总装机']:
             values = results['capacity'][key]
             row = f"  {key:<18}" + "".join([f"{v:>12.2f}" for v in values])
             print(row)
@@ -917,7 +936,7 @@ class PowerCalculator(BaseCalculator):
         
         # 储能
         print("储能配置(GW)")
-        for key in ['抽蓄', '电化学', '总装机']:
+        for key in self.variables.STORAGE_TYPES + ['总装机']:
             values = results['storage'][key]
             row = f"  {key:<18}" + "".join([f"{v:>12.2f}" for v in values])
             print(row)
@@ -929,8 +948,7 @@ class PowerCalculator(BaseCalculator):
         
         # 发电量
         print("发电量数据(万亿kWh)")
-        for key in ['煤电', '煤电+CCS', '气电', '气电+CCS', '核电', '水电',
-                   '风电', '光伏', '生物质', '生物质+CCS', '其他', '总发电量']:
+        for key in self.variables.GENERATION_TYPES + ['总发电量']:
             values = results['generation'][key]
             row = f"  {key:<18}" + "".join([f"{v:>12.4f}" for v in values])
             print(row)
@@ -0,0 +1,239 @@
+# -*- coding: utf-8 -*-
+"""电力技术目录
+
+以数据表描述各装机成本类型（技术）的参数列：装机来源、分摊比例、燃料成本、
+非化石、CCS 等标志和设备寿命。向量化计算由目录生成类型列表和参数矩阵，
+全部技术的投资、运维和燃料成本由一次矩阵运算得到。
+新增技术（如光热、新型储能）只需在目录中增加一行，并在输入数据中提供对应行。
+"""
+
+import csv
+import numpy as np
+from typing import Dict, List, Optional
+from dataclasses import dataclass, field, replace
+
+from .variables import PowerVariables
+
+
+@dataclass
+class TechnologySpec:
+    """技术（装机成本类型）定义"""
+    # 技术名称，如 '风电(海上)'
+    name: str
+    # 装机来源（发电类型或储能类型），为空时与名称相同
+    source: str = ''
+    # 'generation' 或 'storage'
+    kind: str = 'generation'
+    # 分摊比例字段（PowerArrays 中的 (..., Y) 序列），如 'offshore_wind_ratio'
+    split_field: str = ''
+    # 是否取 1-比例
+    split_complement: bool = False
+    # 固定分摊比例（无分摊比例字段时使用）
+    split_value: float = 1.0
+    # 是否计燃料成本
+    fuel_cost: bool = True
+    # 是否为非化石电源
+    non_fossil: bool = False
+    # CCS 对应的基础类型，如 '煤电+CCS' 的基础类型为 '煤电'
+    ccs_base: str = ''
+    # 设备寿命（年）
+    lifetime: int = 25
+    # 是否有装机成本（如 '其他' 只有发电量）
+    capacity_cost: bool = True
+
+    @property
+    def capacity_source(self) -> str:
+        return self.source or self.name
+
+
+# 默认目录（与 PowerVariables 的类型列表和 PowerCalculator 的计算一致）
+DEFAULT_TECHNOLOGIES = [
+    TechnologySpec('煤电', lifetime=30),
+    TechnologySpec('煤电+CCS', ccs_base='煤电', lifetime=30),
+    TechnologySpec('气电', lifetime=25),
+    TechnologySpec('气电+CCS', ccs_base='气电', lifetime=25),
+    TechnologySpec('核电', non_fossil=True, lifetime=40),
+    TechnologySpec('水电', non_fossil=True, lifetime=50),
+    TechnologySpec('风电(陆上)', source='风电', split_field='offshore_wind_ratio',
+                   split_complement=True, fuel_cost=False, non_fossil=True, lifetime=20),
+    TechnologySpec('风电(海上)', source='风电', split_field='offshore_wind_ratio',
+                   fuel_cost=False, non_fossil=True, lifetime=20),
+    TechnologySpec('光伏(集中)', source='光伏', split_field='distributed_solar_ratio',
+                   split_complement=True, fuel_cost=False, non_fossil=True, lifetime=25),
+    TechnologySpec('光伏(分布式)', source='光伏', split_field='distributed_solar_ratio',
+                   fuel_cost=False, non_fossil=True, lifetime=25),
+    TechnologySpec('生物质', non_fossil=True, lifetime=25),
+    TechnologySpec('生物质+CCS', ccs_base='生物质', non_fossil=True, lifetime=25),
+    TechnologySpec('其他', fuel_cost=False, non_fossil=True, capacity_cost=False),
+    TechnologySpec('抽蓄', kind='storage', fuel_cost=False, lifetime=40),
+    TechnologySpec('电化学', kind='storage', fuel_cost=False, lifetime=10),
+]
+
+
+# CSV 列名 -> 字段名
+CSV_COLUMNS = {
+    '技术': 'name',
+    '装机来源': 'source',
+    '类型': 'kind',
+    '分摊比例字段': 'split_field',
+    '取补': 'split_complement',
+    '固定分摊比例': 'split_value',
+    '燃料成本': 'fuel_cost',
+    '非化石': 'non_fossil',
+    'CCS基础类型': 'ccs_base',
+    '寿命': 'lifetime',
+    '装机成本': 'capacity_cost',
+}
+
+KIND_NAMES = {'发电': 'generation', '储能': 'storage'}
+
+
+def _unique(values: List[str]) -> List[str]:
+    """保持顺序去重"""
+    return list(dict.fromkeys(values))
+
+
+@dataclass
+class TechnologyCatalog:
+    """电力技术目录"""
+    technologies: List[TechnologySpec] = field(
+        default_factory=lambda: [replace(t) for t in DEFAULT_TECHNOLOGIES])
+
+    # ==================== 类型列表 ====================
+
+    @property
+    def cost_technologies(self) -> List[TechnologySpec]:
+        """有装机成本的技术：发电类在前，储能类在后"""
+        return ([t for t in self.technologies if t.capacity_cost and t.kind == 'generation']
+                + [t for t in self.technologies if t.capacity_cost and t.kind == 'storage'])
+
+    @property
+    def generation_types(self) -> List[str]:
+        return _unique([t.capacity_source for t in self.technologies if t.kind == 'generation'])
+
+    @property
+    def storage_types(self) -> List[str]:
+        return _unique([t.capacity_source for t in self.technologies if t.kind == 'storage'])
+
+    @property
+    def cost_types(self) -> List[str]:
+        return [t.name for t in self.cost_technologies]
+
+    @property
+    def power_cost_types(self) -> List[str]:
+        """发电类装机成本类型（运维成本、燃料单价按此顺序）"""
+        return [t.name for t in self.cost_technologies if t.kind == 'generation']
+
+    @property
+    def fuel_cost_output_types(self) -> List[str]:
+        """计燃料成本的类型"""
+        return [t.name for t in self.cost_technologies if t.kind == 'generation' and t.fuel_cost]
+
+    @property
+    def non_fossil_types(self) -> List[str]:
+        return _unique([t.capacity_source for t in self.technologies
+                        if t.kind == 'generation' and t.non_fossil])
+
+    @property
+    def ccs_pairs(self) -> List[tuple]:
+        """(基础类型, CCS类型)"""
+        return _unique([(t.ccs_base, t.capacity_source) for t in self.technologies if t.ccs_base])
+
+    @property
+    def capacity_source(self) -> Dict[str, str]:
+        """装机成本类型 -> 装机来源"""
+        return {t.name: t.capacity_source for t in self.cost_technologies}
+
+    # ==================== 参数矩阵 ====================
+
+    def source_matrix(self) -> np.ndarray:
+        """装机来源选择矩阵 (成本类型, 发电类型+储能类型)"""
+        sources = self.generation_types + self.storage_types
+        matrix = np.zeros((len(self.cost_technologies), len(sources)))
+        for i, t in enumerate(self.cost_technologies):
+            matrix[i, sources.index(t.capacity_source)] = 1.0
+        return matrix
+
+    def share_matrix(self, arrays) -> np.ndarray:
+        """
+        分摊比例 (..., 成本类型, Y)
+        有分摊比例字段时取 比例 或 1-比例，否则取固定分摊比例
+        """
+        rows = []
+        for t in self.cost_technologies:
+            if t.split_field:
+                ratio = getattr(arrays, t.split_field)
+                rows.append(1 - ratio if t.split_complement else ratio)
+            else:
+                rows.append(np.full(arrays.electricity_demand.shape, float(t.split_value)))
+        return np.stack(np.broadcast_arrays(*rows), axis=-2)
+
+    def lifetime(self) -> Dict[str, int]:
+        return {t.name: t.lifetime for t in self.cost_technologies}
+
+    def to_variables(self, variables: PowerVariables = None) -> PowerVariables:
+        """生成与目录一致的 PowerVariables（类型列表和设备寿命）"""
+        variables = replace(variables or PowerVariables())
+        generation_types = self.generation_types
+        variables.CAPACITY_TYPES = list(generation_types)
+        variables.GENERATION_TYPES = list(generation_types)
+        variables.UTILIZATION_HOURS_TYPES = list(generation_types)
+        variables.STORAGE_TYPES = self.storage_types
+        variables.CAPACITY_COST_TYPES = self.cost_types
+        variables.OM_COST_RATIO_TYPES = self.power_cost_types
+        variables.FUEL_COST_TYPES = self.power_cost_types
+        variables.FUEL_COST_OUTPUT_TYPES = self.fuel_cost_output_types
+        variables.EQUIPMENT_LIFETIME = self.lifetime()
+        return variables
+
+    # ==================== 读写 ====================
+
+    @classmethod
+    def from_csv(cls, filepath: str) -> 'TechnologyCatalog':
+        """
+        从CSV加载目录
+        CSV格式: 技术,装机来源,类型,分摊比例字段,取补,固定分摊比例,燃料成本,非化石,CCS基础类型,寿命,装机成本
+        类型为 发电/储能，标志列为 1/0，缺省列取默认值
+        """
+        technologies = []
+        with open(filepath, 'r', encoding='utf-8-sig') as f:
+            for row in csv.DictReader(f):
+                values = {}
+                for column, name in CSV_COLUMNS.items():
+                    text = (row.get(column) or '').strip()
+                    if not text:
+                        continue
+                    default = getattr(TechnologySpec, name, None)
+                    if name == 'kind':
+                        values[name] = KIND_NAMES.get(text, text)
+                    elif isinstance(default, bool):
+                        values[name] = text in ('1', 'true', 'True', '是')
+                    elif name == 'lifetime':
+                        values[name] = int(float(text))
+                    elif name == 'split_value':
+                        values[name] = float(text)
+                    else:
+                        values[name] = text
+                technologies.append(TechnologySpec(**values))
+        return cls(technologies)
+
+    def export_to_csv(self, filepath: str) -> None:
+        """导出目录为CSV"""
+        kind_labels = {v: k for k, v in KIND_NAMES.items()}
+        with open(filepath, 'w', newline='', encoding='utf-8-sig') as f:
+            writer = csv.writer(f)
+            writer.writerow(list(CSV_COLUMNS.keys()))
+            for t in self.technologies:
+                row = []
+                for name in CSV_COLUMNS.values():
+                    value = getattr(t, name)
+                    if name == 'kind':
+                        value = kind_labels.get(value, value)
+                    elif isinstance(value, bool):
+                        value = int(value)
+                    row.append(value)
+                writer.writerow(row)
+        print(f"结果已导出到: {filepath}")
+
+
+DEFAULT_CATALOG = TechnologyCatalog()
@@ -0,0 +1,322 @@
+# -*- coding: utf-8 -*-
+"""电力逐时（8760小时）调度计算
+
+在年度电力计算的装机基础上，按逐时负荷和风光出力曲线进行时序调度：
+1. 风电、光伏按容量系数曲线出力，核电、水电、其他按年利用小时数均匀出力（或按曲线）
+2. 净负荷为负时储能充电（抽蓄优先），仍有富余则弃电；为正时储能放电
+3. 剩余净负荷由可调度机组按燃料成本从低到高依次承担，超出部分计为缺电
+
+除储能荷电状态需要按小时递推外，其余计算均在 小时 × 年份 数组上整体完成；
+储能递推在每个小时内对全部年份（及批量情景）同时计算。
+"""
+
+import csv
+import os
+import numpy as np
+from typing import Dict, Any, List, Optional
+from dataclasses import dataclass
+
+from ...utils import IOHandler
+from .variables import PowerVariables
+from .vectorized import PowerArrays, VectorizedPowerCalculator, calculate_capacity_array
+
+
+# 1 万亿kWh = 1e6 GWh
+GWH_PER_TWH10 = 1000000
+
+
+@dataclass
+class HourlyProfiles:
+    """逐时曲线，长度通常为8760"""
+    # 负荷曲线（任意单位，按形状归一化）
+    demand: np.ndarray
+    # 风电容量系数 (0-1)
+    wind: np.ndarray
+    # 光伏容量系数 (0-1)
+    solar: np.ndarray
+    # 水电出力曲线（可选，按形状归一化）
+    hydro: Optional[np.ndarray] = None
+
+    @property
+    def num_hours(self) -> int:
+        return len(self.demand)
+
+
+def load_hourly_profiles(filepath: str) -> HourlyProfiles:
+    """
+    从CSV文件加载逐时曲线
+    CSV格式: 小时,负荷,风电,光伏[,水电]
+    """
+    df = IOHandler.read_csv(filepath)
+    for column in ['负荷', '风电', '光伏']:
+        if column not in df.columns:
+            raise ValueError(f"逐时曲线文件缺少列: {column}")
+    values = lambda column: df[column].fillna(0.0).to_numpy(dtype=float)
+    return HourlyProfiles(
+        demand=values('负荷'),
+        wind=np.clip(values('风电'), 0.0, 1.0),
+        solar=np.clip(values('光伏'), 0.0, 1.0),
+        hydro=values('水电') if '水电' in df.columns else None
+    )
+
+
+class HourlyDispatchEngine:
+    """逐时调度引擎"""
+
+    def __init__(self, profiles: HourlyProfiles, variables: PowerVariables = None):
+        self.variables = variables or PowerVariables()
+        self.profiles = profiles
+
+    def run(self, arrays: PowerArrays) -> Dict[str, Any]:
+        """
+        执行逐时调度
+        Args:
+            arrays: 电力输入数组，可带批量情景前置维度
+        Returns:
+            结果字典，每个叶子为 (..., Y) 数组
+        """
+        variables = self.variables
+        gen_types = variables.GENERATION_TYPES
+        profiles = self.profiles
+        num_hours = profiles.num_hours
+
+        capacity = calculate_capacity_array(arrays)
+        gen = arrays.generation
+        cap = lambda key: capacity[..., gen_types.index(key), :]
+
+        # ==================== 负荷 (小时, ..., Y) GW ====================
+        total_gen = gen.sum(axis=-2)
+        total_demand = ((arrays.hydrogen_demand + arrays.electricity_demand)
+                        * (1 + arrays.transmission_loss))
+        annual_load = np.where(total_demand > 0, total_demand, total_gen) * GWH_PER_TWH10
+        shape = profiles.demand / profiles.demand.sum()
+        load = _outer(shape, annual_load)
+
+        # ==================== 风光及恒定出力 ====================
+        wind = _outer(profiles.wind, cap('风电'))
+        solar = _outer(profiles.solar, cap('光伏'))
+
+        must_run = {}
+        for key in variables.MUST_RUN_TYPES:
+            annual_energy = gen[..., gen_types.index(key), :] * GWH_PER_TWH10
+            if key == '水电' and profiles.hydro is not None:
+                must_run[key] = _outer(profiles.hydro / profiles.hydro.sum(), annual_energy)
+            else:
+                must_run[key] = _outer(np.full(num_hours, 1.0 / num_hours), annual_energy)
+        must_run_total = sum(must_run.values())
+
+        residual = load - wind - solar - must_run_total
+
+        # ==================== 储能 ====================
+        storage_types = variables.STORAGE_TYPES
+        power = np.stack([arrays.storage[..., i, :] for i in range(len(storage_types))])
+        energy = np.stack([power[i] * variables.STORAGE_DURATION.get(k, 4.0)
+                           for i, k in enumerate(storage_types)])
+        efficiency = np.array([np.sqrt(variables.STORAGE_EFFICIENCY.get(k, 0.85))
+                               for k in storage_types])
+        charge, discharge = _dispatch_storage(residual, power, energy, efficiency)
+        net = residual + charge.sum(axis=0) - discharge.sum(axis=0)
+
+        # ==================== 弃电 ====================
+        surplus = np.maximum(-net, 0.0)
+        vre = wind + solar
+        vre_curtailed = np.minimum(surplus, vre)
+        vre_share = np.divide(vre_curtailed, vre, out=np.zeros(vre.shape), where=vre > 0)
+        must_run_share = np.divide(surplus - vre_curtailed, must_run_total,
+                                   out=np.zeros(surplus.shape), where=must_run_total > 0)
+
+        # ==================== 可调度机组按燃料成本排序 ====================
+        # 技术目录中新增的其他发电类型按可调度机组处理
+        classified = variables.DISPATCHABLE_TYPES + variables.MUST_RUN_TYPES + ['风电', '光伏']
+        dispatchable = variables.DISPATCHABLE_TYPES + [k for k in gen_types if k not in classified]
+        disp_index = [gen_types.index(k) for k in dispatchable]
+        fuel_index = [variables.FUEL_COST_TYPES.index(k) for k in dispatchable]
+        disp_cap = capacity[..., disp_index, :]
+        order = np.argsort(arrays.fuel_cost[..., fuel_index, :], axis=-2, kind='stable')
+        sorted_cap = np.take_along_axis(disp_cap, order, axis=-2)
+        cap_before = np.cumsum(sorted_cap, axis=-2) - sorted_cap
+        deficit = np.maximum(net, 0.0)
+        # (机组, 小时, ..., Y)
+        sorted_cap = np.moveaxis(sorted_cap, -2, 0)
+        cap_before = np.moveaxis(cap_before, -2, 0)
+        sorted_output = np.clip(deficit[None] - cap_before[:, None], 0.0, sorted_cap[:, None])
+        unserved = np.maximum(deficit - sorted_cap.sum(axis=0)[None], 0.0)
+        sorted_energy = np.moveaxis(sorted_output.sum(axis=1), 0, -2)
+        disp_energy = np.zeros(sorted_energy.shape)
+        np.put_along_axis(disp_energy, order, sorted_energy, axis=-2)
+
+        # ==================== 汇总 ====================
+        to_twh = lambda hourly: hourly.sum(axis=0) / GWH_PER_TWH10
+        realised = {}
+        for i, key in enumerate(dispatchable):
+            realised[key] = disp_energy[..., i, :] / GWH_PER_TWH10
+        for key, hourly in must_run.items():
+            realised[key] = to_twh(hourly * (1 - must_run_share))
+        realised['风电'] = to_twh(wind * (1 - vre_share))
+        realised['光伏'] = to_twh(solar * (1 - vre_share))
+        generation = {k: realised[k] for k in gen_types}
+        generation['总发电量'] = sum(generation[k] for k in gen_types)
+
+        hours = {}
+        for key in gen_types:
+            hours[key] = _divide(generation[key] * GWH_PER_TWH10, cap(key))
+
+        wind_curtailed = to_twh(wind * vre_share)
+        solar_curtailed = to_twh(solar * vre_share)
+        vre_available = to_twh(vre)
+
+        charged = charge.sum(axis=1) / GWH_PER_TWH10
+        discharged = discharge.sum(axis=1) / GWH_PER_TWH10
+        storage = {}
+        for i, key in enumerate(storage_types):
+            storage[key + '充电量'] = charged[i]
+            storage[key + '放电量'] = discharged[i]
+            storage[key + '等效循环次数'] = _divide(discharged[i] * GWH_PER_TWH10, energy[i])
+        storage['储能/新能源'] = _divide(power.sum(axis=0), cap('风电') + cap('光伏'))
+
+        return {
+            'years': list(arrays.years),
+            'generation': generation,
+            'utilization_hours': hours,
+            'curtailment': {
+                '风电': wind_curtailed, '光伏': solar_curtailed,
+                '合计': wind_curtailed + solar_curtailed,
+                '弃电率': _divide(wind_curtailed + solar_curtailed, vre_available)
+            },
+            'storage_operation': storage,
+            'balance': {
+                '负荷': to_twh(load),
+                '缺电量': to_twh(unserved),
+                '最大负荷(GW)': load.max(axis=0),
+                '最大缺电(GW)': unserved.max(axis=0)
+            }
+        }
+
+
+def _outer(profile: np.ndarray, annual: np.ndarray) -> np.ndarray:
+    """逐时曲线 × 年度量 -> (小时, ..., Y)"""
+    return profile.reshape((-1,) + (1,) * np.ndim(annual)) * annual
+
+
+def _divide(numerator: np.ndarray, denominator: np.ndarray) -> np.ndarray:
+    """逐元素除法，分母为0处结果为0"""
+    return np.divide(numerator, denominator, out=np.zeros(np.shape(numerator)),
+                     where=denominator != 0)
+
+
+def _dispatch_storage(residual: np.ndarray, power: np.ndarray, energy: np.ndarray,
+                      efficiency: np.ndarray):
+    """
+    储能逐时充放电递推
+    Args:
+        residual: 净负荷 (小时, ..., Y)，负值为富余
+        power: 储能功率 (储能, ..., Y) GW
+        energy: 储能容量 (储能, ..., Y) GWh
+        efficiency: 单程效率 (储能,)，往返效率的平方根
+    Returns:
+        (charge, discharge)：(储能, 小时, ..., Y) GW
+    """
+    num_storage = power.shape[0]
+    charge = np.zeros((num_storage,) + residual.shape)
+    discharge = np.zeros((num_storage,) + residual.shape)
+    soc = np.zeros(power.shape)
+
+    surplus_all = np.maximum(-residual, 0.0)
+    deficit_all = np.maximum(residual, 0.0)
+    for h in range(residual.shape[0]):
+        surplus = surplus_all[h]
+        deficit = deficit_all[h]
+        for s in range(num_storage):
+            eta = efficiency[s]
+            c = np.minimum(np.minimum(surplus, power[s]), (energy[s] - soc[s]) / eta)
+            d = np.minimum(np.minimum(deficit, power[s]), soc[s] * eta)
+            soc[s] += c * eta - d / eta
+            surplus = surplus - c
+            deficit = deficit - d
+            charge[s, h] = c
+            discharge[s, h] = d
+    return charge, discharge
+
+
+def export_sections(sections: Dict[str, Dict[str, list]], titles: Dict[str, str],
+                    years: List[str], filepath: str, suffix: str) -> None:
+    """将附加结果分组导出到与 filepath 同目录的 *_{suffix}.csv"""
+    rows = []
+    for section, title in titles.items():
+        rows.append([title] + [''] * len(years))
+        for key, values in sections[section].items():
+            rows.append([key] + values)
+        rows.append([''] * (len(years) + 1))
+
+    stem, ext = os.path.splitext(filepath)
+    output_file = f"{stem}_{suffix}{ext or '.csv'}"
+    with open(output_file, 'w', newline='', encoding='utf-8-sig') as f:
+        writer = csv.writer(f)
+        writer.writerow(['项目'] + years)
+        writer.writerows(rows)
+    print(f"结果已导出到: {output_file}")
+
+
+class PowerDispatchCalculator(VectorizedPowerCalculator):
+    """电力结果计算器（含逐时调度）"""
+
+    def __init__(self, profile_csv_file: str = None):
+        super().__init__()
+        self.profiles: Optional[HourlyProfiles] = None
+        if profile_csv_file:
+            self.load_profiles_from_csv(profile_csv_file)
+
+    def load_profiles_from_csv(self, filepath: str) -> None:
+        """加载逐时曲线"""
+        self.profiles = load_hourly_profiles(filepath)
+
+    def calculate(self) -> Dict[str, Any]:
+        """执行年度计算和逐时调度"""
+        results = super().calculate()
+        if self.profiles is None:
+            print("警告: 未加载逐时曲线，跳过逐时调度")
+            return results
+
+        dispatch = HourlyDispatchEngine(self.profiles, self.variables).run(self.build_arrays())
+        results['dispatch'] = {
+            section: {key: [round(v, 4) for v in values.tolist()]
+                      for key, values in items.items()}
+            for section, items in dispatch.items() if section != 'years'
+        }
+        return results
+
+    def export_to_csv(self, results: dict, filepath: str) -> None:
+        """导出年度结果，逐时调度结果导出到同目录 *_dispatch.csv"""
+        super().export_to_csv(results, filepath)
+        if 'dispatch' not in results:
+            return
+
+        titles = {
+            'generation': '调度发电量(万亿kWh)',
+            'utilization_hours': '实际利用小时数(小时)',
+            'curtailment': '弃电(万亿kWh)',
+            'storage_operation': '储能运行',
+            'balance': '电力平衡'
+        }
+        export_sections(results['dispatch'], titles, results['years'], filepath, 'dispatch')
+
+    def print_results(self, results: dict) -> None:
+        """打印年度结果及调度摘要"""
+        super().print_results(results)
+        if 'dispatch' not in results:
+            return
+
+        years = results['years']
+        dispatch = results['dispatch']
+        print("逐时调度")
+        header = f"{'项目':<20}" + "".join([f"{y:>12}" for y in years])
+        print(header)
+        print("-" * 120)
+        for key in ['风电', '光伏', '煤电', '气电']:
+            values = dispatch['utilization_hours'][key]
+            print(f"  {key + '利用小时':<18}" + "".join([f"{v:>12.0f}" for v in values]))
+        values = dispatch['curtailment']['弃电率']
+        print(f"  {'弃电率':<18}" + "".join([f"{v:>12.2%}" for v in values]))
+        values = dispatch['balance']['缺电量']
+        print(f"  {'缺电量':<18}" + "".join([f"{v:>12.4f}" for v in values]))
+        print("=" * 120)
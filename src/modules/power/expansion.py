@@ -0,0 +1,371 @@
+# -*- coding: utf-8 -*-
+"""电力装机最小成本规划
+
+逐年选择各装机成本类型的装机和发电量，使年化系统成本最小：
+    目标: SUM(投资 × 2 + 运维) + SUM(燃料成本)，省内电网投资 = 电源投资，与总成本口径一致
+    约束:
+    - 发电量 <= 装机 × 最大利用小时数（风光水取输入利用小时数，其余取 8760 × 可用率）
+    - 总发电量 >= (电制氢 + 电力需求) × (1 + 传输损耗) - 其他发电量
+    - 可信装机 >= 尖峰负荷 × (1 + 备用率)
+    - 储能装机 >= 储能/新能源比例 × 风光装机
+    - 净CO2排放 <= 排放上限（可选）
+
+成本、排放系数由 PowerFormulas 中的投资、运维、燃料成本和CO2公式在单位装机/发电量上求得。
+所有年份（及批量情景）组成一个分块对角的稀疏线性规划，用索引数组一次构建，
+由 scipy 的 HiGHS 求解器求解；批量情景中有情景无可行解时，逐情景分别求解，
+只有无解的情景规划结果为 NaN。
+装机来源、燃料成本类型和分摊比例取自技术目录，目录中新增的技术同样参与规划。
+"""
+
+import numpy as np
+from typing import Dict, Any, List
+from dataclasses import replace, fields
+
+try:
+    from scipy import sparse
+    from scipy.optimize import linprog
+except ImportError:  # pragma: no cover - 可选依赖
+    sparse = None
+    linprog = None
+
+from .variables import PowerVariables
+from .formulas import PowerFormulas
+from .catalog import TechnologyCatalog, DEFAULT_CATALOG
+from .vectorized import (PowerArrays, VectorizedPowerCalculator, calculate_capacity_array,
+                         cost_type_capacity, compute_power_arrays, pack_power_results,
+                         _safe_divide)
+from .ldc import default_load_shape, HOURS_PER_YEAR
+
+
+class CapacityExpansionPlanner:
+    """电力装机最小成本规划"""
+
+    def __init__(self, variables: PowerVariables = None, formulas: PowerFormulas = None,
+                 catalog: TechnologyCatalog = None):
+        self.catalog = catalog or DEFAULT_CATALOG
+        self.variables = variables or self.catalog.to_variables()
+        self.formulas = formulas or PowerFormulas()
+
+    @property
+    def variable_renewable_types(self) -> List[str]:
+        """风光（资源约束且非水电）发电类型"""
+        return [k for k in self.variables.RESOURCE_LIMITED_TYPES if k != '水电']
+
+    def solve(self, arrays: PowerArrays, co2_cap: np.ndarray = None,
+              storage_ratio: np.ndarray = None,
+              bounds: Dict[str, tuple] = None,
+              coal_co2_factor: float = 2.66, gas_co2_factor: float = 2.16,
+              gas_conversion_factor: float = 1.33) -> Dict[str, Any]:
+        """
+        求解装机规划
+        Args:
+            arrays: 电力输入数组（需求、成本、利用小时数等），可带批量情景前置维度
+            co2_cap: 净CO2排放上限 (..., Y)，为空时不约束，NaN 表示该年不约束
+            storage_ratio: 储能/新能源最低比例 (..., Y)，为空时取输入装机的比例
+            bounds: {装机成本类型: (下限, 上限)}，值可广播到 (..., Y)，单位GW
+        Returns:
+            {'status', 'message', 'years', 'types', 'capacity' (..., 14, Y),
+             'generation' (..., 12, Y), 'cost' (..., Y), 'scenario_status' (...)}
+            批量求解失败时逐情景重新求解，'scenario_status' 为各情景的求解状态（0 为最优），
+            无解情景的规划结果为 NaN，'status' 取第一个无解情景的状态
+        """
+        if linprog is None:
+            raise ImportError("装机规划需要 scipy，请先安装: pip install scipy")
+
+        options = dict(co2_cap=co2_cap, storage_ratio=storage_ratio, bounds=bounds,
+                       coal_co2_factor=coal_co2_factor, gas_co2_factor=gas_co2_factor,
+                       gas_conversion_factor=gas_conversion_factor)
+        plan = self._solve_lp(arrays, **options)
+        scenario_shape = arrays.electricity_demand.shape[:-1]
+        plan['scenario_status'] = np.full(scenario_shape, plan['status'])
+        if plan['status'] == 0 or int(np.prod(scenario_shape)) <= 1:
+            return plan
+
+        # 逐情景求解，一个情景无解不影响其他情景
+        failed = []
+        for index in np.ndindex(*scenario_shape):
+            single = self._solve_lp(self._scenario_arrays(arrays, index),
+                                    **self._scenario_options(options, arrays, index))
+            plan['scenario_status'][index] = single['status']
+            plan['capacity'][index] = single['capacity']
+            plan['generation'][index] = single['generation']
+            plan['cost'][index] = single['cost']
+            if single['status'] != 0:
+                failed.append((index, single))
+        if not failed:
+            plan['status'], plan['message'] = 0, '批量求解失败，逐情景求解均得到最优解'
+        else:
+            plan['status'] = failed[0][1]['status']
+            plan['message'] = '; '.join(f"情景 {index}: {single['message']}" for index, single in failed)
+        return plan
+
+    @staticmethod
+    def _scenario_arrays(arrays: PowerArrays, index: tuple) -> PowerArrays:
+        """取出批量数组中的一个情景"""
+        return replace(arrays, **{f.name: getattr(arrays, f.name)[index] for f in fields(PowerArrays)
+                                  if f.name != 'years' and getattr(arrays, f.name) is not None})
+
+    @staticmethod
+    def _scenario_options(options: Dict[str, Any], arrays: PowerArrays, index: tuple) -> Dict[str, Any]:
+        """取出约束参数中一个情景的部分（参数可广播到 (..., Y)）"""
+        batch_shape = arrays.electricity_demand.shape
+        take = lambda value: None if value is None else np.broadcast_to(value, batch_shape)[index]
+        single = {key: take(value) for key, value in options.items() if key != 'bounds'}
+        single['bounds'] = {key: tuple(take(v) for v in bound)
+                            for key, bound in (options['bounds'] or {}).items()}
+        return single
+
+    def _solve_lp(self, arrays: PowerArrays, co2_cap: np.ndarray = None,
+                  storage_ratio: np.ndarray = None, bounds: Dict[str, tuple] = None,
+                  coal_co2_factor: float = 2.66, gas_co2_factor: float = 2.16,
+                  gas_conversion_factor: float = 1.33) -> Dict[str, Any]:
+        """构建并求解全部年份（及批量情景）的分块对角线性规划"""
+
+        variables = self.variables
+        catalog = self.catalog
+        sources = catalog.capacity_source
+        cost_types = variables.CAPACITY_COST_TYPES
+        gen_cost_types = variables.OM_COST_RATIO_TYPES
+        num_cap, num_gen = len(cost_types), len(gen_cost_types)
+        batch_shape = arrays.electricity_demand.shape
+        num_blocks = int(np.prod(batch_shape))
+        flat = lambda values: np.broadcast_to(values, batch_shape).reshape(-1)
+        # (..., 类型, Y) -> (类型, B)
+        rows_of = lambda matrix: np.moveaxis(matrix, -2, 0).reshape(matrix.shape[-2], -1)
+
+        # ==================== 目标函数系数 ====================
+        formulas = self.formulas
+        unit_cost = rows_of(arrays.capacity_cost)
+        annuity = rows_of(np.broadcast_to(arrays.annuity_factor[..., None],
+                                          arrays.capacity_cost.shape))
+        investment = formulas.calculate_investment_cost(unit_cost, 1.0, annuity)
+        om = formulas.calculate_om_cost(unit_cost[:num_gen], rows_of(arrays.om_ratio), 1.0)
+        cap_cost = investment.copy()
+        cap_cost[:num_gen] = investment[:num_gen] * 2 + om
+
+        fuel_price = rows_of(arrays.fuel_cost)
+        gen_cost = np.zeros((num_gen, num_blocks))
+        for j, key in enumerate(gen_cost_types):
+            if key in catalog.fuel_cost_output_types:
+                gen_cost[j] = formulas.calculate_fuel_cost(fuel_price[j], 1.0)
+
+        # ==================== 最大利用小时数 ====================
+        hours = rows_of(arrays.utilization_hours)
+        gen_types = variables.GENERATION_TYPES
+        max_hours = np.zeros((num_gen, num_blocks))
+        for j, key in enumerate(gen_cost_types):
+            source = sources[key]
+            if source in variables.RESOURCE_LIMITED_TYPES:
+                max_hours[j] = hours[gen_types.index(source)]
+            else:
+                max_hours[j] = HOURS_PER_YEAR * variables.AVAILABILITY_FACTOR.get(source, 1.0)
+
+        # ==================== 需求 ====================
+        # 无装机成本的发电类型（如 '其他'）按输入发电量扣除
+        fixed = [i for i, key in enumerate(gen_types) if key not in sources.values()]
+        other = arrays.generation[..., fixed, :].sum(axis=-2)
+        demand = flat(np.maximum((arrays.hydrogen_demand + arrays.electricity_demand)
+                                 * (1 + arrays.transmission_loss) - other, 0.0))
+        shape = default_load_shape(variables.LDC_MIN_LOAD_RATIO)
+        # 尖峰负荷(GW) = 年用电量(GWh) / 负荷曲线等效小时数
+        annual_gwh = flat((arrays.hydrogen_demand + arrays.electricity_demand)
+                          * (1 + arrays.transmission_loss)) * 1000000
+        peak = annual_gwh / shape.sum() * (1 + variables.PLANNING_RESERVE_MARGIN)
+        credit = np.array([
+            variables.CAPACITY_CREDIT.get(
+                k, variables.AVAILABILITY_FACTOR.get(sources[k], 1.0))
+            for k in cost_types
+        ])
+
+        if storage_ratio is None:
+            capacity = calculate_capacity_array(arrays)
+            vre_rows = [gen_types.index(k) for k in self.variable_renewable_types]
+            vre_capacity = capacity[..., vre_rows, :].sum(axis=-2)
+            storage_ratio = _safe_divide(arrays.storage.sum(axis=-2), vre_capacity)
+        storage_ratio = flat(storage_ratio)
+
+        # ==================== 稀疏约束矩阵 ====================
+        # 变量: 装机 cap[k, b] = k*B + b，发电量 gen[j, b] = 14*B + j*B + b
+        blocks = np.arange(num_blocks)
+        cap_index = lambda k: k * num_blocks + blocks
+        gen_index = lambda j: (num_cap + j) * num_blocks + blocks
+        num_vars = (num_cap + num_gen) * num_blocks
+
+        row_parts, col_parts, value_parts, rhs_parts = [], [], [], []
+        next_row = [0]
+
+        def add_rows(terms, rhs):
+            """terms: [(变量索引 (B,), 系数 (B,))]，每个块一行"""
+            rows = next_row[0] + blocks
+            for columns, coefficient in terms:
+                row_parts.append(rows)
+                col_parts.append(columns)
+                value_parts.append(np.broadcast_to(coefficient, (num_blocks,)))
+            rhs_parts.append(np.broadcast_to(rhs, (num_blocks,)))
+            next_row[0] += num_blocks
+
+        # 发电量 <= 装机 × 最大利用小时数 / 1000000
+        for j in range(num_gen):
+            add_rows([(gen_index(j), 1.0), (cap_index(j), -max_hours[j] / 1000000)], 0.0)
+        # 总发电量 >= 需求
+        add_rows([(gen_index(j), -1.0) for j in range(num_gen)], -demand)
+        # 可信装机 >= 尖峰负荷 × (1 + 备用率)
+        add_rows([(cap_index(k), -credit[k]) for k in range(num_cap)], -peak)
+        # 储能装机 >= 比例 × 风光装机
+        vre = [k for k, key in enumerate(cost_types) if sources[key] in self.variable_renewable_types]
+        storage = [cost_types.index(k) for k in variables.STORAGE_TYPES]
+        add_rows([(cap_index(k), -1.0) for k in storage]
+                 + [(cap_index(k), storage_ratio) for k in vre], 0.0)
+        # 净CO2 <= 上限
+        if co2_cap is not None:
+            co2 = self._co2_coefficients(arrays, flat(coal_co2_factor), flat(gas_co2_factor),
+                                         flat(gas_conversion_factor))
+            limit = flat(co2_cap).astype(float)
+            add_rows([(gen_index(j), co2[j]) for j in range(num_gen)],
+                     np.where(np.isnan(limit), 1e12, limit))
+
+        a_ub = sparse.csr_matrix(
+            (np.concatenate(value_parts), (np.concatenate(row_parts), np.concatenate(col_parts))),
+            shape=(next_row[0], num_vars))
+        b_ub = np.concatenate(rhs_parts)
+
+        # ==================== 变量上下限 ====================
+        lower = np.zeros(num_vars)
+        upper = np.full(num_vars, np.inf)
+        capacity = calculate_capacity_array(arrays)
+        share, cost_capacity = cost_type_capacity(arrays, capacity, variables, catalog)
+        input_capacity = rows_of(share * cost_capacity)
+        for key in variables.EXPANSION_CAPPED_TYPES:
+            k = cost_types.index(key)
+            upper[cap_index(k)] = input_capacity[k]
+        for key, (low, high) in (bounds or {}).items():
+            k = cost_types.index(key)
+            if low is not None:
+                lower[cap_index(k)] = flat(low)
+            if high is not None:
+                upper[cap_index(k)] = flat(high)
+
+        cost = np.concatenate([cap_cost.reshape(-1), gen_cost.reshape(-1)])
+        result = linprog(cost, A_ub=a_ub, b_ub=b_ub,
+                         bounds=np.column_stack([lower, upper]), method='highs')
+
+        x = result.x if result.x is not None else np.full(num_vars, np.nan)
+        to_batch = lambda values, n: np.moveaxis(values.reshape((n,) + batch_shape), 0, -2)
+        cap_values = x[:num_cap * num_blocks].reshape(num_cap, num_blocks)
+        gen_values = x[num_cap * num_blocks:].reshape(num_gen, num_blocks)
+        block_cost = (cap_cost * cap_values).sum(axis=0) + (gen_cost * gen_values).sum(axis=0)
+        return {
+            'status': result.status,
+            'message': result.message,
+            'years': list(arrays.years),
+            'types': list(cost_types),
+            'capacity': to_batch(cap_values, num_cap),
+            'generation': to_batch(gen_values, num_gen),
+            'cost': block_cost.reshape(batch_shape)
+        }
+
+    def _co2_coefficients(self, arrays: PowerArrays, coal_co2_factor: float,
+                          gas_co2_factor: float, gas_conversion_factor: float) -> np.ndarray:
+        """单位发电量(万亿kWh)的净CO2排放 (12, B)，按 PowerFormulas 的CO2公式计算"""
+        variables = self.variables
+        formulas = self.formulas
+        rate_types = variables.FUEL_RATE_TYPES
+        rate = lambda key: np.moveaxis(arrays.fuel_rate, -2, 0)[rate_types.index(key)].reshape(-1)
+        capture = arrays.ccs_capture_rate.reshape(-1)
+        num_blocks = capture.size
+
+        coefficients = {
+            '煤电': formulas.calculate_coal_co2(
+                formulas.calculate_coal_consumption(1.0, rate('煤炭'), 0.0, 0.0), coal_co2_factor),
+            '煤电+CCS': formulas.calculate_coal_co2(
+                formulas.calculate_coal_consumption(0.0, 0.0, 1.0, rate('煤炭CCS')), coal_co2_factor)
+            - formulas.calculate_fossil_ccs_capture(rate('煤炭CCS'), 1.0, coal_co2_factor,
+                                                    0.0, 0.0, gas_co2_factor,
+                                                    gas_conversion_factor, capture),
+            '气电': formulas.calculate_gas_co2(
+                formulas.calculate_gas_consumption(1.0, rate('天然气'), 0.0, 0.0,
+                                                   gas_conversion_factor), gas_co2_factor),
+            '气电+CCS': formulas.calculate_gas_co2(
+                formulas.calculate_gas_consumption(0.0, 0.0, 1.0, rate('天然气CCS'),
+                                                   gas_conversion_factor), gas_co2_factor)
+            - formulas.calculate_fossil_ccs_capture(0.0, 0.0, coal_co2_factor,
+                                                    rate('天然气CCS'), 1.0, gas_co2_factor,
+                                                    gas_conversion_factor, capture),
+            '生物质+CCS': -formulas.calculate_biomass_ccs_capture(
+                rate('生物质CCS'), 1.0, variables.BIOMASS_CO2_FACTOR, capture),
+        }
+        return np.stack([np.broadcast_to(coefficients.get(k, 0.0), (num_blocks,))
+                         for k in variables.OM_COST_RATIO_TYPES])
+
+    def planned_arrays(self, arrays: PowerArrays, plan: Dict[str, Any]):
+        """
+        将规划结果转换为 PowerArrays 和发电装机
+        Returns:
+            (planned_arrays, capacity)：发电量、利用小时数、储能、海上风电和分布式光伏占比
+            替换为规划值（目录中各分摊比例字段按规划装机重算）；capacity 为发电类型装机 (..., 11, Y)
+        """
+        variables = self.variables
+        sources = self.catalog.capacity_source
+        cost_types = variables.CAPACITY_COST_TYPES
+        gen_cost_types = variables.OM_COST_RATIO_TYPES
+        gen_types = variables.GENERATION_TYPES
+        cap, gen = plan['capacity'], plan['generation']
+
+        capacity = np.zeros(arrays.generation.shape)
+        generation = arrays.generation.copy()
+        for i, key in enumerate(gen_types):
+            cap_rows = [k for k, c in enumerate(cost_types) if sources[c] == key]
+            gen_rows = [j for j, c in enumerate(gen_cost_types) if sources[c] == key]
+            if cap_rows:
+                capacity[..., i, :] = cap[..., cap_rows, :].sum(axis=-2)
+                generation[..., i, :] = gen[..., gen_rows, :].sum(axis=-2)
+            else:
+                capacity[..., i, :] = calculate_capacity_array(arrays)[..., i, :]
+
+        # 分摊比例 = 取比例一侧技术的规划装机 / 装机来源的规划装机
+        ratios = {t.split_field: _safe_divide(cap[..., cost_types.index(t.name), :],
+                                              capacity[..., gen_types.index(t.capacity_source), :])
+                  for t in self.catalog.cost_technologies
+                  if t.split_field and not t.split_complement and t.kind == 'generation'}
+        planned = replace(
+            arrays,
+            generation=generation,
+            utilization_hours=_safe_divide(generation * 1000000, capacity),
+            storage=np.stack([cap[..., cost_types.index(k), :] for k in variables.STORAGE_TYPES],
+                             axis=-2),
+            **ratios
+        )
+        return planned, capacity
+
+
+class ExpansionPowerCalculator(VectorizedPowerCalculator):
+    """电力结果计算器（装机由最小成本规划确定）"""
+
+    def __init__(self, co2_cap: List[float] = None, storage_ratio: List[float] = None):
+        super().__init__()
+        self.co2_cap = co2_cap
+        self.storage_ratio = storage_ratio
+
+    def calculate(self) -> Dict[str, Any]:
+        """执行装机规划，并以规划装机和发电量计算全部结果"""
+        arrays = self.build_arrays()
+        planner = CapacityExpansionPlanner(self.variables, self.formulas, self.catalog)
+        plan = planner.solve(
+            arrays,
+            co2_cap=None if self.co2_cap is None else np.asarray(self.co2_cap, dtype=float),
+            storage_ratio=None if self.storage_ratio is None else np.asarray(self.storage_ratio,
+                                                                             dtype=float),
+            coal_co2_factor=self.power_data.coal_co2_factor,
+            gas_co2_factor=self.power_data.gas_co2_factor,
+            gas_conversion_factor=self.power_data.gas_conversion_factor)
+        if plan['status'] != 0:
+            print(f"警告: 装机规划未得到最优解 - {plan['message']}")
+            return super().calculate()
+
+        planned, capacity = planner.planned_arrays(arrays, plan)
+        raw = compute_power_arrays(planned, self.variables,
+                                   self.power_data.coal_co2_factor,
+                                   self.power_data.gas_co2_factor,
+                                   self.power_data.gas_conversion_factor,
+                                   capacity=capacity, catalog=self.catalog)
+        return pack_power_results(raw, self.power_data.years)
@@ -1,6 +1,8 @@
 # -*- coding: utf-8 -*-
 """电力结果公式定义"""
 
+import math
+
 from ...base import BaseFormulas
 
 
@@ -333,6 +335,17 @@ class PowerFormulas(BaseFormulas):
         factor = 1 - rate
         return factor / (1 - factor ** lifetime)
     
+    def calculate_annuity_factor_derivative(self, lifetime: int, rate: float = 0.06) -> float:
+        """
+        计算年金系数对寿命的导数
+        公式: d年金系数/d寿命 = (1-rate) * (1-rate)^寿命 * LN(1-rate) / (1-(1-rate)^寿命)^2
+        """
+        if lifetime <= 0:
+            return 0.0
+        factor = 1 - rate
+        power = factor ** lifetime
+        return factor * power * math.log(factor) / (1 - power) ** 2
+    
     def calculate_investment_cost(self, unit_cost: float, capacity: float,
                                   annuity_factor: float) -> float:
         """
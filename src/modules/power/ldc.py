@@ -0,0 +1,282 @@
+# -*- coding: utf-8 -*-
+"""负荷持续曲线（LDC）优先顺序调度
+
+比逐时调度更轻量的调度方式，用于由装机内生计算利用小时数和发电结构：
+1. 逐年构建负荷曲线，水电、风电、光伏按给定利用小时数（或逐时出力曲线）优先消纳，
+   得到净负荷并排序为持续曲线
+2. 其余机组按燃料成本（相同时按运维成本占比）从低到高排序，
+   以 装机 × 可用率 依次叠加到持续曲线上
+3. 各机组发电量 = 持续曲线在其容量区间内的面积，超出全部可用装机的部分计为缺电
+
+持续曲线上某一水平以上的面积通过排序、累计和与二分查找计算，
+所有情景 × 年份的曲线拼接后一次查找完成，可直接用于批量情景。
+"""
+
+import numpy as np
+from typing import Dict, Any, List, Optional
+from dataclasses import replace
+
+from .variables import PowerVariables
+from .vectorized import (PowerArrays, VectorizedPowerCalculator, calculate_capacity_array,
+                         compute_power_arrays, pack_power_results)
+from .dispatch import (HourlyProfiles, GWH_PER_TWH10, load_hourly_profiles,
+                       export_sections, _outer, _divide)
+
+
+HOURS_PER_YEAR = 8760
+
+
+def default_load_shape(min_load_ratio: float = 0.45,
+                       num_hours: int = HOURS_PER_YEAR) -> np.ndarray:
+    """无逐时曲线时的默认负荷持续曲线形状：由最大负荷线性下降到最小负荷"""
+    return np.linspace(1.0, min_load_ratio, num_hours)
+
+
+def area_above(sorted_curve: np.ndarray, levels: np.ndarray) -> np.ndarray:
+    """
+    各行持续曲线在各水平以上的面积: SUM(MAX(曲线 - 水平, 0))
+    Args:
+        sorted_curve: 每行升序排列的非负曲线 (R, H)
+        levels: 非负水平 (R, K)
+    Returns:
+        (R, K) 面积，单位为 曲线单位 × 小时
+    """
+    num_rows, num_hours = sorted_curve.shape
+    prefix = np.concatenate([np.zeros((num_rows, 1)), np.cumsum(sorted_curve, axis=-1)], axis=-1)
+
+    # 各行加上互不重叠的偏移后拼接为一条升序序列，一次二分查找所有行
+    span = sorted_curve.max(initial=0.0) + levels.max(initial=0.0) + 1.0
+    offsets = np.arange(num_rows)[:, None] * span
+    flat = (sorted_curve + offsets).ravel()
+    index = np.searchsorted(flat, (levels + offsets).ravel(), side='right')
+    index = index.reshape(levels.shape) - np.arange(num_rows)[:, None] * num_hours
+
+    above = prefix[:, -1:] - np.take_along_axis(prefix, index, axis=-1)
+    return np.maximum(above - (num_hours - index) * levels, 0.0)
+
+
+def area_above_shape(sorted_shape: np.ndarray, levels: np.ndarray) -> np.ndarray:
+    """
+    同一条升序曲线在任意形状水平数组以上的面积: SUM(MAX(曲线 - 水平, 0))
+    """
+    num_hours = len(sorted_shape)
+    prefix = np.concatenate([[0.0], np.cumsum(sorted_shape)])
+    index = np.searchsorted(sorted_shape, levels, side='right')
+    return np.maximum(prefix[-1] - prefix[index] - (num_hours - index) * levels, 0.0)
+
+
+class LoadDurationDispatch:
+    """负荷持续曲线优先顺序调度"""
+
+    def __init__(self, profiles: Optional[HourlyProfiles] = None,
+                 variables: PowerVariables = None):
+        self.variables = variables or PowerVariables()
+        self.profiles = profiles
+
+    def merit_order_types(self) -> List[str]:
+        """参与优先顺序调度的发电类型"""
+        limited = self.variables.RESOURCE_LIMITED_TYPES
+        return [k for k in self.variables.GENERATION_TYPES if k not in limited]
+
+    def run(self, arrays: PowerArrays, capacity: np.ndarray = None) -> Dict[str, Any]:
+        """
+        执行调度
+        Args:
+            arrays: 电力输入数组，可带批量情景前置维度
+            capacity: 发电装机 (..., 11, Y)，为空时由输入发电量和利用小时数计算
+        Returns:
+            {'years', 'capacity', 'generation', 'utilization_hours',
+             'generation_structure', 'balance'}，发电类型矩阵为 (..., 11, Y)，其余为 (..., Y)
+        """
+        variables = self.variables
+        gen_types = variables.GENERATION_TYPES
+        if capacity is None:
+            capacity = calculate_capacity_array(arrays)
+        cap = lambda key: capacity[..., gen_types.index(key), :]
+
+        # ==================== 优先顺序及累计可用装机 ====================
+        merit_types = self.merit_order_types()
+        merit_capacity = np.stack([
+            cap(k) * variables.AVAILABILITY_FACTOR.get(k, 1.0) for k in merit_types
+        ], axis=-2)
+        order = self._merit_order(arrays, merit_types)
+        sorted_cap = np.take_along_axis(merit_capacity, order, axis=-2)
+        levels = np.cumsum(sorted_cap, axis=-2)
+        levels = np.concatenate([np.zeros_like(levels[..., :1, :]), levels], axis=-2)
+
+        # ==================== 负荷持续曲线 ====================
+        total_demand = ((arrays.hydrogen_demand + arrays.electricity_demand)
+                        * (1 + arrays.transmission_loss))
+        total_gen = arrays.generation.sum(axis=-2)
+        annual_load = np.where(total_demand > 0, total_demand, total_gen) * GWH_PER_TWH10
+
+        if self.profiles is not None:
+            limited, surplus, area, peak = self._chronological(arrays, capacity, annual_load, levels)
+        else:
+            limited, surplus, area, peak = self._shape_only(arrays, annual_load, levels)
+
+        # (..., K+1, Y) 面积之差为各机组发电量
+        sorted_energy = area[..., :-1, :] - area[..., 1:, :]
+        merit_energy = np.zeros(sorted_energy.shape)
+        np.put_along_axis(merit_energy, order, sorted_energy, axis=-2)
+        unserved = area[..., -1, :]
+
+        # ==================== 汇总 ====================
+        limited_total = sum(limited.values())
+        curtailed_share = _divide(surplus, limited_total)
+        generation = np.zeros(capacity.shape)
+        for i, key in enumerate(merit_types):
+            generation[..., gen_types.index(key), :] = merit_energy[..., i, :] / GWH_PER_TWH10
+        for key, energy in limited.items():
+            generation[..., gen_types.index(key), :] = energy * (1 - curtailed_share) / GWH_PER_TWH10
+        total = generation.sum(axis=-2)
+
+        return {
+            'years': list(arrays.years),
+            'capacity': capacity,
+            'generation': generation,
+            'utilization_hours': _divide(generation * GWH_PER_TWH10, capacity),
+            'generation_structure': _divide(generation, total[..., None, :]),
+            'balance': {
+                '负荷': annual_load / GWH_PER_TWH10,
+                '最大负荷(GW)': peak,
+                '弃电量': surplus / GWH_PER_TWH10,
+                '缺电量': unserved / GWH_PER_TWH10
+            }
+        }
+
+    def _shape_only(self, arrays: PowerArrays, annual_load: np.ndarray, levels: np.ndarray):
+        """
+        无逐时曲线: 资源约束机组按年发电量均匀出力，净负荷 = 年负荷 × 形状 - 均匀出力
+        所有情景 × 年份共用同一条形状曲线，面积按比例换算，不构建逐时数组
+        """
+        variables = self.variables
+        gen_types = variables.GENERATION_TYPES
+        shape = default_load_shape(variables.LDC_MIN_LOAD_RATIO)
+        shape = np.sort(shape / shape.sum())
+        num_hours = len(shape)
+
+        limited = {k: arrays.generation[..., gen_types.index(k), :] * GWH_PER_TWH10
+                   for k in variables.RESOURCE_LIMITED_TYPES}
+        flat = sum(limited.values()) / num_hours
+
+        # 净负荷(h) = a × 形状(h) - b，水平 L 以上面积 = a × 形状在 (b+L)/a 以上的面积
+        a, b = annual_load[..., None, :], flat[..., None, :]
+        positive = a > 0
+        area = np.where(positive, a * area_above_shape(shape, _divide(levels + b, a)), 0.0)
+        positive_area = np.where(positive, a * area_above_shape(shape, _divide(b, a)), 0.0)
+        # 富余 = SUM(MAX(b - a×形状, 0)) = H×b - a + 净负荷正值面积
+        surplus = np.maximum(num_hours * b - a + positive_area, 0.0)[..., 0, :]
+        peak = annual_load * shape[-1]
+        return limited, surplus, area, peak
+
+    def _chronological(self, arrays: PowerArrays, capacity: np.ndarray,
+                       annual_load: np.ndarray, levels: np.ndarray):
+        """有逐时曲线: 按时序计算净负荷后逐行排序"""
+        variables = self.variables
+        gen_types = variables.GENERATION_TYPES
+        profiles = self.profiles
+        num_hours = profiles.num_hours
+        cap = lambda key: capacity[..., gen_types.index(key), :]
+
+        load = _outer(profiles.demand / profiles.demand.sum(), annual_load)
+        limited, net = {}, load
+        for key in variables.RESOURCE_LIMITED_TYPES:
+            if key == '风电':
+                hourly = _outer(profiles.wind, cap(key))
+            elif key == '光伏':
+                hourly = _outer(profiles.solar, cap(key))
+            else:
+                if key == '水电' and profiles.hydro is not None:
+                    hourly_shape = profiles.hydro / profiles.hydro.sum()
+                else:
+                    hourly_shape = np.full(num_hours, 1.0 / num_hours)
+                annual_energy = arrays.generation[..., gen_types.index(key), :] * GWH_PER_TWH10
+                hourly = _outer(hourly_shape, annual_energy)
+            limited[key] = hourly.sum(axis=0)
+            net = net - hourly
+
+        surplus = np.maximum(-net, 0.0).sum(axis=0)
+        # (..., Y, 小时) 升序排列后展平为 (行, 小时)
+        curve = np.sort(np.moveaxis(np.maximum(net, 0.0), 0, -1), axis=-1)
+        row_levels = np.swapaxes(levels, -1, -2)
+        area = area_above(curve.reshape(-1, num_hours),
+                          row_levels.reshape(-1, row_levels.shape[-1]))
+        area = np.swapaxes(area.reshape(row_levels.shape), -1, -2)
+        return limited, surplus, area, load.max(axis=0)
+
+    def _merit_order(self, arrays: PowerArrays, merit_types: List[str]) -> np.ndarray:
+        """
+        优先顺序索引 (..., K, Y)：按燃料成本(元/kWh)升序，燃料成本相同的按运维成本占比升序
+        """
+        fuel_types = self.variables.FUEL_COST_TYPES
+        om_types = self.variables.OM_COST_RATIO_TYPES
+        zeros = np.zeros(arrays.fuel_cost.shape[:-2] + arrays.fuel_cost.shape[-1:])
+        fuel = np.stack([arrays.fuel_cost[..., fuel_types.index(k), :]
+                         if k in fuel_types else zeros for k in merit_types], axis=-2)
+        om = np.stack([arrays.om_ratio[..., om_types.index(k), :]
+                       if k in om_types else zeros for k in merit_types], axis=-2)
+        return np.lexsort((om, fuel), axis=-2)
+
+
+class LdcPowerCalculator(VectorizedPowerCalculator):
+    """电力结果计算器（负荷持续曲线调度内生利用小时数）"""
+
+    def __init__(self, profiles: Optional[HourlyProfiles] = None):
+        super().__init__()
+        self.profiles = profiles
+
+    def load_profiles_from_csv(self, filepath: str) -> None:
+        """加载逐时曲线（可选，未加载时使用默认负荷持续曲线）"""
+        self.profiles = load_hourly_profiles(filepath)
+
+    def calculate(self) -> Dict[str, Any]:
+        """
+        以输入装机执行调度，用调度后的发电量重新计算发电结构、CO2和成本
+        装机容量（及投资、运维成本）保持输入值
+        """
+        arrays = self.build_arrays()
+        dispatch = LoadDurationDispatch(self.profiles, self.variables).run(arrays)
+        dispatched = replace(arrays, generation=dispatch['generation'],
+                             utilization_hours=dispatch['utilization_hours'])
+        raw = compute_power_arrays(dispatched, self.variables,
+                                   self.power_data.coal_co2_factor,
+                                   self.power_data.gas_co2_factor,
+                                   self.power_data.gas_conversion_factor,
+                                   capacity=dispatch['capacity'], catalog=self.catalog)
+        results = pack_power_results(raw, self.power_data.years)
+
+        gen_types = self.variables.GENERATION_TYPES
+        results['ldc'] = {
+            'utilization_hours': {
+                k: [round(v, 2) for v in dispatch['utilization_hours'][gen_types.index(k)].tolist()]
+                for k in gen_types
+            },
+            'balance': {k: [round(v, 4) for v in values.tolist()]
+                        for k, values in dispatch['balance'].items()}
+        }
+        return results
+
+    def export_to_csv(self, results: dict, filepath: str) -> None:
+        """导出年度结果，调度结果导出到同目录 *_ldc.csv"""
+        super().export_to_csv(results, filepath)
+        if 'ldc' in results:
+            titles = {'utilization_hours': '内生利用小时数(小时)', 'balance': '电力平衡'}
+            export_sections(results['ldc'], titles, results['years'], filepath, 'ldc')
+
+    def print_results(self, results: dict) -> None:
+        """打印年度结果及内生利用小时数"""
+        super().print_results(results)
+        if 'ldc' not in results:
+            return
+
+        years = results['years']
+        print("负荷持续曲线调度 - 内生利用小时数")
+        header = f"{'项目':<20}" + "".join([f"{y:>12}" for y in years])
+        print(header)
+        print("-" * 120)
+        for key, values in results['ldc']['utilization_hours'].items():
+            print(f"  {key:<18}" + "".join([f"{v:>12.0f}" for v in values]))
+        values = results['ldc']['balance']['缺电量']
+        print(f"  {'缺电量':<18}" + "".join([f"{v:>12.4f}" for v in values]))
+        print("=" * 120)
@@ -0,0 +1,185 @@
+# -*- coding: utf-8 -*-
+"""电力系统成本全周期折现（NPV）核算
+
+里程碑年份（如每5年）的年化成本线性插值到逐年，按折现率折现到基准年后求和，
+按技术和成本类别给出现值合计：
+    现值 = SUM(逐年成本 × 折现系数) = 里程碑成本 @ (插值矩阵.T @ 折现向量)
+插值矩阵与折现向量的乘积只与 (年份, 折现率, 基准年) 有关，按键缓存；
+年金系数按 (折现率, 寿命) 缓存。投资按 装机 × 单位成本 × 年金系数(折现率) 重新定价，
+因此同一批情景在多个折现率下重算时，每个折现率只需一次矩阵乘法。
+年金系数公式 (1-rate)/(1-(1-rate)^寿命) 在折现率趋于0时发散，折现率须在 (0, 1) 内。
+"""
+
+import csv
+import os
+import numpy as np
+from functools import lru_cache
+from typing import Dict, List, Tuple
+
+from .variables import PowerVariables
+from .formulas import PowerFormulas
+from .catalog import TechnologyCatalog, DEFAULT_CATALOG
+from .vectorized import (PowerArrays, calculate_capacity_array, cost_type_capacity,
+                         compute_power_arrays, _safe_divide)
+from .stock import interpolation_matrix
+
+
+@lru_cache(maxsize=None)
+def discount_vector(rate: float, start_year: int, end_year: int, base_year: int) -> np.ndarray:
+    """逐年折现系数: 1 / (1+rate)^(年份-基准年)，只读数组"""
+    years = np.arange(start_year, end_year + 1)
+    vector = 1.0 / (1.0 + rate) ** (years - base_year)
+    vector.flags.writeable = False
+    return vector
+
+
+@lru_cache(maxsize=None)
+def milestone_weights(years: Tuple[int, ...], rate: float, base_year: int) -> np.ndarray:
+    """
+    里程碑年份现值权重 (Y,): 插值矩阵.T @ 折现向量
+    里程碑成本 @ 权重 = 逐年插值后的折现总额
+    """
+    annual_years = list(range(years[0], years[-1] + 1))
+    weights = interpolation_matrix(list(years), annual_years).T @ discount_vector(
+        rate, years[0], years[-1], base_year)
+    weights.flags.writeable = False
+    return weights
+
+
+@lru_cache(maxsize=None)
+def cached_annuity_factor(rate: float, lifetime: float) -> float:
+    """年金系数，公式同 PowerFormulas.calculate_annuity_factor；折现率不在 (0, 1) 内时报错"""
+    check_rate(rate)
+    if lifetime <= 0:
+        return 0.0
+    factor = 1 - rate
+    return factor / (1 - factor ** lifetime)
+
+
+def check_rate(rate: float) -> None:
+    """年金系数公式在折现率 <= 0 时无定义（趋于0时发散），折现率须在 (0, 1) 内"""
+    if not 0 < rate < 1:
+        raise ValueError(f"折现率须在 (0, 1) 内: {rate}")
+
+
+def lifetime_from_annuity(annuity: np.ndarray, rate: float) -> np.ndarray:
+    """
+    由年金系数反推寿命（用于未携带寿命数组的 PowerArrays），rate 为计算该年金系数的折现率
+    公式: 寿命 = LN(1 - f/年金系数) / LN(f)，f = 1-rate
+    """
+    check_rate(rate)
+    factor = 1 - rate
+    annuity = np.asarray(annuity, dtype=float)
+    lifetime = np.zeros(annuity.shape)
+    valid = annuity > factor
+    lifetime[valid] = np.log(1 - factor / annuity[valid]) / np.log(factor)
+    return np.round(lifetime, 6)
+
+
+def annuity_matrix(lifetime: np.ndarray, rate: float) -> np.ndarray:
+    """按 (折现率, 寿命) 缓存查表得到与 lifetime 同形状的年金系数"""
+    unique, inverse = np.unique(lifetime, return_inverse=True)
+    values = np.array([cached_annuity_factor(rate, float(life)) for life in unique])
+    return values[inverse].reshape(lifetime.shape)
+
+
+def calculate_power_npv(arrays: PowerArrays, rates: List[float] = None, base_year: int = None,
+                        variables: PowerVariables = None, formulas: PowerFormulas = None,
+                        coal_co2_factor: float = 2.66, gas_co2_factor: float = 2.16,
+                        gas_conversion_factor: float = 1.33,
+                        catalog: TechnologyCatalog = None) -> Dict[float, Dict[str, Dict[str, np.ndarray]]]:
+    """
+    计算各折现率下的成本现值
+    Args:
+        arrays: 电力输入数组，可带批量情景前置维度
+        rates: 折现率列表，为空时使用 PowerFormulas.discount_rate；须在 (0, 1) 内
+        base_year: 折现基准年，为空时取首个年份
+        catalog: 技术目录，数组须按同一目录构建
+    Returns:
+        {折现率: {'investment': {类型: 现值}, 'om_cost': {...}, 'fuel_cost': {...},
+                  'summary': {...}}}，现值单位亿元，形状为批量维度（单情景为标量数组）
+    """
+    catalog = catalog or DEFAULT_CATALOG
+    variables = variables or catalog.to_variables()
+    formulas = formulas or PowerFormulas()
+    fuel_types = catalog.fuel_cost_output_types
+    rates = rates if rates is not None else [formulas.discount_rate]
+    for rate in rates:
+        check_rate(float(rate))
+    years = tuple(int(y) for y in arrays.years)
+    base_year = years[0] if base_year is None else base_year
+    cost_types = variables.CAPACITY_COST_TYPES
+    om_types = variables.OM_COST_RATIO_TYPES
+    num_power = len(om_types)
+
+    # 与折现率无关的部分只算一次
+    raw = compute_power_arrays(arrays, variables, coal_co2_factor, gas_co2_factor,
+                               gas_conversion_factor, catalog=catalog)
+    capacity = calculate_capacity_array(arrays)
+    share, cost_capacity = cost_type_capacity(arrays, capacity, variables, catalog)
+    # 投资 = 单位成本 × 装机 / 10 × 年金系数
+    capital = arrays.capacity_cost * share * cost_capacity / 10
+    # 寿命随输入数组携带；旧数组没有寿命时按计算年金系数的折现率反推
+    lifetime = arrays.lifetime if arrays.lifetime is not None else \
+        lifetime_from_annuity(arrays.annuity_factor, formulas.discount_rate)
+    om = np.stack([raw['om_cost'][k] for k in om_types], axis=-2)
+    fuel = np.stack([raw['fuel_cost_total'][k] for k in fuel_types], axis=-2)
+    grid = raw['investment']['跨省电网']
+    generation = raw['generation']['总发电量']
+
+    results = {}
+    for rate in rates:
+        weights = milestone_weights(years, float(rate), base_year)
+        annuity = annuity_matrix(lifetime, float(rate))
+        investment_pv = np.einsum('...k,...ky,y->...k', annuity, capital, weights)
+        om_pv = om @ weights
+        fuel_pv = fuel @ weights
+        power_pv = investment_pv[..., :num_power].sum(axis=-1)
+        storage_pv = investment_pv[..., num_power:].sum(axis=-1)
+        grid_pv = grid @ weights
+        total_pv = (power_pv + storage_pv + grid_pv + power_pv
+                    + om_pv.sum(axis=-1) + fuel_pv.sum(axis=-1))
+        generation_pv = generation @ weights
+
+        results[rate] = {
+            'investment': {k: investment_pv[..., i] for i, k in enumerate(cost_types)},
+            'om_cost': {k: om_pv[..., i] for i, k in enumerate(om_types)},
+            'fuel_cost': {k: fuel_pv[..., i] for i, k in enumerate(fuel_types)},
+            'summary': {
+                '电源投资': power_pv,
+                '储能投资': storage_pv,
+                '跨省电网': grid_pv,
+                '省内电网': power_pv,
+                '运维成本': om_pv.sum(axis=-1),
+                '燃料成本': fuel_pv.sum(axis=-1),
+                '总成本现值': total_pv,
+                '发电量现值': generation_pv,
+                # 平准化系统成本(元/kWh) = 成本现值 / 发电量现值 / 10000
+                '平准化系统成本': _safe_divide(total_pv, generation_pv) / 10000,
+            }
+        }
+    return results
+
+
+def export_npv_to_csv(results: Dict[float, Dict[str, Dict[str, np.ndarray]]],
+                      filepath: str) -> None:
+    """导出单情景NPV结果，列为各折现率"""
+    if os.path.dirname(filepath):
+        os.makedirs(os.path.dirname(filepath), exist_ok=True)
+
+    rates = list(results.keys())
+    titles = {'summary': '现值合计(亿元)', 'investment': '投资现值(亿元)',
+              'om_cost': '运维成本现值(亿元)', 'fuel_cost': '燃料成本现值(亿元)'}
+    rows = []
+    for section, title in titles.items():
+        rows.append([title] + [''] * len(rates))
+        for key in results[rates[0]][section]:
+            digits = 4 if key == '平准化系统成本' else 2
+            rows.append([key] + [round(float(results[r][section][key]), digits) for r in rates])
+        rows.append([''] * (len(rates) + 1))
+
+    with open(filepath, 'w', newline='', encoding='utf-8-sig') as f:
+        writer = csv.writer(f)
+        writer.writerow(['项目'] + [f"折现率{r:.1%}" for r in rates])
+        writer.writerows(rows)
+    print(f"结果已导出到: {filepath}")
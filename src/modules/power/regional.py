@@ -0,0 +1,544 @@
+# -*- coding: utf-8 -*-
+"""多区域电力计算与跨区输电网络
+
+各电网区域各有一套 PowerData，沿首维堆叠为 区域 × 技术 × 年份 数组，
+全部区域由一次 compute_power_arrays 计算（不逐区域循环计算器）。
+
+区域间输电网络为带容量和损耗的线路图，逐年求解运输问题：
+    变量: 线路正向/反向输电量 f, g，区域缺电量 u，区域富余电量 x
+    约束: 富余_r + SUM(受入 × (1-损耗率)) - SUM(送出) + u_r - x_r = 0
+          0 <= f, g <= 线路年输电能力
+    目标: SUM((损耗率 + 过网费) × 输电量) + 缺电惩罚 × SUM(u)
+    区域富余 = 发电量/(1+误差) - (电制氢 + 电力需求)
+所有年份（及批量情景）组成分块对角的稀疏线性规划，由 scipy 的 HiGHS 求解器一次求解。
+
+全国结果由区域数组汇总为一套 PowerArrays 后按原公式计算，与现有全国输出格式一致：
+发电量、装机、储能、需求直接求和；装机成本、运维占比、燃料单价和燃料消耗率按装机或发电量加权，
+使投资、运维、燃料成本等于各区域之和；CCS捕集率按捕集前的CCS排放量加权，
+全国排放直接取各区域之和（各区域排放因子可能不同），计算后检查二者一致；
+跨区传输容量取各线路按投资系数折算的容量之和。
+"""
+
+import csv
+import os
+import numpy as np
+from typing import Dict, Any, List, Optional
+from dataclasses import dataclass, field, replace
+
+try:
+    from scipy import sparse
+    from scipy.optimize import linprog
+except ImportError:  # pragma: no cover - 可选依赖
+    sparse = None
+    linprog = None
+
+from .calculator import PowerCalculator
+from .variables import PowerVariables
+from .catalog import TechnologyCatalog, DEFAULT_CATALOG
+from .vectorized import (PowerArrays, VectorizedPowerCalculator, calculate_capacity_array,
+                         cost_type_capacity, compute_power_arrays, pack_power_results,
+                         _safe_divide)
+from .batch import PowerBatchCalculator
+from .dispatch import export_sections
+
+
+# 燃料消耗率类型 -> 对应发电类型（汇总时按发电量加权）
+FUEL_RATE_GENERATION = {
+    '煤炭': '煤电',
+    '煤炭CCS': '煤电+CCS',
+    '天然气': '气电',
+    '天然气CCS': '气电+CCS',
+    '生物质': '生物质',
+    '生物质CCS': '生物质+CCS',
+    '浓缩铀': '核电',
+}
+
+# 跨省电网投资系数，同 PowerFormulas.calculate_grid_investment
+GRID_INVESTMENT_FACTOR = 0.06
+
+
+@dataclass
+class TransmissionLine:
+    """跨区输电线路（双向）"""
+    from_region: str
+    to_region: str
+    # 年输电能力 (万亿kWh)，标量或逐年列表
+    capacity: Any = 0.0
+    # 损耗率
+    loss_rate: float = 0.05
+    # 投资系数，跨省电网投资 = 输电能力 × 投资系数 × 10000
+    cost_factor: float = GRID_INVESTMENT_FACTOR
+
+
+@dataclass
+class TransmissionNetwork:
+    """跨区输电网络"""
+    regions: List[str] = field(default_factory=list)
+    lines: List[TransmissionLine] = field(default_factory=list)
+
+    def line_names(self) -> List[str]:
+        return [f"{line.from_region}-{line.to_region}" for line in self.lines]
+
+    def endpoints(self):
+        """线路起点、终点的区域序号 (L,), (L,)"""
+        index = {name: i for i, name in enumerate(self.regions)}
+        for line in self.lines:
+            for name in (line.from_region, line.to_region):
+                if name not in index:
+                    raise ValueError(f"线路区域不在区域列表中: {name}")
+        return (np.array([index[line.from_region] for line in self.lines], dtype=int),
+                np.array([index[line.to_region] for line in self.lines], dtype=int))
+
+    def capacity_matrix(self, num_years: int) -> np.ndarray:
+        """线路年输电能力 (L, Y)"""
+        if not self.lines:
+            return np.zeros((0, num_years))
+        return np.stack([np.broadcast_to(np.asarray(line.capacity, dtype=float), (num_years,))
+                         for line in self.lines])
+
+    def loss_rates(self) -> np.ndarray:
+        return np.array([line.loss_rate for line in self.lines], dtype=float)
+
+    def regional_grid_capacity(self, num_years: int) -> np.ndarray:
+        """
+        各区域分摊的跨区传输容量 (R, Y)
+        每条线路按 输电能力 × 投资系数 / 0.06 折算，两端区域各分摊一半，
+        各区域之和即全国跨区传输容量，跨省电网投资与各线路投资之和一致
+        """
+        capacity = np.zeros((len(self.regions), num_years))
+        if not self.lines:
+            return capacity
+        start, end = self.endpoints()
+        factor = np.array([line.cost_factor for line in self.lines]) / GRID_INVESTMENT_FACTOR
+        equivalent = self.capacity_matrix(num_years) * factor[:, None] / 2
+        np.add.at(capacity, start, equivalent)
+        np.add.at(capacity, end, equivalent)
+        return capacity
+
+    @classmethod
+    def from_csv(cls, filepath: str, regions: List[str] = None,
+                 years: List[str] = None) -> 'TransmissionNetwork':
+        """
+        从CSV加载输电网络
+        CSV格式: 起点,终点,损耗率,投资系数,年份1,年份2,...（年份列为年输电能力，万亿kWh）
+        无年份列时可用 输电能力 列给出各年相同的输电能力
+        """
+        lines = []
+        with open(filepath, 'r', encoding='utf-8-sig') as f:
+            reader = csv.DictReader(f)
+            for row in reader:
+                if not (row.get('起点') or '').strip():
+                    continue
+                if years and all(y in row for y in years):
+                    capacity = [float(row[y] or 0) for y in years]
+                else:
+                    capacity = float(row.get('输电能力') or 0)
+                lines.append(TransmissionLine(
+                    from_region=row['起点'].strip(),
+                    to_region=row['终点'].strip(),
+                    capacity=capacity,
+                    loss_rate=float(row.get('损耗率') or 0.05),
+                    cost_factor=float(row.get('投资系数') or GRID_INVESTMENT_FACTOR)
+                ))
+        if regions is None:
+            regions = list(dict.fromkeys(
+                name for line in lines for name in (line.from_region, line.to_region)))
+        return cls(regions=list(regions), lines=lines)
+
+
+def solve_transmission(network: TransmissionNetwork, surplus: np.ndarray,
+                       capacity: np.ndarray = None, wheeling_cost: float = 0.001,
+                       shortage_penalty: float = 1000.0) -> Dict[str, Any]:
+    """
+    求解跨区输电运输问题
+    Args:
+        network: 输电网络
+        surplus: 区域富余电量 (R, ..., Y)，负值为缺口，单位万亿kWh
+        capacity: 线路年输电能力，可广播到 (L, ..., Y)，为空时取网络中的输电能力
+        wheeling_cost: 单位输电量的过网费（避免无意义的环流）
+        shortage_penalty: 单位缺电量惩罚
+    Returns:
+        {'status', 'message', 'flow' (L, ..., Y) 起点到终点的净输电量,
+         'loss' (L, ..., Y), 'net_import' (R, ..., Y) 扣除损耗后的净受入,
+         'shortage' (R, ..., Y), 'spill' (R, ..., Y)}
+    """
+    surplus = np.asarray(surplus, dtype=float)
+    num_regions = len(network.regions)
+    num_lines = len(network.lines)
+    batch_shape = surplus.shape[1:]
+    num_blocks = int(np.prod(batch_shape))
+    if num_lines == 0:
+        zeros = np.zeros((0,) + batch_shape)
+        return {
+            'status': 0, 'message': '无跨区线路',
+            'flow': zeros, 'loss': zeros,
+            'net_import': np.zeros(surplus.shape),
+            'shortage': np.maximum(-surplus, 0.0),
+            'spill': np.maximum(surplus, 0.0),
+        }
+    if linprog is None:
+        raise ImportError("跨区输电求解需要 scipy，请先安装: pip install scipy")
+
+    if capacity is None:
+        capacity = network.capacity_matrix(batch_shape[-1])
+    capacity = np.broadcast_to(capacity, (num_lines,) + batch_shape).reshape(num_lines, -1)
+    net = surplus.reshape(num_regions, -1)
+    start, end = network.endpoints()
+    loss = network.loss_rates()
+
+    # 变量: 正向 f[l, b] = l*B + b，反向 g[l, b] = (L+l)*B + b，
+    #       缺电 u[r, b] = (2L+r)*B + b，富余 x[r, b] = (2L+R+r)*B + b
+    blocks = np.arange(num_blocks)
+    column = lambda k: (k[:, None] * num_blocks + blocks).reshape(-1)
+    row = lambda r: (r[:, None] * num_blocks + blocks).reshape(-1)
+    repeat = lambda values: np.repeat(values, num_blocks)
+    lines = np.arange(num_lines)
+    regions = np.arange(num_regions)
+    forward, backward = lines, num_lines + lines
+    shortage, spill = 2 * num_lines + regions, 2 * num_lines + num_regions + regions
+    num_vars = (2 * num_lines + 2 * num_regions) * num_blocks
+
+    # 区域平衡: 受入 × (1-损耗率) - 送出 + 缺电 - 富余 = -区域富余
+    rows = np.concatenate([row(end), row(start), row(start), row(end), row(regions), row(regions)])
+    cols = np.concatenate([column(forward), column(forward), column(backward), column(backward),
+                           column(shortage), column(spill)])
+    values = np.concatenate([repeat(1 - loss), repeat(-np.ones(num_lines)),
+                             repeat(1 - loss), repeat(-np.ones(num_lines)),
+                             np.ones(num_regions * num_blocks), -np.ones(num_regions * num_blocks)])
+    a_eq = sparse.csr_matrix((values, (rows, cols)), shape=(num_regions * num_blocks, num_vars))
+    b_eq = -net.reshape(-1)
+
+    line_cost = repeat(loss + wheeling_cost)
+    cost = np.concatenate([line_cost, line_cost,
+                           np.full(num_regions * num_blocks, shortage_penalty),
+                           np.zeros(num_regions * num_blocks)])
+    upper = np.concatenate([capacity.reshape(-1), capacity.reshape(-1),
+                            np.full(2 * num_regions * num_blocks, np.inf)])
+    result = linprog(cost, A_eq=a_eq, b_eq=b_eq,
+                     bounds=np.column_stack([np.zeros(num_vars), upper]), method='highs')
+
+    x = result.x if result.x is not None else np.full(num_vars, np.nan)
+    part = lambda k, n: x[k * num_blocks:(k + n) * num_blocks].reshape(n, num_blocks)
+    f, g = part(0, num_lines), part(num_lines, num_lines)
+    delivered_f, delivered_g = f * (1 - loss[:, None]), g * (1 - loss[:, None])
+    net_import = np.zeros((num_regions, num_blocks))
+    np.add.at(net_import, end, delivered_f - g)
+    np.add.at(net_import, start, delivered_g - f)
+
+    to_batch = lambda values: values.reshape((values.shape[0],) + batch_shape)
+    return {
+        'status': result.status,
+        'message': result.message,
+        'flow': to_batch(f - g),
+        'loss': to_batch((f + g) * loss[:, None]),
+        'net_import': to_batch(net_import),
+        'shortage': to_batch(part(2 * num_lines, num_regions)),
+        'spill': to_batch(part(2 * num_lines + num_regions, num_regions)),
+    }
+
+
+def _weighted(values: np.ndarray, weights: np.ndarray) -> np.ndarray:
+    """沿区域维（首维）加权平均，权重之和为0处取算术平均"""
+    weights = np.broadcast_to(weights, values.shape)
+    total = weights.sum(axis=0)
+    mean = values.mean(axis=0)
+    return np.where(total != 0, _safe_divide((values * weights).sum(axis=0), total), mean)
+
+
+def aggregate_power_arrays(arrays: PowerArrays, variables: PowerVariables = None,
+                           catalog: TechnologyCatalog = None,
+                           coal_co2_factor: Any = 2.66, gas_co2_factor: Any = 2.16,
+                           gas_conversion_factor: Any = 1.33):
+    """
+    将区域数组 (R, ..., 类型, Y) 汇总为全国数组
+    CO2排放因子和天然气折算系数为各区域的取值（可广播到 (R, ..., Y)），用于CCS捕集率加权
+    Returns:
+        (national_arrays, capacity)：capacity 为全国发电装机 (..., 类型, Y)，
+        计算全国结果时传给 compute_power_arrays
+    """
+    variables = variables or PowerVariables()
+    catalog = catalog or DEFAULT_CATALOG
+    gen_types = catalog.generation_types
+    cost_techs = catalog.cost_technologies
+    num_power = len(catalog.power_cost_types)
+
+    capacity = calculate_capacity_array(arrays)
+    share, cost_capacity = cost_type_capacity(arrays, capacity, variables, catalog)
+    tech_capacity = share * cost_capacity
+
+    generation = arrays.generation.sum(axis=0)
+    national_capacity = capacity.sum(axis=0)
+    total_demand = arrays.hydrogen_demand + arrays.electricity_demand
+
+    # 分摊比例 = 各区域分摊装机之和 / 来源装机之和
+    ratios = {}
+    for i, tech in enumerate(cost_techs):
+        if tech.split_field and not tech.split_complement:
+            ratios[tech.split_field] = _safe_divide(tech_capacity[:, ..., i, :].sum(axis=0),
+                                                    cost_capacity[:, ..., i, :].sum(axis=0))
+    national = replace(
+        arrays,
+        generation=generation,
+        utilization_hours=_safe_divide(generation * 1000000, national_capacity),
+        storage=arrays.storage.sum(axis=0),
+        hydrogen_demand=arrays.hydrogen_demand.sum(axis=0),
+        electricity_demand=arrays.electricity_demand.sum(axis=0),
+        cross_region_capacity=arrays.cross_region_capacity.sum(axis=0),
+        transmission_loss=_weighted(arrays.transmission_loss, total_demand),
+        error_rate=_weighted(arrays.error_rate, arrays.generation.sum(axis=-2)),
+        annuity_factor=arrays.annuity_factor.mean(axis=0),
+        lifetime=None if arrays.lifetime is None else arrays.lifetime.mean(axis=0),
+        **ratios
+    )
+
+    # 装机成本: 投资 = 单位成本 × 年金系数 × 分摊装机 之和保持不变
+    national_share, national_cost_capacity = cost_type_capacity(
+        national, national_capacity, variables, catalog)
+    national_tech_capacity = national_share * national_cost_capacity
+    annuity = arrays.annuity_factor[..., None]
+    capital = (arrays.capacity_cost * annuity * tech_capacity).sum(axis=0)
+    national.capacity_cost = np.where(
+        national_tech_capacity > 0,
+        _safe_divide(capital, national.annuity_factor[..., None] * national_tech_capacity),
+        arrays.capacity_cost.mean(axis=0))
+
+    # 运维成本占比: 运维 = 单位成本 × 占比 × 分摊装机 之和保持不变
+    om = (arrays.capacity_cost[..., :num_power, :] * arrays.om_ratio
+          * tech_capacity[..., :num_power, :]).sum(axis=0)
+    om_base = national.capacity_cost[..., :num_power, :] * national_tech_capacity[..., :num_power, :]
+    national.om_ratio = np.where(om_base > 0, _safe_divide(om, om_base),
+                                 arrays.om_ratio.mean(axis=0))
+
+    # 燃料单价: 燃料成本 = 单价 × 分摊比例 × 来源发电量 之和保持不变
+    source_index = [gen_types.index(t.capacity_source) for t in cost_techs[:num_power]]
+    fuel_base = share[..., :num_power, :] * arrays.generation[..., source_index, :]
+    national.fuel_cost = _weighted(arrays.fuel_cost, fuel_base)
+
+    # 燃料消耗率: 按对应发电类型的发电量加权（排放之和保持不变）
+    rate_types = variables.FUEL_RATE_TYPES
+    rate_weights = np.stack([
+        arrays.generation[..., gen_types.index(FUEL_RATE_GENERATION[k]), :]
+        if FUEL_RATE_GENERATION.get(k) in gen_types
+        else np.ones(arrays.generation.shape[:-2] + arrays.generation.shape[-1:])
+        for k in rate_types], axis=-2)
+    national.fuel_rate = _weighted(arrays.fuel_rate, rate_weights)
+
+    # CCS捕集率: 按捕集前的CCS排放量（发电量 × 燃料消耗率 × 排放因子）加权，捕集量之和保持不变
+    def ccs_generation(name):
+        if name not in gen_types:
+            return np.zeros(arrays.generation.shape[:-2] + arrays.generation.shape[-1:])
+        return arrays.generation[..., gen_types.index(name), :]
+
+    rate = {k: arrays.fuel_rate[..., i, :] for i, k in enumerate(rate_types)}
+    zero = np.zeros_like(arrays.ccs_capture_rate)
+    ccs_co2 = (rate.get('煤炭CCS', zero) * ccs_generation('煤电+CCS') * coal_co2_factor
+               + gas_conversion_factor * rate.get('天然气CCS', zero) * ccs_generation('气电+CCS')
+               * gas_co2_factor
+               + rate.get('生物质CCS', zero) * ccs_generation('生物质+CCS') * variables.BIOMASS_CO2_FACTOR)
+    national.ccs_capture_rate = _weighted(arrays.ccs_capture_rate, ccs_co2)
+    return national, national_capacity
+
+
+def check_regional_totals(results: Dict[str, Any], sections=('co2_emission',),
+                          tolerance: float = 1e-3) -> List[str]:
+    """
+    检查全国结果是否等于各区域之和（结果已按4位小数取整，容差按区域数放宽）
+    Returns:
+        不一致的项目 ['分组.项目']
+    """
+    regions = list(results.get('regions', {}).values())
+    mismatched = []
+    for section in sections:
+        for key, values in results.get(section, {}).items():
+            total = np.sum([region[section][key] for region in regions], axis=0)
+            if not np.allclose(values, total, rtol=0, atol=tolerance * max(len(regions), 1)):
+                mismatched.append(f"{section}.{key}")
+    return mismatched
+
+
+class RegionalPowerCalculator(VectorizedPowerCalculator):
+    """多区域电力结果计算器（含跨区输电网络）"""
+
+    def __init__(self, network: TransmissionNetwork = None, catalog: TechnologyCatalog = None):
+        super().__init__(catalog)
+        self.network = network
+        self.regions: List[str] = []
+        self.region_arrays: Optional[PowerArrays] = None
+        self.batch = PowerBatchCalculator()
+
+    # ==================== 数据加载 ====================
+
+    def load_regions_from_csv_files(self, filepaths: Dict[str, str]) -> None:
+        """
+        加载各区域输入数据（格式同 PowerCalculator 的CSV输入）
+        Args:
+            filepaths: {区域名称: CSV文件路径}
+        """
+        self.batch.catalog = self.catalog
+        self.batch.variables = self.variables
+        self.batch.formulas = self.formulas
+        self.batch.load_from_csv_files(filepaths)
+        self._set_regions()
+
+    def load_regions(self, regions: Dict[str, Any]) -> None:
+        """加载各区域数据 {区域名称: PowerData 或 load_from_dict 格式的字典}"""
+        self.batch.catalog = self.catalog
+        self.batch.variables = self.variables
+        self.batch.formulas = self.formulas
+        self.batch.load_scenarios(regions)
+        self._set_regions()
+
+    def load_from_csv(self, filepath: str) -> None:
+        """
+        从区域清单CSV加载（供 main.py 的 input_csv_file 使用）
+        CSV格式: 区域,输入文件（相对路径以清单文件所在目录为基准）
+        """
+        base = os.path.dirname(filepath)
+        filepaths = {}
+        with open(filepath, 'r', encoding='utf-8-sig') as f:
+            for row in csv.DictReader(f):
+                name = (row.get('区域') or '').strip()
+                if name:
+                    path = row['输入文件'].strip()
+                    filepaths[name] = path if os.path.isabs(path) else os.path.join(base, path)
+        self.load_regions_from_csv_files(filepaths)
+
+    def load_network_from_csv(self, filepath: str) -> None:
+        """加载跨区输电网络（需在加载区域数据后调用，以区域年份读取逐年输电能力）"""
+        years = list(self.region_arrays.years) if self.region_arrays is not None else None
+        self.network = TransmissionNetwork.from_csv(filepath, self.regions or None, years)
+
+    def _set_regions(self) -> None:
+        self.regions = list(self.batch.scenarios)
+        self.region_arrays = self.batch.arrays
+        # 全国年份和CO2排放系数取首个区域
+        self.power_data.years = list(self.region_arrays.years)
+        self.power_data.coal_co2_factor = float(self.batch.coal_co2_factor[0])
+        self.power_data.gas_co2_factor = float(self.batch.gas_co2_factor[0])
+        self.power_data.gas_conversion_factor = float(self.batch.gas_conversion_factor[0])
+
+    # ==================== 计算 ====================
+
+    def _network(self) -> TransmissionNetwork:
+        network = self.network or TransmissionNetwork(regions=list(self.regions))
+        if network.regions != self.regions:
+            network = replace(network, regions=list(self.regions))
+        return network
+
+    def build_arrays(self) -> PowerArrays:
+        """构建区域数组，跨区传输容量取输电网络分摊值（无线路时保留区域输入）"""
+        if self.region_arrays is None:
+            raise ValueError("尚未加载区域数据")
+        network = self._network()
+        if not network.lines:
+            return self.region_arrays
+        return replace(self.region_arrays,
+                       cross_region_capacity=network.regional_grid_capacity(
+                           len(self.region_arrays.years)))
+
+    def calculate(self) -> Dict[str, Any]:
+        """
+        计算各区域和全国结果，并求解跨区输电
+        Returns:
+            全国结果（格式同 PowerCalculator.calculate），另含:
+            'transmission': 全国输电汇总，'lines': 各线路输电量，
+            'regions': {区域名称: 区域结果（含 'transmission' 分组）}
+        """
+        arrays = self.build_arrays()
+        network = self._network()
+        years = list(arrays.years)
+
+        regional = compute_power_arrays(arrays, self.variables,
+                                        self.batch.coal_co2_factor[:, None],
+                                        self.batch.gas_co2_factor[:, None],
+                                        self.batch.gas_conversion_factor[:, None],
+                                        catalog=self.catalog)
+        surplus = (arrays.generation.sum(axis=-2) / (1 + arrays.error_rate)
+                   - arrays.hydrogen_demand - arrays.electricity_demand)
+        flows = solve_transmission(network, surplus)
+        if flows['status'] != 0:
+            print(f"警告: 跨区输电未得到最优解 - {flows['message']}")
+
+        national, capacity = aggregate_power_arrays(arrays, self.variables, self.catalog,
+                                                    self.batch.coal_co2_factor[:, None],
+                                                    self.batch.gas_co2_factor[:, None],
+                                                    self.batch.gas_conversion_factor[:, None])
+        raw = compute_power_arrays(national, self.variables,
+                                   self.power_data.coal_co2_factor,
+                                   self.power_data.gas_co2_factor,
+                                   self.power_data.gas_conversion_factor,
+                                   capacity=capacity, catalog=self.catalog)
+        # 各区域排放因子可能不同，全国排放直接取各区域之和
+        raw['co2_emission'] = {key: values.sum(axis=0)
+                               for key, values in regional['co2_emission'].items()}
+        results = pack_power_results(raw, years)
+
+        rounded = lambda values: [round(v, 4) for v in values.tolist()]
+        results['transmission'] = {
+            '跨区输电量': rounded(np.abs(flows['flow']).sum(axis=0)),
+            '线路损耗': rounded(flows['loss'].sum(axis=0)),
+            '缺电量': rounded(flows['shortage'].sum(axis=0)),
+            '弃电量': rounded(flows['spill'].sum(axis=0)),
+        }
+        results['lines'] = {name: rounded(flows['flow'][i])
+                            for i, name in enumerate(network.line_names())}
+        results['regions'] = {}
+        for r, name in enumerate(self.regions):
+            region_results = pack_power_results(
+                {section: {key: values[r] for key, values in items.items()}
+                 for section, items in regional.items()}, years)
+            region_results['transmission'] = {
+                '富余电量': rounded(surplus[r]),
+                '净受入': rounded(flows['net_import'][r]),
+                '缺电量': rounded(flows['shortage'][r]),
+                '弃电量': rounded(flows['spill'][r]),
+            }
+            results['regions'][name] = region_results
+
+        mismatched = check_regional_totals(results)
+        if mismatched:
+            print(f"警告: 全国结果不等于各区域之和 - {', '.join(mismatched)}")
+        return results
+
+    # ==================== 输出 ====================
+
+    def export_to_csv(self, results: dict, filepath: str) -> None:
+        """
+        导出全国结果，跨区输电结果导出到同目录 *_network.csv，
+        各区域结果导出到 *_{区域名称}.csv
+        """
+        super().export_to_csv(results, filepath)
+        if 'transmission' not in results:
+            return
+
+        years = results['years']
+        titles = {'transmission': '跨区输电(万亿kWh)', 'lines': '线路净输电量(万亿kWh)'}
+        export_sections(results, titles, years, filepath, 'network')
+
+        stem, ext = os.path.splitext(filepath)
+        exporter = PowerCalculator()
+        exporter.variables = self.variables
+        for name, region_results in results['regions'].items():
+            region_file = f"{stem}_{name}{ext or '.csv'}"
+            exporter.export_to_csv(region_results, region_file)
+            export_sections(region_results, {'transmission': '区域电力平衡(万亿kWh)'},
+                            years, region_file, 'network')
+
+    def print_results(self, results: dict) -> None:
+        """打印全国结果及各区域净受入"""
+        super().print_results(results)
+        if 'transmission' not in results:
+            return
+
+        years = results['years']
+        print("跨区输电")
+        header = f"{'项目':<20}" + "".join([f"{y:>12}" for y in years])
+        print(header)
+        print("-" * 120)
+        for key, values in results['transmission'].items():
+            print(f"  {key:<18}" + "".join([f"{v:>12.4f}" for v in values]))
+        print("区域净受入")
+        for name, region_results in results['regions'].items():
+            values = region_results['transmission']['净受入']
+            print(f"  {name:<18}" + "".join([f"{v:>12.4f}" for v in values]))
+        print("=" * 120)
@@ -0,0 +1,138 @@
+# -*- coding: utf-8 -*-
+"""电力成本和LCOE解析敏感性（雅可比）
+
+一次计算得到总成本和LCOE对各技术装机成本、运维比例、燃料单价和设备寿命的偏导数，
+替代逐个扰动输入重复计算。各成本公式对参数是线性的，导数为闭式：
+- d投资/d单位成本 = 年金系数 × 装机 / 10（电源投资同时计入省内电网，计2次）
+- d运维/d单位成本 = 运维比例 × 装机 / 10，d运维/d运维比例 = 单位成本 × 装机 / 10
+- d燃料成本/d燃料单价 = 分摊比例 × 来源发电量 × 10000
+- d投资/d寿命 = 单位成本 × 装机 / 10 × d年金系数/d寿命
+- dLCOE = d总成本 / 总发电量 / 10000（总发电量与上述参数无关）
+
+某年的结果只依赖当年参数（寿命为各年共用），因此每个偏导数为 (..., Y) 数组，
+即雅可比矩阵在年份维上的对角线。
+"""
+
+import csv
+import os
+import numpy as np
+from typing import Dict, Any, List
+
+from .variables import PowerVariables
+from .formulas import PowerFormulas
+from .catalog import TechnologyCatalog, DEFAULT_CATALOG
+from .vectorized import (PowerArrays, calculate_capacity_array, cost_type_capacity,
+                         _safe_divide)
+from .npv import lifetime_from_annuity
+
+
+# 参数分组 -> 中文名称
+PARAMETER_GROUPS = {
+    'capacity_cost': '装机成本(万元/MW)',
+    'om_ratio': '运维成本占比',
+    'fuel_cost': '燃料单价(元/kWh)',
+    'equipment_lifetime': '设备寿命(年)',
+}
+
+
+def annuity_derivative(arrays: PowerArrays, formulas: PowerFormulas) -> np.ndarray:
+    """
+    年金系数对寿命的导数 (..., 14)，逐个寿命调用 PowerFormulas.calculate_annuity_factor_derivative
+    （寿命取值很少，按不同寿命各算一次后查表）；数组未携带寿命时由年金系数反推
+    """
+    lifetime = arrays.lifetime if arrays.lifetime is not None else \
+        lifetime_from_annuity(arrays.annuity_factor, formulas.discount_rate)
+    unique, inverse = np.unique(np.asarray(lifetime, dtype=float), return_inverse=True)
+    values = np.array([formulas.calculate_annuity_factor_derivative(life, formulas.discount_rate)
+                       for life in unique.tolist()])
+    return values[inverse].reshape(np.shape(lifetime))
+
+
+def calculate_power_sensitivity(arrays: PowerArrays, variables: PowerVariables = None,
+                                formulas: PowerFormulas = None,
+                                catalog: TechnologyCatalog = None) -> Dict[str, Dict[str, Dict[str, np.ndarray]]]:
+    """
+    计算总成本和LCOE对成本参数的偏导数（类型列表和分摊比例取自技术目录 catalog）
+    Returns:
+        {'total_cost': {分组: {类型: (..., Y)}}, 'lcoe': {...}}，
+        分组为 capacity_cost / om_ratio / fuel_cost / equipment_lifetime，未取整
+    """
+    catalog = catalog or DEFAULT_CATALOG
+    variables = variables or catalog.to_variables()
+    formulas = formulas or PowerFormulas()
+    cost_types = variables.CAPACITY_COST_TYPES
+    om_types = variables.OM_COST_RATIO_TYPES
+    fuel_types = variables.FUEL_COST_TYPES
+    num_power = len(om_types)
+
+    capacity = calculate_capacity_array(arrays)
+    share, cost_capacity = cost_type_capacity(arrays, capacity, variables, catalog)
+    unit_capacity = share * cost_capacity / 10
+    unit_cost = arrays.capacity_cost
+    annuity = arrays.annuity_factor[..., :, None]
+
+    # 电源投资同时计为省内电网投资
+    multiplier = np.ones(len(cost_types))
+    multiplier[:num_power] = 2
+    multiplier = multiplier[:, None]
+
+    d_capacity_cost = multiplier * annuity * unit_capacity
+    d_capacity_cost[..., :num_power, :] += arrays.om_ratio * unit_capacity[..., :num_power, :]
+    d_om_ratio = unit_cost[..., :num_power, :] * unit_capacity[..., :num_power, :]
+    d_annuity = annuity_derivative(arrays, formulas)[..., :, None]
+    d_lifetime = multiplier * unit_cost * unit_capacity * d_annuity
+
+    gen_types = variables.GENERATION_TYPES
+    sources = catalog.capacity_source
+    d_fuel_cost = np.zeros(arrays.fuel_cost.shape)
+    for i, key in enumerate(fuel_types):
+        if key in catalog.fuel_cost_output_types:
+            source_gen = arrays.generation[..., gen_types.index(sources[key]), :]
+            d_fuel_cost[..., i, :] = share[..., i, :] * source_gen * 10000
+
+    total_cost = {
+        'capacity_cost': {k: d_capacity_cost[..., i, :] for i, k in enumerate(cost_types)},
+        'om_ratio': {k: d_om_ratio[..., i, :] for i, k in enumerate(om_types)},
+        'fuel_cost': {k: d_fuel_cost[..., i, :] for i, k in enumerate(fuel_types)},
+        'equipment_lifetime': {k: d_lifetime[..., i, :] for i, k in enumerate(cost_types)},
+    }
+
+    total_gen = arrays.generation.sum(axis=-2)
+    lcoe = {
+        group: {k: _safe_divide(values, total_gen) / 10000 for k, values in items.items()}
+        for group, items in total_cost.items()
+    }
+    return {'total_cost': total_cost, 'lcoe': lcoe}
+
+
+def pack_sensitivity(raw: Dict[str, Dict[str, Dict[str, np.ndarray]]],
+                     digits: int = 8) -> Dict[str, Any]:
+    """将单情景敏感性数组转换为列表并取整"""
+    return {
+        target: {
+            group: {k: [round(v, digits) for v in values.tolist()] for k, values in items.items()}
+            for group, items in groups.items()
+        }
+        for target, groups in raw.items()
+    }
+
+
+def export_sensitivity_to_csv(sensitivity: Dict[str, Any], years: List[str], filepath: str) -> None:
+    """导出敏感性结果（pack_sensitivity 格式）"""
+    if os.path.dirname(filepath):
+        os.makedirs(os.path.dirname(filepath), exist_ok=True)
+
+    titles = {'total_cost': 'd总成本(亿元)', 'lcoe': 'dLCOE(元/kWh)'}
+    rows = []
+    for target, title in titles.items():
+        for group, group_name in PARAMETER_GROUPS.items():
+            rows.append([f"{title} / d{group_name}"] + [''] * len(years))
+            for key, values in sensitivity[target][group].items():
+                rows.append([key] + values)
+            rows.append([''] * (len(years) + 1))
+
+    with open(filepath, 'w', newline='', encoding='utf-8-sig') as f:
+        writer = csv.writer(f)
+        writer.writerow(['项目'] + list(years))
+        writer.writerows(rows)
+    print(f"结果已导出到: {filepath}")
@@ -0,0 +1,186 @@
+# -*- coding: utf-8 -*-
+"""电力装机存量（分代际）模型
+
+按技术和建设年份跟踪装机的新增、退役和存量：
+- 里程碑年份（如每5年）的装机需求线性插值到逐年
+- 基准年存量按寿命均匀分布在此前各年建成
+- 每年先按寿命自然退役，存量仍超过需求时按建成年份从早到晚提前退役，
+  存量不足时新增装机补足
+- 新建投资按各代际建成年份的单位造价计算，年化投资为各在役代际年金之和
+
+所有运算在 (..., 技术, 代际) 数组上进行，前置维度可用于批量情景。
+"""
+
+import numpy as np
+from typing import Dict, Any, List
+
+from .formulas import PowerFormulas
+from .catalog import TechnologyCatalog, DEFAULT_CATALOG
+from .vectorized import PowerArrays, calculate_capacity_array, cost_type_capacity
+from .batch import annuity_factor_array
+
+
+def interpolation_matrix(years: List[int], annual_years: List[int]) -> np.ndarray:
+    """
+    构建线性插值矩阵 W (逐年 × 里程碑年)，逐年值 = 里程碑值 @ W.T
+    """
+    years = np.asarray(years, dtype=float)
+    annual_years = np.asarray(annual_years, dtype=float)
+    eye = np.eye(len(years))
+    return np.stack([np.interp(annual_years, years, eye[j]) for j in range(len(years))], axis=1)
+
+
+def box_sum(values: np.ndarray, width: np.ndarray) -> np.ndarray:
+    """
+    沿最后一维的滑动窗口和: out[t] = SUM(values[t-width+1 .. t])
+    即与长度为 width 的矩形核做因果卷积，用累计和相减实现，width 可逐技术不同
+    """
+    csum = np.cumsum(values, axis=-1)
+    n = values.shape[-1]
+    t = np.arange(n)
+    width = np.asarray(width)[..., None]
+    lag = t - width
+    lagged = np.take_along_axis(
+        csum, np.broadcast_to(np.clip(lag, 0, None), csum.shape), axis=-1)
+    return csum - np.where(lag >= 0, lagged, 0.0)
+
+
+class CapacityStockModel:
+    """电力装机存量模型"""
+
+    def __init__(self, lifetime: Dict[str, int] = None, types: List[str] = None,
+                 rate: float = None, catalog: TechnologyCatalog = None):
+        self.catalog = catalog or DEFAULT_CATALOG
+        self.variables = self.catalog.to_variables()
+        self.formulas = PowerFormulas()
+        self.types = types or self.variables.CAPACITY_COST_TYPES
+        lifetime = lifetime or self.variables.EQUIPMENT_LIFETIME
+        self.lifetime = np.array([int(lifetime.get(k, 25)) for k in self.types])
+        self.rate = self.formulas.discount_rate if rate is None else rate
+
+    def run(self, capacity: np.ndarray, years: List[str],
+            unit_cost: np.ndarray = None, return_vintage: bool = False) -> Dict[str, Any]:
+        """
+        执行存量计算
+        Args:
+            capacity: 里程碑年份装机需求 (..., 技术, Y)，单位GW
+            years: 里程碑年份
+            unit_cost: 装机成本 (..., 技术, Y)，单位万元/MW，为空时不计算投资
+            return_vintage: 是否返回完整代际矩阵 (..., 技术, 代际, 逐年)
+        Returns:
+            逐年结果字典，数组最后一维为逐年年份
+        """
+        milestone_years = [int(y) for y in years]
+        annual_years = list(range(milestone_years[0], milestone_years[-1] + 1))
+        weights = interpolation_matrix(milestone_years, annual_years)
+        demand = np.maximum(capacity @ weights.T, 0.0)
+
+        num_years = len(annual_years)
+        lifetime = self.lifetime
+        max_life = int(lifetime.max())
+        # 代际轴: 前 max_life 个为基准年前建成的存量，之后与逐年年份一一对应
+        num_vintages = max_life + num_years
+        vintage_years = np.arange(annual_years[0] - max_life, annual_years[-1] + 1)
+
+        batch_shape = demand.shape[:-1]
+        tech_index = np.arange(len(self.types))
+
+        # 基准年存量按寿命均匀分布: 建成于 [基准年-寿命, 基准年-1] 的各代际各占 1/寿命，
+        # 其中最早一代在基准年达到寿命退役并由新增补足
+        age_at_start = annual_years[0] - vintage_years[:max_life]
+        initial_mask = age_at_start[None, :] <= lifetime[:, None]
+        cohorts = np.zeros(batch_shape + (num_vintages,))
+        cohorts[..., :max_life] = (demand[..., :1] / lifetime[:, None]) * initial_mask
+
+        additions = np.zeros(demand.shape)
+        retirements = np.zeros(demand.shape)
+        early_retirements = np.zeros(demand.shape)
+        remaining = np.zeros(demand.shape)
+        vintage = np.zeros(batch_shape + (num_vintages, num_years)) if return_vintage else None
+        stock = cohorts.sum(axis=-1)
+
+        for t in range(num_years):
+            # 自然退役: 建成年份 = 当年 - 寿命（代际索引始终 >= 0）
+            retire_index = max_life + t - lifetime
+            retired = cohorts[..., tech_index, retire_index].copy()
+            cohorts[..., tech_index, retire_index] = 0.0
+            retirements[..., t] = retired
+            stock = stock - retired
+
+            # 存量超过需求时，按建成年份从早到晚提前退役
+            # （只对存在超额的 情景×技术 行做代际累计和）
+            excess = np.maximum(stock - demand[..., t], 0.0)
+            rows = np.flatnonzero(excess > 0)
+            if rows.size:
+                flat = cohorts.reshape(-1, num_vintages)
+                selected = flat[rows]
+                before = np.cumsum(selected, axis=-1) - selected
+                scrapped = np.clip(excess.reshape(-1)[rows, None] - before, 0.0, selected)
+                flat[rows] = selected - scrapped
+                early = np.zeros(excess.size)
+                early[rows] = scrapped.sum(axis=-1)
+                early_retirements[..., t] = early.reshape(excess.shape)
+                stock = stock - early_retirements[..., t]
+
+            # 存量不足时新增装机
+            added = np.maximum(demand[..., t] - stock, 0.0)
+            cohorts[..., max_life + t] = added
+            additions[..., t] = added
+            stock = stock + added
+            remaining[..., t] = stock
+            if return_vintage:
+                vintage[..., t] = cohorts
+
+        results = {
+            'years': [str(y) for y in annual_years],
+            'types': list(self.types),
+            'demand': demand,
+            'additions': additions,
+            'retirements': retirements,
+            'early_retirements': early_retirements,
+            'remaining': remaining,
+        }
+        if return_vintage:
+            results['vintage_years'] = [str(y) for y in vintage_years]
+            results['vintage'] = vintage
+
+        if unit_cost is not None:
+            cost = unit_cost @ weights.T
+            # 新建投资(亿元) = 单位成本(万元/MW) * 新增装机(GW) / 10
+            capex = cost * additions / 10
+            # 各代际在寿命期内每年支付年金: 与寿命长度的矩形核卷积
+            # （提前退役的代际仍支付剩余年金，计为搁浅成本）
+            annuity = annuity_factor_array(lifetime, self.rate)[:, None]
+            new_build = box_sum(capex * annuity, lifetime)
+            # 基准年存量按基准年单位成本计年金，直至各代际退役
+            initial_payment = cost[..., :1] * annuity / 10 * (
+                cohorts_initial_remaining(demand[..., 0], lifetime, annual_years))
+            results['new_build_capex'] = capex
+            results['annualized_investment'] = new_build + initial_payment
+        return results
+
+    def run_power_arrays(self, arrays: PowerArrays,
+                         return_vintage: bool = False) -> Dict[str, Any]:
+        """以 PowerArrays 计算出的各成本类型装机为需求执行存量计算"""
+        capacity = calculate_capacity_array(arrays)
+        share, cost_capacity = cost_type_capacity(arrays, capacity, self.variables, self.catalog)
+        return self.run(share * cost_capacity, arrays.years,
+                        unit_cost=arrays.capacity_cost, return_vintage=return_vintage)
+
+
+def cohorts_initial_remaining(initial_capacity: np.ndarray, lifetime: np.ndarray,
+                              annual_years: List[int]) -> np.ndarray:
+    """
+    基准年存量在各年的剩余装机（不含提前退役）
+    均匀分布于寿命期内的存量线性退役: 剩余 = 初始 * MAX(寿命-1-已过年数, 0) / 寿命
+    """
+    elapsed = np.arange(len(annual_years))
+    life = lifetime[:, None]
+    fraction = np.maximum(life - 1 - elapsed[None, :], 0) / life
+    return initial_capacity[..., None] * fraction
+
+
+def select_years(values: np.ndarray, annual_years: List[str], years: List[str]) -> np.ndarray:
+    """从逐年结果中取出指定年份（如里程碑年份），用于替换年化总装机投资的近似值"""
+    index = [annual_years.index(str(y)) for y in years]
+    return values[..., index]
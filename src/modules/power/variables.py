@@ -152,6 +152,11 @@ class PowerVariables(BaseVariables):
         '生物质+CCS'   # 行156
     ])
     
+    # 燃料成本输出类型（风电、光伏不计燃料成本）
+    FUEL_COST_OUTPUT_TYPES: List[str] = field(default_factory=lambda: [
+        '煤电', '煤电+CCS', '气电', '气电+CCS', '核电', '水电', '生物质', '生物质+CCS'
+    ])
+    
     # 设备寿命（年）
     EQUIPMENT_LIFETIME: dict = field(default_factory=lambda: {
         '煤电': 30,
@@ -180,3 +185,61 @@ class PowerVariables(BaseVariables):
     COAL_CO2_FACTOR: float = 2.66  # 吨CO2/吨煤
     GAS_CO2_FACTOR: float = 2.16   # 吨CO2/km3天然气
     BIOMASS_CO2_FACTOR: float = 1.74  # 吨CO2/吨生物质
+    
+    # 储能时长（小时，储能容量 = 功率 × 时长）
+    STORAGE_DURATION: dict = field(default_factory=lambda: {
+        '抽蓄': 6.0,
+        '电化学': 2.0
+    })
+    
+    # 储能往返效率
+    STORAGE_EFFICIENCY: dict = field(default_factory=lambda: {
+        '抽蓄': 0.75,
+        '电化学': 0.85
+    })
+    
+    # 可调度机组（按燃料成本排序参与逐时调度）
+    DISPATCHABLE_TYPES: List[str] = field(default_factory=lambda: [
+        '煤电', '煤电+CCS', '气电', '气电+CCS', '生物质', '生物质+CCS'
+    ])
+    
+    # 出力恒定机组（按年利用小时数均匀出力）
+    MUST_RUN_TYPES: List[str] = field(default_factory=lambda: [
+        '核电', '水电', '其他'
+    ])
+    
+    # 资源约束机组（负荷持续曲线调度中按给定利用小时数或出力曲线优先消纳）
+    RESOURCE_LIMITED_TYPES: List[str] = field(default_factory=lambda: [
+        '水电', '风电', '光伏'
+    ])
+    
+    # 可用率（负荷持续曲线调度中可用装机 = 装机 × 可用率，未列出的为1）
+    AVAILABILITY_FACTOR: dict = field(default_factory=lambda: {
+        '煤电': 0.9,
+        '煤电+CCS': 0.85,
+        '气电': 0.9,
+        '气电+CCS': 0.85,
+        '核电': 0.9,
+        '生物质': 0.85,
+        '生物质+CCS': 0.8
+    })
+    
+    # 无逐时曲线时默认负荷持续曲线的最小负荷/最大负荷之比
+    LDC_MIN_LOAD_RATIO: float = 0.45
+    
+    # 容量可信度（装机规划中计入尖峰负荷备用的比例，未列出的按可用率计）
+    CAPACITY_CREDIT: dict = field(default_factory=lambda: {
+        '水电': 0.5,
+        '风电(陆上)': 0.1,
+        '风电(海上)': 0.15,
+        '光伏(集中)': 0.05,
+        '光伏(分布式)': 0.05,
+        '抽蓄': 1.0,
+        '电化学': 0.9
+    })
+    
+    # 装机规划备用率（可信装机 >= 尖峰负荷 × (1 + 备用率)）
+    PLANNING_RESERVE_MARGIN: float = 0.15
+    
+    # 装机规划中受资源约束、装机不超过输入装机的类型
+    EXPANSION_CAPPED_TYPES: List[str] = field(default_factory=lambda: ['水电'])
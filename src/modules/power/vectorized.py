@@ -0,0 +1,372 @@
+# -*- coding: utf-8 -*-
+"""电力结果向量化计算器
+
+将逐年、逐技术的标量计算改写为 技术 × 年份 数组上的整体运算。
+所有数组的最后一维为年份，倒数第二维为技术类型，前置维度可用于批量情景。
+"""
+
+import numpy as np
+from typing import Dict, Any, List
+from dataclasses import dataclass, field
+
+from .calculator import PowerCalculator, PowerData
+from .variables import PowerVariables
+from .formulas import PowerFormulas
+from .catalog import TechnologyCatalog, DEFAULT_CATALOG
+
+
+# 默认技术目录下的类型映射
+# 装机成本类型 -> 装机容量来源（发电类型或储能类型）
+COST_CAPACITY_SOURCE = DEFAULT_CATALOG.capacity_source
+
+# 燃料成本输出类型（风电、光伏不计燃料成本）
+FUEL_COST_OUTPUT_TYPES = DEFAULT_CATALOG.fuel_cost_output_types
+
+# 非化石发电类型
+NON_FOSSIL_TYPES = DEFAULT_CATALOG.non_fossil_types
+
+
+@dataclass
+class PowerArrays:
+    """电力输入数组（技术 × 年份）"""
+    # 年份列表
+    years: List[str] = field(default_factory=list)
+
+    # 发电量 (..., 11, Y)
+    generation: np.ndarray = None
+
+    # 利用小时数 (..., 11, Y)
+    utilization_hours: np.ndarray = None
+
+    # 储能装机 (..., 2, Y)
+    storage: np.ndarray = None
+
+    # 装机成本 (..., 14, Y)
+    capacity_cost: np.ndarray = None
+
+    # 运维成本占比 (..., 12, Y)
+    om_ratio: np.ndarray = None
+
+    # 燃料成本 (..., 12, Y)
+    fuel_cost: np.ndarray = None
+
+    # 燃料消耗率 (..., 7, Y)
+    fuel_rate: np.ndarray = None
+
+    # 单项序列 (..., Y)
+    ccs_capture_rate: np.ndarray = None
+    transmission_loss: np.ndarray = None
+    error_rate: np.ndarray = None
+    cross_region_capacity: np.ndarray = None
+    hydrogen_demand: np.ndarray = None
+    electricity_demand: np.ndarray = None
+    offshore_wind_ratio: np.ndarray = None
+    distributed_solar_ratio: np.ndarray = None
+
+    # 年金系数 (..., 14)，按装机成本类型
+    annuity_factor: np.ndarray = None
+
+    # 设备寿命 (..., 14)，按装机成本类型（NPV 按各折现率重算年金系数）
+    lifetime: np.ndarray = None
+
+
+def _series(values: list, num_years: int) -> np.ndarray:
+    """将列表转换为定长数组，缺失部分补0（与 _get_value 的默认值一致）"""
+    arr = np.zeros(num_years)
+    n = min(len(values), num_years)
+    if n:
+        arr[:n] = values[:n]
+    return arr
+
+
+def _matrix(data_dict: dict, keys: List[str], num_years: int) -> np.ndarray:
+    """将 {类型: 序列} 字典按给定顺序转换为 类型 × 年份 矩阵"""
+    return np.stack([_series(data_dict.get(k, []), num_years) for k in keys]) \
+        if keys else np.zeros((0, num_years))
+
+
+def build_power_arrays(power_data: PowerData, variables: PowerVariables = None,
+                       formulas: PowerFormulas = None) -> PowerArrays:
+    """从 PowerData 一次性构建输入数组"""
+    variables = variables or PowerVariables()
+    formulas = formulas or PowerFormulas()
+    num_years = len(power_data.years)
+    lifetime = power_data.equipment_lifetime
+
+    return PowerArrays(
+        years=list(power_data.years),
+        generation=_matrix(power_data.generation, variables.GENERATION_TYPES, num_years),
+        utilization_hours=_matrix(power_data.utilization_hours,
+                                  variables.UTILIZATION_HOURS_TYPES, num_years),
+        storage=_matrix(power_data.storage, variables.STORAGE_TYPES, num_years),
+        capacity_cost=_matrix(power_data.capacity_cost, variables.CAPACITY_COST_TYPES, num_years),
+        om_ratio=_matrix(power_data.om_ratio, variables.OM_COST_RATIO_TYPES, num_years),
+        fuel_cost=_matrix(power_data.fuel_cost, variables.FUEL_COST_TYPES, num_years),
+        fuel_rate=_matrix(power_data.fuel_rate, variables.FUEL_RATE_TYPES, num_years),
+        ccs_capture_rate=_series(power_data.ccs_capture_rate, num_years),
+        transmission_loss=_series(power_data.transmission_loss, num_years),
+        error_rate=_series(power_data.error_rate, num_years),
+        cross_region_capacity=_series(power_data.cross_region_capacity, num_years),
+        hydrogen_demand=_series(power_data.hydrogen_demand, num_years),
+        electricity_demand=_series(power_data.electricity_demand, num_years),
+        offshore_wind_ratio=_series(power_data.offshore_wind_ratio, num_years),
+        distributed_solar_ratio=_series(power_data.distributed_solar_ratio, num_years),
+        annuity_factor=np.array([
+            formulas.calculate_annuity_factor(lifetime.get(k, 25), formulas.discount_rate)
+            for k in variables.CAPACITY_COST_TYPES
+        ]),
+        lifetime=np.array([float(lifetime.get(k, 25)) for k in variables.CAPACITY_COST_TYPES])
+    )
+
+
+def _safe_divide(numerator: np.ndarray, denominator: np.ndarray) -> np.ndarray:
+    """逐元素除法，分母为0处结果为0（对应公式中的 IF(分母=0, 0, ...)）"""
+    numerator, denominator = np.broadcast_arrays(numerator, denominator)
+    out = np.zeros(numerator.shape)
+    np.divide(numerator, denominator, out=out, where=denominator != 0)
+    return out
+
+
+def _rows(matrix: np.ndarray, types: List[str], keys: List[str]) -> np.ndarray:
+    """按类型名称选取矩阵的行（技术维为倒数第二维）"""
+    return matrix[..., [types.index(k) for k in keys], :]
+
+
+def calculate_capacity_array(arrays: PowerArrays) -> np.ndarray:
+    """
+    根据发电量和利用小时数计算装机容量 (..., 11, Y)
+    公式: 装机容量(GW) = IF(利用小时数>0, 发电量/利用小时数*1000000, 0)
+    """
+    gen, hours = arrays.generation, arrays.utilization_hours
+    capacity = np.zeros(np.broadcast_shapes(gen.shape, hours.shape))
+    np.divide(gen, hours, out=capacity, where=hours > 0)
+    return capacity * 1000000
+
+
+def cost_type_capacity(arrays: PowerArrays, capacity: np.ndarray,
+                       variables: PowerVariables = None, catalog: TechnologyCatalog = None):
+    """
+    将发电装机和储能装机映射到装机成本类型 (..., 成本类型, Y)
+    Returns:
+        (share, cost_capacity)：分摊比例（如海上风电占比、分布式光伏占比，无分摊为1）
+        和对应的装机容量，成本类型装机 = share * cost_capacity
+    """
+    catalog = catalog or DEFAULT_CATALOG
+    share = catalog.share_matrix(arrays)
+    source = np.concatenate([capacity, arrays.storage], axis=-2)
+    cost_capacity = np.einsum('ks,...sy->...ky', catalog.source_matrix(), source)
+    return share, cost_capacity
+
+
+def compute_power_arrays(arrays: PowerArrays, variables: PowerVariables = None,
+                         coal_co2_factor: float = 2.66, gas_co2_factor: float = 2.16,
+                         gas_conversion_factor: float = 1.33,
+                         capacity: np.ndarray = None,
+                         catalog: TechnologyCatalog = None) -> Dict[str, Dict[str, np.ndarray]]:
+    """
+    在数组上执行全部电力计算，返回未取整的结果数组
+
+    结构与 PowerCalculator.calculate 的结果字典一致，每个叶子为 (..., Y) 数组。
+    求和均沿技术维按原公式顺序逐项累加，保证与标量路径结果一致。
+    capacity 为空时装机容量由发电量和利用小时数计算，否则直接使用（如调度后发电量与装机分离时）。
+    类型列表、分摊比例和各类标志取自技术目录 catalog，数组须按同一目录构建。
+    """
+    variables = variables or PowerVariables()
+    catalog = catalog or DEFAULT_CATALOG
+    gen_types = catalog.generation_types
+    cost_types = catalog.cost_types
+    om_types = catalog.power_cost_types
+    storage_types = catalog.storage_types
+    fuel_output_types = catalog.fuel_cost_output_types
+    non_fossil_types = catalog.non_fossil_types
+
+    def g(matrix, key, types=gen_types):
+        return matrix[..., types.index(key), :]
+
+    # ==================== 发电量 ====================
+    gen = arrays.generation
+    total_gen = gen.sum(axis=-2)
+
+    # ==================== 装机容量 ====================
+    if capacity is None:
+        capacity = calculate_capacity_array(arrays)
+    total_cap = capacity.sum(axis=-2)
+
+    wind_cap, solar_cap = g(capacity, '风电'), g(capacity, '光伏')
+    non_fossil_cap = _rows(capacity, gen_types, non_fossil_types).sum(axis=-2)
+
+    # ==================== 储能 ====================
+    total_storage = arrays.storage.sum(axis=-2)
+
+    # ==================== 发电量占比 ====================
+    wind_gen, solar_gen = g(gen, '风电'), g(gen, '光伏')
+    non_fossil_gen = _rows(gen, gen_types, non_fossil_types).sum(axis=-2)
+    generation_ratio = _safe_divide(gen, total_gen[..., None, :])
+    wind_solar_gen_ratio = _safe_divide(wind_gen + solar_gen, total_gen)
+
+    # ==================== 碳捕集占比 ====================
+    ccs_ratio = {}
+    for base, ccs in catalog.ccs_pairs:
+        without_ccs, with_ccs = g(gen, base), g(gen, ccs)
+        ratio = _safe_divide(without_ccs, without_ccs + with_ccs)
+        ccs_ratio[base] = ratio
+        ccs_ratio[ccs] = 1 - ratio
+
+    # ==================== 投资成本 ====================
+    share, cost_capacity = cost_type_capacity(arrays, capacity, variables, catalog)
+
+    unit_cost = arrays.capacity_cost
+    annuity = arrays.annuity_factor[..., :, None]
+    investment = unit_cost * annuity * share * cost_capacity / 10
+
+    num_power = len(om_types)
+    total_power_inv = investment[..., :num_power, :].sum(axis=-2)
+    total_storage_inv = investment[..., num_power:, :].sum(axis=-2)
+    grid_inv = arrays.cross_region_capacity * 0.06 * 10000
+    intra_grid = total_power_inv
+
+    # ==================== 运维成本 ====================
+    om_cost = (unit_cost[..., :num_power, :] * arrays.om_ratio * share[..., :num_power, :]
+               * cost_capacity[..., :num_power, :] / 10)
+    total_om = om_cost.sum(axis=-2)
+
+    # ==================== 燃料成本 ====================
+    # 燃料成本 = 燃料单价 × 分摊比例 × 来源发电量 × 10000
+    fuel_index = [om_types.index(k) for k in fuel_output_types]
+    source_gen = _rows(gen, gen_types, [catalog.capacity_source[k] for k in fuel_output_types])
+    fuel = arrays.fuel_cost[..., fuel_index, :] * (share[..., fuel_index, :] * source_gen) * 10000
+    total_fuel = fuel.sum(axis=-2)
+
+    # ==================== 总成本和LCOE ====================
+    total_cost = total_power_inv + total_storage_inv + grid_inv + intra_grid + total_om + total_fuel
+
+    lcoe_power = _safe_divide(total_power_inv, total_gen) / 10000
+    lcoe_storage = _safe_divide(total_storage_inv, total_gen) / 10000
+    lcoe_grid_cross = _safe_divide(grid_inv, total_gen) / 10000
+    lcoe_grid_intra = _safe_divide(intra_grid, total_gen) / 10000
+    lcoe_om = _safe_divide(total_om, total_gen) / 10000
+    lcoe_fuel = _safe_divide(total_fuel, total_gen) / 10000
+    lcoe_total = lcoe_power + lcoe_storage + lcoe_grid_cross + lcoe_grid_intra + lcoe_om + lcoe_fuel
+
+    # ==================== CO2排放 ====================
+    rate = arrays.fuel_rate
+    fuel_rate_types = variables.FUEL_RATE_TYPES
+    coal_rate, coal_ccs_rate = g(rate, '煤炭', fuel_rate_types), g(rate, '煤炭CCS', fuel_rate_types)
+    gas_rate, gas_ccs_rate = g(rate, '天然气', fuel_rate_types), g(rate, '天然气CCS', fuel_rate_types)
+    bio_ccs_rate = g(rate, '生物质CCS', fuel_rate_types)
+    coal_ccs_gen, gas_ccs_gen = g(gen, '煤电+CCS'), g(gen, '气电+CCS')
+    capture = arrays.ccs_capture_rate
+
+    coal_co2 = (g(gen, '煤电') * coal_rate + coal_ccs_gen * coal_ccs_rate) * coal_co2_factor
+    gas_co2 = ((g(gen, '气电') * gas_rate + gas_ccs_gen * gas_ccs_rate)
+               * gas_conversion_factor * gas_co2_factor)
+    total_direct_co2 = coal_co2 + gas_co2
+    fossil_ccs = (coal_ccs_rate * coal_ccs_gen * coal_co2_factor
+                  + gas_conversion_factor * gas_ccs_rate * gas_ccs_gen * gas_co2_factor) * capture
+    biomass_ccs = bio_ccs_rate * g(gen, '生物质+CCS') * variables.BIOMASS_CO2_FACTOR * capture
+
+    h2_demand = arrays.hydrogen_demand
+    elec_demand = arrays.electricity_demand
+
+    results = {
+        'capacity': {k: capacity[..., i, :] for i, k in enumerate(gen_types)},
+        'capacity_structure': {
+            '非化石占比': _safe_divide(non_fossil_cap, total_cap),
+            '风光占比': _safe_divide(wind_cap + solar_cap, total_cap),
+            '煤电占比': _safe_divide(g(capacity, '煤电') + g(capacity, '煤电+CCS'), total_cap)
+        },
+        'storage': {
+            **{k: arrays.storage[..., i, :] for i, k in enumerate(storage_types)},
+            '总装机': total_storage,
+            '储能/新能源': _safe_divide(total_storage, wind_cap + solar_cap)
+        },
+        'generation': {k: gen[..., i, :] for i, k in enumerate(gen_types)},
+        'generation_ratio': {k: generation_ratio[..., i, :] for i, k in enumerate(gen_types)},
+        'generation_structure': {
+            '非化石占比': _safe_divide(non_fossil_gen, total_gen),
+            '风光占比': wind_solar_gen_ratio,
+            '煤电占比': _safe_divide(g(gen, '煤电') + g(gen, '煤电+CCS'), total_gen)
+        },
+        'supply_demand': {
+            '电制氢': h2_demand, '电力需求': elec_demand, '总需求': h2_demand + elec_demand,
+            '传输损耗': arrays.transmission_loss, '跨区传输': arrays.cross_region_capacity
+        },
+        'ccs_ratio': ccs_ratio,
+        'co2_emission': {
+            '来自煤炭': coal_co2, '来自天然气': gas_co2, '总直接排放': total_direct_co2,
+            '化石能源CCS': fossil_ccs, '生物质CCS': biomass_ccs,
+            '净排放': total_direct_co2 - fossil_ccs - biomass_ccs
+        },
+        'investment': {k: investment[..., i, :] for i, k in enumerate(cost_types)},
+        'om_cost': {k: om_cost[..., i, :] for i, k in enumerate(om_types)},
+        'fuel_cost_total': {k: fuel[..., i, :] for i, k in enumerate(fuel_output_types)},
+        'total_cost': {'总成本': total_cost},
+        'lcoe': {
+            '电源投资': lcoe_power, '储能投资': lcoe_storage,
+            '电网投资(跨省)': lcoe_grid_cross, '电网投资(省内)': lcoe_grid_intra,
+            '运维成本': lcoe_om, '燃料成本': lcoe_fuel, 'LCOE': lcoe_total
+        }
+    }
+    results['capacity']['总装机'] = total_cap
+    results['generation']['总发电量'] = total_gen
+    results['generation_ratio']['风光占比'] = wind_solar_gen_ratio
+    results['investment'].update({
+        '总电源投资': total_power_inv, '总储能投资': total_storage_inv,
+        '跨省电网': grid_inv, '省内电网': intra_grid
+    })
+    results['om_cost']['总运维成本'] = total_om
+    results['fuel_cost_total']['总燃料成本'] = total_fuel
+    return results
+
+
+# 结果分组的小数位数，与 PowerCalculator.calculate 保持一致
+RESULT_PRECISION = {
+    'capacity': 2, 'capacity_structure': 4, 'storage': 2, 'generation': 4,
+    'generation_ratio': 4, 'generation_structure': 4, 'supply_demand': 4,
+    'ccs_ratio': 4, 'co2_emission': 4, 'investment': 2, 'om_cost': 2,
+    'fuel_cost_total': 2, 'total_cost': 2, 'lcoe': 4
+}
+
+
+def pack_power_results(raw: Dict[str, Dict[str, np.ndarray]], years: List[str]) -> Dict[str, Any]:
+    """将单个情景的结果数组转换为与 PowerCalculator.calculate 相同的取整列表字典"""
+    results = {'years': years}
+    for section, items in raw.items():
+        digits = RESULT_PRECISION[section]
+        results[section] = {}
+        for key, values in items.items():
+            # 储能比例在标量路径中保留4位小数
+            n = 4 if key == '储能/新能源' else digits
+            results[section][key] = [round(v, n) for v in values.tolist()]
+    return results
+
+
+class VectorizedPowerCalculator(PowerCalculator):
+    """电力结果向量化计算器，结果与 PowerCalculator 一致"""
+
+    def __init__(self, catalog: TechnologyCatalog = None):
+        super().__init__()
+        self.set_catalog(catalog or DEFAULT_CATALOG)
+
+    def set_catalog(self, catalog: TechnologyCatalog) -> None:
+        """设置技术目录，类型列表和设备寿命随之更新"""
+        self.catalog = catalog
+        self.variables = catalog.to_variables(self.variables)
+
+    def load_catalog_from_csv(self, filepath: str) -> None:
+        """从CSV加载技术目录（需在加载输入数据前调用）"""
+        self.set_catalog(TechnologyCatalog.from_csv(filepath))
+
+    def build_arrays(self) -> PowerArrays:
+        """构建输入数组"""
+        return build_power_arrays(self.power_data, self.variables, self.formulas)
+
+    def calculate(self) -> Dict[str, Any]:
+        """执行所有计算"""
+        arrays = self.build_arrays()
+        raw = compute_power_arrays(arrays, self.variables,
+                                   self.power_data.coal_co2_factor,
+                                   self.power_data.gas_co2_factor,
+                                   self.power_data.gas_conversion_factor,
+                                   catalog=self.catalog)
+        return pack_power_results(raw, self.power_data.years)
@@ -0,0 +1,13 @@
+# -*- coding: utf-8 -*-
+"""计算流水线 - 按依赖图并行执行各计算模块和分析模块"""
+
+from .graph import PipelineNode, PipelineGraph
+from .runner import (PipelineRunner, StageResult, execute_node,
+                     STATUS_DONE, STATUS_FAILED, STATUS_SKIPPED)
+from .cache import StageCache, code_version, file_digest
+from .stages import build_pipeline
+
+__all__ = ['PipelineNode', 'PipelineGraph', 'PipelineRunner', 'StageResult',
+           'execute_node', 'build_pipeline',
+           'StageCache', 'code_version', 'file_digest',
+           'STATUS_DONE', 'STATUS_FAILED', 'STATUS_SKIPPED']
@@ -0,0 +1,186 @@
+# -*- coding: utf-8 -*-
+"""流水线阶段缓存
+
+阶段缓存键为以下内容的 SHA-256：
+- 节点名称、阶段函数和节点参数（对应的配置段）
+- 各输入文件的内容哈希（上游节点的输出文件也在其中，上游结果不变则下游命中）
+- requires 上游节点的缓存键（内存结果的依赖）
+- 代码版本：src/ 下全部 .py 文件和 main.py 的内容哈希
+命中时从缓存恢复输出文件（含附加导出文件）和结果字典，跳过该阶段。
+"""
+
+import hashlib
+import json
+import os
+import pickle
+import shutil
+import tempfile
+from typing import Dict, Any, List, Optional, Tuple
+
+from .graph import PipelineNode
+
+
+# 项目根目录
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# 默认缓存目录
+DEFAULT_CACHE_DIR = os.path.join(PROJECT_ROOT, '.pipeline_cache')
+
+# 每个节点保留的缓存条目数
+MAX_ENTRIES_PER_NODE = 3
+
+_CHUNK_SIZE = 1 << 20
+
+
+def file_digest(filepath: str) -> Optional[str]:
+    """文件内容的 SHA-256，文件不存在时返回 None"""
+    if not os.path.exists(filepath):
+        return None
+    digest = hashlib.sha256()
+    with open(filepath, 'rb') as f:
+        for chunk in iter(lambda: f.read(_CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def code_version(root: str = PROJECT_ROOT) -> str:
+    """代码版本：src/ 下全部 .py 文件和 main.py 的内容哈希"""
+    digest = hashlib.sha256()
+    paths = [os.path.join(root, 'main.py')]
+    for directory, dirnames, filenames in os.walk(os.path.join(root, 'src')):
+        dirnames[:] = sorted(d for d in dirnames if d != '__pycache__')
+        paths.extend(os.path.join(directory, name) for name in sorted(filenames)
+                     if name.endswith('.py'))
+    for path in paths:
+        digest.update(os.path.relpath(path, root).encode('utf-8'))
+        digest.update((file_digest(path) or 'missing').encode('utf-8'))
+    return digest.hexdigest()
+
+
+class StageCache:
+    """流水线阶段缓存（按内容哈希）"""
+
+    def __init__(self, cache_dir: str = DEFAULT_CACHE_DIR, version: str = None):
+        self.cache_dir = cache_dir
+        self.version = version or code_version()
+        # 本次运行中的文件哈希 {(路径, 修改时间, 大小): 哈希}
+        self._digests: Dict[Tuple[str, int, int], Optional[str]] = {}
+
+    def _digest(self, filepath: str) -> Optional[str]:
+        try:
+            stat = os.stat(filepath)
+        except OSError:
+            return None
+        key = (os.path.abspath(filepath), stat.st_mtime_ns, stat.st_size)
+        if key not in self._digests:
+            self._digests[key] = file_digest(filepath)
+        return self._digests[key]
+
+    def key(self, node: PipelineNode, upstream_keys: Dict[str, str]) -> str:
+        """
+        计算节点的缓存键（须在上游节点全部完成后计算）
+        Args:
+            upstream_keys: {requires 上游节点名称: 缓存键}
+        """
+        digest = hashlib.sha256()
+        func = f"{node.func.__module__}.{node.func.__qualname__}"
+        for part in (node.name, func, self.version,
+                     json.dumps(node.params, sort_keys=True, ensure_ascii=False, default=str)):
+            digest.update(part.encode('utf-8'))
+            digest.update(b'\0')
+        for path in sorted(node.inputs):
+            digest.update(path.encode('utf-8'))
+            digest.update((self._digest(path) or 'missing').encode('utf-8'))
+        for name in sorted(upstream_keys):
+            digest.update(f"{name}={upstream_keys[name]}".encode('utf-8'))
+        return digest.hexdigest()
+
+    def _entry_dir(self, name: str, key: str) -> str:
+        return os.path.join(self.cache_dir, name, key)
+
+    # ==================== 读取 ====================
+
+    def load(self, name: str, key: str) -> Optional[Tuple[Dict[str, Any], List[str]]]:
+        """
+        命中时恢复输出文件并返回 (结果字典, 输出文件列表)，未命中返回 None
+        输出文件与缓存内容相同时不重写
+        """
+        entry = self._entry_dir(name, key)
+        manifest_file = os.path.join(entry, 'manifest.json')
+        if not os.path.exists(manifest_file):
+            return None
+        try:
+            with open(manifest_file, 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+            with open(os.path.join(entry, 'results.pkl'), 'rb') as f:
+                results = pickle.load(f)
+        except (OSError, ValueError, pickle.UnpicklingError, EOFError):
+            return None
+
+        written = []
+        for item in manifest['files']:
+            cached, target = os.path.join(entry, 'files', item['name']), item['target']
+            if not os.path.exists(cached):
+                return None
+            if self._digest(target) != item['digest']:
+                _atomic_copy(cached, target)
+            written.append(target)
+        os.utime(entry)
+        return results, written
+
+    # ==================== 写入 ====================
+
+    def store(self, name: str, key: str, results: Dict[str, Any], written: List[str]) -> None:
+        """保存节点结果和输出文件（先写临时目录再整体改名，并发写入同一键时保留先完成者）"""
+        entry = self._entry_dir(name, key)
+        if os.path.exists(entry):
+            return
+        os.makedirs(os.path.dirname(entry), exist_ok=True)
+        staging = tempfile.mkdtemp(prefix=f'.{key[:8]}-', dir=os.path.dirname(entry))
+        try:
+            files_dir = os.path.join(staging, 'files')
+            os.makedirs(files_dir)
+            files = []
+            for i, target in enumerate(written):
+                cached_name = f"{i}_{os.path.basename(target)}"
+                shutil.copyfile(target, os.path.join(files_dir, cached_name))
+                files.append({'name': cached_name, 'target': os.path.abspath(target),
+                              'digest': self._digest(target)})
+            with open(os.path.join(staging, 'results.pkl'), 'wb') as f:
+                pickle.dump(results, f, protocol=pickle.HIGHEST_PROTOCOL)
+            with open(os.path.join(staging, 'manifest.json'), 'w', encoding='utf-8') as f:
+                json.dump({'node': name, 'key': key, 'files': files}, f,
+                          ensure_ascii=False, indent=2)
+            os.rename(staging, entry)
+        except OSError:
+            shutil.rmtree(staging, ignore_errors=True)
+            return
+        self._prune(name)
+
+    def _prune(self, name: str) -> None:
+        """每个节点只保留最近使用的若干条目"""
+        node_dir = os.path.join(self.cache_dir, name)
+        entries = [os.path.join(node_dir, d) for d in os.listdir(node_dir)
+                   if not d.startswith('.')]
+        entries.sort(key=os.path.getmtime, reverse=True)
+        for entry in entries[MAX_ENTRIES_PER_NODE:]:
+            shutil.rmtree(entry, ignore_errors=True)
+
+    def clear(self) -> None:
+        """清空缓存"""
+        shutil.rmtree(self.cache_dir, ignore_errors=True)
+
+
+def _atomic_copy(source: str, target: str) -> None:
+    """复制到目标目录下的临时文件后改名"""
+    directory = os.path.dirname(os.path.abspath(target))
+    os.makedirs(directory, exist_ok=True)
+    handle, temp = tempfile.mkstemp(prefix='.cache-', dir=directory)
+    os.close(handle)
+    try:
+        shutil.copyfile(source, temp)
+        os.replace(temp, target)
+    except OSError:
+        if os.path.exists(temp):
+            os.remove(temp)
+        raise
@@ -0,0 +1,105 @@
+# -*- coding: utf-8 -*-
+"""流水线节点和依赖图
+
+每个计算器/分析器声明为一个节点，显式给出输入文件、输出文件和需要内存结果的上游节点。
+节点间的依赖由 "输入文件 = 其他节点的输出文件" 和 requires 推导，无需手工排序。
+"""
+
+import os
+from typing import Dict, Any, List, Set, Callable, Iterable
+from dataclasses import dataclass, field
+
+
+@dataclass
+class PipelineNode:
+    """流水线节点"""
+    # 节点名称，如 'power'、'template'
+    name: str
+    # 阶段函数 func(params, upstream, outputs) -> 结果字典，须为模块顶层函数（可在子进程中调用）
+    func: Callable
+    # 传给阶段函数的参数
+    params: Dict[str, Any] = field(default_factory=dict)
+    # 读取的文件
+    inputs: List[str] = field(default_factory=list)
+    # 写出的文件
+    outputs: List[str] = field(default_factory=list)
+    # 需要其内存结果的上游节点（如 use_module_results）
+    requires: List[str] = field(default_factory=list)
+    # 说明
+    description: str = ''
+
+
+def _normalize(path: str) -> str:
+    return os.path.normcase(os.path.abspath(path))
+
+
+class PipelineGraph:
+    """流水线依赖图（有向无环图）"""
+
+    def __init__(self, nodes: Iterable[PipelineNode] = ()):
+        self.nodes: Dict[str, PipelineNode] = {}
+        for node in nodes:
+            self.add(node)
+
+    def add(self, node: PipelineNode) -> None:
+        """添加节点"""
+        if node.name in self.nodes:
+            raise ValueError(f"节点名称重复: {node.name}")
+        self.nodes[node.name] = node
+
+    def producers(self) -> Dict[str, str]:
+        """输出文件 -> 生成该文件的节点"""
+        producers = {}
+        for node in self.nodes.values():
+            for path in node.outputs:
+                key = _normalize(path)
+                if key in producers:
+                    raise ValueError(f"输出文件 {path} 同时由 {producers[key]} 和 {node.name} 生成")
+                producers[key] = node.name
+        return producers
+
+    def dependencies(self) -> Dict[str, Set[str]]:
+        """节点 -> 上游节点集合；requires 中未加入图的节点（如未启用）忽略"""
+        producers = self.producers()
+        dependencies = {}
+        for node in self.nodes.values():
+            upstream = {producers[_normalize(path)] for path in node.inputs
+                        if _normalize(path) in producers}
+            upstream.update(name for name in node.requires if name in self.nodes)
+            upstream.discard(node.name)
+            dependencies[node.name] = upstream
+        return dependencies
+
+    def topological_order(self) -> List[str]:
+        """拓扑排序（同层按加入顺序），存在环时抛出 ValueError"""
+        return [name for level in self.levels() for name in level]
+
+    def levels(self) -> List[List[str]]:
+        """按层分组：同一层的节点互不依赖，可并行执行"""
+        dependencies = self.dependencies()
+        remaining = dict(dependencies)
+        done: Set[str] = set()
+        levels = []
+        while remaining:
+            level = [name for name, upstream in remaining.items() if upstream <= done]
+            if not level:
+                raise ValueError(f"流水线存在循环依赖: {', '.join(remaining)}")
+            levels.append(level)
+            done.update(level)
+            for name in level:
+                del remaining[name]
+        return levels
+
+    def subgraph(self, targets: Iterable[str]) -> 'PipelineGraph':
+        """只保留目标节点及其全部上游节点"""
+        dependencies = self.dependencies()
+        keep: Set[str] = set()
+        stack = list(targets)
+        while stack:
+            name = stack.pop()
+            if name not in self.nodes:
+                raise ValueError(f"未知节点: {name}")
+            if name not in keep:
+                keep.add(name)
+                stack.extend(dependencies[name])
+        return PipelineGraph(node for name, node in self.nodes.items() if name in keep)
@@ -0,0 +1,224 @@
+# -*- coding: utf-8 -*-
+"""流水线执行器
+
+按依赖图在进程池中并行执行节点：上游全部完成的节点立即提交，互不依赖的节点同时运行。
+每个节点的输出先写入输出目录下的临时目录，节点成功后逐个 os.replace 到目标位置，
+下游节点只会读到完整的文件（同一文件系统内 rename 为原子操作）。
+节点的打印输出在子进程中捕获，节点结束后整体打印，避免多进程输出交错。
+启用阶段缓存（StageCache）时，节点在上游完成后计算缓存键，命中则恢复输出并跳过执行。
+"""
+
+import io
+import os
+import shutil
+import time
+import tempfile
+import traceback
+from contextlib import redirect_stdout
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+from typing import Dict, Any, List, Optional
+from dataclasses import dataclass, field
+
+from .graph import PipelineGraph, PipelineNode
+from .cache import StageCache
+
+
+# 节点状态
+STATUS_DONE = '完成'
+STATUS_FAILED = '失败'
+STATUS_SKIPPED = '跳过'
+
+
+@dataclass
+class StageResult:
+    """节点执行结果"""
+    name: str
+    status: str
+    seconds: float = 0.0
+    # 捕获的打印输出
+    log: str = ''
+    error: str = ''
+    # 阶段函数返回的结果（供 requires 的下游节点使用）
+    results: Dict[str, Any] = field(default_factory=dict)
+    # 实际写出的文件
+    written: List[str] = field(default_factory=list)
+    # 缓存键和是否由缓存恢复
+    key: str = ''
+    cached: bool = False
+
+
+def _staging_paths(node: PipelineNode) -> Dict[str, str]:
+    """为每个输出目录创建临时目录，返回 {输出文件: 临时文件}"""
+    staging_dirs = {}
+    staged = {}
+    for path in node.outputs:
+        directory = os.path.dirname(os.path.abspath(path))
+        if directory not in staging_dirs:
+            os.makedirs(directory, exist_ok=True)
+            staging_dirs[directory] = tempfile.mkdtemp(prefix=f'.{node.name}-', dir=directory)
+        staged[path] = os.path.join(staging_dirs[directory], os.path.basename(path))
+    return staged
+
+
+def _commit_outputs(staged: Dict[str, str]) -> List[str]:
+    """将临时目录中的全部文件（含附加导出文件）原子替换到输出目录，并删除临时目录"""
+    written = []
+    for staging_dir in sorted({os.path.dirname(p) for p in staged.values()}):
+        target_dir = os.path.dirname(staging_dir)
+        for filename in sorted(os.listdir(staging_dir)):
+            target = os.path.join(target_dir, filename)
+            os.replace(os.path.join(staging_dir, filename), target)
+            written.append(target)
+        os.rmdir(staging_dir)
+    return written
+
+
+def _discard_outputs(staged: Dict[str, str]) -> None:
+    for staging_dir in {os.path.dirname(p) for p in staged.values()}:
+        shutil.rmtree(staging_dir, ignore_errors=True)
+
+
+def execute_node(node: PipelineNode, upstream: Dict[str, Dict[str, Any]]) -> StageResult:
+    """执行单个节点（在子进程或当前进程中）"""
+    start = time.perf_counter()
+    buffer = io.StringIO()
+    staged = _staging_paths(node)
+    try:
+        with redirect_stdout(buffer):
+            results = node.func(node.params, upstream, staged) or {}
+        written = _commit_outputs(staged)
+        log = buffer.getvalue()
+        for staging_dir in {os.path.dirname(p) for p in staged.values()}:
+            log = log.replace(staging_dir + os.sep, os.path.dirname(staging_dir) + os.sep)
+        return StageResult(node.name, STATUS_DONE, time.perf_counter() - start,
+                           log, results=results, written=written)
+    except Exception:
+        _discard_outputs(staged)
+        return StageResult(node.name, STATUS_FAILED, time.perf_counter() - start,
+                           buffer.getvalue(), error=traceback.format_exc())
+
+
+class PipelineRunner:
+    """流水线执行器"""
+
+    def __init__(self, graph: PipelineGraph, max_workers: Optional[int] = None,
+                 verbose: bool = True, cache: StageCache = None):
+        """
+        Args:
+            graph: 依赖图
+            max_workers: 进程数，为空时取CPU核数；为1时在当前进程中顺序执行
+            verbose: 是否打印各节点的输出
+            cache: 阶段缓存，为空时不使用缓存
+        """
+        self.graph = graph
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.verbose = verbose
+        self.cache = cache
+
+    def run(self) -> Dict[str, StageResult]:
+        """执行全部节点，返回 {节点名称: StageResult}"""
+        dependencies = self.graph.dependencies()
+        self.graph.levels()  # 检查循环依赖
+        results: Dict[str, StageResult] = {}
+        pending = [name for name in self.graph.nodes]
+        start = time.perf_counter()
+
+        def ready(name):
+            return all(results.get(up) is not None and results[up].status == STATUS_DONE
+                       for up in dependencies[name])
+
+        def blocked(name):
+            return any(up in results and results[up].status != STATUS_DONE
+                       for up in dependencies[name])
+
+        def upstream_results(name):
+            node = self.graph.nodes[name]
+            return {up: results[up].results for up in node.requires if up in results}
+
+        def skip_blocked():
+            for name in list(pending):
+                if blocked(name):
+                    pending.remove(name)
+                    self._record(results, StageResult(name, STATUS_SKIPPED,
+                                                      error='上游节点未完成'))
+
+        keys: Dict[str, str] = {}
+
+        def from_cache(name):
+            """计算缓存键，命中时记录结果并返回 True"""
+            if self.cache is None:
+                return False
+            node = self.graph.nodes[name]
+            keys[name] = self.cache.key(node, {up: results[up].key for up in node.requires
+                                               if up in results})
+            hit = self.cache.load(name, keys[name])
+            if hit is None:
+                return False
+            self._record(results, StageResult(name, STATUS_DONE, results=hit[0],
+                                              written=hit[1], key=keys[name], cached=True))
+            return True
+
+        def finish(result):
+            result.key = keys.get(result.name, '')
+            if self.cache is not None and result.status == STATUS_DONE:
+                self.cache.store(result.name, result.key, result.results, result.written)
+            self._record(results, result)
+
+        if self.max_workers == 1:
+            while pending:
+                skip_blocked()
+                for name in [n for n in pending if ready(n)]:
+                    pending.remove(name)
+                    if not from_cache(name):
+                        finish(execute_node(self.graph.nodes[name], upstream_results(name)))
+                    break
+        else:
+            with ProcessPoolExecutor(max_workers=self.max_workers) as executor:
+                running = {}
+                while pending or running:
+                    skip_blocked()
+                    launched = False
+                    for name in [n for n in pending if ready(n)]:
+                        pending.remove(name)
+                        launched = True
+                        if from_cache(name):
+                            continue
+                        future = executor.submit(execute_node, self.graph.nodes[name],
+                                                 upstream_results(name))
+                        running[future] = name
+                    if launched or not running:
+                        continue
+                    finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                    for future in finished:
+                        finish(future.result())
+                        del running[future]
+
+        if self.verbose:
+            self.print_summary(results, time.perf_counter() - start)
+        return results
+
+    def _record(self, results: Dict[str, StageResult], result: StageResult) -> None:
+        results[result.name] = result
+        if not self.verbose:
+            return
+        print(f"\n{'='*70}")
+        if result.cached:
+            print(f"[{result.status}] {result.name} (缓存)")
+        else:
+            print(f"[{result.status}] {result.name} ({result.seconds:.2f}s)")
+        print("=" * 70)
+        if result.log:
+            print(result.log, end='' if result.log.endswith('\n') else '\n')
+        if result.error:
+            print(result.error)
+
+    @staticmethod
+    def print_summary(results: Dict[str, StageResult], seconds: float) -> None:
+        """打印各节点状态和耗时"""
+        print("\n" + "=" * 70)
+        print(f"流水线执行完成，总耗时 {seconds:.2f}s")
+        print("=" * 70)
+        for name, result in results.items():
+            timing = '缓存' if result.cached else f"{result.seconds:.2f}s"
+            print(f"  {name:<20}{result.status:<6}{timing:>10}")
+        print("=" * 70)
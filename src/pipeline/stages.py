@@ -0,0 +1,261 @@
+# -*- coding: utf-8 -*-
+"""流水线阶段函数和默认流水线
+
+阶段函数签名为 func(params, upstream, outputs)：
+- params: 节点参数（模块/分析配置）
+- upstream: {上游节点名称: 结果字典}，仅包含节点 requires 中的节点
+- outputs: {输出文件: 临时文件}，阶段函数只写临时文件，由执行器原子替换到输出位置
+阶段函数在子进程中执行，须为模块顶层函数。
+"""
+
+import copy
+import os
+from typing import Dict, Any, List
+
+from .graph import PipelineNode, PipelineGraph
+
+
+# 默认流水线中的计算模块（按此顺序加入图）
+PIPELINE_MODULES = ['building', 'power', 'industry', 'transport', 'balance']
+
+# config.json 中未配置的分析模块默认配置（与各运行脚本的默认路径一致）
+DEFAULT_ANALYSIS_CONFIG = {
+    'trajectory': {
+        'enabled': True,
+        'input_csv_file': 'data/input/trajectory_input.csv',
+        'output_csv_file': 'data/output/trajectory_output.csv',
+        'use_module_results': False
+    },
+    'balance_2030_2050': {
+        'enabled': True,
+        'input_csv_file': 'data/input/balance_2030_2050_input.csv',
+        'output_csv_file': 'data/output/balance_2030_2050_output.csv',
+        'use_module_results': False
+    },
+    'scenario_summary': {
+        'enabled': True,
+        'input_csv_file': 'data/input/scenario_summary_input.csv',
+        'output_csv_file': 'data/output/scenario_summary_output.csv'
+    },
+    'statistics': {
+        'enabled': True,
+        'data_dir': 'data/output',
+        'output_csv_file': 'data/output/statistics_output.csv'
+    },
+}
+
+
+# ==================== 阶段函数 ====================
+
+def run_module_stage(params: Dict[str, Any], upstream: Dict[str, Any],
+                     outputs: Dict[str, str]) -> Dict[str, Any]:
+    """计算模块阶段，复用 main.run_module（引擎选择、技术目录、逐时曲线等配置）"""
+    from main import run_module
+    module_config = dict(params['config'])
+    output_file = module_config.get('output_csv_file')
+    if output_file:
+        module_config['output_csv_file'] = outputs[output_file]
+    return run_module(params['module'], module_config)
+
+
+def run_main_analysis_stage(params: Dict[str, Any], upstream: Dict[str, Any],
+                            outputs: Dict[str, str]) -> Dict[str, Any]:
+    """宏观测算参考/数据模板/能源结构阶段，复用 main.py 中对应的运行函数"""
+    import main
+    runners = {
+        'macro': main.run_macro_analysis,
+        'template': main.run_template_analysis,
+        'structure': main.run_structure_analysis,
+    }
+    name = params['analysis']
+    config = {'analysis': {name: _staged_config(params['config'], outputs)}}
+    return runners[name](config, upstream)
+
+
+def run_trajectory_stage(params: Dict[str, Any], upstream: Dict[str, Any],
+                         outputs: Dict[str, str]) -> Dict[str, Any]:
+    """碳排放轨迹阶段"""
+    from src.analysis.trajectory import TrajectoryAnalyzer
+    config = params['config']
+    analyzer = TrajectoryAnalyzer()
+    if config.get('use_module_results') and upstream:
+        print("从模块计算结果加载数据...")
+        for module_name, results in upstream.items():
+            analyzer.load_module_results(module_name, results)
+        analyzer.load_from_modules()
+    elif not _load_input(analyzer, config.get('input_csv_file')):
+        return {}
+
+    results = analyzer.calculate()
+    analyzer.print_results(results)
+    analyzer.export_to_csv(results, outputs[config['output_csv_file']])
+    return results
+
+
+def run_balance_2030_2050_stage(params: Dict[str, Any], upstream: Dict[str, Any],
+                                outputs: Dict[str, str]) -> Dict[str, Any]:
+    """2030年和2050年平衡阶段"""
+    from src.analysis.balance_2030_2050 import BalanceAnalyzer
+    config = params['config']
+    analyzer = BalanceAnalyzer()
+    if config.get('use_module_results') and upstream:
+        print("从模块计算结果加载数据...")
+        for module_name, results in upstream.items():
+            analyzer.load_module_results(module_name, results)
+        analyzer.load_from_modules()
+    elif not _load_input(analyzer, config.get('input_csv_file')):
+        return {}
+
+    results = analyzer.calculate()
+    analyzer.export_to_csv(results, outputs[config['output_csv_file']])
+    return results
+
+
+def run_scenario_summary_stage(params: Dict[str, Any], upstream: Dict[str, Any],
+                               outputs: Dict[str, str]) -> Dict[str, Any]:
+    """情景数据一览表阶段（use_module_results 时读取上游结果，否则读取宏观、结构、轨迹、模板的输出CSV）"""
+    from src.analysis.scenario_summary import ScenarioSummaryAnalyzer
+    config = params['config']
+    paths = params['sources']
+    store = _result_store(upstream) if config.get('use_module_results') and upstream else None
+    return ScenarioSummaryAnalyzer().run(
+        input_path=config.get('input_csv_file'),
+        output_path=outputs[config['output_csv_file']],
+        macro_path=paths['macro'],
+        structure_path=paths['structure'],
+        trajectory_path=paths['trajectory'],
+        template_path=paths['template'],
+        store=store)
+
+
+def run_statistics_stage(params: Dict[str, Any], upstream: Dict[str, Any],
+                         outputs: Dict[str, str]) -> Dict[str, Any]:
+    """统计表格阶段（use_module_results 时读取上游结果，否则读取宏观、结构、轨迹、模板的输出CSV）"""
+    from src.analysis.statistics import StatisticsAnalyzer
+    config = params['config']
+    analyzer = StatisticsAnalyzer()
+    if config.get('use_module_results') and upstream:
+        print("从上游结果加载数据...")
+        analyzer.load_from_store(_result_store(upstream))
+    else:
+        analyzer.load_from_csv(config.get('data_dir', 'data/output'))
+    results = analyzer.calculate()
+    analyzer.print_results()
+    analyzer.export_to_csv(outputs[config['output_csv_file']])
+    return results
+
+
+def _staged_config(config: Dict[str, Any], outputs: Dict[str, str]) -> Dict[str, Any]:
+    """将配置中的输出路径替换为临时文件"""
+    config = copy.deepcopy(config)
+    output_file = config.get('output_csv_file')
+    if output_file:
+        config['output_csv_file'] = outputs[output_file]
+    return config
+
+
+def _result_store(upstream: Dict[str, Any]):
+    """由上游分析结果重建结果存储（输出表由各分析器按完整精度生成）"""
+    from src.utils import ResultStore
+    from src.analysis import MacroAnalyzer, StructureAnalyzer, TemplateAnalyzer
+    from src.analysis.trajectory import TrajectoryAnalyzer
+    analyzers = {'macro': MacroAnalyzer, 'structure': StructureAnalyzer,
+                 'trajectory': TrajectoryAnalyzer, 'template': TemplateAnalyzer}
+    store = ResultStore()
+    for name, results in upstream.items():
+        if results:
+            store.publish(name, results, analyzers[name]() if name in analyzers else None)
+    return store
+
+
+def _load_input(analyzer, input_file: str) -> bool:
+    if input_file and os.path.exists(input_file):
+        print(f"从CSV文件加载数据: {input_file}")
+        analyzer.load_input_from_csv(input_file)
+        return True
+    print(f"警告: 输入文件不存在 - {input_file}")
+    return False
+
+
+# ==================== 默认流水线 ====================
+
+def _paths(paths: List[str]) -> List[str]:
+    """去掉未配置的路径"""
+    return [p for p in paths if p]
+
+
+def build_pipeline(config: Dict[str, Any]) -> PipelineGraph:
+    """
+    由 config.json 构建默认流水线
+    - 计算模块: building、power、industry、transport、balance（已启用的）
+    - 分析: macro、template、structure、trajectory、balance_2030_2050（依赖模块结果或输入CSV）
+    - 汇总: scenario_summary、statistics（依赖 macro/structure/trajectory/template 的输出CSV，
+      use_module_results 时改为依赖其内存结果）
+    """
+    graph = PipelineGraph()
+    modules = config.get('modules', {})
+    analysis = {name: dict(cfg) for name, cfg in DEFAULT_ANALYSIS_CONFIG.items()}
+    for name, cfg in config.get('analysis', {}).items():
+        analysis[name] = {**analysis.get(name, {}), **cfg}
+
+    # ==================== 计算模块 ====================
+    enabled_modules = []
+    for name in PIPELINE_MODULES + [m for m in modules if m not in PIPELINE_MODULES]:
+        cfg = modules.get(name, {})
+        if not cfg.get('enabled', False):
+            continue
+        input_key = 'input_json_file' if cfg.get('input_type') == 'json' else 'input_csv_file'
+        graph.add(PipelineNode(
+            name=name,
+            func=run_module_stage,
+            params={'module': name, 'config': cfg},
+            inputs=_paths([cfg.get(input_key), cfg.get('catalog_csv_file'),
+                           cfg.get('profile_csv_file'), cfg.get('network_csv_file')]),
+            outputs=_paths([cfg.get('output_csv_file')]),
+            description=f"计算模块 {name}"))
+        enabled_modules.append(name)
+
+    # ==================== 分析模块 ====================
+    def add_analysis(name, func, requires, inputs):
+        cfg = analysis.get(name, {})
+        if not cfg.get('enabled', False):
+            return
+        use_results = cfg.get('use_module_results', False)
+        graph.add(PipelineNode(
+            name=name,
+            func=func,
+            params={'analysis': name, 'config': cfg},
+            inputs=[] if use_results else _paths([cfg.get(k) for k in inputs]),
+            outputs=_paths([cfg.get('output_csv_file')]),
+            requires=requires if use_results else [],
+            description=f"分析模块 {name}"))
+
+    add_analysis('macro', run_main_analysis_stage, enabled_modules,
+                 ['input_csv_file', 'sector_data_csv_file'])
+    add_analysis('template', run_main_analysis_stage, ['building', 'power'], ['input_csv_file'])
+    add_analysis('structure', run_main_analysis_stage, ['template'], ['input_csv_file'])
+    add_analysis('trajectory', run_trajectory_stage, ['template', 'structure', 'power'],
+                 ['input_csv_file'])
+    add_analysis('balance_2030_2050', run_balance_2030_2050_stage,
+                 ['template', 'structure', 'trajectory'], ['input_csv_file'])
+
+    # ==================== 汇总 ====================
+    sources = {name: analysis.get(name, {}).get('output_csv_file',
+                                                f"data/output/{name}_output.csv")
+               for name in ['macro', 'structure', 'trajectory', 'template']}
+    for name, func in [('scenario_summary', run_scenario_summary_stage),
+                       ('statistics', run_statistics_stage)]:
+        cfg = analysis.get(name, {})
+        if not cfg.get('enabled', False):
+            continue
+        use_results = cfg.get('use_module_results', False)
+        graph.add(PipelineNode(
+            name=name,
+            func=func,
+            params={'config': cfg, 'sources': sources},
+            inputs=([] if use_results else list(sources.values()))
+                   + _paths([cfg.get('input_csv_file')]),
+            outputs=_paths([cfg.get('output_csv_file')]),
+            requires=list(sources) if use_results else [],
+            description=f"汇总 {name}"))
+    return graph
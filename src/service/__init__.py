@@ -0,0 +1,11 @@
+# -*- coding: utf-8 -*-
+"""常驻情景计算服务 - 预先加载计算代码和输入表，通过本机 HTTP 接口响应情景计算请求；文件监视实时重算"""
+
+from .tables import CellPatch, InputTableCache
+from .server import (ScenarioService, ServiceServer, serve, results_to_npz,
+                     DEFAULT_HOST, DEFAULT_PORT)
+from .watch import WatchSession, indicator_values, format_delta, KEY_INDICATORS
+
+__all__ = ['CellPatch', 'InputTableCache', 'ScenarioService', 'ServiceServer', 'serve',
+           'results_to_npz', 'DEFAULT_HOST', 'DEFAULT_PORT',
+           'WatchSession', 'indicator_values', 'format_delta', 'KEY_INDICATORS']
@@ -0,0 +1,262 @@
+# -*- coding: utf-8 -*-
+"""常驻情景计算服务
+
+服务进程启动时导入全部计算模块和分析模块、读取一次配置、解析并缓存输入表，
+之后在本机 HTTP 端口上响应情景计算请求，每次请求只做计算本身（不写输出文件）：
+
+    GET  /health     服务状态
+    POST /evaluate   计算情景，请求体为 JSON:
+        {
+          "overrides": {"modules": {"power": {"engine": "vectorized"}}},   配置覆盖项（可选）
+          "cells": [{"file": "data/input/power_input.csv", "section": "发电量", "row": "煤电",
+                     "column": "2030", "value": 1.2}],                     输入表单元格修改（可选，
+                                                                           项目在多个分区出现时须给出 section）
+          "outputs": ["trajectory", "power"],                              返回的结果（可选，默认全部）
+          "format": "json"                                                 json 或 npz（二进制数组）
+        }
+    POST /reload     重新读取配置，清空输入表缓存
+
+json 格式返回 {"seconds": 耗时, "results": {名称: 结果字典}}；
+npz 格式返回 numpy .npz 数据，每个结果三个等长数组 {名称}/items、{名称}/years、{名称}/values
+（结果字典展开为 项目、年份、数值 长表，见 batch.shards.flatten_results）。
+请求按到达顺序逐个计算（计算代码使用进程级状态，不并发执行）。
+"""
+
+import io
+import json
+import time
+import traceback
+from contextlib import redirect_stdout
+from http.server import HTTPServer, BaseHTTPRequestHandler
+from typing import Dict, Any, List, Optional
+
+import numpy as np
+
+from ..utils import ConfigLoader, IOHandler, ResultStore
+from ..batch.scenarios import merge_config
+from ..batch.shared import SHARED_INPUT_KEYS
+from ..batch.shards import flatten_results
+from .tables import CellPatch, InputTableCache
+
+
+# 默认监听地址（仅本机）
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8765
+
+# 请求体大小上限
+MAX_REQUEST_BYTES = 16 * 1024 * 1024
+
+NPZ_CONTENT_TYPE = 'application/x-npz'
+
+
+def _json_default(value):
+    """numpy 类型转为 JSON"""
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    raise TypeError(f"无法转换为JSON: {type(value).__name__}")
+
+
+def results_to_npz(results: Dict[str, Any]) -> bytes:
+    """结果字典展开为长表数组，打包为 .npz"""
+    arrays = {}
+    for name, result in results.items():
+        rows = flatten_results(result) if isinstance(result, dict) else []
+        arrays[f"{name}/items"] = np.array([row[0] for row in rows], dtype=str)
+        arrays[f"{name}/years"] = np.array([row[1] for row in rows], dtype=str)
+        arrays[f"{name}/values"] = np.array([row[2] for row in rows], dtype=np.float64)
+    buffer = io.BytesIO()
+    np.savez(buffer, **arrays)
+    return buffer.getvalue()
+
+
+class ScenarioService:
+    """常驻情景计算服务（计算部分，与 HTTP 无关，也可在进程内直接调用）"""
+
+    def __init__(self, config_file: str = 'config/config.json', warm: bool = True):
+        """
+        Args:
+            config_file: 基础配置文件
+            warm: 是否在启动时预先计算一次基础情景（预热缓存和首次调用开销）
+        """
+        import main
+        self._main = main
+        self.config_file = config_file
+        self.tables = InputTableCache()
+        IOHandler.register_table_source(self.tables)
+        self.requests = 0
+        self.started = time.time()
+        self.reload(warm)
+
+    def reload(self, warm: bool = True) -> None:
+        """重新读取配置，清空并重新预读输入表"""
+        with redirect_stdout(io.StringIO()):
+            self.base_config = ConfigLoader(self.config_file).load()
+        self.tables.clear()
+        self.tables.preload(self.input_files(self.base_config))
+        if warm:
+            self.evaluate({})
+
+    @staticmethod
+    def input_files(config: Dict[str, Any]) -> List[str]:
+        """配置中已启用的模块和分析读取的输入文件"""
+        paths = []
+        for section in ('modules', 'analysis'):
+            for cfg in config.get(section, {}).values():
+                if cfg.get('enabled', True):
+                    paths += [cfg[key] for key in SHARED_INPUT_KEYS if cfg.get(key)]
+        return paths
+
+    def scenario_config(self, overrides: Dict[str, Any]) -> Dict[str, Any]:
+        """基础配置合并覆盖项，并去掉全部输出文件（服务不写文件）"""
+        config = merge_config(self.base_config, overrides or {})
+        for section in ('modules', 'analysis'):
+            for cfg in config.get(section, {}).values():
+                for key in list(cfg):
+                    if key.startswith('output_') and key.endswith('_file'):
+                        cfg[key] = None
+        return config
+
+    def evaluate(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        计算一个情景
+        Returns:
+            {'seconds': 耗时, 'results': {名称: 结果字典}, 'log': 计算过程的打印输出}
+        """
+        if not isinstance(request, dict):
+            raise ValueError("请求应为 JSON 对象")
+        start = time.perf_counter()
+        config = self.scenario_config(request.get('overrides', {}))
+        patches = [CellPatch.from_dict(cell) for cell in request.get('cells', [])]
+        outputs = request.get('outputs')
+
+        buffer = io.StringIO()
+        self.tables.set_patches(patches)
+        try:
+            with redirect_stdout(buffer):
+                store: ResultStore = self._main.run_all(config)
+        finally:
+            self.tables.set_patches([])
+        self.requests += 1
+
+        names = list(store) if outputs is None else [name for name in outputs if name in store]
+        return {'seconds': round(time.perf_counter() - start, 6),
+                'results': {name: store[name] for name in names},
+                'log': buffer.getvalue()}
+
+    def status(self) -> Dict[str, Any]:
+        return {'config': self.config_file, 'requests': self.requests,
+                'uptime': round(time.time() - self.started, 1),
+                'cached_tables': len(self.tables),
+                'cache_hits': self.tables.hits, 'cache_misses': self.tables.misses}
+
+    def close(self) -> None:
+        IOHandler.unregister_table_source(self.tables)
+
+
+class ServiceRequestHandler(BaseHTTPRequestHandler):
+    """HTTP 请求处理（self.server.service 为 ScenarioService）"""
+
+    server_version = 'EnergyScenarioService/1.0'
+
+    def do_GET(self):
+        if self.path.rstrip('/') == '/health':
+            self._send_json(200, {'status': 'ok', **self.server.service.status()})
+        else:
+            self._send_json(404, {'error': f"未知路径: {self.path}"})
+
+    def do_POST(self):
+        path = self.path.rstrip('/')
+        if path not in ('/evaluate', '/reload'):
+            self._send_json(404, {'error': f"未知路径: {self.path}"})
+            return
+        try:
+            request = self._read_json()
+        except ValueError as e:
+            self._send_json(400, {'error': str(e)})
+            return
+
+        service = self.server.service
+        try:
+            if path == '/reload':
+                service.reload()
+                self._send_json(200, {'status': 'ok', **service.status()})
+                return
+            response = service.evaluate(request)
+        except (ValueError, KeyError) as e:
+            self._send_json(400, {'error': str(e.args[0] if e.args else e)})
+            return
+        except Exception as e:
+            self._send_json(500, {'error': f"{type(e).__name__}: {e}",
+                                  'traceback': traceback.format_exc()})
+            return
+
+        if request.get('format') == 'npz' or NPZ_CONTENT_TYPE in self.headers.get('Accept', ''):
+            self._send(200, results_to_npz(response['results']), NPZ_CONTENT_TYPE,
+                       {'X-Seconds': str(response['seconds'])})
+        else:
+            if not request.get('log'):
+                response.pop('log')
+            self._send_json(200, response)
+
+    def _read_json(self) -> Dict[str, Any]:
+        length = int(self.headers.get('Content-Length') or 0)
+        if length > MAX_REQUEST_BYTES:
+            raise ValueError(f"请求体过大: {length} 字节")
+        body = self.rfile.read(length) if length else b''
+        if not body.strip():
+            return {}
+        try:
+            request = json.loads(body.decode('utf-8'))
+        except (UnicodeDecodeError, json.JSONDecodeError) as e:
+            raise ValueError(f"请求体不是有效的 JSON: {e}")
+        if not isinstance(request, dict):
+            raise ValueError("请求应为 JSON 对象")
+        return request
+
+    def _send_json(self, code: int, data: Dict[str, Any]) -> None:
+        body = json.dumps(data, ensure_ascii=False, default=_json_default).encode('utf-8')
+        self._send(code, body, 'application/json; charset=utf-8')
+
+    def _send(self, code: int, body: bytes, content_type: str,
+              headers: Optional[Dict[str, str]] = None) -> None:
+        self.send_response(code)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+
+class ServiceServer(HTTPServer):
+    """情景计算 HTTP 服务（单线程，请求逐个处理）"""
+
+    def __init__(self, service: ScenarioService, host: str = DEFAULT_HOST,
+                 port: int = DEFAULT_PORT, verbose: bool = False):
+        super().__init__((host, port), ServiceRequestHandler)
+        self.service = service
+        self.verbose = verbose
+
+
+def serve(config_file: str = 'config/config.json', host: str = DEFAULT_HOST,
+          port: int = DEFAULT_PORT, verbose: bool = False) -> None:
+    """启动服务，直到中断（Ctrl+C）"""
+    start = time.perf_counter()
+    service = ScenarioService(config_file)
+    server = ServiceServer(service, host, port, verbose)
+    print(f"情景计算服务已启动: http://{host}:{server.server_address[1]} "
+          f"（预热 {time.perf_counter() - start:.2f}s，缓存输入表 {service.status()['cached_tables']} 个）")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        service.close()
+        print("情景计算服务已停止")
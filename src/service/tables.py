@@ -0,0 +1,192 @@
+# -*- coding: utf-8 -*-
+"""常驻服务的输入表缓存
+
+输入CSV解析一次后缓存在内存中（按文件时间戳和大小校验，文件修改后重新解析），
+注册为 IOHandler 的输入表来源，之后每次计算直接复制缓存的 DataFrame。
+请求可附带单元格修改（文件, 行, 列, 值），只作用于该次计算，不修改缓存和文件。
+行按标签路径匹配：标签列为年份列之前的各列（单位列除外），分区标题行的标签向下延续，
+如电力输入的 ('装机成本', '煤电')、轨迹输入的 ('工业部门', '来自煤炭')；匹配到多行时报错。
+"""
+
+import os
+from typing import Dict, Any, List, Optional, Tuple
+from dataclasses import dataclass
+
+import pandas as pd
+
+from ..utils import file_stamp
+
+
+# 不作为行标签的列
+UNIT_COLUMNS = ('单位',)
+
+
+@dataclass
+class CellPatch:
+    """输入表单元格修改"""
+    # 输入文件路径（与配置中的路径一致，内部按绝对路径匹配）
+    file: str
+    # 行：项目标签（如 '煤电'）、标签路径（如 ['装机成本', '煤电']），或整数行号
+    row: Any
+    # 列名（如 '2030'）
+    column: str
+    value: Any
+    # 所在分区的标签（如 '装机成本'），与 row 组成标签路径
+    section: Any = None
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'CellPatch':
+        missing = [key for key in ('file', 'row', 'column', 'value') if key not in data]
+        if missing:
+            raise ValueError(f"单元格修改缺少字段: {', '.join(missing)}")
+        return cls(data['file'], data['row'], str(data['column']), data['value'], data.get('section'))
+
+    @property
+    def labels(self) -> List[str]:
+        """标签路径（分区在前，项目在后）"""
+        def as_list(value):
+            if value is None:
+                return []
+            return [str(v).strip() for v in value] if isinstance(value, (list, tuple)) else [str(value).strip()]
+        return as_list(self.section) + as_list(self.row)
+
+
+def _label(value: Any) -> str:
+    return str(value).strip() if pd.notna(value) else ''
+
+
+def row_labels(df: pd.DataFrame) -> List[Tuple[str, ...]]:
+    """
+    各行的标签路径
+    标签列为年份列之前的各列（单位列除外）。某一标签列有值时更新该层级并清除更深层级，
+    只有一个标签列的表中，数值列全部为空的行为分区标题，其标签作为后续各行的分区
+    """
+    columns = []
+    for i, column in enumerate(df.columns):
+        if i > 0 and str(column).strip().isdigit():
+            break
+        if str(column).strip() not in UNIT_COLUMNS:
+            columns.append(i)
+    values = df.iloc[:, [i for i in range(df.shape[1]) if i not in columns
+                         and str(df.columns[i]).strip() not in UNIT_COLUMNS]]
+    headers = values.isna().all(axis=1).tolist() if values.shape[1] else [False] * len(df)
+
+    paths = []
+    current = [''] * len(columns)
+    section = ''
+    for n, row in enumerate(df.iloc[:, columns].itertuples(index=False)):
+        if len(columns) == 1:
+            label = _label(row[0])
+            if headers[n] and label:
+                section = label
+                paths.append((label,))
+            else:
+                paths.append(tuple(v for v in (section, label) if v))
+            continue
+        for j, value in enumerate(row):
+            label = _label(value)
+            if label:
+                current[j] = label
+                current[j + 1:] = [''] * (len(columns) - j - 1)
+        paths.append(tuple(v for v in current if v))
+    return paths
+
+
+def find_row(df: pd.DataFrame, patch: CellPatch) -> Any:
+    """
+    单元格修改所在行的索引
+    标签路径的最后一项须等于行的项目标签，其余各项（分区）须出现在行的标签路径中；
+    没有匹配的标签时整数 row 按行号定位。匹配到多行时报错（应指定 section）
+    """
+    labels = patch.labels
+    matches = []
+    if labels:
+        *sections, item = labels
+        for index, path in zip(df.index, row_labels(df)):
+            if path and path[-1] == item and all(s in path[:-1] for s in sections):
+                matches.append((index, path))
+    if len(matches) == 1:
+        return matches[0][0]
+    if len(matches) > 1:
+        paths = '; '.join('/'.join(path) for _, path in matches)
+        raise ValueError(f"{patch.file} 中行 {'/'.join(labels)} 匹配到多行（{paths}），请用 section 指定分区")
+    if isinstance(patch.row, int) and 0 <= patch.row < len(df):
+        return df.index[patch.row]
+    raise KeyError(f"{patch.file} 中没有行: {'/'.join(labels)}")
+
+
+class InputTableCache:
+    """缓存的输入表来源（IOHandler.register_table_source）"""
+
+    def __init__(self):
+        # {绝对路径: (文件时间戳, DataFrame)}
+        self._tables: Dict[str, Tuple[Tuple[int, int], pd.DataFrame]] = {}
+        # 当前计算的单元格修改 {绝对路径: [CellPatch]}
+        self._patches: Dict[str, List[CellPatch]] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def _table(self, path: str) -> Optional[pd.DataFrame]:
+        """缓存的输入表（不复制），文件不存在时返回 None"""
+        stamp = file_stamp(path)
+        if stamp is None:
+            return None
+        cached = self._tables.get(path)
+        if cached is None or cached[0] != stamp:
+            self.misses += 1
+            cached = self._tables[path] = (stamp, pd.read_csv(path, encoding='utf-8'))
+        else:
+            self.hits += 1
+        return cached[1]
+
+    def get(self, filepath: str) -> Optional[pd.DataFrame]:
+        """返回输入表副本（应用当前的单元格修改），文件不存在时返回 None"""
+        path = os.path.abspath(filepath)
+        table = self._table(path)
+        if table is None:
+            return None
+        df = table.copy()
+        for patch in self._patches.get(path, []):
+            self._apply(df, patch)
+        return df
+
+    @staticmethod
+    def _apply(df: pd.DataFrame, patch: CellPatch) -> None:
+        if patch.column not in df.columns:
+            raise KeyError(f"{patch.file} 中没有列: {patch.column}")
+        index = find_row(df, patch)
+        if pd.api.types.is_numeric_dtype(df[patch.column]):
+            df.loc[index, patch.column] = float(patch.value)
+        else:
+            df[patch.column] = df[patch.column].astype(object)
+            df.loc[index, patch.column] = patch.value
+
+    def set_patches(self, patches: List[CellPatch]) -> None:
+        """
+        设置当前计算的单元格修改（空列表清除）
+        设置时即在缓存的输入表上定位各修改，文件、行或列不存在及行匹配不唯一时报错
+        """
+        resolved: Dict[str, List[CellPatch]] = {}
+        for patch in patches:
+            path = os.path.abspath(patch.file)
+            table = self._table(path)
+            if table is None:
+                raise KeyError(f"输入文件不存在: {patch.file}")
+            if patch.column not in table.columns:
+                raise KeyError(f"{patch.file} 中没有列: {patch.column}")
+            find_row(table, patch)
+            resolved.setdefault(path, []).append(patch)
+        self._patches = resolved
+
+    def preload(self, paths: List[str]) -> int:
+        """预先解析输入文件，返回已缓存的文件数"""
+        for path in paths:
+            self.get(path)
+        return len(self._tables)
+
+    def __len__(self) -> int:
+        return len(self._tables)
+
+    def clear(self) -> None:
+        self._tables.clear()
+        self._patches.clear()
@@ -0,0 +1,197 @@
+# -*- coding: utf-8 -*-
+"""文件监视实时重算
+
+main.py --watch：首次完整计算后常驻内存，轮询输入CSV和配置文件的修改时间：
+- 输入文件修改时只重新解析该文件（其他输入表从内存缓存读取），
+  按流水线依赖图（pipeline.build_pipeline）只重算读取该文件的阶段及其下游阶段，其余阶段的结果保留在结果存储中
+- 配置文件修改时重新读取配置，只重算配置发生变化的阶段及其下游阶段
+- 每次重算后打印关键指标的变化（温室气体净排放、非化石能源占比、LCOE 等）
+"""
+
+import glob
+import io
+import os
+import time
+from contextlib import redirect_stdout
+from typing import Dict, Any, List, Optional, Set, Tuple
+
+from ..utils import ConfigLoader, IOHandler, ResultStore, file_stamp, KEY_INDICATORS, indicator_values
+from ..pipeline import build_pipeline
+from ..batch.shared import SHARED_INPUT_KEYS
+from .tables import InputTableCache
+
+
+# 默认监视的输入文件
+DEFAULT_WATCH_PATTERNS = ('data/input/*.csv',)
+
+# 变化小于该值时视为未变
+DELTA_TOLERANCE = 1e-9
+
+
+def _normalize(path: str) -> str:
+    return os.path.normcase(os.path.abspath(path))
+
+
+def format_delta(before: Dict[str, Dict[str, float]],
+                 after: Dict[str, Dict[str, float]]) -> List[str]:
+    """关键指标变化，每个指标一行，只列出变化的年份"""
+    lines = []
+    for label, _, _ in KEY_INDICATORS:
+        old, new = before.get(label, {}), after.get(label, {})
+        changes = []
+        for year, value in new.items():
+            previous = old.get(year)
+            if previous is None:
+                changes.append(f"{year}: {value:.4g}")
+            elif abs(value - previous) > DELTA_TOLERANCE:
+                changes.append(f"{year}: {previous:.4g}→{value:.4g} ({value - previous:+.4g})")
+        if changes:
+            lines.append(f"  {label:<10}" + "  ".join(changes))
+    return lines or ["  关键指标无变化"]
+
+
+class WatchSession:
+    """文件监视实时重算"""
+
+    def __init__(self, config_file: str = 'config/config.json',
+                 patterns: Tuple[str, ...] = DEFAULT_WATCH_PATTERNS, interval: float = 1.0):
+        """
+        Args:
+            config_file: 配置文件
+            patterns: 监视的输入文件（glob），配置中引用的输入文件也一并监视
+            interval: 轮询间隔（秒）
+        """
+        import main
+        self._main = main
+        self.config_file = config_file
+        self.patterns = patterns
+        self.interval = interval
+        self.tables = InputTableCache()
+        self.store = ResultStore()
+        self.config: Dict[str, Any] = {}
+        self._stamps: Dict[str, Optional[Tuple[int, int]]] = {}
+
+    # ==================== 依赖 ====================
+
+    def watched_files(self) -> List[str]:
+        """监视的文件：配置文件、匹配 patterns 的文件和配置中引用的输入文件"""
+        paths = {_normalize(self.config_file)}
+        for pattern in self.patterns:
+            paths.update(_normalize(p) for p in glob.glob(pattern))
+        for section in ('modules', 'analysis'):
+            for cfg in self.config.get(section, {}).values():
+                for key, value in cfg.items():
+                    if isinstance(value, str) and value and key.endswith('_file') \
+                            and not key.startswith('output_'):
+                        paths.add(_normalize(value))
+        return sorted(paths)
+
+    @staticmethod
+    def downstream(config: Dict[str, Any], names: Set[str]) -> Set[str]:
+        """阶段及其全部下游阶段"""
+        dependencies = build_pipeline(config).dependencies()
+        affected = set(names)
+        changed = True
+        while changed:
+            changed = False
+            for name, upstream in dependencies.items():
+                if name not in affected and upstream & affected:
+                    affected.add(name)
+                    changed = True
+        return affected
+
+    @staticmethod
+    def readers(config: Dict[str, Any], paths: Set[str]) -> Set[str]:
+        """读取这些文件的阶段"""
+        return {node.name for node in build_pipeline(config).nodes.values()
+                if any(_normalize(p) in paths for p in node.inputs)}
+
+    @staticmethod
+    def changed_stages(old: Dict[str, Any], new: Dict[str, Any]) -> Set[str]:
+        """配置发生变化（含新增）的阶段"""
+        old_nodes = build_pipeline(old).nodes
+        changed = set()
+        for name, node in build_pipeline(new).nodes.items():
+            previous = old_nodes.get(name)
+            if previous is None or (previous.params, previous.inputs, previous.requires) != \
+                    (node.params, node.inputs, node.requires):
+                changed.add(name)
+        return changed
+
+    # ==================== 计算 ====================
+
+    def _load_config(self) -> Dict[str, Any]:
+        with redirect_stdout(io.StringIO()):
+            return ConfigLoader(self.config_file).load()
+
+    def _preload(self) -> None:
+        paths = []
+        for section in ('modules', 'analysis'):
+            for cfg in self.config.get(section, {}).values():
+                paths += [cfg[key] for key in SHARED_INPUT_KEYS if cfg.get(key)]
+        self.tables.preload([p for p in paths if os.path.exists(p)])
+
+    def start(self) -> None:
+        """读取配置，注册输入表缓存，完整计算一次"""
+        self.config = self._load_config()
+        IOHandler.register_table_source(self.tables)
+        self._preload()
+        self._main.run_all(self.config, self.store)
+        self._stamps = {path: file_stamp(path) for path in self.watched_files()}
+
+    def poll(self) -> Set[str]:
+        """修改过的文件（含新增和删除）"""
+        current = {path: file_stamp(path) for path in self.watched_files()}
+        changed = {path for path in set(current) | set(self._stamps)
+                   if current.get(path) != self._stamps.get(path)}
+        self._stamps = current
+        return changed
+
+    def recompute(self, changed: Set[str]) -> List[str]:
+        """按修改的文件重算受影响的阶段，返回重算的阶段"""
+        stages: Set[str] = set()
+        if _normalize(self.config_file) in changed:
+            new_config = self._load_config()
+            stages |= self.changed_stages(self.config, new_config)
+            for name in set(self.store) - set(build_pipeline(new_config).nodes):
+                self.store.remove(name)
+            self.config = new_config
+        stages |= self.readers(self.config, changed)
+        stages = self.downstream(self.config, stages)
+        if not stages:
+            return []
+
+        before = indicator_values(self.store)
+        start = time.perf_counter()
+        with redirect_stdout(io.StringIO()):
+            self._main.run_all(self.config, self.store, only=stages)
+        seconds = time.perf_counter() - start
+
+        ordered = [name for name in build_pipeline(self.config).topological_order() if name in stages]
+        print(f"\n[{time.strftime('%H:%M:%S')}] 修改: {', '.join(os.path.basename(p) for p in sorted(changed))}"
+              f" -> 重算 {', '.join(ordered)}（{seconds:.2f}s）")
+        for line in format_delta(before, indicator_values(self.store)):
+            print(line)
+        return ordered
+
+    def run(self) -> None:
+        """完整计算一次后持续监视，直到中断（Ctrl+C）"""
+        self.start()
+        print(f"\n监视 {len(self._stamps)} 个文件的修改（每 {self.interval:g}s 检查一次，Ctrl+C 退出）")
+        try:
+            while True:
+                time.sleep(self.interval)
+                changed = self.poll()
+                if not changed:
+                    continue
+                # 等待编辑器写完
+                time.sleep(min(self.interval, 0.2))
+                changed |= self.poll()
+                try:
+                    self.recompute(changed)
+                except Exception as e:
+                    print(f"\n重算失败: {type(e).__name__}: {e}")
+        except KeyboardInterrupt:
+            print("\n停止监视")
+        finally:
+            IOHandler.unregister_table_source(self.tables)
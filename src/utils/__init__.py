@@ -2,6 +2,8 @@
 """工具模块"""
 
 from .config_loader import ConfigLoader
-from .io_handler import IOHandler
+from .io_handler import IOHandler, file_stamp
+from .result_store import ResultStore
+from .indicators import KEY_INDICATORS, indicator_values
 
-__all__ = ['ConfigLoader', 'IOHandler']
+__all__ = ['ConfigLoader', 'IOHandler', 'file_stamp', 'ResultStore', 'KEY_INDICATORS', 'indicator_values']
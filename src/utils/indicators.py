@@ -0,0 +1,37 @@
+# -*- coding: utf-8 -*-
+"""关键指标
+
+文件监视重算（service/watch.py）打印的指标变化与实验设计（batch/design.py）的默认输出指标共用此定义。
+"""
+
+from typing import Dict, Any, List, Tuple
+
+
+# 关键指标 (名称, 阶段, 结果中的路径)
+KEY_INDICATORS: List[Tuple[str, str, tuple]] = [
+    ('温室气体净排放', 'trajectory', ('summary', 'net_ghg_emission')),
+    ('非化石能源占比', 'structure', ('structure', 'non_fossil_ratio')),
+    ('非化石发电占比', 'power', ('generation_structure', '非化石占比')),
+    ('LCOE', 'power', ('lcoe', 'LCOE')),
+]
+
+
+def indicator_values(results, indicators: List[Tuple[str, str, tuple]] = None) -> Dict[str, Dict[str, float]]:
+    """
+    从各阶段结果中取指标 {名称: {年份: 数值}}（阶段未启用或结果中没有的指标跳过）
+    Args:
+        results: {阶段: 结果字典}，可为 ResultStore
+        indicators: 指标列表，默认 KEY_INDICATORS
+    """
+    values = {}
+    for label, stage, path in indicators or KEY_INDICATORS:
+        if stage not in results:
+            continue
+        item: Any = results[stage]
+        years = [str(y) for y in item.get('years', [])]
+        for key in path:
+            item = item.get(key) if isinstance(item, dict) else None
+        if item is None:
+            continue
+        values[label] = {year: float(value) for year, value in zip(years, list(item))}
+    return values
@@ -5,12 +5,39 @@ import os
 import csv
 import json
 import pandas as pd
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional, Tuple
+
+
+# 已注册的输入表来源（如批量计算工作进程中的共享内存输入表），读取CSV时优先查找
+_table_sources: List[Any] = []
+
+
+def file_stamp(filepath: str) -> Optional[Tuple[int, int]]:
+    """文件 (修改时间, 大小)，用于检查文件是否被修改，文件不存在时返回 None"""
+    try:
+        stat = os.stat(filepath)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
 
 
 class IOHandler:
     """输入输出处理器"""
     
+    @staticmethod
+    def register_table_source(source) -> None:
+        """
+        注册输入表来源
+        source.get(filepath) 返回该文件对应的 DataFrame，不提供该文件时返回 None
+        """
+        _table_sources.append(source)
+    
+    @staticmethod
+    def unregister_table_source(source) -> None:
+        """注销输入表来源"""
+        if source in _table_sources:
+            _table_sources.remove(source)
+    
     @staticmethod
     def ensure_dir(filepath: str) -> None:
         """确保目录存在"""
@@ -20,7 +47,11 @@ class IOHandler:
     
     @staticmethod
     def read_csv(filepath: str) -> pd.DataFrame:
-        """读取CSV文件"""
+        """读取CSV文件（已注册的输入表来源提供该文件时直接返回，不再解析）"""
+        for source in _table_sources:
+            df = source.get(filepath)
+            if df is not None:
+                return df
         if not os.path.exists(filepath):
             raise FileNotFoundError(f"文件不存在: {filepath}")
         return pd.read_csv(filepath, encoding='utf-8')
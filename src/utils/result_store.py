@@ -0,0 +1,103 @@
+# -*- coding: utf-8 -*-
+"""进程内结果存储
+
+计算模块和分析模块按名称发布结果字典，下游分析器按名称读取，不经过CSV往返：
+- 结果字典保留完整精度（导出CSV按4位小数格式化，重新读取会损失精度）
+- 分析模块同时发布输出表（与导出CSV结构相同、数值未格式化），
+  供情景数据一览表、统计表格等按输出表解析的分析器直接读取
+CSV导出只作为可选输出，不再是模块间传递数据的途径。
+"""
+
+import os
+from collections.abc import Mapping
+from typing import Dict, Any, List, Optional, Tuple, Iterator
+
+import pandas as pd
+
+
+class ResultStore(Mapping):
+    """进程内结果存储（只读映射接口：名称 -> 结果字典）"""
+
+    def __init__(self):
+        self._results: Dict[str, Dict[str, Any]] = {}
+        # {名称: (表头, 数据行)}
+        self._tables: Dict[str, Tuple[List[str], List[list]]] = {}
+
+    # ==================== 发布 ====================
+
+    def publish(self, name: str, results: Dict[str, Any], analyzer=None) -> None:
+        """
+        发布结果
+        Args:
+            name: 名称，如 'power'、'template'
+            results: 结果字典
+            analyzer: 分析器（提供 build_table 时同时发布完整精度的输出表）
+        """
+        self._results[name] = results
+        if analyzer is not None and hasattr(analyzer, 'build_table'):
+            self.publish_table(name, *analyzer.build_table(results, precise=True))
+        else:
+            self._tables.pop(name, None)
+
+    def publish_table(self, name: str, headers: List[str], rows: List[list]) -> None:
+        """发布输出表（表头和数据行，空单元格为空字符串）"""
+        self._tables[name] = (list(headers), [list(row) for row in rows])
+
+    def entry(self, name: str) -> Tuple[Dict[str, Any], Optional[Tuple[List[str], List[list]]]]:
+        """(结果字典, 输出表)，用于保存检查点"""
+        return self._results[name], self._tables.get(name)
+
+    def restore(self, name: str, results: Dict[str, Any],
+                table: Optional[Tuple[List[str], List[list]]] = None) -> None:
+        """恢复由 entry() 保存的结果和输出表"""
+        self._results[name] = results
+        if table is not None:
+            self.publish_table(name, *table)
+        else:
+            self._tables.pop(name, None)
+
+    def remove(self, name: str) -> None:
+        """删除结果和输出表"""
+        self._results.pop(name, None)
+        self._tables.pop(name, None)
+
+    def clear(self) -> None:
+        """清空存储"""
+        self._results.clear()
+        self._tables.clear()
+
+    # ==================== 读取 ====================
+
+    def __getitem__(self, name: str) -> Dict[str, Any]:
+        return self._results[name]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._results)
+
+    def __len__(self) -> int:
+        return len(self._results)
+
+    def has_table(self, name: str) -> bool:
+        return name in self._tables
+
+    def table(self, name: str) -> Optional[pd.DataFrame]:
+        """
+        输出表的 DataFrame（与 pd.read_csv 读取导出CSV的结构一致：空单元格为 NaN），
+        未发布时返回 None
+        """
+        if name not in self._tables:
+            return None
+        headers, rows = self._tables[name]
+        nan = float('nan')
+        width = len(headers)
+        data = [[nan if value == '' else value for value in row[:width]] + [nan] * (width - len(row))
+                for row in rows]
+        return pd.DataFrame(data, columns=headers)
+
+    def export_table(self, name: str, filepath: str, encoding: str = 'utf-8') -> None:
+        """将输出表按完整精度导出为CSV（格式化的导出仍使用各分析器的 export_to_csv）"""
+        table = self.table(name)
+        if table is None:
+            raise KeyError(f"结果存储中没有输出表: {name}")
+        os.makedirs(os.path.dirname(filepath), exist_ok=True) if os.path.dirname(filepath) else None
+        table.to_csv(filepath, index=False, encoding=encoding)
@@ -0,0 +1,155 @@
+# -*- coding: utf-8 -*-
+"""自定义技术目录下各电力计算引擎的测试
+
+目录在 '光伏(分布式)' 与 '生物质' 之间插入 '光热'，类型顺序与默认目录不同。
+'光热' 发电量和成本为 0 时，各引擎结果应与默认目录一致；有发电量时应计入结果。
+"""
+
+import numpy as np
+import pytest
+from dataclasses import replace
+
+from src.modules.power import (VectorizedPowerCalculator, LdcPowerCalculator, PowerDispatchCalculator,
+                               ExpansionPowerCalculator, RegionalPowerCalculator, TechnologyCatalog,
+                               TechnologySpec, DEFAULT_CATALOG, PowerBatchCalculator,
+                               calculate_power_npv, calculate_power_sensitivity)
+from src.modules.power.dispatch import HourlyProfiles
+from src.modules.power.stock import CapacityStockModel
+
+YEARS = ['2020', '2030', '2040', '2050', '2060']
+
+
+def custom_catalog() -> TechnologyCatalog:
+    technologies = [replace(t) for t in DEFAULT_CATALOG.technologies]
+    index = [t.name for t in technologies].index('生物质')
+    technologies.insert(index, TechnologySpec('光热', fuel_cost=False, non_fossil=True, lifetime=25))
+    return TechnologyCatalog(technologies)
+
+
+def power_dict(catalog: TechnologyCatalog, seed: int = 0, solar_thermal: float = 0.0) -> dict:
+    """按目录生成一个情景的 load_from_dict 输入，默认目录的类型取值与目录无关，'光热' 发电量取 solar_thermal"""
+    rng = np.random.default_rng(seed)
+    variables = DEFAULT_CATALOG.to_variables()
+    n = len(YEARS)
+    series = lambda low, high: rng.uniform(low, high, n).tolist()
+    generation = {k: series(0.2, 2.0) for k in variables.GENERATION_TYPES}
+    hours = {k: series(1500, 5000) for k in variables.GENERATION_TYPES}
+    capacity_cost = {k: series(3000, 9000) for k in variables.CAPACITY_COST_TYPES}
+    om_ratio = {k: series(0.02, 0.05) for k in variables.OM_COST_RATIO_TYPES}
+    fuel_cost = {k: series(0.1, 0.4) for k in variables.FUEL_COST_TYPES}
+    if '光热' in catalog.cost_types:
+        generation['光热'] = [solar_thermal] * n
+        hours['光热'] = [3000.0] * n
+        capacity_cost['光热'] = [12000.0 if solar_thermal else 0.0] * n
+        om_ratio['光热'] = [0.03 if solar_thermal else 0.0] * n
+        fuel_cost['光热'] = [0.0] * n
+    return {
+        'years': YEARS,
+        'generation': generation,
+        'utilization_hours': hours,
+        'storage': {k: series(10, 80) for k in variables.STORAGE_TYPES},
+        'transmission_loss': [0.05] * n,
+        'error_rate': [0.01] * n,
+        'cross_region_capacity': series(50, 200),
+        'hydrogen_demand': series(0.0, 0.5),
+        'electricity_demand': [sum(v[i] for v in generation.values()) * 0.9 for i in range(n)],
+        'fuel_rate': {k: series(0.2, 0.35) for k in variables.FUEL_RATE_TYPES},
+        'ccs_capture_rate': [0.9] * n,
+        'capacity_cost': capacity_cost,
+        'om_ratio': om_ratio,
+        'fuel_cost': fuel_cost,
+        'offshore_wind_ratio': series(0.1, 0.4),
+        'distributed_solar_ratio': series(0.2, 0.5),
+    }
+
+
+def profiles(num_hours: int = 168) -> HourlyProfiles:
+    hours = np.arange(num_hours)
+    return HourlyProfiles(demand=1.0 + 0.3 * np.sin(hours / 24 * 2 * np.pi),
+                          wind=0.3 + 0.2 * np.cos(hours / 50),
+                          solar=np.clip(np.sin((hours % 24 - 6) / 12 * np.pi), 0.0, 1.0))
+
+
+def make_calculator(calculator_class, catalog: TechnologyCatalog = None, **kwargs):
+    calculator = calculator_class()
+    if catalog is not None:
+        calculator.set_catalog(catalog)
+    if calculator_class is RegionalPowerCalculator:
+        calculator.load_regions({f'区域{i}': power_dict(catalog or DEFAULT_CATALOG, seed=i, **kwargs)
+                                 for i in range(3)})
+    else:
+        calculator.load_from_dict(power_dict(catalog or DEFAULT_CATALOG, **kwargs))
+    if calculator_class is PowerDispatchCalculator:
+        calculator.profiles = profiles()
+    return calculator
+
+
+def assert_same_results(custom: dict, default: dict) -> None:
+    for section, items in default.items():
+        if not isinstance(items, dict):
+            continue
+        for key, values in items.items():
+            if isinstance(values, str) or isinstance(values, list) and values and isinstance(values[0], str):
+                continue
+            if isinstance(values, dict):
+                assert_same_results(custom[section], {key: values})
+            else:
+                np.testing.assert_allclose(custom[section][key], values, rtol=1e-9, atol=1e-9,
+                                           err_msg=f"{section}.{key}")
+
+
+@pytest.mark.parametrize('calculator_class', [VectorizedPowerCalculator, LdcPowerCalculator,
+                                              PowerDispatchCalculator, RegionalPowerCalculator])
+def test_zero_technology_matches_default(calculator_class):
+    default = make_calculator(calculator_class).calculate()
+    custom = make_calculator(calculator_class, custom_catalog()).calculate()
+    assert custom['generation']['光热'] == [0.0] * len(YEARS)
+    assert_same_results(custom, default)
+
+
+@pytest.mark.parametrize('calculator_class', [VectorizedPowerCalculator, LdcPowerCalculator,
+                                              PowerDispatchCalculator, RegionalPowerCalculator,
+                                              ExpansionPowerCalculator])
+def test_custom_technology_in_results(calculator_class):
+    pytest.importorskip('scipy')
+    results = make_calculator(calculator_class, custom_catalog(), solar_thermal=0.5).calculate()
+    assert '光热' in results['generation']
+    assert '光热' in results['investment']
+    assert all(np.isfinite(results['total_cost']['总成本']))
+
+
+def test_expansion_plans_custom_technology():
+    pytest.importorskip('scipy')
+    from src.modules.power import CapacityExpansionPlanner
+    catalog = custom_catalog()
+    calculator = make_calculator(ExpansionPowerCalculator, catalog, solar_thermal=0.5)
+    planner = CapacityExpansionPlanner(calculator.variables, calculator.formulas, catalog)
+    plan = planner.solve(calculator.build_arrays())
+    assert plan['status'] == 0
+    assert '光热' in plan['types']
+
+
+def test_npv_sensitivity_stock_follow_catalog():
+    catalog = custom_catalog()
+    calculator = make_calculator(VectorizedPowerCalculator, catalog, solar_thermal=0.5)
+    arrays = calculator.build_arrays()
+
+    npv = calculate_power_npv(arrays, [0.05], variables=calculator.variables, catalog=catalog)
+    assert '光热' in npv[0.05]['investment']
+    assert '光热' not in npv[0.05]['fuel_cost']
+
+    sensitivity = calculate_power_sensitivity(arrays, calculator.variables, catalog=catalog)
+    assert '光热' in sensitivity['total_cost']['capacity_cost']
+    assert not sensitivity['total_cost']['fuel_cost']['光热'].any()
+
+    stock = CapacityStockModel(catalog=catalog).run_power_arrays(arrays)
+    assert stock['types'] == catalog.cost_types
+    assert stock['remaining'][catalog.cost_types.index('光热')].any()
+
+
+def test_batch_calculator_follows_catalog():
+    catalog = custom_catalog()
+    batch = PowerBatchCalculator(catalog)
+    batch.load_scenarios({'a': power_dict(catalog, 0, 0.5), 'b': power_dict(catalog, 1, 0.5)})
+    results = batch.calculate()
+    assert results['generation']['光热'].shape == (2, len(YEARS))
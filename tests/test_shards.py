@@ -0,0 +1,73 @@
+# -*- coding: utf-8 -*-
+"""分片结果合并的测试"""
+
+import os
+import pickle
+
+from src.batch import ScenarioSpec, merge_results
+from src.batch.runner import RESULTS_FILENAME
+from src.batch.shards import MERGED_DIRNAME
+
+
+def scenario_store(index: int, resumed: bool) -> dict:
+    """
+    一个情景的结果存储
+    一次运行完成时各阶段结果按完成顺序写入并共享年份列表；
+    从检查点恢复时先写入恢复的阶段，各阶段结果分别反序列化，不共享对象
+    """
+    years = ['2020', '2030', '2060']
+    power = {'years': years, 'generation': {'煤电': [1.0 + index, 0.8, 0.1]}}
+    macro = {'years': list(years) if resumed else years, 'gdp': {'GDP': [100.0, 150.0 + index, 300.0]}}
+    if resumed:
+        return {'macro': pickle.loads(pickle.dumps(macro)), 'power': pickle.loads(pickle.dumps(power))}
+    return {'power': power, 'macro': macro}
+
+
+def write_shard(output_root: str, names: list, resumed: bool) -> None:
+    for name in names:
+        output_dir = os.path.join(output_root, name)
+        os.makedirs(output_dir, exist_ok=True)
+        with open(os.path.join(output_dir, RESULTS_FILENAME), 'wb') as f:
+            pickle.dump(scenario_store(int(name[1:]), resumed), f, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def merged_bytes(output_root: str) -> dict:
+    merged_dir = os.path.join(output_root, MERGED_DIRNAME)
+    files = {}
+    for filename in ('results.pkl', 'results_long.csv'):
+        with open(os.path.join(merged_dir, filename), 'rb') as f:
+            files[filename] = f.read()
+    return files
+
+
+def test_merge_is_independent_of_shard_and_stage_order(tmp_path):
+    scenarios = [ScenarioSpec(name) for name in ('s0', 's1', 's2', 's3')]
+
+    # 一次全部成功：分片 0、1 依次完成
+    complete = str(tmp_path / 'complete')
+    write_shard(complete, ['s0', 's2'], resumed=False)
+    write_shard(complete, ['s1', 's3'], resumed=False)
+
+    # 分片 1 先完成；分片 0 中断后从检查点恢复
+    resumed = str(tmp_path / 'resumed')
+    write_shard(resumed, ['s3', 's1'], resumed=False)
+    write_shard(resumed, ['s2', 's0'], resumed=True)
+
+    first = merge_results(complete, scenarios, num_shards=2, verbose=False)
+    second = merge_results(resumed, scenarios, num_shards=2, verbose=False)
+    assert first['merged'] == second['merged'] == ['s0', 's1', 's2', 's3']
+    assert merged_bytes(complete) == merged_bytes(resumed)
+
+    with open(os.path.join(resumed, MERGED_DIRNAME, 'results.pkl'), 'rb') as f:
+        merged = pickle.load(f)
+    assert list(merged) == ['s0', 's1', 's2', 's3']
+    assert list(merged['s0']) == ['macro', 'power']
+
+
+def test_merge_reports_missing_scenarios(tmp_path):
+    output_root = str(tmp_path)
+    write_shard(output_root, ['s0'], resumed=False)
+    report = merge_results(output_root, [ScenarioSpec('s0'), ScenarioSpec('s1')], num_shards=2,
+                           verbose=False)
+    assert report['merged'] == ['s0']
+    assert report['missing'] == ['s1']